@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-chunk cleanup heuristics, legacy rescans vs ChunkProfile.
+
+Legacy path (what the runner used to do per chunk):
+    needs_llm_cleanup() → cleanup_markdown() → classify_chunk()
+    + _calculate_timeout() + _cleanup_options() — five scans of the same text.
+
+Profile path:
+    profile_chunk() once, then every heuristic reads the profile.
+
+Usage:
+    PYTHONPATH=. python bench/bench_chunk_profile.py
+    PYTHONPATH=. python bench/bench_chunk_profile.py --corpus docs/ --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from src.llm.cleanup import (
+    _calculate_timeout,
+    _cleanup_options,
+    classify_chunk,
+    needs_llm_cleanup,
+    profile_chunk,
+)
+from src.scraper.markdown import chunk_markdown
+
+_PIECES = [
+    "Documentation paragraph explaining the configuration options in detail. ",
+    "## Section heading\n\n",
+    "```python\nimport docrawl\nclient = docrawl.Client()\nclient.run()\n```\n\n",
+    "| Option | Default | Description |\n|---|---|---|\n| depth | 5 | Max depth |\n",
+    "| Name | Value |\n| a | 1 |\n",
+    r"The loss is $\frac{1}{n}\sum_i x_i$ for all samples. ",
+    "Pricing starts at $9.99 per month. ",
+    "On this page\n",
+    "Accept cookie settings. Privacy Policy. ",
+    "- list item with `inline code`\n",
+]
+
+
+def _synthetic_corpus(n_chunks: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(n_chunks):
+        text = ""
+        while len(text) < rng.randint(500, 6000):
+            text += rng.choice(_PIECES)
+        chunks.append(text)
+    return chunks
+
+
+def _file_corpus(root: Path) -> list[str]:
+    chunks: list[str] = []
+    for path in sorted(root.rglob("*.md")):
+        chunks.extend(chunk_markdown(path.read_text(encoding="utf-8")))
+    return chunks
+
+
+def _legacy(chunk: str) -> None:
+    if needs_llm_cleanup(chunk):
+        classify_chunk(chunk)
+        _calculate_timeout(chunk)
+        _cleanup_options(chunk)
+
+
+def _profiled(chunk: str) -> None:
+    profile = profile_chunk(chunk)
+    if needs_llm_cleanup(chunk, profile):
+        classify_chunk(chunk, profile)
+        _calculate_timeout(chunk, profile)
+        _cleanup_options(chunk, profile)
+
+
+def _time(fn, corpus: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for chunk in corpus:
+            fn(chunk)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--corpus", type=Path, help="Directory of .md files to chunk")
+    parser.add_argument("--chunks", type=int, default=500, help="Synthetic chunk count")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    corpus = (
+        _file_corpus(args.corpus) if args.corpus else _synthetic_corpus(args.chunks)
+    )
+    total_chars = sum(len(c) for c in corpus)
+    calls = len(corpus) * args.repeat
+    print(f"Corpus: {len(corpus)} chunks, {total_chars / 1024:.0f} KB")
+
+    # Sanity check: both paths must agree before timing means anything
+    for chunk in corpus:
+        assert classify_chunk(chunk, profile_chunk(chunk)) == classify_chunk(chunk)
+
+    legacy = _time(_legacy, corpus, args.repeat)
+    profiled = _time(_profiled, corpus, args.repeat)
+    print(f"legacy   : {legacy * 1e6 / calls:8.1f} µs/chunk")
+    print(f"profile  : {profiled * 1e6 / calls:8.1f} µs/chunk")
+    print(f"speedup  : {legacy / profiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: robots.txt is_allowed on 100k URLs, per-rule scan vs RobotsMatcher.
+
+Legacy path (what RobotsParser.is_allowed used to do per URL): urlparse the
+URL, then ``startswith`` against every Disallow and every Allow rule. It knew
+no wildcards, so it is timed on the plain rules only.
+
+Reference path (a straightforward wildcard-aware implementation): one
+compiled regex per rule, every rule tried per URL, longest match wins.
+
+Fast path: ``RobotsMatcher`` — plain rules in a character trie walked once
+along the path; wildcard rules grouped under the trie node of their literal
+prefix, one combined regex per node, tried only where the walk passes.
+
+Usage:
+    PYTHONPATH=. python bench/bench_robots.py
+    PYTHONPATH=. python bench/bench_robots.py --urls 100000 --rules 5000 --repeat 5
+    PYTHONPATH=. python bench/bench_robots.py --robots robots.txt --corpus urls.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.crawler.robots import RobotsParser
+
+HOST = "https://example.com"
+SECTIONS = ["docs", "api", "blog", "guide", "ref", "search", "static", "Admin"]
+
+
+def _legacy(parser: RobotsParser, url: str) -> bool:
+    path = urlparse(url).path
+    best_disallow = max(
+        (len(r) for r in parser.disallowed if path.startswith(r)), default=None
+    )
+    best_allow = max(
+        (len(r) for r in parser.allowed if path.startswith(r)), default=None
+    )
+    if best_disallow is None:
+        return True
+    if best_allow is None:
+        return False
+    return best_allow >= best_disallow
+
+
+def _rule_regex(rule: str) -> re.Pattern[str]:
+    anchored = rule.endswith("$")
+    body = rule[:-1] if anchored else rule
+    pattern = ".*".join(re.escape(part) for part in body.split("*"))
+    return re.compile(pattern + (r"\Z" if anchored else ""))
+
+
+def _reference(parser: RobotsParser):
+    """Per-rule regex scan: the obvious wildcard-aware is_allowed."""
+    rules = [(_rule_regex(r), len(r), False) for r in parser.disallowed] + [
+        (_rule_regex(r), len(r), True) for r in parser.allowed
+    ]
+
+    def is_allowed(url: str) -> bool:
+        parts = urlparse(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        best = (-1, True)
+        for regex, length, allow in rules:
+            if (length, allow) > best and regex.match(path):
+                best = (length, allow)
+        return best[1]
+
+    return is_allowed
+
+
+def _synthetic_robots(rng: random.Random, n: int, wildcards: bool) -> str:
+    lines = ["User-agent: *"]
+    for _ in range(n):
+        section = rng.choice(SECTIONS)
+        kind = rng.random()
+        if wildcards and kind < 0.15:
+            rule = f"/{section}/*/p{rng.randint(0, 999)}"
+        elif wildcards and kind < 0.2:
+            rule = f"/*.{rng.choice(['pdf', 'zip', 'json'])}$"
+        elif wildcards and kind < 0.25:
+            rule = f"/{section}/*?{rng.choice(['print', 'sort', 'ref'])}="
+        else:
+            rule = f"/{section}/s{rng.randint(0, 400)}/"
+            if rng.random() < 0.5:
+                rule += f"p{rng.randint(0, 50)}"
+        directive = "Allow" if rng.random() < 0.3 else "Disallow"
+        lines.append(f"{directive}: {rule}")
+    return "\n".join(lines) + "\n"
+
+
+def _synthetic_urls(rng: random.Random, n: int) -> list[str]:
+    tails = ["", "", "/", ".html", ".pdf", "?print=1", "?q=x", "#top"]
+    return [
+        f"{HOST}/{rng.choice(SECTIONS)}/s{rng.randint(0, 400)}"
+        f"/p{rng.randint(0, 999)}{rng.choice(tails)}"
+        for _ in range(n)
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def _parser(content: str) -> RobotsParser:
+    parser = RobotsParser()
+    parser._parse(content)
+    return parser
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--robots", type=Path, help="robots.txt file to match against")
+    parser.add_argument("--corpus", type=Path, help="Text file, one URL per line")
+    parser.add_argument("--urls", type=int, default=100_000, help="Synthetic URLs")
+    parser.add_argument("--rules", type=int, default=2000, help="Synthetic rules")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    if args.corpus:
+        urls = [u.strip() for u in args.corpus.read_text().splitlines() if u.strip()]
+    else:
+        urls = _synthetic_urls(rng, args.urls)
+    print(f"URLs: {len(urls)}")
+
+    # Plain rules only: the legacy scan is the baseline
+    plain = _parser(_synthetic_robots(rng, args.rules, wildcards=False))
+    plain_urls = [u.split("?", 1)[0] for u in urls]  # legacy ignored the query
+    assert [_legacy(plain, u) for u in plain_urls] == [
+        plain.is_allowed(u) for u in plain_urls
+    ]
+    legacy_t = _time(lambda: [_legacy(plain, u) for u in plain_urls], args.repeat)
+    trie_t = _time(lambda: [plain.is_allowed(u) for u in plain_urls], args.repeat)
+    print(f"{len(plain.disallowed) + len(plain.allowed)} plain rules")
+    print(f"  startswith scan: {legacy_t * 1000:8.1f} ms")
+    print(f"  RobotsMatcher  : {trie_t * 1000:8.1f} ms")
+    print(f"  speedup        : {legacy_t / trie_t:8.1f}x")
+
+    # Wildcard rules: a per-rule regex scan is the baseline
+    content = (
+        args.robots.read_text()
+        if args.robots
+        else _synthetic_robots(rng, args.rules, wildcards=True)
+    )
+    mixed = _parser(content)
+    reference = _reference(mixed)
+    assert [reference(u) for u in urls] == [mixed.is_allowed(u) for u in urls]
+    wildcard = sum(
+        "*" in r or r.endswith("$") for r in mixed.disallowed + mixed.allowed
+    )
+    ref_t = _time(lambda: [reference(u) for u in urls], args.repeat)
+    fast_t = _time(lambda: [mixed.is_allowed(u) for u in urls], args.repeat)
+    print(f"{len(mixed.disallowed) + len(mixed.allowed)} rules, {wildcard} wildcard")
+    print(f"  per-rule regex : {ref_t * 1000:8.1f} ms")
+    print(f"  RobotsMatcher  : {fast_t * 1000:8.1f} ms")
+    print(f"  speedup        : {ref_t / fast_t:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: sitemap parsing, fromstring + findall vs streaming parser.
+
+Legacy path: ``gzip.decompress`` the whole body, build the full element tree
+with ``ET.fromstring`` and walk it with ``findall``.
+
+Streaming path: ``iter_sitemap_chunks`` gunzips in bounded chunks into
+``parse_sitemap_stream``, which hands out each ``<loc>`` as it closes.
+
+Reports wall time and peak traced memory (tracemalloc) for each path.
+
+Usage:
+    PYTHONPATH=. python bench/bench_sitemap_parse.py
+    PYTHONPATH=. python bench/bench_sitemap_parse.py --urls 50000 --gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import time
+import tracemalloc
+
+import defusedxml.ElementTree as ET
+
+from src.crawler.discovery import SITEMAP_NS, iter_sitemap_chunks, parse_sitemap_stream
+
+
+def _sitemap(n_urls: int) -> bytes:
+    entries = "".join(
+        f"<url><loc>https://example.com/docs/section{i % 50}/page{i}</loc>"
+        f"<lastmod>2024-01-{i % 28 + 1:02d}</lastmod><priority>0.5</priority></url>"
+        for i in range(n_urls)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="{SITEMAP_NS["ns"]}">{entries}</urlset>'
+    ).encode()
+
+
+def _legacy_parse(content: bytes) -> list[str]:
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    root = ET.fromstring(content)
+    return [e.text for e in root.findall(".//ns:url/ns:loc", SITEMAP_NS) if e.text]
+
+
+def _streaming_parse(content: bytes) -> list[str]:
+    urls: list[str] = []
+    parse_sitemap_stream(iter_sitemap_chunks(content), urls.append)
+    return urls
+
+
+def _measure(fn, content: bytes) -> tuple[list[str], float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(content)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--urls", type=int, default=50000, help="URLs in the sitemap")
+    parser.add_argument("--gzip", action="store_true", help="Serve a .xml.gz body")
+    args = parser.parse_args()
+
+    content = _sitemap(args.urls)
+    raw_size = len(content)
+    if args.gzip:
+        content = gzip.compress(content)
+    mb = 1e6
+    print(
+        f"Sitemap: {args.urls} URLs, {raw_size / mb:.1f} MB XML, "
+        f"{len(content) / mb:.1f} MB body"
+    )
+
+    legacy_urls, legacy_t, legacy_mem = _measure(_legacy_parse, content)
+    stream_urls, stream_t, stream_mem = _measure(_streaming_parse, content)
+    # Sanity check: both paths must agree before timing means anything
+    assert legacy_urls == stream_urls
+
+    # Both peaks include the returned URL list itself
+    print(f"legacy   : {legacy_t:6.2f} s, peak {legacy_mem / 1e6:7.1f} MB")
+    print(f"streaming: {stream_t:6.2f} s, peak {stream_mem / 1e6:7.1f} MB")
+    print(f"memory   : {legacy_mem / stream_mem:6.2f}x lower")
+
+
+if __name__ == "__main__":
+    main()
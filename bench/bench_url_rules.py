@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: filter_urls on large sitemaps, per-URL loops vs UrlRules.
+
+Legacy path (what filter_urls used to do per URL): urlparse the URL and the
+base URL, loop over EXCLUDED_EXTENSIONS and EXCLUDED_PATTERNS, then over the
+language pattern lists, working out again whether the base URL has a
+language.
+
+Fast path: ``UrlRules`` — base parts and language worked out once, one
+combined regex per rule class, plain http(s) URLs split without urlparse.
+With --globs, include/exclude globs are timed as well (no legacy
+equivalent).
+
+Usage:
+    PYTHONPATH=. python bench/bench_url_rules.py
+    PYTHONPATH=. python bench/bench_url_rules.py --urls 100000 --repeat 5
+    PYTHONPATH=. python bench/bench_url_rules.py --corpus urls.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.crawler.filter import (
+    EXCLUDED_EXTENSIONS,
+    EXCLUDED_PATTERNS,
+    LANGUAGE_PATTERNS,
+    UrlRules,
+    filter_urls,
+)
+
+BASE_URL = "https://example.com/docs/"
+
+
+def _legacy_language(path: str, language: str, base_url: str) -> bool:
+    if language == "all":
+        return True
+    path_lower = path.lower()
+    for pattern in LANGUAGE_PATTERNS.get(language, [f"/{language}/"]):
+        if pattern in path_lower:
+            return True
+    for other_lang in set(LANGUAGE_PATTERNS.keys()) - {language}:
+        for pattern in LANGUAGE_PATTERNS[other_lang]:
+            if pattern in path_lower:
+                return False
+    if base_url:
+        base_path = urlparse(base_url).path.lower()
+        if any(p in base_path for ps in LANGUAGE_PATTERNS.values() for p in ps):
+            return False
+    return True
+
+
+def _legacy(urls: list[str], base_url: str, language: str) -> list[str]:
+    filtered: set[str] = set()
+    for url in urls:
+        base_parsed = urlparse(base_url)
+        parsed = urlparse(url)
+        if parsed.netloc != base_parsed.netloc:
+            continue
+        path = parsed.path.rstrip("/")
+        if not path.startswith(base_parsed.path.rstrip("/")):
+            continue
+        if any(path.lower().endswith(ext) for ext in EXCLUDED_EXTENSIONS):
+            continue
+        if any(pattern in path.lower() for pattern in EXCLUDED_PATTERNS):
+            continue
+        if not _legacy_language(path, language, base_url):
+            continue
+        filtered.add(f"{parsed.scheme}://{parsed.netloc}{path}")
+    return sorted(filtered)
+
+
+def _synthetic_urls(rng: random.Random, n: int) -> list[str]:
+    langs = ["", "", "", "en/", "fr/", "ja/", "pt-br/", "EN/"]
+    tails = ["", "", "/", ".html", ".pdf", ".PNG", "?page=2", "#top", ";jsessionid=1"]
+    sections = ["guide", "api", "blog", "changelog", "tutorial", "assets", "ref"]
+    odd = [
+        "HTTPS://example.com/docs/x",
+        "https://example.com/docs/ spaced",
+        "https://example.com/docs/café",
+        "https://[::1]/docs/x",
+        "https://example.com:8443/docs/x",
+        "ftp://example.com/docs/x",
+        "/docs/relative",
+    ]
+    urls = []
+    for i in range(n):
+        if i % 97 == 0:
+            urls.append(rng.choice(odd))
+            continue
+        host = "example.com" if rng.random() < 0.9 else "other.org"
+        prefix = "docs/" if rng.random() < 0.85 else ""
+        urls.append(
+            f"https://{host}/{rng.choice(langs)}{prefix}{rng.choice(sections)}"
+            f"/s{rng.randint(0, 200)}/p{i}{rng.choice(tails)}"
+        )
+    return urls
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--corpus", type=Path, help="Text file, one URL per line")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--urls", type=int, default=100_000, help="Synthetic URLs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--globs", action="store_true", help="Also time 10+10 globs")
+    args = parser.parse_args()
+
+    if args.corpus:
+        urls = [u.strip() for u in args.corpus.read_text().splitlines() if u.strip()]
+    else:
+        urls = _synthetic_urls(random.Random(42), args.urls)
+    print(f"URLs: {len(urls)}")
+
+    # Sanity check: both paths must agree before timing means anything
+    assert _legacy(urls, args.base_url, args.language) == filter_urls(
+        urls, args.base_url, args.language
+    )
+
+    legacy_t = _time(lambda: _legacy(urls, args.base_url, args.language), args.repeat)
+    rules_t = _time(
+        lambda: UrlRules(args.base_url, args.language).filter(urls), args.repeat
+    )
+    print(f"per-URL loops: {legacy_t * 1000:8.1f} ms")
+    print(f"UrlRules     : {rules_t * 1000:8.1f} ms")
+    print(f"speedup      : {legacy_t / rules_t:8.1f}x")
+
+    if args.globs:
+        include = [f"/docs/{s}*" for s in ("guide", "api", "tutorial", "ref")] + [
+            f"*/s{n}/*" for n in range(6)
+        ]
+        exclude = [f"*/p{n}" for n in range(10)]
+        rules = UrlRules(args.base_url, args.language, include, exclude)
+        globs_t = _time(lambda: rules.filter(urls), args.repeat)
+        print(f"+ 20 globs   : {globs_t * 1000:8.1f} ms")
+        top = ", ".join(f"{rule} ({n})" for rule, n in rules.hits.most_common(5))
+        print(f"top rules    : {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,22 @@ class JobRequest(BaseModel):
         "markdown"  # PR 3.2: structured JSON output opt-in
     )
     use_pipeline_mode: bool = False  # PR 3.3: opt-in producer/consumer pipeline
+    stream_llm_filter: bool = Field(
+        default=True,
+        description=(
+            "Start scraping URLs as each LLM filtering batch accepts them instead of "
+            "waiting for the full filtered list. The index still follows the final "
+            "LLM reading order."
+        ),
+    )
+    use_url_classifier: bool = Field(
+        default=True,
+        description=(
+            "Let the local URL classifier (trained on earlier LLM filtering "
+            "decisions) keep or drop confidently classified URLs without asking "
+            "the LLM. Set False to send every URL to crawl_model."
+        ),
+    )
     converter: str | None = Field(
         default=None, pattern=r"^[\w-]{1,50}$"
     )  # PR 3.4: converter plugin name (None = default)
@@ -56,7 +72,88 @@ class JobRequest(BaseModel):
         ),
     )
     language: str = Field(default="en", max_length=10)
+    doc_version: str = Field(
+        default="auto",
+        max_length=50,
+        description=(
+            "Documentation version to keep where the site has versioned trees "
+            "(/docs/v1/, /docs/v2/, /en/stable/, /en/3.2/...). 'auto' keeps "
+            "stable, latest or current, else the highest version, and keeps "
+            "trees of development branches only (main, next...) whole; 'all' keeps "
+            "every version."
+        ),
+    )
+    include_globs: list[str] | None = Field(
+        default=None,
+        description=(
+            "fnmatch globs a URL must match to be kept, e.g. '/docs/guides/*'. "
+            "Globs without '://' match the URL path, others the whole URL (no "
+            "query string). Applied after the built-in filters. Each glob max "
+            "200 chars, list max 20 items."
+        ),
+    )
+    exclude_globs: list[str] | None = Field(
+        default=None,
+        description=(
+            "fnmatch globs of URLs to drop, e.g. '*/internal/*' (same matching as "
+            "include_globs; exclusion wins). Each glob max 200 chars, list max "
+            "20 items."
+        ),
+    )
     filter_sitemap_by_path: bool = True
+    use_discovery_cache: bool = Field(
+        default=True,
+        description=(
+            "Reuse the URLs discovered for the same base URL, max_depth and "
+            "filter_sitemap_by_path by an earlier job (TTL, sitemaps revalidated "
+            "via ETag/Last-Modified once expired). Set False to force discovery."
+        ),
+    )
+    sitemap_early_stop: bool = Field(
+        default=False,
+        description=(
+            "Stream child sitemaps of a sitemap index and stop downloading one as "
+            "soon as its first entries show no URL under the base path. Only "
+            "applies with filter_sitemap_by_path on a non-root base path."
+        ),
+    )
+    canonical_dedup: bool = Field(
+        default=False,
+        description=(
+            "Skip URL variants of the same page before fetching: tracking params "
+            "(utm_*, gclid, ...) and trailing index.html are removed, and redirects "
+            'and <link rel="canonical"> targets are learned as pages are fetched. '
+            "The redirect map is written to _redirects.json in the output."
+        ),
+    )
+    race_discovery: bool = Field(
+        default=False,
+        description=(
+            "Start sitemap, nav parsing and recursive crawl discovery at once "
+            "instead of one after another. The highest-priority strategy with "
+            "enough URLs wins and the others are cancelled."
+        ),
+    )
+    stream_discovery: bool = Field(
+        default=False,
+        description=(
+            "Scrape URLs while discovery is still running: each batch the recursive "
+            "crawl finds goes through basic, robots.txt and (with crawl_model) LLM "
+            "filtering straight into scraping, and pages_total grows as it goes. "
+            "Without LLM filtering the index is sorted; with it, it follows the "
+            "LLM order batch by batch."
+        ),
+    )
+    reuse_discovery_html: bool = Field(
+        default=False,
+        description=(
+            "Keep the pages downloaded by the recursive crawl during discovery and "
+            "convert them with the HTTP fast-path converter when scraping, instead "
+            "of fetching them again. Bounded by HTML_HANDOFF_MAX_MB; the rest "
+            "spills to a handoff directory under the page cache when use_cache "
+            "is on."
+        ),
+    )
     content_selectors: list[str] | None = Field(
         default=None,
         description=(
@@ -72,6 +169,14 @@ class JobRequest(BaseModel):
         ),
     )
 
+    noise_patterns: list[str] | None = Field(
+        default=None,
+        description=(
+            "Extra regex patterns for noise lines in the converted Markdown (searched per line, "
+            "added to DocRawl defaults before chunking). Each pattern max 200 chars, list max 20 items."
+        ),
+    )
+
     @field_validator("content_selectors", "noise_selectors")
     @classmethod
     def validate_selectors(cls, v: list[str] | None) -> list[str] | None:
@@ -89,6 +194,42 @@ class JobRequest(BaseModel):
                 )
         return v
 
+    @field_validator("noise_patterns")
+    @classmethod
+    def validate_noise_patterns(cls, v: list[str] | None) -> list[str] | None:
+        """Validate per-job noise regexes and pre-compile the line matcher."""
+        if v is None:
+            return v
+        if len(v) > 20:
+            raise ValueError("Noise pattern list max 20 items")
+        for pat in v:
+            if len(pat) > 200:
+                raise ValueError(
+                    f"Noise pattern too long (max 200 chars): {pat[:50]}..."
+                )
+        from src.scraper.markdown import get_noise_matcher
+
+        try:
+            get_noise_matcher(tuple(v))
+        except re.error as e:
+            raise ValueError(f"Invalid noise pattern: {e}")
+        return v
+
+    @field_validator("include_globs", "exclude_globs")
+    @classmethod
+    def validate_globs(cls, v: list[str] | None) -> list[str] | None:
+        """Validate per-job URL glob lists."""
+        if v is None:
+            return v
+        if len(v) > 20:
+            raise ValueError("Glob list max 20 items")
+        for glob in v:
+            if not glob:
+                raise ValueError("Empty glob")
+            if len(glob) > 200:
+                raise ValueError(f"Glob too long (max 200 chars): {glob[:50]}...")
+        return v
+
     @field_validator("output_path")
     @classmethod
     def validate_output_path(cls, v: str) -> str:
@@ -177,6 +318,10 @@ class JobStatus(BaseModel):
     current_url: str | None = None
     converter: str | None = None  # PR 3.5: show converter in job status
     pages_retried: int = 0  # PR 4: scrape-level retry count
+    tables_rendered: int = 0
+    heavy_calls_avoided: int = 0
+    math_restored: int = 0
+    discovered_from_cache: bool = False
 
 
 class OllamaModel(BaseModel):
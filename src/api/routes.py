@@ -148,6 +148,10 @@ async def get_job_status(job_id: str) -> JobStatus:
         current_url=job.current_url,
         converter=job.request.converter if job.request else None,
         pages_retried=job.pages_retried,
+        tables_rendered=job.tables_rendered,
+        heavy_calls_avoided=job.heavy_calls_avoided,
+        math_restored=job.math_restored,
+        discovered_from_cache=job.discovered_from_cache,
     )
 
 
@@ -423,6 +427,15 @@ async def list_converters(request: Request) -> dict:
     return {"converters": converters, "default": "markdownify"}
 
 
+@router.get("/cleanup/stats")
+@limiter.limit("60/minute")
+async def get_cleanup_stats(request: Request) -> dict:
+    """LLM cleanup effectiveness: edit distance by site and by chunk feature."""
+    from src.llm.cleanup_stats import cleanup_stats
+
+    return cleanup_stats.snapshot()
+
+
 @router.get("/info")
 async def app_info() -> dict:
     """App identity metadata: version, repo, author, models used during development."""
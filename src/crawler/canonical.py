@@ -0,0 +1,181 @@
+"""Canonical and redirect-aware URL deduplication before fetching.
+
+Doc sites serve the same page at ``/guide``, ``/guide/index.html`` and
+``/guide/?utm_source=...``, or redirect old paths to new ones. Every variant
+used to be fetched and converted, and only the post-conversion
+``content_hash`` caught the duplicates. ``UrlCanonicalizer`` keeps one URL
+per page before fetching:
+
+- canonical_url() normalizes, strips tracking params (URL_TRACKING_PARAMS,
+  fnmatch patterns) and drops a trailing ``index.html`` / ``index.htm``
+- redirects (final URL differs) and ``<link rel="canonical">`` targets are
+  learned as pages are fetched; later URLs resolving to an already claimed
+  page are skipped without fetching
+- the redirect map (requested URL → final URL) is written to the job output
+
+Per-job state; create one per run_job. Canonical targets on another host
+are ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from src.crawler.discovery import normalize_url
+
+logger = logging.getLogger(__name__)
+
+URL_TRACKING_PARAMS = [
+    p.strip().lower()
+    for p in os.environ.get(
+        "URL_TRACKING_PARAMS",
+        "utm_*,gclid,dclid,fbclid,msclkid,yclid,mc_cid,mc_eid,_ga,_gl,_hsenc,_hsmi,ref_src",
+    ).split(",")
+    if p.strip()
+]
+REDIRECT_MAP_FILE = "_redirects.json"
+_MAX_HOPS = 10
+
+_INDEX_FILES = ("/index.html", "/index.htm")
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"""([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+_HEAD_END_RE = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return any(fnmatchcase(name, pattern) for pattern in URL_TRACKING_PARAMS)
+
+
+def canonical_url(url: str) -> str:
+    """Normalized *url* without tracking params or a trailing index file."""
+    url = normalize_url(url)
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        pairs = parse_qsl(query, keep_blank_values=True)
+        kept = [(name, value) for name, value in pairs if not _is_tracking(name)]
+        if len(kept) != len(pairs):
+            query = urlencode(kept)
+    path = parts.path
+    for index in _INDEX_FILES:
+        if path.lower().endswith(index):
+            path = path[: -len(index)] or "/"
+            break
+    if (path, query) == (parts.path, parts.query):
+        return url
+    return normalize_url(urlunsplit(parts._replace(path=path, query=query)))
+
+
+def extract_canonical(html: str, page_url: str) -> str | None:
+    """Absolute ``<link rel="canonical">`` target in the head of *html*, if any."""
+    head_end = _HEAD_END_RE.search(html)
+    head = html[: head_end.start()] if head_end else html[:65536]
+    for tag in _LINK_TAG_RE.findall(head):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+            for m in _ATTR_RE.finditer(tag)
+        }
+        if "canonical" in attrs.get("rel", "").lower().split() and attrs.get("href"):
+            return urljoin(page_url, attrs["href"].strip())
+    return None
+
+
+class UrlCanonicalizer:
+    """Per-job URL → page resolution from canonical forms, redirects and rel=canonical.
+
+    Counters: skipped (URLs resolved to a page already claimed)
+    """
+
+    def __init__(self) -> None:
+        self._aliases: dict[str, str] = {}  # canonical form -> target form
+        self._claimed: dict[str, str] = {}  # resolved form -> URL scraped for it
+        self.redirects: dict[str, str] = {}  # requested URL -> final URL
+        self.canonicals: dict[str, str] = {}  # URL -> its rel=canonical target
+        self.skipped = 0
+
+    def resolve(self, url: str) -> str:
+        """The form *url* is deduplicated by, following learned aliases."""
+        key = canonical_url(url)
+        for _ in range(_MAX_HOPS):
+            target = self._aliases.get(key)
+            if target is None:
+                break
+            key = target
+        return key
+
+    def dedupe(self, urls: list[str]) -> list[str]:
+        """Drop URLs resolving to the same page as an earlier one (order kept)."""
+        seen: set[str] = set()
+        kept = []
+        for url in urls:
+            key = self.resolve(url)
+            if key not in seen:
+                seen.add(key)
+                kept.append(url)
+        self.skipped += len(urls) - len(kept)
+        return kept
+
+    def claim(self, url: str) -> str | None:
+        """Claim *url*'s page before fetching it.
+
+        Returns None if the page is new (now claimed by *url*), otherwise the
+        URL already scraped for it, in which case *url* should be skipped.
+        """
+        key = self.resolve(url)
+        owner = self._claimed.setdefault(key, url)
+        if owner == url:
+            return None
+        self.skipped += 1
+        return owner
+
+    def _alias(self, url: str, target: str) -> None:
+        source, dest = canonical_url(url), self.resolve(target)
+        if source != dest and self.resolve(dest) != source:
+            self._aliases[source] = dest
+
+    def learn(
+        self, url: str, final_url: str | None = None, canonical: str | None = None
+    ) -> str | None:
+        """Record where fetching *url* led (redirect target, rel=canonical).
+
+        Returns the URL already scraped for the page *url* turned out to be,
+        or None if it is a page of its own (now claimed by *url*).
+        """
+        host = urlsplit(url).netloc.lower()
+        if final_url and canonical_url(final_url) != canonical_url(url):
+            self.redirects[url] = final_url
+            self._alias(url, final_url)
+        if canonical and urlsplit(canonical).netloc.lower() == host:
+            if canonical_url(canonical) != self.resolve(url):
+                self.canonicals[url] = canonical
+                self._alias(url, canonical)
+        key = self.resolve(url)
+        owner = self._claimed.setdefault(key, url)
+        if owner == url:
+            return None
+        self.skipped += 1
+        return owner
+
+    def save_redirect_map(self, output_path: Path) -> Path | None:
+        """Write redirects and canonical targets to REDIRECT_MAP_FILE, if any."""
+        if not self.redirects and not self.canonicals:
+            return None
+        path = output_path / REDIRECT_MAP_FILE
+        data = {"redirects": self.redirects, "canonicals": self.canonicals}
+        try:
+            path.write_text(
+                json.dumps(data, indent=2, sort_keys=True), encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write redirect map to {path}: {e}")
+            return None
+        return path
@@ -1,22 +1,44 @@
 """URL discovery: sitemap, nav parsing, recursive crawl."""
 
 import asyncio
-import gzip
+import hashlib
 import logging
 import os
 import random
+import re
+import time
+import zlib
+from dataclasses import dataclass, field
 import defusedxml.ElementTree as ET  # XXE-safe replacement — closes CONS-010 / issue #64
 from xml.etree.ElementTree import ParseError as XMLParseError
-from typing import TYPE_CHECKING, cast
-from urllib.parse import urljoin, urlparse, urlunparse
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Iterable, Iterator, cast
+from urllib.parse import urljoin, urlparse, urlsplit, urlunparse
 
 if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+    from src.crawler.html_handoff import HtmlHandoff
     from src.scraper.cache import PageCache
+    from src.scraper.page import PagePool
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from src.crawler.discovery_cache import (
+    DiscoveryCache,
+    DiscoveryEntry,
+    SitemapValidators,
+)
+from src.crawler.hreflang import (
+    HreflangAlternates,
+    extract_hreflang,
+    language_tag,
+    parse_link_header,
+)
+from src.crawler.robots import robots_cache
+from src.crawler.traps import CrawlTrapDetector
 from src.utils.security import validate_url_not_ssrf
 
 logger = logging.getLogger(__name__)
@@ -76,17 +98,99 @@ def normalize_url(url: str) -> str:
         return url  # Return as-is, let caller handle
 
 
+LINK_EXTRACT_OFFLOOP_BYTES = int(
+    os.environ.get("LINK_EXTRACT_OFFLOOP_BYTES", str(256 * 1024))
+)
+_SKIP_LINK_SCHEMES = ("javascript:", "mailto:", "tel:", "data:")
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
+def _raw_hrefs(html: str) -> tuple[str | None, list[str]]:
+    """Return (first <base href>, every <a href>) of a page, parsed with lxml."""
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        root = lxml.html.fromstring(html.encode("utf-8"), parser=_UTF8_HTML_PARSER)
+    except etree.ParserError:  # empty or whitespace-only document
+        return None, []
+    base = cast(list[str], root.xpath("//base/@href"))
+    return (base[0] if base else None), cast(list[str], root.xpath("//a/@href"))
+
+
+def _is_plain_root_relative(href: str) -> bool:
+    """True for hrefs like ``/docs/page?x=1`` that need no urljoin to resolve."""
+    return (
+        href.startswith("/")
+        and not href.startswith("//")
+        and "/." not in href
+        and ";" not in href  # urlparse splits ;params off the last segment
+        and "\\" not in href
+        and len(href) < 1000
+        and href.isascii()
+        and href.isprintable()
+        and " " not in href
+    )
+
+
+def extract_links(html: str, page_url: str, base_domain: str) -> list[str]:
+    """Return the normalized same-domain links of a page, in document order.
+
+    lxml's C parser replaces a BeautifulSoup html.parser tree (see
+    bench/bench_link_extract.py). Relative links resolve against
+    ``<base href>`` when the page declares one. javascript:, mailto:, tel:,
+    data: and fragment-only links are skipped, other fragments are dropped.
+    Each distinct href is resolved and normalized once; plain root-relative
+    hrefs, the bulk of docs navigation, are joined to the origin directly
+    instead of going through urljoin + normalize_url. No duplicates.
+    """
+    base_href, hrefs = _raw_hrefs(html)
+    base = urljoin(page_url, base_href.strip()) if base_href else page_url
+    domain = base_domain.lower()
+    base_parts = urlsplit(base)
+    origin = None  # scheme://host for root-relative hrefs, if same-domain
+    if base_parts.scheme in ("http", "https") and base_parts.netloc.lower() == domain:
+        origin = f"{base_parts.scheme.lower()}://{domain}"
+
+    links: dict[str, None] = {}
+    for href in dict.fromkeys(hrefs):
+        href = href.strip()
+        if not href or href.startswith("#"):
+            continue
+        if origin is not None and _is_plain_root_relative(href):
+            path, _, query = href.partition("#")[0].partition("?")
+            path = path.rstrip("/") or "/"
+            links[f"{origin}{path}?{query}" if query else f"{origin}{path}"] = None
+            continue
+        if href[:11].lower().startswith(_SKIP_LINK_SCHEMES):
+            continue
+        parts = urlsplit(urljoin(base, href))
+        if parts.scheme not in ("http", "https") or parts.netloc.lower() != domain:
+            continue
+        clean_url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        if parts.query:
+            clean_url += f"?{parts.query}"
+        links[normalize_url(clean_url)] = None
+    return list(links)
+
+
 async def _extract_links(
     url: str,
     base_domain: str,
     client: httpx.AsyncClient,
     sem: asyncio.Semaphore,
     jitter: bool = True,
+    handoff: "HtmlHandoff | None" = None,
+    alternates: HreflangAlternates | None = None,
 ) -> list[str]:
-    """Fetch a URL and return same-domain links found in it.
+    """Fetch a URL and return the normalized same-domain links found in it.
 
-    Used by parallel recursive_crawl per-depth-level gather.
+    Called by the recursive_crawl frontier workers.
     Jitter 0.1–0.3s between requests mitigates rate limiting.
+    HTML pages are also given to *handoff*, if any, for the scraping phase,
+    and their hreflang alternates (head links, Link header) to *alternates*.
+    Pages of LINK_EXTRACT_OFFLOOP_BYTES or more are parsed in a worker
+    thread so large pages do not block the event loop.
     """
     async with sem:
         if jitter:
@@ -102,24 +206,18 @@ async def _extract_links(
             content_type = response.headers.get("content-type", "")
             if "text/html" not in content_type:
                 return []
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            links: list[str] = []
-            for link in soup.find_all("a", href=True):
-                href = cast(str, link["href"])
-                if any(
-                    skip in href.lower()
-                    for skip in ["#", "javascript:", "mailto:", "tel:"]
-                ):
-                    continue
-                absolute_url = urljoin(url, href)
-                parsed = urlparse(absolute_url)
-                if parsed.netloc == base_domain and parsed.scheme in ["http", "https"]:
-                    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    if parsed.query:
-                        clean_url += f"?{parsed.query}"
-                    links.append(clean_url)
-            return links
+            html = response.text
+            if handoff is not None:
+                handoff.put(url, html, etag=_header(response, "etag"))
+            if alternates is not None:
+                links = extract_hreflang(html, url)
+                link_header = _header(response, "link")
+                if link_header:
+                    links = {**parse_link_header(link_header, url), **links}
+                _record_alternates(alternates, links)
+            if len(html) >= LINK_EXTRACT_OFFLOOP_BYTES:
+                return await asyncio.to_thread(extract_links, html, url, base_domain)
+            return extract_links(html, url, base_domain)
         except httpx.TimeoutException:
             logger.debug(f"Timeout crawling {url}")
             return []
@@ -128,109 +226,328 @@ async def _extract_links(
             return []
 
 
+def _record_alternates(alternates: HreflangAlternates, links: dict[str, str]) -> None:
+    """
+    Add one hreflang declaration, its URLs in the form filter_urls emits.
+
+    filter_hreflang looks groups up by filter_urls output, which has no
+    trailing slash even on the root (``https://x.com``), where normalize_url
+    keeps ``https://x.com/``. Queries stay: they may be all that tells the
+    languages apart (``?hl=ja``).
+    """
+    normalized = {}
+    for tag, href in links.items():
+        try:
+            parsed = urlparse(normalize_url(href))
+        except ValueError:
+            continue
+        normalized[tag] = urlunparse(parsed._replace(path=parsed.path.rstrip("/")))
+    alternates.add(normalized)
+
+
+DISCOVERY_MAX_URLS = int(os.environ.get("DISCOVERY_MAX_URLS", "1000"))
+
+
+class UrlSeenSet:
+    """Set of URLs kept as 64-bit blake2b digests instead of the strings.
+
+    An int digest costs a fraction of a typical URL string, so the visited
+    set stays small at 100k+ URLs. The collision odds at a million URLs are
+    about 3e-8, and a collision only means one URL is treated as visited.
+    """
+
+    def __init__(self) -> None:
+        self._digests: set[int] = set()
+
+    @staticmethod
+    def _digest(url: str) -> int:
+        return int.from_bytes(
+            hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+
+    def add(self, url: str) -> bool:
+        """Add *url*; return False if it was already present."""
+        digest = self._digest(url)
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and self._digest(url) in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+@dataclass
+class CrawlProgress:
+    """Live counters of a running recursive_crawl (updated in place)."""
+
+    discovered: int = 0  # unique URLs found so far (including the base URL)
+    fetched: int = 0  # pages downloaded and scanned for links
+    queued: int = 0  # pages waiting in the frontier
+    in_flight: int = 0  # pages being fetched right now
+    depth: int = 0  # deepest level fetched so far
+    capped: bool = False  # stopped at max_urls
+    suppressed: int = 0  # URLs dropped as crawler traps (see traps)
+
+
 async def recursive_crawl(
-    base_url: str, max_depth: int, concurrency: int | None = None
+    base_url: str,
+    max_depth: int,
+    concurrency: int | None = None,
+    max_urls: int | None = None,
+    progress: CrawlProgress | None = None,
+    handoff: "HtmlHandoff | None" = None,
+    on_urls: Callable[[list[str]], None] | None = None,
+    traps: CrawlTrapDetector | None = None,
+    alternates: HreflangAlternates | None = None,
 ) -> list[str]:
     """
-    Recursively crawl internal links up to max_depth using parallel BFS per depth level.
+    Recursively crawl internal links up to max_depth with a frontier queue.
+
+    ``concurrency`` workers pull pages from one FIFO frontier continuously,
+    each URL carrying its own depth, so a slow page only holds up its own
+    worker instead of the whole depth level. Output is still breadth-first
+    in spirit (FIFO), but not strictly level by level.
 
     Args:
         base_url: Starting URL
         max_depth: Maximum depth to crawl (1 = only direct links from base_url)
-        concurrency: Max concurrent requests per level. Defaults to DISCOVERY_CONCURRENCY env var (10).
-                     Set to 1 for sequential behaviour identical to the previous implementation.
+        concurrency: Number of workers. Defaults to DISCOVERY_CONCURRENCY env var (10).
+                     Set to 1 for sequential behaviour.
+        max_urls: Stop after this many unique URLs (default DISCOVERY_MAX_URLS).
+        progress: If given, updated live with crawl counters.
+        handoff: If given, receives the HTML of every crawled page so scraping
+                 can reuse it instead of fetching the page again.
+        on_urls: If given, called with each batch of newly discovered URLs
+                 (the base URL, then the new links of each fetched page).
+        traps: Crawler trap detector; new links are cleaned (stripped query
+               params) and admitted through it. Defaults to one built from
+               the CRAWL_TRAP_* / CRAWL_STRIP_PARAMS env vars.
+        alternates: If given, receives the hreflang alternates declared by
+                    every crawled page.
 
     Returns:
-        List of discovered URLs (deduplicated, normalized)
+        List of discovered URLs (deduplicated, normalized), in discovery order
 
     Edge cases handled:
-    - Deduplication via normalized URLs
+    - Deduplication via normalized URLs (compact UrlSeenSet)
     - Same-domain filtering
     - Fragment removal
     - Trailing slash normalization
     - Jitter 0.1–0.3s between requests (rate limiting mitigation)
-    - Total URL cap (1000 URLs max to prevent explosion)
+    - Total URL cap (max_urls) to prevent explosion
+    - Crawler traps (pagination, calendars, facets, session IDs, repeated
+      segments) suppressed per path pattern before they reach the cap
     - Timeout handling (10s per request)
     - Heartbeat logging every 10 URLs
     - Per-URL error handling (failures don't stop crawl)
     """
     if concurrency is None:
         concurrency = int(os.environ.get("DISCOVERY_CONCURRENCY", "10"))
+    concurrency = max(1, concurrency)
+    if max_urls is None:
+        max_urls = DISCOVERY_MAX_URLS
+    if progress is None:
+        progress = CrawlProgress()
+    if traps is None:
+        traps = CrawlTrapDetector()
 
     if max_depth < 1:
         return [base_url]
 
-    visited: set[str] = set()
+    seen = UrlSeenSet()
     discovered_urls: list[str] = []
     base_domain = urlparse(base_url).netloc
 
-    MAX_URLS = 1000  # Safety cap
     HEARTBEAT_INTERVAL = 10  # Log every N URLs
 
     sem = asyncio.Semaphore(concurrency)
+    frontier: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+
+    def add(normalized: str, fetch_url: str, depth: int) -> bool:
+        """Record a newly found URL and queue it if it is to be fetched.
+
+        Returns True if the URL was new (and under the cap).
+        """
+        if progress.capped:
+            return False
+        if len(discovered_urls) >= max_urls:
+            progress.capped = True
+            return False
+        if normalized in seen:
+            return False
+        if not traps.admit(normalized):
+            progress.suppressed += 1
+            return False
+        seen.add(normalized)
+        discovered_urls.append(normalized)
+        progress.discovered = len(discovered_urls)
+        if len(discovered_urls) % HEARTBEAT_INTERVAL == 0:
+            logger.info(
+                f"Crawl progress: {len(discovered_urls)} URLs discovered, "
+                f"{progress.fetched} fetched, {frontier.qsize()} queued"
+            )
+        if depth < max_depth:
+            frontier.put_nowait((fetch_url, depth))
+            progress.queued = frontier.qsize()
+        return True
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while True:
+            url, depth = await frontier.get()
+            progress.queued = frontier.qsize()
+            try:
+                if progress.capped:
+                    continue  # drain: nothing fetched now could be recorded
+                progress.in_flight += 1
+                try:
+                    links = await _extract_links(
+                        url,
+                        base_domain,
+                        client,
+                        sem,
+                        jitter=(concurrency > 1),
+                        handoff=handoff,
+                        alternates=alternates,
+                    )
+                finally:
+                    progress.in_flight -= 1
+                progress.fetched += 1
+                progress.depth = max(progress.depth, depth)
+                # Links come normalized from extract_links
+                links = [traps.clean(link) for link in links]
+                fresh = [link for link in links if add(link, link, depth + 1)]
+                if on_urls is not None and fresh:
+                    on_urls(fresh)
+            except Exception as e:
+                # A dead worker would leave its queued URLs unfinished and
+                # frontier.join() waiting forever
+                logger.warning(f"Failed to process links of {url}: {e}")
+            finally:
+                frontier.task_done()
 
     async with httpx.AsyncClient(
         timeout=10.0,
         follow_redirects=True,
         headers={"User-Agent": "DocRawl/1.0 (Documentation Crawler)"},
     ) as client:
-        # BFS level by level
-        current_level: list[str] = [base_url]
-
-        for depth in range(max_depth + 1):
-            if not current_level or len(discovered_urls) >= MAX_URLS:
-                break
-
-            # Deduplicate and cap at current level
-            to_fetch: list[str] = []
-            for url in current_level:
-                normalized = normalize_url(url)
-                if normalized not in visited and len(discovered_urls) < MAX_URLS:
-                    visited.add(normalized)
-                    discovered_urls.append(normalized)
-                    to_fetch.append(url)
-
-                    if len(discovered_urls) % HEARTBEAT_INTERVAL == 0:
-                        logger.info(
-                            f"Crawl progress: {len(discovered_urls)} URLs discovered"
-                        )
-
-            if depth >= max_depth:
-                break
-
-            logger.debug(
-                f"Crawling depth {depth}/{max_depth}: {len(to_fetch)} URLs in parallel"
-            )
-
-            # Gather links from all URLs at this depth in parallel
-            results = await asyncio.gather(
-                *[
-                    _extract_links(
-                        url, base_domain, client, sem, jitter=(concurrency > 1)
-                    )
-                    for url in to_fetch
-                ],
-                return_exceptions=False,
-            )
-
-            # Flatten and deduplicate next level
-            next_level_set: set[str] = set()
-            for link_list in results:
-                for link in link_list:
-                    norm = normalize_url(link)
-                    if norm not in visited and norm not in next_level_set:
-                        next_level_set.add(norm)
+        # The base URL is fetched as given
+        if add(normalize_url(base_url), base_url, 0) and on_urls is not None:
+            on_urls([normalize_url(base_url)])
+        workers = [asyncio.create_task(worker(client)) for _ in range(concurrency)]
+        try:
+            await frontier.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    progress.queued = 0
+
+    if progress.capped:
+        logger.warning(f"Hit URL cap ({max_urls}). Crawl may be incomplete.")
+    if traps.suppressed:
+        top = ", ".join(f"{p} ({n})" for p, n in traps.suppressed.most_common(5))
+        logger.info(f"Suppressed {traps.total_suppressed} crawler-trap URLs: {top}")
+
+    logger.info(
+        f"Recursive crawl complete: {len(discovered_urls)} URLs found "
+        f"({progress.fetched} pages fetched, depth {progress.depth})"
+    )
+    return discovered_urls
 
-            current_level = list(next_level_set)
 
-    if len(discovered_urls) >= MAX_URLS:
-        logger.warning(f"Hit URL cap ({MAX_URLS}). Crawl may be incomplete.")
+MAX_NAV_URLS = 100
+
+# Common navigation selectors
+NAV_SELECTORS = [
+    "nav a",
+    "aside a",
+    ".sidebar a",
+    ".navigation a",
+    '[role="navigation"] a',
+    ".toc a",  # Table of contents
+    ".menu a",
+]
+
+# Runs in the page: walks every selector in order and returns the raw hrefs
+# of same-host http(s) links, stopping at `limit` distinct URLs. URLs are told
+# apart as normalize_url does (fragment and trailing slashes dropped), so
+# /a and /a/ take one slot. One round trip instead of one get_attribute call
+# per link.
+_NAV_HREFS_JS = """
+({selectors, base, limit}) => {
+    const host = new URL(base).host;
+    const seen = new Set();
+    const hrefs = [];
+    for (const selector of selectors) {
+        let links;
+        try {
+            links = document.querySelectorAll(selector);
+        } catch (e) {
+            continue;
+        }
+        for (const link of links) {
+            const href = link.getAttribute("href");
+            if (!href || href.startsWith("#")) continue;
+            let url;
+            try {
+                url = new URL(href, base);
+            } catch (e) {
+                continue;
+            }
+            if (url.host !== host) continue;
+            if (url.protocol !== "http:" && url.protocol !== "https:") continue;
+            const path = url.pathname === "/" ? "/" : url.pathname.replace(/\/+$/, "");
+            const key = url.origin + path + url.search;
+            if (seen.has(key)) continue;
+            seen.add(key);
+            hrefs.push(href);
+            if (hrefs.length >= limit) return hrefs;
+        }
+    }
+    return hrefs;
+}
+"""
+
+
+def _nav_url(href: str, base_url: str, base_domain: str) -> str | None:
+    """Normalized same-domain http(s) URL for a nav *href*, else None."""
+    # Skip anchors and non-http links
+    if href.startswith("#") or href.startswith("javascript:"):
+        return None
+    parsed = urlparse(urljoin(base_url, href))
+    if parsed.netloc != base_domain or parsed.scheme not in ("http", "https"):
+        return None
+    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        clean_url += f"?{parsed.query}"
+    return normalize_url(clean_url)
+
+
+async def _collect_nav_urls(page: "Page", base_url: str) -> list[str]:
+    """Load *base_url* in *page* and return its nav URLs (at most MAX_NAV_URLS)."""
+    logger.debug("Loading page for nav parsing...")
+    await page.goto(base_url, wait_until="domcontentloaded", timeout=10000)
+    hrefs = await page.evaluate(
+        _NAV_HREFS_JS,
+        {"selectors": NAV_SELECTORS, "base": base_url, "limit": MAX_NAV_URLS},
+    )
 
-    logger.info(f"Recursive crawl complete: {len(discovered_urls)} URLs found")
-    return discovered_urls
+    base_domain = urlparse(base_url).netloc
+    discovered_urls: dict[str, None] = {}
+    for href in hrefs or []:
+        url = _nav_url(href, base_url, base_domain) if href else None
+        if url is not None:
+            discovered_urls[url] = None
+    if len(discovered_urls) >= MAX_NAV_URLS:
+        logger.info(f"Hit nav URL cap ({MAX_NAV_URLS}), stopping")
+    return list(discovered_urls)[:MAX_NAV_URLS]
 
 
-async def try_nav_parse(base_url: str) -> list[str]:
+async def try_nav_parse(base_url: str, pool: "PagePool | None" = None) -> list[str]:
     """
     Parse navigation/sidebar links from the page using Playwright.
 
@@ -238,32 +555,20 @@ async def try_nav_parse(base_url: str) -> list[str]:
 
     Args:
         base_url: URL to parse navigation from
+        pool: Shared PagePool (main.py keeps one warm). A page is borrowed
+              from it; without one a browser is launched for this call.
 
     Returns:
         List of URLs found in navigation elements
 
     Edge cases handled:
-    - Multiple nav selectors (nav, aside, sidebar, etc.)
+    - Multiple nav selectors (nav, aside, sidebar, etc.), read in a single
+      page.evaluate call
     - External link filtering
     - Deduplication
     - Timeout (10s page load, reduced from 15s)
-    - Max 100 URLs cap
+    - Max 100 URLs cap (MAX_NAV_URLS)
     """
-    discovered_urls: set[str] = set()
-    base_domain = urlparse(base_url).netloc
-    MAX_NAV_URLS = 100
-
-    # Common navigation selectors
-    NAV_SELECTORS = [
-        "nav a",
-        "aside a",
-        ".sidebar a",
-        ".navigation a",
-        '[role="navigation"] a',
-        ".toc a",  # Table of contents
-        ".menu a",
-    ]
-
     msg = f"Trying nav parsing on {base_url}"
     logger.info(msg)
 
@@ -274,56 +579,14 @@ async def try_nav_parse(base_url: str) -> list[str]:
         return []
 
     try:
-        async with async_playwright() as p:
-            async with await p.chromium.launch(headless=True) as browser:
-                async with await browser.new_page() as page:
-                    logger.debug("Loading page for nav parsing...")
-                    await page.goto(
-                        base_url, wait_until="domcontentloaded", timeout=10000
-                    )
-
-                    # Try each selector with limit
-                    for selector in NAV_SELECTORS:
-                        if len(discovered_urls) >= MAX_NAV_URLS:
-                            logger.info(f"Hit nav URL cap ({MAX_NAV_URLS}), stopping")
-                            break
-
-                        try:
-                            links = await page.query_selector_all(selector)
-                            logger.debug(
-                                f"Selector '{selector}' found {len(links)} links"
-                            )
-
-                            for link in links:
-                                if len(discovered_urls) >= MAX_NAV_URLS:
-                                    break
-
-                                href = await link.get_attribute("href")
-                                if not href:
-                                    continue
-
-                                # Skip anchors and non-http links
-                                if href.startswith("#") or href.startswith(
-                                    "javascript:"
-                                ):
-                                    continue
-
-                                absolute_url = urljoin(base_url, href)
-                                parsed = urlparse(absolute_url)
-
-                                # Same domain only
-                                if parsed.netloc == base_domain and parsed.scheme in [
-                                    "http",
-                                    "https",
-                                ]:
-                                    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                                    if parsed.query:
-                                        clean_url += f"?{parsed.query}"
-                                    discovered_urls.add(normalize_url(clean_url))
-
-                        except Exception as e:
-                            logger.debug(f"Selector '{selector}' failed: {e}")
-                            continue
+        if pool is not None:
+            async with pool.acquire() as page:
+                result = await _collect_nav_urls(page, base_url)
+        else:
+            async with async_playwright() as p:
+                async with await p.chromium.launch(headless=True) as browser:
+                    async with await browser.new_page() as page:
+                        result = await _collect_nav_urls(page, base_url)
 
     except PlaywrightTimeout:
         msg = f"Nav parsing timeout after 10s on {base_url}"
@@ -334,16 +597,242 @@ async def try_nav_parse(base_url: str) -> list[str]:
         logger.error(msg)
         return []
 
-    result = list(discovered_urls)[:MAX_NAV_URLS]
     msg = f"Nav parsing found {len(result)} URLs"
     logger.info(msg)
     return result
 
 
+SITEMAP_CONCURRENCY = int(os.environ.get("SITEMAP_CONCURRENCY", "8"))
+SITEMAP_NS = {"ns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+SITEMAP_CHUNK_SIZE = 64 * 1024  # bytes fed to the XML parser at a time
+
+_SM = "{" + SITEMAP_NS["ns"] + "}"
+_XHTML = "{http://www.w3.org/1999/xhtml}"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+class _BodyDecoder:
+    """Push-style sitemap body decoder: raw bytes in, bounded XML chunks out.
+
+    Gzip is detected by its magic bytes rather than the ``.gz`` suffix, so a
+    ``.xml.gz`` already decoded by the HTTP client (Content-Encoding: gzip)
+    is read as plain XML. Decompressed output is bounded to ``chunk_size``
+    per step; multi-member gzip files are supported.
+    """
+
+    def __init__(self, chunk_size: int = SITEMAP_CHUNK_SIZE) -> None:
+        self._size = chunk_size
+        self._head = b""
+        self._gzip: bool | None = None  # unknown until two bytes are seen
+        self._decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        """Decode the next piece of the body.
+
+        Raises:
+            zlib.error: On corrupt gzip data
+        """
+        if self._gzip is None:
+            self._head += data
+            if len(self._head) < 2:
+                return
+            self._gzip = self._head[:2] == _GZIP_MAGIC
+            data, self._head = self._head, b""
+        if not self._gzip:
+            for i in range(0, len(data), self._size):
+                yield data[i : i + self._size]
+            return
+        while data:
+            out = self._decomp.decompress(data, self._size)
+            if out:
+                yield out
+            if self._decomp.eof:
+                # Next gzip member (if any) starts in the unused tail
+                data = self._decomp.unused_data
+                if data:
+                    self._decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                data = self._decomp.unconsumed_tail
+
+    def finish(self) -> Iterator[bytes]:
+        """Flush the end of the body.
+
+        Raises:
+            EOFError: On truncated gzip data
+        """
+        if self._gzip is None:
+            if self._head:
+                yield self._head
+        elif self._gzip and not self._decomp.eof:
+            raise EOFError("Compressed sitemap ended before the end-of-stream marker")
+
+
+def iter_sitemap_chunks(
+    content: bytes, chunk_size: int = SITEMAP_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Yield the sitemap body in chunks, gunzipping on the fly (see _BodyDecoder).
+
+    Raises:
+        zlib.error / EOFError: On corrupt or truncated gzip data
+    """
+    decoder = _BodyDecoder(chunk_size)
+    for i in range(0, len(content), chunk_size):
+        yield from decoder.feed(content[i : i + chunk_size])
+    yield from decoder.finish()
+
+
+class _SitemapTarget:
+    """Parser target that hands out ``<loc>`` entries as their elements close.
+
+    No element tree is built: only the text of the current ``<loc>`` is held,
+    so memory stays flat however many entries the file has. ``<url><loc>``
+    entries go to ``on_url``; ``<sitemap><loc>`` entries are collected in
+    ``children``. The ``<xhtml:link rel="alternate" hreflang>`` entries of a
+    ``<url>`` go to ``on_alternates`` (loc, {language: href}) when it closes.
+    """
+
+    def __init__(
+        self,
+        on_url: Callable[[str], None],
+        on_alternates: Callable[[str, dict[str, str]], None] | None = None,
+    ) -> None:
+        self.children: list[str] = []
+        self._on_url = on_url
+        self._on_alternates = on_alternates
+        self._stack: list[str] = []
+        self._text: list[str] = []
+        self._loc = ""
+        self._alternates: dict[str, str] = {}
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        if (
+            tag == _XHTML + "link"
+            and self._on_alternates is not None
+            and self._stack
+            and self._stack[-1] == _SM + "url"
+            and "alternate" in attrib.get("rel", "").lower().split()
+        ):
+            lang = language_tag(attrib.get("hreflang", ""))
+            href = attrib.get("href", "").strip()
+            if lang is not None and href:
+                self._alternates.setdefault(lang, href)
+        self._stack.append(tag)
+        if tag == _SM + "loc":
+            self._text.clear()
+
+    def data(self, data: str) -> None:
+        if self._stack and self._stack[-1] == _SM + "loc":
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        self._stack.pop()
+        if tag == _SM + "url":
+            if self._alternates and self._loc and self._on_alternates is not None:
+                self._on_alternates(self._loc, self._alternates)
+            self._loc = ""
+            self._alternates = {}
+            return
+        if tag != _SM + "loc" or not self._stack:
+            return
+        loc = "".join(self._text).strip()
+        self._text.clear()
+        if not loc:
+            return
+        if self._stack[-1] == _SM + "url":
+            self._loc = loc
+            self._on_url(loc)
+        elif self._stack[-1] == _SM + "sitemap":
+            self.children.append(loc)
+
+    def close(self) -> list[str]:
+        return self.children
+
+
+def parse_sitemap_stream(
+    chunks: Iterable[bytes],
+    on_url: Callable[[str], None],
+    on_alternates: Callable[[str, dict[str, str]], None] | None = None,
+) -> list[str]:
+    """Incrementally parse sitemap XML; return the nested sitemap URLs.
+
+    Each page URL is passed to ``on_url`` as soon as its ``<loc>`` closes,
+    and its hreflang alternates, if any, to ``on_alternates`` once its
+    ``<url>`` entry closes.
+    Uses defusedxml's parser (entities and external references forbidden),
+    fed chunk by chunk instead of building the document with fromstring().
+
+    Raises:
+        xml.etree.ElementTree.ParseError: On malformed XML
+    """
+    parser = ET.DefusedXMLParser(target=_SitemapTarget(on_url, on_alternates))
+    for chunk in chunks:
+        parser.feed(chunk)
+    return cast(list[str], parser.close())
+
+
+SITEMAP_SAMPLE_URLS = int(os.environ.get("SITEMAP_SAMPLE_URLS", "50"))
+
+# Sitemap file-name words that mark a section never holding documentation
+# (Yoast/WordPress: post-, category-, post_tag-, author-sitemap.xml)
+_OFF_TOPIC_SITEMAP_WORDS = frozenset(
+    "blog blogs news press post posts careers career jobs job events event "
+    "author authors tag tags category categories podcast podcasts webinar "
+    "webinars customers case-studies".split()
+)
+_NAME_WORD_RE = re.compile(r"[a-z]+(?:-studies)?")
+
+
+def off_topic_sitemap(sitemap_url: str, base_path: str) -> str | None:
+    """Return the word showing a child sitemap cannot hold base_path URLs.
+
+    Only the sitemap's file name is inspected (``sitemap-blog-3.xml`` →
+    ``blog``). A word that also appears in ``base_path`` never prunes, so
+    crawling ``/blog/`` still expands ``blog-sitemap.xml``. None when the
+    name says nothing.
+    """
+    name = urlparse(sitemap_url).path.rsplit("/", 1)[-1].lower()
+    base_words = set(_NAME_WORD_RE.findall(base_path.lower()))
+    for word in _NAME_WORD_RE.findall(name):
+        if word in _OFF_TOPIC_SITEMAP_WORDS and word not in base_words:
+            return word
+    return None
+
+
+class _SitemapIrrelevant(Exception):
+    """Raised by the URL filter to stop reading a child sitemap early."""
+
+
+@dataclass
+class SitemapReport:
+    """Fetch/parse outcome and timing of one sitemap file."""
+
+    url: str
+    # ok | cached | not_found | http_<code> | timeout | invalid | error
+    # | pruned (skipped by name) | stopped (early stop after sampling)
+    status: str = "ok"
+    fetch_time: float = 0.0  # seconds, including semaphore wait (and parse if streamed)
+    parse_time: float = 0.0  # seconds (decompress + XML parse); 0 if streamed
+    size: int = 0  # bytes as fetched (compressed for .gz)
+    urls: int = 0  # page URLs kept from this file
+    children: int = 0  # nested sitemaps listed (sitemap index)
+    bytes_saved: int = 0  # body bytes not downloaded thanks to an early stop
+    etag: str | None = None  # validators of a 200 response, for revalidation
+    last_modified: str | None = None
+
+
+def _header(response: httpx.Response, name: str) -> str | None:
+    value = response.headers.get(name)
+    return value if isinstance(value, str) and value else None
+
+
 async def try_sitemap(
     base_url: str,
     filter_by_path: bool = True,
     sitemap_cache: "PageCache | None" = None,
+    concurrency: int | None = None,
+    report: list[SitemapReport] | None = None,
+    early_stop: bool = False,
+    alternates: HreflangAlternates | None = None,
 ) -> list[str]:
     """
     Try to parse sitemap.xml and robots.txt.
@@ -353,19 +842,41 @@ async def try_sitemap(
     2. /sitemap_index.xml
     3. Parse robots.txt for Sitemap: directive
 
+    The standard locations are fetched while robots.txt is read, and the
+    children of sitemap indexes are fetched concurrently; at most
+    ``concurrency`` (SITEMAP_CONCURRENCY) sitemap requests are in flight.
+    Each sitemap URL is fetched once per call, even if several indexes (or
+    robots.txt and the standard locations) list it.
+
+    With path filtering on a non-root base path, sitemap indexes are expanded
+    lazily: children whose file name marks an unrelated section (see
+    off_topic_sitemap) are not fetched at all. With ``early_stop``, the other
+    children are streamed and abandoned as soon as their first
+    SITEMAP_SAMPLE_URLS entries hold no URL under the base path. This assumes
+    the entries are grouped by section, which large sitemaps usually are but
+    the protocol does not promise, so it is opt-in. Top-level sitemaps are
+    always read in full.
+
     Args:
         base_url: Base URL of the site
         filter_by_path: If True, filter URLs to only include those under the base URL's path
         sitemap_cache: Optional PageCache for sitemap HTTP responses. When provided,
-                       sitemap XML is cached on first fetch and reused on repeat crawls,
-                       avoiding redundant HTTP requests. Gzipped sitemaps (.gz) are not cached.
+                       the raw sitemap bytes (gzipped ones included) are cached on
+                       first fetch and reused on repeat crawls, avoiding redundant
+                       HTTP requests.
+        concurrency: Max concurrent sitemap fetches (default SITEMAP_CONCURRENCY).
+        report: If given, one SitemapReport per fetched sitemap is appended.
+        early_stop: Stop reading child sitemaps whose sampled first entries
+                    are all outside the base path.
+        alternates: If given, receives the ``xhtml:link`` hreflang alternates
+                    of every kept URL.
 
     Returns:
         List of URLs found in sitemaps
 
     Edge cases handled:
-    - Gzipped sitemaps (.xml.gz)
-    - Sitemap index files (nested sitemaps)
+    - Gzipped sitemaps (.xml.gz), decompressed and parsed incrementally
+    - Sitemap index files (nested sitemaps), including cycles
     - Multiple sitemaps in robots.txt
     - Invalid XML handling
     - 404s and network errors
@@ -375,134 +886,311 @@ async def try_sitemap(
     base_path = urlparse(base_url).path.rstrip("/") if urlparse(base_url).path else ""
     if base_path == "":
         base_path = "/"
+    sem = asyncio.Semaphore(max(1, concurrency or SITEMAP_CONCURRENCY))
+    seen_sitemaps: set[str] = set()
+    reports: list[SitemapReport] = []
+    prune = filter_by_path and base_path != "/"
+    start = time.monotonic()
 
     msg = f"Trying sitemap on {base_url}"
     logger.info(msg)
 
-    async def parse_sitemap_xml(url: str, client: httpx.AsyncClient) -> set[str]:
-        """Parse a sitemap XML file with robust error handling."""
-        urls: set[str] = set()
-        is_gz = url.endswith(".gz")
+    async def fetch_sitemap(
+        url: str, client: httpx.AsyncClient, entry: SitemapReport
+    ) -> bytes | None:
+        """Return the raw sitemap body (cache first), or None if unavailable."""
+        # Check cache first (raw bytes, so gzipped sitemaps round-trip too)
+        if sitemap_cache:
+            cached = sitemap_cache.get_bytes(url)
+            if cached is not None:
+                logger.debug(f"Sitemap cache HIT: {url}")
+                entry.status = "cached"
+                return cached
+
+        response = await client.get(url, timeout=10.0)
+
+        # Skip 404s gracefully
+        if response.status_code == 404:
+            logger.debug(f"Sitemap not found (404): {url}")
+            entry.status = "not_found"
+            return None
+        elif response.status_code != 200:
+            logger.debug(f"Non-200 status {response.status_code} for sitemap: {url}")
+            entry.status = f"http_{response.status_code}"
+            return None
+
+        entry.etag = _header(response, "etag")
+        entry.last_modified = _header(response, "last-modified")
+        # Cache successful responses
+        if sitemap_cache:
+            logger.debug(f"Sitemap cache MISS, storing: {url}")
+            sitemap_cache.put_bytes(url, response.content)
+        return response.content
+
+    def url_filter(urls: set[str], sample: bool) -> Callable[[str], None]:
+        """Per-URL filter adding kept URLs to *urls*.
+
+        With *sample*, raises _SitemapIrrelevant once the first
+        SITEMAP_SAMPLE_URLS entries have all been rejected.
+        """
+        seen = 0
+
+        def keep(url_text: str) -> None:
+            nonlocal seen
+            seen += 1
+            parsed = urlparse(url_text)
+            url_path = parsed.path.rstrip("/") if parsed.path else "/"
+            # Filter same domain, then by base path if enabled
+            if parsed.netloc != base_domain:
+                pass
+            elif prune and not url_path.startswith(base_path):
+                logger.debug(
+                    f"Skipping URL not under base path {base_path}: {url_text}"
+                )
+            else:
+                urls.add(normalize_url(url_text))
+            if sample and seen == SITEMAP_SAMPLE_URLS and not urls:
+                raise _SitemapIrrelevant()
 
-        try:
-            content: bytes | None = None
+        return keep
 
-            # Check cache first (non-gzipped only — binary .gz can't round-trip through str)
-            if sitemap_cache and not is_gz:
-                cached = sitemap_cache.get(url)
-                if cached is not None:
-                    logger.debug(f"Sitemap cache HIT: {url}")
-                    content = cached.encode("utf-8")
+    def alternates_sink(urls: set[str]) -> Callable[[str, dict[str, str]], None]:
+        """Record the hreflang alternates of URLs kept in *urls*."""
 
-            if content is None:
-                response = await client.get(url, timeout=10.0)
+        def record(loc: str, links: dict[str, str]) -> None:
+            if alternates is None:
+                return
+            try:
+                if normalize_url(loc) not in urls:
+                    return
+            except ValueError:
+                return
+            _record_alternates(alternates, links)
+
+        return record
+
+    def parse_sitemap(
+        content: bytes, sample: bool = False
+    ) -> tuple[list[str], set[str]]:
+        """Return (nested sitemap URLs, page URLs kept) from sitemap XML.
+
+        Streams the (gunzipped) body through parse_sitemap_stream and filters
+        each URL as it is read, so only the kept URLs are ever held in memory.
+        """
+        urls: set[str] = set()
+        children = parse_sitemap_stream(
+            iter_sitemap_chunks(content),
+            url_filter(urls, sample),
+            alternates_sink(urls) if alternates is not None else None,
+        )
+        return children, urls
+
+    async def stream_sitemap(
+        url: str, client: httpx.AsyncClient, entry: SitemapReport
+    ) -> tuple[list[str], set[str]] | None:
+        """Download and parse a child sitemap together, stopping early if
+        its sampled first entries are all irrelevant (early_stop mode).
+
+        Returns (nested sitemap URLs, page URLs kept), or None if unavailable.
+
+        Raises:
+            _SitemapIrrelevant: After abandoning the download
+        """
+        if sitemap_cache:
+            cached = sitemap_cache.get_bytes(url)
+            if cached is not None:
+                logger.debug(f"Sitemap cache HIT: {url}")
+                entry.status = "cached"
+                entry.size = len(cached)
+                return parse_sitemap(cached, sample=True)
 
-                # Skip 404s gracefully
-                if response.status_code == 404:
-                    logger.debug(f"Sitemap not found (404): {url}")
-                    return urls
-                elif response.status_code != 200:
-                    logger.debug(
-                        f"Non-200 status {response.status_code} for sitemap: {url}"
+        urls: set[str] = set()
+        decoder = _BodyDecoder()
+        target = _SitemapTarget(
+            url_filter(urls, True),
+            alternates_sink(urls) if alternates is not None else None,
+        )
+        parser = ET.DefusedXMLParser(target=target)
+        body = bytearray() if sitemap_cache else None
+        async with client.stream("GET", url, timeout=10.0) as response:
+            if response.status_code == 404:
+                logger.debug(f"Sitemap not found (404): {url}")
+                entry.status = "not_found"
+                return None
+            elif response.status_code != 200:
+                logger.debug(
+                    f"Non-200 status {response.status_code} for sitemap: {url}"
+                )
+                entry.status = f"http_{response.status_code}"
+                return None
+            entry.etag = _header(response, "etag")
+            entry.last_modified = _header(response, "last-modified")
+            try:
+                async for data in response.aiter_bytes():
+                    if body is not None:
+                        body.extend(data)
+                    for chunk in decoder.feed(data):
+                        parser.feed(chunk)
+                for chunk in decoder.finish():
+                    parser.feed(chunk)
+                children = cast(list[str], parser.close())
+            except _SitemapIrrelevant:
+                # Leaving the stream context closes the connection mid-body
+                length = response.headers.get("content-length", "")
+                if length.isdigit():
+                    entry.bytes_saved = max(
+                        0, int(length) - response.num_bytes_downloaded
                     )
-                    return urls
-
-                content = response.content
-
-                # Cache successful non-gzipped responses
-                if sitemap_cache and not is_gz:
-                    logger.debug(f"Sitemap cache MISS, storing: {url}")
-                    sitemap_cache.put(url, response.text)
+                raise
+            finally:
+                entry.size = response.num_bytes_downloaded
+
+        if sitemap_cache and body is not None:
+            logger.debug(f"Sitemap cache MISS, storing: {url}")
+            sitemap_cache.put_bytes(url, bytes(body))
+        return children, urls
+
+    async def parse_sitemap_xml(
+        url: str, client: httpx.AsyncClient, child: bool = False
+    ) -> set[str]:
+        """Fetch and parse a sitemap (and, concurrently, its children)."""
+        urls: set[str] = set()
+        key = normalize_url(url)
+        if key in seen_sitemaps:
+            return urls
+        seen_sitemaps.add(key)
+
+        entry = SitemapReport(url=url)
+        reports.append(entry)
+        children: list[str] = []
+
+        # Lazy index expansion: skip children that cannot hold base-path URLs
+        if child and prune:
+            word = off_topic_sitemap(url, base_path)
+            if word is not None:
+                logger.debug(f"Pruned sitemap {url} ('{word}' is outside {base_path})")
+                entry.status = "pruned"
+                return urls
 
-            # Handle gzipped sitemaps
-            if url.endswith(".gz"):
+        try:
+            fetch_start = time.monotonic()
+            if child and prune and early_stop:
                 try:
-                    content = gzip.decompress(content)
-                except Exception as e:
-                    logger.warning(
-                        f"✗ Failed to decompress gzipped sitemap: {url} - {e}"
+                    async with sem:
+                        streamed = await stream_sitemap(url, client, entry)
+                except _SitemapIrrelevant:
+                    logger.debug(
+                        f"Stopped reading sitemap {url} after {SITEMAP_SAMPLE_URLS} "
+                        f"entries outside {base_path}"
                     )
+                    entry.status = "stopped"
                     return urls
-
-            # Parse XML with defensive error handling
-            try:
-                root = ET.fromstring(content)
-            except XMLParseError as e:
-                logger.warning(f"✗ Invalid XML in sitemap: {url} - {e}")
-                return urls
-
-            # Handle sitemap index (nested sitemaps)
-            namespace = {"ns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-
-            # Check if this is a sitemap index
-            for sitemap_elem in root.findall(".//ns:sitemap/ns:loc", namespace):
-                nested_url = sitemap_elem.text
-                if nested_url:
-                    # Recursively parse nested sitemaps (failures don't stop entire discovery)
-                    try:
-                        nested_urls = await parse_sitemap_xml(nested_url, client)
-                        urls.update(nested_urls)
-                    except Exception as e:
-                        logger.debug(
-                            f"Failed to parse nested sitemap {nested_url}: {e}"
-                        )
-                        continue
-
-            # Extract URLs from regular sitemap
-            for url_elem in root.findall(".//ns:url/ns:loc", namespace):
-                url_text = url_elem.text
-                if url_text:
-                    parsed = urlparse(url_text)
-                    # Filter same domain
-                    if parsed.netloc == base_domain:
-                        # Filter by base path if enabled
-                        url_path = parsed.path.rstrip("/") if parsed.path else "/"
-                        if filter_by_path and base_path != "/":
-                            if not url_path.startswith(base_path):
-                                logger.debug(
-                                    f"Skipping URL not under base path {base_path}: {url_text}"
-                                )
-                                continue
-                        urls.add(normalize_url(url_text))
-
+                finally:
+                    entry.fetch_time = time.monotonic() - fetch_start
+                if streamed is None:
+                    return urls
+                children, urls = streamed
+            else:
+                async with sem:
+                    content = await fetch_sitemap(url, client, entry)
+                entry.fetch_time = time.monotonic() - fetch_start
+                if content is None:
+                    return urls
+                entry.size = len(content)
+                parse_start = time.monotonic()
+                try:
+                    children, urls = parse_sitemap(content)
+                finally:
+                    entry.parse_time = time.monotonic() - parse_start
+            entry.urls = len(urls)
+            entry.children = len(children)
+        except (zlib.error, EOFError) as e:
+            logger.warning(f"✗ Failed to decompress gzipped sitemap: {url} - {e}")
+            entry.status = "invalid"
+            return set()
+        except XMLParseError as e:
+            logger.warning(f"✗ Invalid XML in sitemap: {url} - {e}")
+            entry.status = "invalid"
+            return set()
         except httpx.TimeoutException:
             logger.debug(f"Timeout fetching sitemap: {url}")
+            entry.status = "timeout"
+            return urls
         except Exception as e:
             logger.warning(f"✗ Failed to parse sitemap {url}: {e}")
+            entry.status = "error"
+            return urls
+        logger.debug(
+            f"Sitemap {url}: {entry.size} bytes, fetch {entry.fetch_time:.2f}s, "
+            f"parse {entry.parse_time:.2f}s, {entry.urls} URLs, "
+            f"{entry.children} nested sitemaps"
+        )
 
+        # Nested sitemaps are fetched concurrently (failures don't stop discovery)
+        nested = await asyncio.gather(
+            *(parse_sitemap_xml(c, client, child=True) for c in children),
+            return_exceptions=True,
+        )
+        for c, result in zip(children, nested):
+            if isinstance(result, BaseException):
+                logger.debug(f"Failed to parse nested sitemap {c}: {result}")
+            else:
+                urls.update(result)
         return urls
 
+    async def robots_sitemaps(client: httpx.AsyncClient) -> list[str]:
+        """Sitemap: directives from robots.txt (optional, errors ignored).
+
+        Read through robots_cache, so the job's robots filtering reuses it.
+        """
+        parsed = await robots_cache.get(base_url, client=client)
+        return list(parsed.sitemaps) if parsed is not None else []
+
     async with httpx.AsyncClient(
         timeout=10.0,
         follow_redirects=True,
         headers={"User-Agent": "DocRawl/1.0 (Documentation Crawler)"},
     ) as client:
-        # Try standard sitemap locations
-        sitemap_urls = [
+        # Standard sitemap locations are fetched while robots.txt is read
+        standard_urls = [
             urljoin(base_url, "/sitemap.xml"),
             urljoin(base_url, "/sitemap_index.xml"),
         ]
+        robots_task = asyncio.ensure_future(robots_sitemaps(client))
+        results = await asyncio.gather(
+            *(parse_sitemap_xml(url, client) for url in standard_urls)
+        )
+        directive_urls = await robots_task
+        results += await asyncio.gather(
+            *(parse_sitemap_xml(url, client) for url in dict.fromkeys(directive_urls))
+        )
 
-        # Try to get sitemap URLs from robots.txt
-        try:
-            robots_url = urljoin(base_url, "/robots.txt")
-            response = await client.get(robots_url, timeout=5.0)
-            if response.status_code == 200:
-                for line in response.text.split("\n"):
-                    if line.lower().startswith("sitemap:"):
-                        sitemap_url = line.split(":", 1)[1].strip()
-                        sitemap_urls.append(sitemap_url)
-        except Exception:
-            pass  # robots.txt is optional
-
-        # Parse all discovered sitemaps
-        for sitemap_url in sitemap_urls:
-            logger.debug(f"Parsing sitemap: {sitemap_url}")
-            urls = await parse_sitemap_xml(sitemap_url, client)
+        # Merge results from all discovered sitemaps
+        for sitemap_url, urls in zip(standard_urls + directive_urls, results):
             if urls:
                 logger.debug(f"Sitemap {sitemap_url} contributed {len(urls)} URLs")
                 discovered_urls.update(urls)
 
+    if report is not None:
+        report.extend(reports)
+    fetched = [r for r in reports if r.status in ("ok", "cached")]
+    if fetched:
+        logger.info(
+            f"Sitemaps: {len(fetched)}/{len(reports)} fetched in "
+            f"{time.monotonic() - start:.1f}s wall "
+            f"(fetch {sum(r.fetch_time for r in fetched):.1f}s, "
+            f"parse {sum(r.parse_time for r in fetched):.1f}s summed; "
+            f"{sum(r.size for r in fetched)} bytes)"
+        )
+    pruned = [r for r in reports if r.status == "pruned"]
+    stopped = [r for r in reports if r.status == "stopped"]
+    if pruned or stopped:
+        logger.info(
+            f"Sitemap pruning: {len(pruned)} child sitemaps skipped by name, "
+            f"{len(stopped)} stopped after sampling; saved {len(pruned)} requests "
+            f"and {sum(r.bytes_saved for r in stopped)} bytes"
+        )
+
     result = list(discovered_urls)
     if result:
         msg = f"Sitemap parsing found {len(result)} URLs"
@@ -513,11 +1201,247 @@ async def try_sitemap(
     return result
 
 
+DISCOVERY_MIN_URLS = int(os.environ.get("DISCOVERY_MIN_URLS", "1"))
+
+
+@dataclass
+class StrategyTiming:
+    """Time-to-result of one discovery strategy."""
+
+    name: str  # sitemap | nav | crawl
+    # won | empty | failed | skipped (cascade, not run) | unused (race: a
+    # higher-priority strategy won) | cancelled (race: stopped unfinished)
+    outcome: str = "skipped"
+    seconds: float = 0.0  # from discovery start to result (or cancellation)
+    urls: int = 0
+
+
+@dataclass
+class DiscoveryReport:
+    """How discover_urls produced its result."""
+
+    strategy: str = ""  # sitemap | nav | crawl | fallback
+    from_cache: bool = False
+    revalidated: bool = False  # expired cache entry confirmed by 304 responses
+    cache_age: float = 0.0  # seconds since the cached result was discovered
+    sitemaps: list[SitemapReport] = field(default_factory=list)
+    # Live counters of the recursive crawl, if that strategy runs
+    crawl: CrawlProgress = field(default_factory=CrawlProgress)
+    # URLs the recursive crawl suppressed as traps, per pattern (traps.suppressed)
+    traps: CrawlTrapDetector = field(default_factory=CrawlTrapDetector)
+    strategies: list[StrategyTiming] = field(default_factory=list)
+    # hreflang groups declared by sitemaps and crawled pages (filter_hreflang)
+    alternates: HreflangAlternates = field(default_factory=HreflangAlternates)
+
+
+async def revalidate_sitemaps(validators: list[SitemapValidators]) -> bool:
+    """Conditionally re-request sitemaps; True if every one is 304 Not Modified."""
+    if not validators:
+        return False
+    sem = asyncio.Semaphore(SITEMAP_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        timeout=10.0,
+        follow_redirects=True,
+        headers={"User-Agent": "DocRawl/1.0 (Documentation Crawler)"},
+    ) as client:
+
+        async def unchanged(validator: SitemapValidators) -> bool:
+            async with sem:
+                response = await client.get(
+                    validator.url,
+                    headers=validator.conditional_headers(),
+                    timeout=10.0,
+                )
+            return response.status_code == 304
+
+        results = await asyncio.gather(
+            *(unchanged(v) for v in validators), return_exceptions=True
+        )
+    return all(r is True for r in results)
+
+
+# Sitemap outcomes a cached result can be revalidated after: read over HTTP,
+# or known not to contribute (absent, pruned by name)
+_REVALIDATABLE_STATUSES = ("ok", "stopped", "not_found", "pruned")
+
+
+def _sitemap_validators(reports: list[SitemapReport]) -> list[SitemapValidators]:
+    """Validators of every sitemap the URLs came from, or [] if one has none.
+
+    Sitemaps served from the page cache carry no validators, and failed
+    reads (timeout, error, 5xx...) are sources nobody checked: either way a
+    304 on the others cannot vouch for the whole result.
+    """
+    if any(r.status not in _REVALIDATABLE_STATUSES for r in reports):
+        return []
+    read = [r for r in reports if r.status in ("ok", "stopped")]
+    if not read or any(r.etag is None and r.last_modified is None for r in read):
+        return []
+    return [SitemapValidators(r.url, r.etag, r.last_modified) for r in read]
+
+
+_STRATEGY_LABELS = {
+    "sitemap": ("sitemap discovery", "Sitemap"),
+    "nav": ("nav parsing", "Nav parsing"),
+    "crawl": ("recursive crawl", "Recursive crawl"),
+}
+
+Strategy = tuple[str, Callable[[], Coroutine[Any, Any, list[str]]]]
+
+
+def _pick_result(
+    results: list[tuple[str, list[str]]],
+) -> tuple[str, list[str]] | None:
+    """First sufficient result by priority, else the first non-empty one."""
+    for name, urls in results:
+        if len(urls) >= DISCOVERY_MIN_URLS:
+            return name, urls
+    return next(((n, u) for n, u in results if u), None)
+
+
+async def _cascade_strategies(
+    strategies: list[Strategy],
+    timings: list[StrategyTiming],
+    promote: Callable[[str], None],
+) -> tuple[str, list[str]] | None:
+    """Run strategies one after another until one has a sufficient result."""
+    start = time.monotonic()
+    results: list[tuple[str, list[str]]] = []
+    winner: tuple[str, list[str]] | None = None
+    total = len(strategies)
+    for i, (name, run) in enumerate(strategies, 1):
+        label, title = _STRATEGY_LABELS[name]
+        timing = StrategyTiming(name)
+        timings.append(timing)
+        if winner is not None:
+            logger.info(
+                f"Strategy {i}/{total}: Skipping {label} "
+                f"({_STRATEGY_LABELS[winner[0]][0]} found {len(winner[1])} URLs)"
+            )
+            continue
+        logger.info(f"Strategy {i}/{total}: Trying {label}...")
+        promote(name)
+        try:
+            urls = await run()
+        except Exception as e:
+            timing.outcome = "failed"
+            logger.error(f"✗ {title} failed with exception: {e}")
+            urls = []
+        else:
+            timing.outcome = "empty"
+            logger.info(
+                f"✓ {title} success: {len(urls)} URLs found"
+                if urls
+                else f"✗ {title}: No URLs found"
+            )
+        timing.seconds = time.monotonic() - start
+        timing.urls = len(urls)
+        results.append((name, urls))
+        if len(urls) >= DISCOVERY_MIN_URLS:
+            winner = (name, urls)
+    picked = winner or _pick_result(results)
+    if picked is not None:
+        next(t for t in timings if t.name == picked[0]).outcome = "won"
+    return picked
+
+
+async def _race_strategies(
+    strategies: list[Strategy],
+    timings: list[StrategyTiming],
+    promote: Callable[[str], None],
+) -> tuple[str, list[str]] | None:
+    """Start every strategy at once; the highest-priority sufficient one wins.
+
+    Results are taken in priority order: a lower-priority strategy that
+    finishes first is held until every higher-priority one has failed or
+    come back short, and once a strategy wins, the lower-priority ones
+    still running are cancelled.
+    """
+    start = time.monotonic()
+    tasks: list[tuple[str, asyncio.Task[list[str]]]] = []
+    for name, run in strategies:
+        timing = StrategyTiming(name)
+        timings.append(timing)
+        task = asyncio.create_task(run())
+
+        def finished(_: asyncio.Future, timing: StrategyTiming = timing) -> None:
+            timing.seconds = time.monotonic() - start
+
+        task.add_done_callback(finished)
+        tasks.append((name, task))
+    logger.info(f"Racing discovery strategies: {', '.join(n for n, _ in tasks)}")
+
+    results: list[tuple[str, list[str]]] = []
+    winner: tuple[str, list[str]] | None = None
+    try:
+        for (name, task), timing in zip(tasks, timings):
+            title = _STRATEGY_LABELS[name][1]
+            promote(name)
+            try:
+                urls = await task
+            except Exception as e:
+                timing.outcome = "failed"
+                logger.error(f"✗ {title} failed with exception: {e}")
+                continue
+            timing.urls = len(urls)
+            timing.outcome = "empty"
+            results.append((name, urls))
+            if len(urls) >= DISCOVERY_MIN_URLS:
+                winner = (name, urls)
+                logger.info(
+                    f"✓ {title} won the race: {len(urls)} URLs ({timing.seconds:.1f}s)"
+                )
+                break
+            logger.info(f"✗ {title}: {len(urls)} URLs ({timing.seconds:.1f}s)")
+    finally:
+        for (name, task), timing in zip(tasks, timings):
+            if not task.done():
+                task.cancel()
+                timing.outcome = "cancelled"
+                timing.seconds = time.monotonic() - start
+            elif timing.outcome == "skipped":
+                # Finished while a higher-priority strategy was being awaited
+                timing.outcome = "unused"
+                if not task.cancelled() and task.exception() is None:
+                    timing.urls = len(task.result())
+        await asyncio.gather(*(t for _, t in tasks), return_exceptions=True)
+
+    picked = winner or _pick_result(results)
+    if picked is not None:
+        next(t for t in timings if t.name == picked[0]).outcome = "won"
+    cancelled = [t.name for t in timings if t.outcome == "cancelled"]
+    if cancelled:
+        logger.info(f"Cancelled lower-priority strategies: {', '.join(cancelled)}")
+    return picked
+
+
+def _cacheable(urls: list[str], base_url: str, report: DiscoveryReport) -> bool:
+    """False for results that may be degraded by transient errors."""
+    reason = ""
+    if len(urls) < DISCOVERY_MIN_URLS:
+        reason = f"fewer than {DISCOVERY_MIN_URLS} URLs"
+    elif len(urls) == 1 and normalize_url(urls[0]) == normalize_url(base_url):
+        reason = "only the base URL was found"
+    elif report.strategy == "crawl" and report.crawl.capped:
+        reason = "the crawl stopped at its URL cap"
+    if reason:
+        logger.info(f"Discovery result for {base_url} not cached: {reason}")
+    return not reason
+
+
 async def discover_urls(
     base_url: str,
     max_depth: int = 5,
     filter_by_path: bool = True,
     sitemap_cache: "PageCache | None" = None,
+    sitemap_early_stop: bool = False,
+    discovery_cache: DiscoveryCache | None = None,
+    report: DiscoveryReport | None = None,
+    html_handoff: "HtmlHandoff | None" = None,
+    on_urls: Callable[[list[str]], None] | None = None,
+    race: bool = False,
+    page_pool: "PagePool | None" = None,
 ) -> list[str]:
     """
     Discover URLs using cascade strategy — stops at first success:
@@ -525,83 +1449,127 @@ async def discover_urls(
     2. Try nav parsing (only if sitemap failed)
     3. Try recursive crawl (only if both above failed)
 
+    With ``race`` all three start at once instead; the highest-priority
+    strategy with a sufficient result wins and lower-priority ones still
+    running are cancelled (see _race_strategies). A result is sufficient
+    with at least DISCOVERY_MIN_URLS URLs.
+
     Args:
         base_url: Base URL to discover
         max_depth: Maximum depth for recursive crawl
         filter_by_path: If True, filter sitemap URLs to only include those under base URL's path
         sitemap_cache: Optional PageCache instance for sitemap HTTP responses (PR 2.4).
+        sitemap_early_stop: Stop reading child sitemaps whose first entries are
+            all outside the base path (see try_sitemap).
+        discovery_cache: Optional cross-job DiscoveryCache. A fresh entry for
+            (base_url, max_depth, filter_by_path) is returned without any
+            discovery; an expired sitemap result is reused if its sitemaps
+            all answer 304 to conditional requests. Results that look degraded
+            are not stored: fewer than DISCOVERY_MIN_URLS URLs, only the base
+            URL, or a recursive crawl stopped at its URL cap. On a cache hit
+            nothing is crawled, so ``on_urls`` and ``html_handoff`` receive
+            nothing.
+        report: If given, filled with the strategy used, cache details,
+            each strategy's time-to-result and the hreflang alternates found.
+        html_handoff: If given, keeps the pages downloaded by the recursive
+            crawl for the scraping phase (JobRequest.reuse_discovery_html).
+        on_urls: If given, receives the recursive crawl's URLs batch by batch
+            as they are found (JobRequest.stream_discovery). Sitemap and nav
+            results are only returned.
+        race: Run the strategies concurrently (JobRequest.race_discovery).
+        page_pool: Shared PagePool nav parsing borrows its page from.
 
     Returns deduplicated, normalized URLs. Never returns empty list.
     """
     all_urls = set()
+    if report is None:
+        report = DiscoveryReport()
 
     # SSRF validation before any network activity — closes CONS-002 / issue #51
     validate_url_not_ssrf(base_url)
 
-    msg = f"=== Starting URL discovery for {base_url} (max_depth={max_depth}) ==="
-    logger.info(msg)
+    cache_key = ""
+    if discovery_cache is not None:
+        cache_key = discovery_cache.key(
+            normalize_url(base_url), max_depth, filter_by_path, sitemap_early_stop
+        )
+        cached = discovery_cache.get(cache_key)
+        if cached is not None:
+            age = cached.age
+            if discovery_cache.is_fresh(cached):
+                pass
+            elif await revalidate_sitemaps(cached.sitemaps):
+                discovery_cache.renew(cache_key)
+                report.revalidated = True
+            else:
+                cached = None
+        if cached is not None:
+            report.from_cache = True
+            report.strategy = cached.strategy
+            report.cache_age = age
+            for group in cached.alternates:
+                report.alternates.add(group)
+            how = "revalidated, " if report.revalidated else ""
+            logger.info(
+                f"✓ Discovery cache hit for {base_url}: {len(cached.urls)} URLs "
+                f"({how}{cached.strategy}, discovered {age:.0f}s ago)"
+            )
+            return list(cached.urls)
 
-    # Strategy 1: Sitemap (fast, authoritative)
-    msg = "Strategy 1/3: Trying sitemap discovery..."
+    msg = f"=== Starting URL discovery for {base_url} (max_depth={max_depth}) ==="
     logger.info(msg)
 
-    try:
-        sitemap_urls = await try_sitemap(base_url, filter_by_path, sitemap_cache)
-        if sitemap_urls:
-            all_urls.update(sitemap_urls)
-            msg = f"✓ Sitemap success: {len(sitemap_urls)} URLs found"
-            logger.info(msg)
-        else:
-            msg = "✗ Sitemap: No URLs found"
-            logger.info(msg)
-    except Exception as e:
-        msg = f"✗ Sitemap failed with exception: {e}"
-        logger.error(msg)
-
-    # Cascade: stop at first successful strategy
-    if all_urls:
-        msg = f"Strategy 2/3: Skipping nav parsing (sitemap found {len(all_urls)} URLs)"
-        logger.info(msg)
-        msg = "Strategy 3/3: Skipping recursive crawl (sitemap succeeded)"
-        logger.info(msg)
-    else:
-        # Strategy 2: Nav parsing (only if sitemap failed)
-        msg = "Strategy 2/3: Trying nav parsing..."
-        logger.info(msg)
-
-        try:
-            nav_urls = await try_nav_parse(base_url)
-            if nav_urls:
-                all_urls.update(nav_urls)
-                msg = f"✓ Nav parsing success: {len(nav_urls)} URLs found"
-                logger.info(msg)
-            else:
-                msg = "✗ Nav parsing: No URLs found"
-                logger.info(msg)
-        except Exception as e:
-            msg = f"✗ Nav parsing failed with exception: {e}"
-            logger.error(msg)
+    # In a race the crawl runs alongside the other strategies; its URLs are
+    # only streamed out once it is the strategy whose result will be used.
+    crawl_batches: list[list[str]] = []
+    crawl_live = not race
 
-        # Strategy 3: Recursive crawl (only if sitemap and nav both failed)
-        if all_urls:
-            msg = f"Strategy 3/3: Skipping recursive crawl (nav parsing found {len(all_urls)} URLs)"
-            logger.info(msg)
+    def crawl_sink(batch: list[str]) -> None:
+        if crawl_live and on_urls is not None:
+            on_urls(batch)
         else:
-            msg = "Strategy 3/3: Falling back to recursive crawl (comprehensive)"
-            logger.info(msg)
-
-            try:
-                crawl_urls = await recursive_crawl(base_url, max_depth)
-                if crawl_urls:
-                    all_urls.update(crawl_urls)
-                    msg = f"✓ Recursive crawl success: {len(crawl_urls)} URLs found"
-                    logger.info(msg)
-                else:
-                    msg = "✗ Recursive crawl returned no URLs (unexpected)"
-                    logger.warning(msg)
-            except Exception as e:
-                msg = f"✗ Recursive crawl failed with exception: {e}"
-                logger.error(msg)
+            crawl_batches.append(batch)
+
+    def promote(name: str) -> None:
+        nonlocal crawl_live
+        if name == "crawl" and not crawl_live:
+            crawl_live = True
+            if on_urls is not None:
+                for batch in crawl_batches:
+                    on_urls(batch)
+            crawl_batches.clear()
+
+    strategies: list[Strategy] = [
+        (
+            "sitemap",
+            lambda: try_sitemap(
+                base_url,
+                filter_by_path,
+                sitemap_cache,
+                report=report.sitemaps,
+                early_stop=sitemap_early_stop,
+                alternates=report.alternates,
+            ),
+        ),
+        ("nav", lambda: try_nav_parse(base_url, page_pool)),
+        (
+            "crawl",
+            lambda: recursive_crawl(
+                base_url,
+                max_depth,
+                progress=report.crawl,
+                handoff=html_handoff,
+                on_urls=crawl_sink if on_urls is not None else None,
+                traps=report.traps,
+                alternates=report.alternates,
+            ),
+        ),
+    ]
+    run = _race_strategies if race else _cascade_strategies
+    winner = await run(strategies, report.strategies, promote)
+    if winner is not None:
+        report.strategy, found = winner
+        all_urls.update(found)
 
     # Deduplicate and sort
     final_urls = sorted(list(all_urls))
@@ -611,6 +1579,20 @@ async def discover_urls(
         msg = "⚠ All strategies failed! Returning base URL as minimum fallback"
         logger.warning(msg)
         final_urls = [normalize_url(base_url)]
+        report.strategy = "fallback"
+    elif discovery_cache is not None and _cacheable(final_urls, base_url, report):
+        validators = (
+            _sitemap_validators(report.sitemaps) if report.strategy == "sitemap" else []
+        )
+        discovery_cache.put(
+            cache_key,
+            DiscoveryEntry(
+                final_urls,
+                report.strategy,
+                sitemaps=validators,
+                alternates=report.alternates.groups(),
+            ),
+        )
 
     msg = f"=== Discovery complete: {len(final_urls)} total unique URLs ==="
     logger.info(msg)
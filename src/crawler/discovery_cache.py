@@ -0,0 +1,154 @@
+"""Cross-job discovery result cache.
+
+Discovery (sitemap → nav → recursive crawl) is the same work for every job
+on the same docs site, yet each job used to redo it from scratch.
+``DiscoveryCache`` keeps the discovered URL list per
+(base_url, max_depth, filter_by_path, sitemap_early_stop), so the lossy
+early-stopped sitemap reads only serve jobs that opted into them:
+
+- within DISCOVERY_CACHE_TTL the cached list is used as is (no requests)
+- past the TTL, a list that came from sitemaps is revalidated with
+  conditional GETs (If-None-Match / If-Modified-Since) on the sitemaps it
+  was read from; if every one answers 304 the entry is renewed, otherwise
+  discovery runs again
+- nav and crawl results carry no validators and simply expire
+
+Process-wide; persisted to DISCOVERY_CACHE_PATH (JSON, atomic write) when
+that env var is set, in-memory only otherwise. At most MAX_ENTRIES entries
+are kept, oldest dropped first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_CACHE_TTL = int(os.environ.get("DISCOVERY_CACHE_TTL", str(6 * 3600)))
+MAX_ENTRIES = 200
+
+
+@dataclass
+class SitemapValidators:
+    """HTTP validators of one sitemap a cached result was read from."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class DiscoveryEntry:
+    """One cached discovery result."""
+
+    urls: list[str]
+    strategy: str  # sitemap | nav | crawl
+    timestamp: float = field(default_factory=time.time)
+    # Empty unless every sitemap read had an ETag or Last-Modified
+    sitemaps: list[SitemapValidators] = field(default_factory=list)
+    # hreflang groups ({language: URL}) found with the URLs
+    alternates: list[dict[str, str]] = field(default_factory=list)
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.timestamp)
+
+
+class DiscoveryCache:
+    """Process-wide discovered-URL cache with TTL and sitemap revalidation.
+
+    Args:
+        path: JSON file to load from / save to. None keeps entries in memory.
+        ttl: Seconds an entry is used without revalidation.
+    """
+
+    def __init__(
+        self, path: Path | None = None, ttl: int = DISCOVERY_CACHE_TTL
+    ) -> None:
+        self._path = path
+        self.ttl = ttl
+        self._entries: dict[str, DiscoveryEntry] = {}
+        if path is not None:
+            self.load()
+
+    @staticmethod
+    def key(
+        base_url: str,
+        max_depth: int,
+        filter_by_path: bool,
+        sitemap_early_stop: bool = False,
+    ) -> str:
+        key = f"{base_url}|{max_depth}|{int(filter_by_path)}"
+        return f"{key}|early-stop" if sitemap_early_stop else key
+
+    def get(self, key: str) -> DiscoveryEntry | None:
+        """Return the entry for *key*, fresh or not (see is_fresh)."""
+        return self._entries.get(key)
+
+    def is_fresh(self, entry: DiscoveryEntry) -> bool:
+        return entry.age <= self.ttl
+
+    def put(self, key: str, entry: DiscoveryEntry) -> None:
+        self._entries[key] = entry
+        if len(self._entries) > MAX_ENTRIES:
+            oldest = min(self._entries, key=lambda k: self._entries[k].timestamp)
+            del self._entries[oldest]
+        self.save()
+
+    def renew(self, key: str) -> None:
+        """Restart the TTL of a revalidated entry."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.timestamp = time.time()
+            self.save()
+
+    def reset(self) -> None:
+        self._entries.clear()
+
+    def load(self) -> None:
+        """Load persisted entries; a missing or corrupt file starts empty."""
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            for key, raw in data.get("entries", {}).items():
+                self._entries[key] = DiscoveryEntry(
+                    urls=list(raw["urls"]),
+                    strategy=raw["strategy"],
+                    timestamp=float(raw["timestamp"]),
+                    sitemaps=[SitemapValidators(**v) for v in raw.get("sitemaps", [])],
+                    alternates=[dict(g) for g in raw.get("alternates", [])],
+                )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable discovery cache {self._path}: {e}")
+            self.reset()
+
+    def save(self) -> None:
+        """Persist entries atomically (.tmp → os.replace); no-op without a path."""
+        if self._path is None:
+            return
+        data = {"entries": {k: asdict(v) for k, v in self._entries.items()}}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to save discovery cache to {self._path}: {e}")
+
+
+_cache_path = os.environ.get("DISCOVERY_CACHE_PATH")
+discovery_cache = DiscoveryCache(Path(_cache_path) if _cache_path else None)
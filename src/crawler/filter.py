@@ -1,8 +1,16 @@
 """Deterministic URL filtering."""
 
 import logging
+import re
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from fnmatch import translate
+from typing import cast
 from urllib.parse import urlparse
 
+from src.crawler.hreflang import HreflangAlternates, language_tag
+
 logger = logging.getLogger(__name__)
 
 EXCLUDED_EXTENSIONS = {
@@ -57,7 +65,12 @@ LANGUAGE_PATTERNS = {
 }
 
 
-def filter_urls(urls: list[str], base_url: str, language: str = "en") -> list[str]:
+def filter_urls(
+    urls: list[str],
+    base_url: str,
+    language: str = "en",
+    rules: "UrlRules | None" = None,
+) -> list[str]:
     """
     Apply deterministic filtering to URL list.
 
@@ -66,39 +79,184 @@ def filter_urls(urls: list[str], base_url: str, language: str = "en") -> list[st
     - Exclude common non-doc patterns
     - Filter by language (default: English only)
     - Deduplicate
+
+    Pass the job's compiled *rules* (which then replace base_url and
+    language) to reuse them across calls, apply include/exclude globs and
+    collect per-rule hit counts.
     """
-    base_parsed = urlparse(base_url)
-    base_domain = base_parsed.netloc
-    base_path = base_parsed.path.rstrip("/")
+    if rules is None:
+        rules = UrlRules(base_url, language)
+    filtered = rules.filter(urls)
 
-    filtered: set[str] = set()
+    logger.info(
+        f"Filtered {len(urls)} URLs down to {len(filtered)} "
+        f"(language: {rules.language})"
+    )
+    return filtered
 
-    for url in urls:
-        parsed = urlparse(url)
 
-        if parsed.netloc != base_domain:
-            continue
+# Plain http(s) URLs split without urlparse (see UrlRules._split); anything
+# else (spaces, controls, non-ASCII, ;params, IPv6 hosts) takes the slow path
+_SIMPLE_URL_RE = re.compile(
+    r"(https?)://([^/?#;\[\]\x00-\x20\x7f]*)([^?#;\x00-\x20\x7f]*)"
+)
+_URL_TAIL_RE = re.compile(r"[?#][^\x00-\x20\x7f]*")
+# A user glob without "://" is matched against the path of the URL
+_ORIGIN_RE = r"[a-zA-Z][a-zA-Z0-9+.-]*://[^/]*"
 
-        path = parsed.path.rstrip("/")
-        if not path.startswith(base_path):
-            continue
 
-        if any(path.lower().endswith(ext) for ext in EXCLUDED_EXTENSIONS):
-            continue
+def _any_of(literals: list[str]) -> re.Pattern[str] | None:
+    """One regex searching for any of *literals* (longest first), or None."""
+    if not literals:
+        return None
+    ordered = sorted(set(literals), key=lambda lit: (-len(lit), lit))
+    return re.compile("|".join(re.escape(lit) for lit in ordered))
 
-        if any(pattern in path.lower() for pattern in EXCLUDED_PATTERNS):
-            continue
 
-        if not _matches_language(path, language, base_url):
-            continue
+def _glob_regex(globs: list[str]) -> re.Pattern[str] | None:
+    """One regex fully matching any of *globs*; group ``g<i>`` names the glob matched."""
+    if not globs:
+        return None
+    return re.compile(
+        "|".join(
+            f"(?P<g{i}>{'' if '://' in glob else _ORIGIN_RE}{translate(glob)})"
+            for i, glob in enumerate(globs)
+        )
+    )
 
-        normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
-        filtered.add(normalized)
 
-    logger.info(
-        f"Filtered {len(urls)} URLs down to {len(filtered)} (language: {language})"
-    )
-    return sorted(filtered)
+def _glob_index(match: re.Match[str]) -> int:
+    """Index of the glob a _glob_regex match came from."""
+    return int(cast(str, match.lastgroup)[1:])
+
+
+class UrlRules:
+    """The filter_urls rules of one job, compiled once.
+
+    Base URL parts and the base's language are worked out up front, and each
+    rule class (extensions, patterns, target language, other languages,
+    include globs, exclude globs) is a single combined regex, so a URL costs
+    one split and a handful of regex calls however many rules there are.
+
+    User globs use fnmatch syntax (``*`` also matches ``/``). A glob with
+    ``://`` is matched against the whole URL, any other against its path,
+    both in the form filter_urls returns (no query, no trailing slash). URLs
+    matching an exclude glob are dropped; with include globs, URLs matching
+    none of them are dropped too. Globs only narrow the built-in rules.
+
+    ``hits`` counts, per rule, the URLs it dropped (``extension .pdf``,
+    ``pattern /blog/``, ``language``, ``exclude <glob>``, ``include``...) and
+    the URLs each include glob let through (``include <glob>``).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        language: str = "en",
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+    ) -> None:
+        base = urlparse(base_url)
+        self.base_url = base_url
+        self.language = language
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.hits: Counter[str] = Counter()
+
+        self._domain = base.netloc
+        self._base_path = base.path.rstrip("/")
+        self._extension_re = re.compile(
+            "(?:"
+            + "|".join(re.escape(ext) for ext in sorted(EXCLUDED_EXTENSIONS))
+            + r")\Z"
+        )
+        self._pattern_re = _any_of(list(EXCLUDED_PATTERNS))
+        self._target_re: re.Pattern[str] | None = None
+        self._other_re: re.Pattern[str] | None = None
+        self._base_has_language = False
+        if language != "all":
+            self._target_re = _any_of(
+                LANGUAGE_PATTERNS.get(language, [f"/{language}/"])
+            )
+            self._other_re = _any_of(
+                [
+                    pattern
+                    for lang, patterns in LANGUAGE_PATTERNS.items()
+                    if lang != language
+                    for pattern in patterns
+                ]
+            )
+            if base_url:
+                base_path = base.path.lower()
+                self._base_has_language = any(
+                    pattern in base_path
+                    for patterns in LANGUAGE_PATTERNS.values()
+                    for pattern in patterns
+                )
+        self._include_re = _glob_regex(self.include)
+        self._exclude_re = _glob_regex(self.exclude)
+
+    @staticmethod
+    def _split(url: str) -> tuple[str, str, str]:
+        """(scheme, netloc, path) exactly as urlparse returns them."""
+        if url.isascii():
+            m = _SIMPLE_URL_RE.match(url)
+            if m is not None and (
+                m.end() == len(url) or _URL_TAIL_RE.fullmatch(url, m.end())
+            ):
+                return m.group(1), m.group(2), m.group(3)
+        parsed = urlparse(url)
+        return parsed.scheme, parsed.netloc, parsed.path
+
+    def _rejects(self, path: str) -> str | None:
+        """The built-in rule dropping an in-scope *path*, if any."""
+        lower = path.lower()
+        m = self._extension_re.search(lower)
+        if m is not None:
+            return f"extension {m.group()}"
+        if self._pattern_re is not None:
+            m = self._pattern_re.search(lower)
+            if m is not None:
+                return f"pattern {m.group()}"
+        if self._target_re is not None and not self._target_re.search(lower):
+            if self._base_has_language or (
+                self._other_re is not None and self._other_re.search(lower)
+            ):
+                return "language"
+        return None
+
+    def keep(self, url: str) -> str | None:
+        """The form *url* is kept in, or None if a rule drops it (counted in hits)."""
+        scheme, netloc, path = self._split(url)
+        if netloc != self._domain:
+            self.hits["domain"] += 1
+            return None
+        path = path.rstrip("/")
+        if not path.startswith(self._base_path):
+            self.hits["base path"] += 1
+            return None
+        rule = self._rejects(path)
+        if rule is not None:
+            self.hits[rule] += 1
+            return None
+        kept = f"{scheme}://{netloc}{path}"
+        if self._exclude_re is not None:
+            m = self._exclude_re.match(kept)
+            if m is not None:
+                self.hits[f"exclude {self.exclude[_glob_index(m)]}"] += 1
+                return None
+        if self._include_re is not None:
+            m = self._include_re.match(kept)
+            if m is None:
+                self.hits["include"] += 1
+                return None
+            self.hits[f"include {self.include[_glob_index(m)]}"] += 1
+        return kept
+
+    def filter(self, urls: list[str]) -> list[str]:
+        """Kept forms of *urls*, deduplicated and sorted (filter_urls' output)."""
+        keep = self.keep
+        return sorted({kept for url in urls if (kept := keep(url)) is not None})
 
 
 def _matches_language(path: str, language: str, base_url: str = "") -> bool:
@@ -147,3 +305,231 @@ def _matches_language(path: str, language: str, base_url: str = "") -> bool:
             return False
 
     return True
+
+
+# Path segments naming a documentation version: v2, 1.4, 3.2.x, v1.4.0
+_VERSION_NUMBER_RE = re.compile(r"^(?:v\d+|v?\d+(?:\.(?:\d+|x))+)$", re.IGNORECASE)
+# Version aliases, in the order the default ("auto") prefers them
+STABLE_VERSION_ALIASES = ("stable", "latest", "current")
+DEV_VERSION_ALIASES = ("dev", "development", "master", "main", "next", "nightly")
+
+
+@dataclass
+class VersionReport:
+    """What filter_versions kept and dropped."""
+
+    # Version tree (scheme://host/prefix/) -> version kept in it
+    kept: dict[str, str] = field(default_factory=dict)
+    # Version -> URLs dropped for being in it
+    dropped: dict[str, int] = field(default_factory=dict)
+
+
+def _version_segment(segment: str) -> bool:
+    lower = segment.lower()
+    return bool(_VERSION_NUMBER_RE.match(lower)) or lower in (
+        STABLE_VERSION_ALIASES + DEV_VERSION_ALIASES
+    )
+
+
+def _version_segments(url: str) -> Iterator[tuple[str, str, bool]]:
+    """(tree, segment, has descendants) for each version-like path segment."""
+    parsed = urlparse(url)
+    segments = parsed.path.split("/")
+    last = max((i for i, s in enumerate(segments) if s), default=-1)
+    for i, segment in enumerate(segments):
+        if segment and _version_segment(segment):
+            prefix = "/".join(segments[:i]) + "/"
+            yield f"{parsed.scheme}://{parsed.netloc}{prefix}", segment, i < last
+
+
+def has_version_segment(url: str) -> bool:
+    """True if a path segment of *url* looks like a version (v2, 3.1, stable...).
+
+    Such URLs may be dropped by filter_versions once the rest of their tree
+    is known; others never are.
+    """
+    return next(_version_segments(url), None) is not None
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    """Sort key of a numbered version ("x" ranks above any number)."""
+    parts = version.lower().lstrip("v").split(".")
+    return tuple(1 << 30 if p == "x" else int(p) for p in parts)
+
+
+def _pick_version(versions: set[str], requested: str) -> str | None:
+    """
+    The version of a tree to keep: *requested* if present, else stable/latest.
+
+    None when the tree only has development branches (main, next...): with
+    no release to prefer, every branch is kept.
+    """
+    by_name = {v.lower().lstrip("v"): v for v in versions}
+    wanted = requested.lower().lstrip("v")
+    if requested != "auto" and wanted in by_name:
+        return by_name[wanted]
+    for alias in STABLE_VERSION_ALIASES:
+        if alias in by_name:
+            return by_name[alias]
+    numbered = [v for v in versions if _VERSION_NUMBER_RE.match(v)]
+    if numbered:
+        return max(numbered, key=_version_key)
+    return None
+
+
+def filter_versions(
+    urls: list[str], version: str = "auto", report: VersionReport | None = None
+) -> list[str]:
+    """
+    Keep one version of each versioned documentation tree.
+
+    A version tree is a path prefix under which at least two different
+    version directories appear (``/docs/v1/``, ``/docs/v2/``, ``/docs/latest/``,
+    or ReadTheDocs ``/en/stable/`` and ``/en/3.2/``). A segment only counts as
+    a version directory when some URL lies below it, so pages named like a
+    version (``/whatsnew/3.12``) stay pages. In each tree only the requested
+    version is kept; URLs of the tree without a version segment and URLs
+    outside any tree are kept as is.
+
+    Args:
+        urls: URLs to filter (order kept)
+        version: Version to keep ("v2", "3.2", "latest"...). "auto" (or a
+                 version a tree does not have) keeps stable, latest or
+                 current, else the highest numbered version; a tree of
+                 development branches only (main, next...) is left whole.
+                 "all" disables.
+        report: If given, receives the kept version per tree and the number
+                of URLs dropped per version.
+    """
+    if report is None:
+        report = VersionReport()
+    if version == "all":
+        return list(urls)
+
+    # Version directories: the first version segment with URLs below it
+    trees: dict[str, set[str]] = {}
+    for url in urls:
+        for tree, segment, has_descendants in _version_segments(url):
+            if has_descendants:
+                trees.setdefault(tree, set()).add(segment)
+                break
+
+    # URL -> (tree, version) for its first segment naming a version directory
+    # (this also places the version's root page, /docs/v2 or /docs/v2/)
+    located: dict[str, tuple[str, str]] = {}
+    for url in urls:
+        for tree, segment, _ in _version_segments(url):
+            if segment in trees.get(tree, ()):
+                located[url] = (tree, segment)
+                break
+
+    chosen: dict[str, str] = {}
+    for tree, versions in trees.items():
+        if len(versions) > 1:
+            pick = _pick_version(versions, version)
+            if pick is not None:
+                chosen[tree] = pick
+    report.kept.update(chosen)
+
+    kept: list[str] = []
+    for url in urls:
+        tree, segment = located.get(url, ("", ""))
+        if tree in chosen and segment != chosen[tree]:
+            report.dropped[segment] = report.dropped.get(segment, 0) + 1
+            continue
+        kept.append(url)
+
+    if report.dropped:
+        logger.info(
+            f"Version filtering kept {len(kept)}/{len(urls)} URLs "
+            f"({', '.join(f'{t}: {v}' for t, v in chosen.items())})"
+        )
+    return kept
+
+
+@dataclass
+class HreflangReport:
+    """What filter_hreflang kept and dropped."""
+
+    groups: int = 0  # alternate groups with at least one URL in the list
+    dropped: int = 0  # URLs dropped as another language of a kept URL
+    substituted: int = 0  # requested-language URLs added in place of a group
+
+
+def _pick_alternate(group: dict[str, str], language: str) -> str | None:
+    """URL of *group* in *language*: exact tag, then same primary language, then x-default."""
+    if language in group:
+        return group[language]
+    primary = language.split("-")[0]
+    if primary in group:
+        return group[primary]
+    regional = sorted(tag for tag in group if tag.split("-")[0] == primary)
+    if regional:
+        return group[regional[0]]
+    return group.get("x-default")
+
+
+def filter_hreflang(
+    urls: list[str],
+    language: str,
+    alternates: HreflangAlternates,
+    rules: UrlRules | None = None,
+    report: HreflangReport | None = None,
+) -> list[str]:
+    """
+    Keep one URL per hreflang alternate group, in the requested language.
+
+    Catches translations that path-prefix matching (_matches_language)
+    cannot see, e.g. unprefixed English pages next to ``/guide-fr`` ones.
+    URLs of a group other than its *language* URL are dropped. When that URL
+    was not discovered itself it takes the group's place, provided *rules*
+    keep it (in the form filter_urls returns). Groups
+    without the language (nor x-default), and URLs in no group, are kept as
+    is.
+
+    Args:
+        urls: URLs to filter (order kept)
+        language: Requested language tag ("en", "pt-br"). "all" disables.
+        alternates: Groups collected during discovery
+        rules: Rules a substituted URL must pass, usually the job's rules
+               for language "all"; without them no URL is substituted
+        report: If given, receives group and drop counts.
+    """
+    if report is None:
+        report = HreflangReport()
+    tag = language_tag(language)
+    if language == "all" or tag is None or not len(alternates):
+        return list(urls)
+
+    present = set(urls)
+    chosen: dict[int, str | None] = {}  # id(group) -> URL kept for it
+    kept: list[str] = []
+    emitted: set[str] = set()
+    for url in urls:
+        group = alternates.group(url)
+        if group is None:
+            kept.append(url)
+            continue
+        if id(group) not in chosen:
+            report.groups += 1
+            target = _pick_alternate(group, tag)
+            if target is not None and target not in present:
+                target = rules.keep(target) if rules is not None else None
+            chosen[id(group)] = target
+        target = chosen[id(group)]
+        if target is None or url == target:
+            kept.append(url)
+        elif target not in present and target not in emitted:
+            kept.append(target)
+            emitted.add(target)
+            report.substituted += 1
+            report.dropped += 1
+        else:
+            report.dropped += 1
+
+    if report.dropped:
+        logger.info(
+            f"hreflang filtering kept {len(kept)}/{len(urls)} URLs "
+            f"({report.groups} alternate groups, language {tag})"
+        )
+    return kept
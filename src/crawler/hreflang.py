@@ -0,0 +1,124 @@
+"""hreflang alternate-language groups collected during discovery.
+
+Language filtering (filter.py, LANGUAGE_PATTERNS) only recognises path
+prefixes such as ``/fr/``, so sites localizing by subdomain, query param or
+unprefixed paths had every language fetched. Many of them declare their
+translations instead:
+
+- sitemaps: ``<xhtml:link rel="alternate" hreflang="fr" href="...">`` inside
+  each ``<url>`` entry
+- pages: ``<link rel="alternate" hreflang="fr" href="...">`` in the head, or
+  the same relation in an HTTP ``Link`` header
+
+``HreflangAlternates`` merges these declarations into groups (one page in
+each of its languages); filter.filter_hreflang then keeps one URL per group.
+Language tags are lowercased with ``_`` read as ``-``. URLs are stored as
+given, so callers pass them normalized (discovery uses normalize_url).
+Per-job state; create one per discovery run.
+"""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import urljoin
+
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(
+    r"""([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE
+)
+_HEAD_END_RE = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+_LINK_HEADER_RE = re.compile(r"<([^>]*)>([^<]*)")
+_LINK_PARAM_RE = re.compile(r"""([a-zA-Z-]+)\s*=\s*(?:"([^"]*)"|([^\s;,]+))""")
+_LANG_TAG_RE = re.compile(r"^(?:x-default|[a-z]{2,3}(?:-[a-z0-9]{1,8})*)$")
+
+
+def language_tag(value: str) -> str | None:
+    """Normalized hreflang value (``en_US`` → ``en-us``), None if malformed."""
+    tag = value.strip().lower().replace("_", "-")
+    return tag if _LANG_TAG_RE.match(tag) else None
+
+
+def _alternates(
+    candidates: list[tuple[str, str, str]], page_url: str
+) -> dict[str, str]:
+    """{language: absolute URL} from (rel, hreflang, href) triples."""
+    found: dict[str, str] = {}
+    for rel, hreflang, href in candidates:
+        if "alternate" not in rel.lower().split() or not href.strip():
+            continue
+        tag = language_tag(hreflang)
+        if tag is not None:
+            found.setdefault(tag, urljoin(page_url, href.strip()))
+    return found
+
+
+def extract_hreflang(html: str, page_url: str) -> dict[str, str]:
+    """{language: absolute URL} of the ``<link rel="alternate" hreflang>`` tags in the head."""
+    head_end = _HEAD_END_RE.search(html)
+    head = html[: head_end.start()] if head_end else html[:65536]
+    candidates = []
+    for tag in _LINK_TAG_RE.findall(head):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+            for m in _ATTR_RE.finditer(tag)
+        }
+        if "hreflang" in attrs:
+            candidates.append(
+                (attrs.get("rel", ""), attrs["hreflang"], attrs.get("href", ""))
+            )
+    return _alternates(candidates, page_url)
+
+
+def parse_link_header(value: str, page_url: str) -> dict[str, str]:
+    """{language: absolute URL} of the ``rel="alternate"; hreflang`` entries of a Link header."""
+    candidates = []
+    for target, params in _LINK_HEADER_RE.findall(value):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or ""
+            for m in _LINK_PARAM_RE.finditer(params)
+        }
+        if "hreflang" in attrs:
+            candidates.append((attrs.get("rel", ""), attrs["hreflang"], target))
+    return _alternates(candidates, page_url)
+
+
+class HreflangAlternates:
+    """Per-job groups of URLs declared as language alternates of each other.
+
+    Each group maps language tag → URL. Declarations sharing a URL are
+    merged into one group; the first URL declared for a language wins.
+    """
+
+    def __init__(self) -> None:
+        self._groups: dict[str, dict[str, str]] = {}  # URL -> its group
+
+    def __len__(self) -> int:
+        return len({id(g) for g in self._groups.values()})
+
+    def add(self, links: dict[str, str]) -> None:
+        """Record one declaration ({language: URL}, normalized tags and URLs)."""
+        if len(links) < 2:
+            return  # a page with no other language forms no group
+        existing = {id(g): g for url in links.values() if (g := self._groups.get(url))}
+        groups = list(existing.values())
+        group = groups[0] if groups else {}
+        for other in groups[1:]:
+            for tag, url in other.items():
+                self._groups.pop(url, None)
+                group.setdefault(tag, url)
+        for tag, url in links.items():
+            group.setdefault(tag, url)
+        # URLs losing a language to an earlier declaration stay ungrouped
+        for url in group.values():
+            self._groups[url] = group
+
+    def group(self, url: str) -> dict[str, str] | None:
+        """The group *url* belongs to, if it was declared in one."""
+        return self._groups.get(url)
+
+    def groups(self) -> list[dict[str, str]]:
+        """Every group, once each (e.g. to persist them)."""
+        return list({id(g): g for g in self._groups.values()}.values())
+
+    def reset(self) -> None:
+        self._groups.clear()
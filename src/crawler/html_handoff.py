@@ -0,0 +1,149 @@
+"""Hand pages fetched during discovery over to the scraping phase.
+
+When discovery falls back to recursive_crawl, every crawled page is already
+downloaded in full just to read its links; scraping used to fetch the same
+pages a second time. ``HtmlHandoff`` keeps those bodies (with their ETags)
+so the scraping phase can convert them directly with the HTTP fast-path
+converter instead.
+
+Design decisions:
+- opt-in via JobRequest.reuse_discovery_html (default False)
+- memory is bounded by HTML_HANDOFF_MAX_MB (UTF-8 size of kept bodies);
+  past that, bodies spill to a directory of their own when one is given
+  (use_cache), and are dropped otherwise (scraping then fetches them as usual)
+- spilled bodies never go to the PageCache: they are raw, unvetted crawl
+  responses, while cache entries hold the content HTML scraping extracted
+- URLs are keyed by normalize_url, the form discovery returns them in
+- take() removes the page (and its spill file), so each body is handed over
+  at most once and memory and disk are released as scraping progresses
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.crawler.discovery import normalize_url
+
+logger = logging.getLogger(__name__)
+
+HTML_HANDOFF_MAX_MB = int(os.environ.get("HTML_HANDOFF_MAX_MB", "64"))
+
+
+@dataclass
+class HandoffPage:
+    """One page body fetched during discovery."""
+
+    url: str
+    html: str
+    etag: str | None = None
+
+
+class HtmlHandoff:
+    """Bounded store of discovery-fetched HTML, spilling to disk.
+
+    Args:
+        spill_dir: Directory to write bodies to once the memory budget is
+                   used. None drops them instead.
+        max_bytes: In-memory budget. Defaults to HTML_HANDOFF_MAX_MB.
+
+    Counters: kept (in memory), spilled, dropped, served (taken by scraping)
+    """
+
+    def __init__(
+        self, spill_dir: Path | None = None, max_bytes: int | None = None
+    ) -> None:
+        self._spill_dir = spill_dir
+        self._spilled: set[str] = set()
+        self._max_bytes = (
+            HTML_HANDOFF_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        )
+        self._pages: dict[str, HandoffPage] = {}
+        self._bytes = 0
+        self.kept = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.served = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def _spill_path(self, key: str) -> Path:
+        assert self._spill_dir is not None  # only spilled keys get here
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self._spill_dir / f"{digest}.json"
+
+    def _write_spill(self, page: HandoffPage) -> bool:
+        """Write *page* to the spill directory (atomic); False on failure."""
+        path = self._spill_path(page.url)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(
+                json.dumps({"url": page.url, "html": page.html, "etag": page.etag}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.debug(f"Handoff spill failed for {page.url}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def _read_spill(self, key: str) -> HandoffPage | None:
+        """Read and delete the spill file of *key*."""
+        path = self._spill_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.debug(f"Handoff spill unreadable for {key}: {e}")
+            return None
+        finally:
+            path.unlink(missing_ok=True)
+        if data.get("url") != key:
+            return None
+        return HandoffPage(key, data.get("html", ""), data.get("etag"))
+
+    def put(self, url: str, html: str, etag: str | None = None) -> None:
+        """Keep the body of *url* for scraping (memory, disk or dropped)."""
+        key = normalize_url(url)
+        if key in self._pages or key in self._spilled:
+            return
+        size = len(html.encode("utf-8"))
+        if self._bytes + size <= self._max_bytes:
+            self._pages[key] = HandoffPage(key, html, etag)
+            self._bytes += size
+            self.kept += 1
+        elif self._spill_dir is not None and self._write_spill(
+            HandoffPage(key, html, etag)
+        ):
+            self._spilled.add(key)
+            self.spilled += 1
+        else:
+            self.dropped += 1
+
+    def take(self, url: str) -> HandoffPage | None:
+        """Remove and return the page for *url* (from memory or disk), if any."""
+        key = normalize_url(url)
+        page = self._pages.pop(key, None)
+        if page is not None:
+            self._bytes -= len(page.html.encode("utf-8"))
+        elif key in self._spilled:
+            self._spilled.discard(key)
+            page = self._read_spill(key)
+        if page is not None:
+            self.served += 1
+        return page
+
+    def clear(self) -> None:
+        """Release pages that scraping never asked for (e.g. filtered out)."""
+        self._pages.clear()
+        self._bytes = 0
+        for key in self._spilled:
+            self._spill_path(key).unlink(missing_ok=True)
+        self._spilled.clear()
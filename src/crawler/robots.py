@@ -1,95 +1,331 @@
-"""robots.txt parser."""
+"""robots.txt parser, compiled rule matching and a process-wide per-host cache.
 
+Parsing follows RFC 9309:
+- directive names are case-insensitive, rule paths keep their case
+- ``#`` comments are stripped; consecutive ``User-agent`` lines share a group
+- the group naming ROBOTS_USER_AGENT applies if there is one, else the
+  ``*`` groups (merged); ``Sitemap:`` lines are read wherever they appear
+- ``*`` matches any run of characters, a trailing ``$`` anchors the end
+- the longest matching rule wins; Allow wins a tie; the path is matched
+  with its query string
+
+``RobotsMatcher`` compiles the rules once: plain prefix rules go into a
+character trie walked along the path (one pass, no per-rule scan). Wildcard
+rules hang off the trie node of their literal prefix (the text before the
+first ``*``), compiled into one regex per node whose alternatives are ordered
+longest first; only the nodes the walk passes through are tried.
+
+``robots_cache`` keeps each host's parsed robots.txt for ROBOTS_CACHE_TTL
+seconds, shared by every job: RobotsParser.load (URL filtering) and
+try_sitemap (``Sitemap:`` directives) read the same entry, and concurrent
+requests for one host share one fetch. A missing robots.txt (non-200) is
+cached too; network errors are not. At most MAX_ENTRIES hosts are kept,
+oldest dropped first, together with their fetch locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
 import logging
-from urllib.parse import urlparse
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import cast
+from urllib.parse import urlsplit
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+ROBOTS_CACHE_TTL = int(os.environ.get("ROBOTS_CACHE_TTL", "3600"))
+ROBOTS_USER_AGENT = "docrawl"  # product token looked for in User-agent lines
+MAX_ENTRIES = 500
+
+
+class _TrieNode:
+    __slots__ = ("children", "allow", "wildcard", "wildcard_re", "max_wildcard")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.allow: bool | None = None  # verdict of the plain rule ending here
+        # Wildcard rules whose literal prefix ends here: (length, allow),
+        # longest first, and one regex with a named alternative for each
+        self.wildcard: list[tuple[int, bool]] = []
+        self.wildcard_re: re.Pattern[str] | None = None
+        self.max_wildcard = -1
+
+
+class RobotsMatcher:
+    """Compiled Allow/Disallow rules: a prefix trie plus regexes for wildcards."""
+
+    def __init__(self, allowed: list[str], disallowed: list[str]) -> None:
+        self._root = _TrieNode()
+        wildcard: dict[str, bool] = {}  # pattern -> allowed
+        for rules, allow in ((disallowed, False), (allowed, True)):
+            for rule in rules:
+                if "*" in rule or rule.endswith("$"):
+                    wildcard[rule] = wildcard.get(rule, False) or allow
+                else:
+                    node = self._node(rule)
+                    node.allow = bool(node.allow) or allow
+
+        # Each wildcard rule hangs off the node of its literal prefix, so only
+        # rules whose prefix the path starts with are tried. Longest first,
+        # Allow before Disallow: a node's first matching alternative wins.
+        by_node: dict[int, tuple[_TrieNode, list[tuple[str, bool]]]] = {}
+        for rule, allow in wildcard.items():
+            node = self._node(re.split(r"[*$]", rule, maxsplit=1)[0])
+            by_node.setdefault(id(node), (node, []))[1].append((rule, allow))
+        for node, node_rules in by_node.values():
+            node_rules.sort(key=lambda r: (-len(r[0]), not r[1]))
+            node.wildcard = [(len(rule), allow) for rule, allow in node_rules]
+            node.max_wildcard = node.wildcard[0][0]
+            node.wildcard_re = re.compile(
+                "|".join(
+                    f"(?P<r{i}>{_wildcard_regex(rule)})"
+                    for i, (rule, _) in enumerate(node_rules)
+                )
+            )
+
+    def _node(self, prefix: str) -> _TrieNode:
+        node = self._root
+        for ch in prefix:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = _TrieNode()
+            node = child
+        return node
+
+    def is_allowed(self, path: str) -> bool:
+        """True unless the longest rule matching *path* (path?query) is a Disallow."""
+        best_len, best_allow = -1, True
+        node = self._root
+        candidates = [node] if node.wildcard_re is not None else []
+        for i, ch in enumerate(path):
+            child = node.children.get(ch)
+            if child is None:
+                break
+            node = child
+            if node.allow is not None:
+                best_len, best_allow = i + 1, node.allow
+            if node.wildcard_re is not None:
+                candidates.append(node)
+        for node in candidates:
+            regex = node.wildcard_re
+            if regex is None or node.max_wildcard < best_len:
+                continue
+            m = regex.match(path)
+            if m is not None:
+                length, allow = node.wildcard[int(cast(str, m.lastgroup)[1:])]
+                if (length, allow) > (best_len, best_allow):
+                    best_len, best_allow = length, allow
+        return best_allow
+
+
+def _wildcard_regex(rule: str) -> str:
+    anchored = rule.endswith("$")
+    body = rule[:-1] if anchored else rule
+    return ".*".join(re.escape(part) for part in body.split("*")) + (
+        r"\Z" if anchored else ""
+    )
+
 
 class RobotsParser:
-    """Simple robots.txt parser supporting Disallow and Allow directives."""
+    """robots.txt parser supporting Allow/Disallow with ``*`` and ``$`` wildcards.
+
+    ``disallowed`` and ``allowed`` may be reassigned; the compiled matcher is
+    rebuilt on the next is_allowed call.
+    """
 
     def __init__(self) -> None:
-        self.disallowed: list[str] = []
-        self.allowed: list[str] = []
+        self._disallowed: list[str] = []
+        self._allowed: list[str] = []
+        self._matcher: RobotsMatcher | None = None
         self.crawl_delay: float | None = None
+        self.sitemaps: list[str] = []
 
-    async def load(self, base_url: str) -> bool:
-        """Load and parse robots.txt from base URL."""
-        parsed = urlparse(base_url)
-        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+    @property
+    def disallowed(self) -> list[str]:
+        return self._disallowed
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(robots_url, timeout=10)
-                if response.status_code != 200:
-                    return False
-
-                self._parse(response.text)
-                return True
-        except Exception as e:
-            logger.warning(f"Failed to load robots.txt: {e}")
+    @disallowed.setter
+    def disallowed(self, rules: list[str]) -> None:
+        self._disallowed = rules
+        self._matcher = None
+
+    @property
+    def allowed(self) -> list[str]:
+        return self._allowed
+
+    @allowed.setter
+    def allowed(self, rules: list[str]) -> None:
+        self._allowed = rules
+        self._matcher = None
+
+    async def load(self, base_url: str, cache: RobotsCache | None = None) -> bool:
+        """Load the robots.txt of base_url's host (through robots_cache).
+
+        Returns False if the host has none or it could not be fetched.
+        """
+        parsed = await (robots_cache if cache is None else cache).get(base_url)
+        if parsed is None:
             return False
+        # Entries are shared read-only, so the compiled matcher is too
+        self._disallowed = parsed.disallowed
+        self._allowed = parsed.allowed
+        self._matcher = parsed.matcher
+        self.crawl_delay = parsed.crawl_delay
+        self.sitemaps = parsed.sitemaps
+        return True
 
     def _parse(self, content: str) -> None:
         """Parse robots.txt content."""
-        in_user_agent_all = False
-
-        for line in content.splitlines():
-            line = line.strip().lower()
-
-            if line.startswith("user-agent:"):
-                agent = line.split(":", 1)[1].strip()
-                in_user_agent_all = agent == "*"
-            elif in_user_agent_all:
-                if line.startswith("disallow:"):
-                    path = line.split(":", 1)[1].strip()
-                    if path:
-                        self.disallowed.append(path)
-                elif line.startswith("allow:"):
-                    path = line.split(":", 1)[1].strip()
-                    if path:
-                        self.allowed.append(path)
-                elif line.startswith("crawl-delay:"):
+        groups: list[tuple[list[str], list[tuple[str, str]], list[float]]] = []
+        agents: list[str] | None = None  # agents of the group being read
+        sitemaps: list[str] = []
+
+        for raw in content.splitlines():
+            line = raw.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+            if field == "user-agent":
+                if agents is None:
+                    agents = []
+                    groups.append((agents, [], []))
+                agents.append(value.lower())
+            elif field == "sitemap":
+                if value:
+                    sitemaps.append(value)
+            elif groups:
+                agents = None  # the next User-agent line starts a new group
+                if field in ("allow", "disallow"):
+                    if value:
+                        groups[-1][1].append((field, value))
+                elif field == "crawl-delay":
                     try:
-                        self.crawl_delay = float(line.split(":", 1)[1].strip())
+                        groups[-1][2].append(float(value))
                     except ValueError:
                         pass
 
+        own = [g for g in groups if ROBOTS_USER_AGENT in g[0]]
+        applied = own or [g for g in groups if "*" in g[0]]
+        rules = [rule for g in applied for rule in g[1]]
+        delays = [delay for g in applied for delay in g[2]]
+        self.disallowed = [path for field, path in rules if field == "disallow"]
+        self.allowed = [path for field, path in rules if field == "allow"]
+        self.crawl_delay = delays[-1] if delays else None
+        self.sitemaps = sitemaps
+
+    @property
+    def matcher(self) -> RobotsMatcher:
+        """The compiled rules (built on first use)."""
+        if self._matcher is None:
+            self._matcher = RobotsMatcher(self._allowed, self._disallowed)
+        return self._matcher
+
     def is_allowed(self, url: str) -> bool:
         """Check if URL is allowed by robots.txt.
 
         Uses specificity-based precedence: the longest matching rule wins.
         If Allow and Disallow tie on length, Allow wins (RFC 9309 §2.2.2).
         """
-        parsed = urlparse(url)
-        path = parsed.path
-
-        best_disallow_len: int | None = None
-        for rule in self.disallowed:
-            if path.startswith(rule):
-                if best_disallow_len is None or len(rule) > best_disallow_len:
-                    best_disallow_len = len(rule)
-
-        best_allow_len: int | None = None
-        for rule in self.allowed:
-            if path.startswith(rule):
-                if best_allow_len is None or len(rule) > best_allow_len:
-                    best_allow_len = len(rule)
-
-        # No rule matched at all -> allowed
-        if best_disallow_len is None and best_allow_len is None:
-            return True
-
-        # Only allow matched -> allowed
-        if best_disallow_len is None:
-            return True
-
-        # Only disallow matched -> blocked
-        if best_allow_len is None:
-            return False
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return self.matcher.is_allowed(path)
+
+
+@dataclass
+class _CachedRobots:
+    parser: RobotsParser | None  # None: the host has no robots.txt
+    timestamp: float
+
+
+class RobotsCache:
+    """Process-wide parsed robots.txt per host (scheme://netloc), with TTL.
+
+    Args:
+        ttl: Seconds an entry is served before robots.txt is fetched again.
+    """
+
+    def __init__(self, ttl: int = ROBOTS_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self._entries: dict[str, _CachedRobots] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.fetches = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def _fresh(self, key: str) -> _CachedRobots | None:
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry.timestamp <= self.ttl:
+            return entry
+        return None
+
+    async def get(
+        self, url: str, client: httpx.AsyncClient | None = None
+    ) -> RobotsParser | None:
+        """Parsed robots.txt of *url*'s host, fetched (with *client*, if given)
+        unless a fresh entry exists. None if the host has none or it could not
+        be fetched. The parser is shared: do not modify it.
+        """
+        key = self.key(url)
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry.parser
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = self._fresh(key)  # fetched while we waited
+                if entry is not None:
+                    return entry.parser
+                try:
+                    if client is not None:
+                        parser = await self._fetch(key, client)
+                    else:
+                        async with httpx.AsyncClient() as own_client:
+                            parser = await self._fetch(key, own_client)
+                except Exception as e:
+                    logger.warning(f"Failed to load robots.txt: {e}")
+                    return None
+                self._entries[key] = _CachedRobots(parser, time.time())
+                if len(self._entries) > MAX_ENTRIES:
+                    self._evict_oldest()
+                return parser
+        finally:
+            # Locks live as long as their entry (or fetch), so they stay bounded
+            if key not in self._entries and not lock.locked():
+                self._locks.pop(key, None)
+
+    def _evict_oldest(self) -> None:
+        oldest = min(self._entries, key=lambda k: self._entries[k].timestamp)
+        del self._entries[oldest]
+        lock = self._locks.get(oldest)
+        if lock is not None and not lock.locked():  # else a refetch is running
+            del self._locks[oldest]
+
+    async def _fetch(self, key: str, client: httpx.AsyncClient) -> RobotsParser | None:
+        self.fetches += 1
+        response = await client.get(f"{key}/robots.txt", timeout=10)
+        if response.status_code != 200:
+            return None
+        parser = RobotsParser()
+        parser._parse(response.text)
+        # Compiled once, before the parser is shared
+        parser._matcher = RobotsMatcher(parser.allowed, parser.disallowed)
+        return parser
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._locks.clear()
+        self.fetches = 0
+
 
-        # Both matched: Allow wins on tie or when more specific
-        return best_allow_len >= best_disallow_len
+robots_cache = RobotsCache()
@@ -0,0 +1,159 @@
+"""Crawler trap detection for the recursive crawl.
+
+recursive_crawl keeps query strings, so faceted search pages, calendars,
+``?page=N`` pagination, session-ID links and self-nesting relative links
+(``/docs/docs/docs/...``) can fill the URL cap with near-duplicates before
+any real doc page is found. ``CrawlTrapDetector`` decides, for each newly
+found URL, whether it is admitted to the crawl:
+
+- configured query params are stripped first (CRAWL_STRIP_PARAMS, fnmatch
+  patterns; session IDs by default), so ``?jsessionid=...`` variants
+  collapse onto one URL
+- repeated segments: a path with a segment occurring more than
+  CRAWL_TRAP_MAX_REPEATS times is suppressed
+- query cardinality: once a query param of a path has taken
+  CRAWL_TRAP_QUERY_VALUES distinct values, URLs with new values for it are
+  suppressed (calendars, pagination, facets)
+- fan-out: at most CRAWL_TRAP_FANOUT URLs per path pattern, where numeric,
+  date-like and ID-like segments are wildcards and query values are
+  ignored (``/blog/2024/01/15?ref=x`` → ``/blog/{n}/{n}/{n}?ref``)
+
+Suppressed URLs are counted per pattern (``suppressed``). Any limit set to
+0 disables that check. The detector holds per-crawl state; create one per
+recursive_crawl.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter
+from fnmatch import fnmatchcase
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CRAWL_TRAP_FANOUT = int(os.environ.get("CRAWL_TRAP_FANOUT", "100"))
+CRAWL_TRAP_MAX_REPEATS = int(os.environ.get("CRAWL_TRAP_MAX_REPEATS", "2"))
+CRAWL_TRAP_QUERY_VALUES = int(os.environ.get("CRAWL_TRAP_QUERY_VALUES", "25"))
+CRAWL_STRIP_PARAMS = [
+    p.strip().lower()
+    for p in os.environ.get(
+        "CRAWL_STRIP_PARAMS", "jsessionid,phpsessid,sessionid,session_id"
+    ).split(",")
+    if p.strip()
+]
+
+_NUMERIC_RE = re.compile(r"^\d+([-_.]\d+)*$")  # 42, 2024-01-15, 1.4.0
+_ID_RE = re.compile(r"^(?=.*\d)[0-9a-f-]{16,}$", re.IGNORECASE)  # hashes, UUIDs
+
+
+def _segment_pattern(segment: str) -> str:
+    if _NUMERIC_RE.match(segment):
+        return "{n}"
+    if _ID_RE.match(segment):
+        return "{id}"
+    return segment
+
+
+def url_pattern(url: str) -> str:
+    """Path pattern of *url*: dynamic-looking segments as wildcards, query names only."""
+    parts = urlsplit(url)
+    path = "/".join(_segment_pattern(s) for s in parts.path.split("/"))
+    if parts.query:
+        names = sorted({name for name, _ in parse_qsl(parts.query, True)})
+        path += "?" + "&".join(names)
+    return path or "/"
+
+
+class CrawlTrapDetector:
+    """Per-crawl URL admission with trap limits and query-param stripping.
+
+    Args:
+        fanout: Max URLs per path pattern. Defaults to CRAWL_TRAP_FANOUT.
+        max_repeats: Max occurrences of one path segment. Defaults to
+                     CRAWL_TRAP_MAX_REPEATS.
+        query_values: Max distinct values per (path, query param). Defaults
+                      to CRAWL_TRAP_QUERY_VALUES.
+        strip_params: fnmatch patterns (case-insensitive) of query params
+                      removed by clean(). Defaults to CRAWL_STRIP_PARAMS.
+
+    ``suppressed`` maps each pattern to the number of URLs it suppressed.
+    """
+
+    def __init__(
+        self,
+        fanout: int | None = None,
+        max_repeats: int | None = None,
+        query_values: int | None = None,
+        strip_params: list[str] | None = None,
+    ) -> None:
+        self.fanout = CRAWL_TRAP_FANOUT if fanout is None else fanout
+        self.max_repeats = (
+            CRAWL_TRAP_MAX_REPEATS if max_repeats is None else max_repeats
+        )
+        self.query_values = (
+            CRAWL_TRAP_QUERY_VALUES if query_values is None else query_values
+        )
+        self.strip_params = [
+            p.lower()
+            for p in (CRAWL_STRIP_PARAMS if strip_params is None else strip_params)
+        ]
+        self.suppressed: Counter[str] = Counter()
+        self._per_pattern: Counter[str] = Counter()
+        self._values: dict[tuple[str, str], set[str]] = {}
+
+    @property
+    def total_suppressed(self) -> int:
+        return sum(self.suppressed.values())
+
+    def _strip(self, name: str) -> bool:
+        name = name.lower()
+        return any(fnmatchcase(name, pattern) for pattern in self.strip_params)
+
+    def clean(self, url: str) -> str:
+        """Return *url* without the query params matching strip_params."""
+        if not self.strip_params:
+            return url
+        parts = urlsplit(url)
+        if not parts.query:
+            return url
+        pairs = parse_qsl(parts.query, keep_blank_values=True)
+        kept = [(name, value) for name, value in pairs if not self._strip(name)]
+        if len(kept) == len(pairs):
+            return url
+        return urlunsplit(parts._replace(query=urlencode(kept)))
+
+    def admit(self, url: str) -> bool:
+        """Record *url* (already cleaned and not seen before); False if it is a trap."""
+        parts = urlsplit(url)
+        pattern = url_pattern(url)
+
+        if self.max_repeats:
+            segments = [s for s in parts.path.split("/") if s]
+            if segments:
+                _, count = Counter(segments).most_common(1)[0]
+                if count > self.max_repeats:
+                    self.suppressed[pattern] += 1
+                    return False
+
+        new_values: list[set[str]] = []
+        new_value: list[str] = []
+        if self.query_values and parts.query:
+            for name, value in parse_qsl(parts.query, keep_blank_values=True):
+                values = self._values.setdefault((parts.path, name), set())
+                if value in values:
+                    continue
+                if len(values) >= self.query_values:
+                    self.suppressed[f"{parts.path}?{name}=*"] += 1
+                    return False
+                new_values.append(values)
+                new_value.append(value)
+
+        if self.fanout and self._per_pattern[pattern] >= self.fanout:
+            self.suppressed[pattern] += 1
+            return False
+
+        # Only admitted URLs count toward the limits
+        self._per_pattern[pattern] += 1
+        for values, value in zip(new_values, new_value):
+            values.add(value)
+        return True
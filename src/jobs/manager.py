@@ -38,6 +38,11 @@ class Job:
     pages_skipped: int = 0  # PR 2.3: dedup skips
     pages_blocked: int = 0  # PR 2.3: bot-check pages
     pages_retried: int = 0  # PR 4: scrape-level retry count
+    tables_rendered: int = 0  # tables rendered to GFM by the converter table stage
+    heavy_calls_avoided: int = 0  # chunks kept out of the heavy cleanup tier by it
+    math_restored: int = 0  # rendered math expressions replaced by their TeX source
+    cleanup_learned_skips: int = 0  # chunks skipped by a site's learned threshold
+    discovered_from_cache: bool = False  # URLs reused from the discovery cache
     # PR 3.1: pause/resume via asyncio.Event (set=running, clear=paused)
     _paused: bool = False
     _pause_event: asyncio.Event = field(default_factory=lambda: _make_running_event())
@@ -4,24 +4,53 @@ import asyncio
 import logging
 import os as _os
 import time
+from dataclasses import asdict as _asdict
 from dataclasses import dataclass as _dataclass
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine
 from urllib.parse import urlparse
 
 from src.jobs.manager import Job
 from src.api.models import JobRequest
-from src.crawler.discovery import discover_urls
-from src.crawler.filter import filter_urls
+from src.crawler.canonical import UrlCanonicalizer, extract_canonical
+from src.crawler.discovery import DiscoveryReport, discover_urls
+from src.crawler.discovery_cache import discovery_cache
+from src.crawler.html_handoff import HtmlHandoff
+from src.crawler.filter import (
+    HreflangReport,
+    UrlRules,
+    VersionReport,
+    filter_hreflang,
+    filter_urls,
+    filter_versions,
+    has_version_segment,
+)
+from src.crawler.hreflang import HreflangAlternates
 from src.crawler.robots import RobotsParser
-from src.llm.filter import filter_urls_with_llm
-from src.llm.cleanup import cleanup_markdown, needs_llm_cleanup
+from src.llm.filter import FilterBatchReport, filter_urls_with_llm
+from src.llm.url_classifier import ClassifierReport, UrlClassifier, url_classifier
+from src.llm.cleanup import (
+    ChunkProfile,
+    cleanup_markdown,
+    heavy_avoided_by_tables,
+    needs_llm_cleanup,
+    profile_chunk,
+)
+from src.llm.cleanup_stats import (
+    cleanup_stats,
+    feature_key,
+    normalized_edit_distance,
+)
 from src.llm.client import get_available_models, get_provider_for_model
 from src.scraper.page import (
+    PageFetchInfo,
     PageScraper,
     PagePool,
     fetch_markdown_native,
     fetch_markdown_proxy,
     fetch_html_fast,
+    convert_html_fast,
+    record_stage_counts,
 )
 from src.scraper.markdown import chunk_markdown
 from src.scraper.detection import is_blocked_response, content_hash
@@ -35,10 +64,18 @@ from src.scraper.structured import (
 )
 from src.scraper.converters import get_converter
 from src.scraper.converters.base import MarkdownConverter
+from src.scraper.converters.math_tex import MathAwareConverter, has_restored_math
+from src.scraper.converters.tables import TableAwareConverter
 
 logger = logging.getLogger(__name__)
 
 MAX_SCRAPE_RETRIES = int(_os.environ.get("SCRAPE_MAX_RETRIES", "2"))
+# stream_discovery: URLs per streamed LLM filtering call, and seconds of
+# discovery silence after which a smaller pending batch is filtered anyway
+DISCOVERY_STREAM_BATCH = int(_os.environ.get("DISCOVERY_STREAM_BATCH", "50"))
+DISCOVERY_STREAM_IDLE = float(_os.environ.get("DISCOVERY_STREAM_IDLE", "2"))
+# Seconds between live recursive-crawl progress events during discovery
+CRAWL_PROGRESS_INTERVAL = float(_os.environ.get("CRAWL_PROGRESS_INTERVAL", "2"))
 
 
 async def validate_models(
@@ -133,7 +170,13 @@ async def run_job(
     scraper = PageScraper()
     robots = RobotsParser()
     # PR 3.4: resolve converter plugin (None → default "markdownify")
-    _converter = get_converter(request.converter)
+    # Tables are rendered to GFM and math restored to its TeX source deterministically
+    # so neither needs the heavy cleanup tier
+    _converter = MathAwareConverter(
+        TableAwareConverter(get_converter(request.converter))
+    )
+    # Streamed LLM filtering or stream discovery, running alongside scraping
+    filter_task: asyncio.Task[list[str]] | None = None
 
     try:
         # INIT phase
@@ -230,6 +273,18 @@ async def run_job(
         # PR 3.1: skip discovery/filtering when resuming from saved state
         before_llm: float = 0.0
         llm_duration: float = 0.0
+        # Streaming LLM filter: accepted URLs arrive on url_stream in batches
+        url_stream: asyncio.Queue[list[str] | None] | None = None
+        # Pages downloaded by the recursive crawl, reused by scraping
+        html_handoff: HtmlHandoff | None = None
+        if request.reuse_discovery_html and resume_urls is None:
+            html_handoff = HtmlHandoff(
+                spill_dir=(
+                    Path(request.output_path) / ".cache" / "handoff"
+                    if request.use_cache
+                    else None
+                )
+            )
         if resume_urls is not None:
             urls = resume_urls
             await _log(
@@ -240,37 +295,25 @@ async def run_job(
                     "message": f"Resuming from state: {len(urls)} pending URLs (skipping discovery/filtering)",
                 },
             )
-        else:
-            # DISCOVERY phase
-            phase_start = time.monotonic()
-            await _log(
-                job,
-                "phase_change",
-                {
-                    "phase": "discovery",
-                    "message": "Crawling site structure...",
-                },
-            )
-
-            urls = await discover_urls(
-                base_url, request.max_depth, request.filter_sitemap_by_path
+        elif request.stream_discovery:
+            # Discovered URLs flow through filtering into scraping as found
+            url_stream = asyncio.Queue()
+            filter_task = asyncio.create_task(
+                _stream_discovery(
+                    job, base_url, robots, html_handoff, url_stream, page_pool
+                )
             )
-
-            discovery_time = time.monotonic() - phase_start
-            await _log(
-                job,
-                "log",
-                {
-                    "phase": "discovery",
-                    "message": f"Found {len(urls)} URLs ({discovery_time:.1f}s)",
-                },
+            urls = []
+        else:
+            alternates = HreflangAlternates()
+            urls = await _discover(
+                job, base_url, html_handoff, page_pool=page_pool, alternates=alternates
             )
 
             if job.is_cancelled:
                 return
 
             # FILTERING phase — basic
-            phase_start = time.monotonic()
             total_before = len(urls)
             await _log(
                 job,
@@ -281,7 +324,10 @@ async def run_job(
                 },
             )
 
-            urls = filter_urls(urls, base_url, request.language)
+            rules = UrlRules(
+                base_url, request.language, request.include_globs, request.exclude_globs
+            )
+            urls = filter_urls(urls, base_url, request.language, rules)
             after_basic = len(urls)
             removed_basic = total_before - after_basic
             await _log(
@@ -290,8 +336,27 @@ async def run_job(
                 {
                     "phase": "filtering",
                     "message": f"Basic filtering: {total_before} → {after_basic} URLs (removed {removed_basic} non-doc)",
+                    "rule_hits": dict(rules.hits),
                 },
             )
+            await _log_glob_hits(job, rules)
+
+            # Keep one version of versioned doc trees (/v1/, /v2/, /stable/...)
+            versions = VersionReport()
+            urls = filter_versions(urls, request.doc_version, versions)
+            await _log_version_filtering(job, versions, after_basic, len(urls))
+
+            # One URL per hreflang alternate group, in the requested language
+            before_hreflang = len(urls)
+            hreflang = HreflangReport()
+            urls = filter_hreflang(
+                urls,
+                request.language,
+                alternates,
+                UrlRules(base_url, "all", request.include_globs, request.exclude_globs),
+                hreflang,
+            )
+            await _log_hreflang_filtering(job, hreflang, before_hreflang, len(urls))
 
             # Robots.txt filtering
             if request.respect_robots_txt:
@@ -321,13 +386,47 @@ async def run_job(
                     },
                 )
 
+                async def _on_filter_batch(report: FilterBatchReport) -> None:
+                    if report.batches < 2:
+                        return
+                    await _log(
+                        job,
+                        "log",
+                        {
+                            "phase": "filtering",
+                            "message": f"LLM batch {report.index + 1}/{report.batches}: "
+                            f"{report.urls_in} → {report.urls_out} {report.unit} "
+                            f"({report.duration:.1f}s"
+                            + (", fallback)" if report.fell_back else ")"),
+                        },
+                    )
+
                 llm_start = time.monotonic()
-                urls = await filter_urls_with_llm(urls, request.crawl_model)
-                llm_duration = time.monotonic() - llm_start
+                if request.stream_llm_filter:
+                    # Accepted URLs are scraped while later batches are still
+                    # being filtered; the final order is applied at index time.
+                    url_stream = asyncio.Queue()
+                    filter_task = asyncio.create_task(
+                        _stream_llm_filter(
+                            job, urls, request.crawl_model, url_stream, _on_filter_batch
+                        )
+                    )
+                    urls = []
+                else:
+                    classified = ClassifierReport()
+                    urls = await filter_urls_with_llm(
+                        urls,
+                        request.crawl_model,
+                        on_batch=_on_filter_batch,
+                        classifier=_classifier_for(job),
+                        classifier_report=classified,
+                    )
+                    llm_duration = time.monotonic() - llm_start
+                    await _log_classifier_decisions(job, classified)
             else:
                 llm_duration = 0.0
 
-        if request.crawl_model is not None:
+        if request.crawl_model is not None and filter_task is None:
             await _log(
                 job,
                 "log",
@@ -339,6 +438,25 @@ async def run_job(
             )
         # end else (full discovery/filtering)
 
+        # Drop URL variants of one page (tracking params, index files) and
+        # learn redirects / rel=canonical as pages are fetched
+        canonicalizer = UrlCanonicalizer() if request.canonical_dedup else None
+        if canonicalizer is not None and urls:
+            before_dedup = len(urls)
+            urls = canonicalizer.dedupe(urls)
+            if len(urls) < before_dedup:
+                await _log(
+                    job,
+                    "log",
+                    {
+                        "phase": "filtering",
+                        "message": (
+                            f"Canonical URLs: {before_dedup} → {len(urls)} "
+                            "(tracking params and index files removed)"
+                        ),
+                    },
+                )
+
         job.pages_total = len(urls)
 
         if job.is_cancelled:
@@ -389,6 +507,11 @@ async def run_job(
                 if job.is_cancelled:
                     return
 
+                if canonicalizer is not None and await _skip_url_variant(
+                    job, url, canonicalizer.claim(url), f"{i + 1}/{len(urls)}"
+                ):
+                    return
+
                 job.current_url = url
                 page_start = time.monotonic()
 
@@ -410,13 +533,16 @@ async def run_job(
                     raw_html: str | None = None  # PR 3.2: kept for structured output
                     fetch_method = "playwright"
                     load_time = 0.0
+                    fetch_info = PageFetchInfo()
 
                     # PR 2.4: check cache before any network call
                     if page_cache is not None:
                         cached_html = page_cache.get(url)
                         if cached_html is not None:
                             markdown = _converter.convert(cached_html)  # PR 3.4
+                            record_stage_counts(_converter, fetch_info)
                             fetch_method = "cache"
+                            fetch_info.canonical = extract_canonical(cached_html, url)
                             load_time = time.monotonic() - page_start
                             await _log(
                                 job,
@@ -427,8 +553,35 @@ async def run_job(
                                 },
                             )
 
+                    # Reuse the page body the recursive crawl already downloaded
+                    if markdown is None and html_handoff is not None:
+                        handed = html_handoff.take(url)
+                        fast_md = (
+                            convert_html_fast(
+                                handed.html, info=fetch_info, converter=_converter
+                            )
+                            if handed
+                            else None
+                        )
+                        if handed and fast_md:
+                            markdown = fast_md
+                            raw_html = handed.html
+                            fetch_method = "discovery"
+                            fetch_info.canonical = extract_canonical(handed.html, url)
+                            async with _counter_lock:
+                                pages_http_fast += 1
+                            load_time = time.monotonic() - page_start
+                            await _log(
+                                job,
+                                "log",
+                                {
+                                    "phase": "scraping",
+                                    "message": f"[{i + 1}/{len(urls)}] [discovery-html] Reused crawled HTML for {url} ({load_time:.2f}s)",
+                                },
+                            )
+
                     # Try native markdown via content negotiation
-                    if request.use_native_markdown:
+                    if markdown is None and request.use_native_markdown:
                         md_content, token_count = await fetch_markdown_native(url)
                         if md_content:
                             markdown = md_content
@@ -470,7 +623,9 @@ async def run_job(
 
                     # HTTP fast-path: try plain HTTP before Playwright (PR 1.3)
                     if markdown is None and request.use_http_fast_path:
-                        fast_md = await fetch_html_fast(url)
+                        fast_md = await fetch_html_fast(
+                            url, info=fetch_info, converter=_converter
+                        )
                         if fast_md:
                             markdown = fast_md
                             fetch_method = "http_fast"
@@ -495,6 +650,7 @@ async def run_job(
                                     pool=page_pool,
                                     content_selectors=request.content_selectors,
                                     noise_selectors=request.noise_selectors,
+                                    info=fetch_info,
                                 )
                                 break
                             except asyncio.CancelledError:
@@ -516,12 +672,28 @@ async def run_job(
                         raw_html = html  # PR 3.2: keep for structured output
                         load_time = time.monotonic() - page_start
                         markdown = _converter.convert(html)  # PR 3.4
+                        record_stage_counts(_converter, fetch_info)
                         async with _counter_lock:
                             pages_playwright += 1
                         # PR 2.4: cache the raw HTML (only if not blocked — checked below)
                         if page_cache is not None:
                             if not is_blocked_response(markdown):
                                 page_cache.put(url, html)
+                    tables_repaired = fetch_info.tables_repaired
+                    math_restored = fetch_info.math_restored
+                    job.tables_rendered += fetch_info.tables_rendered
+                    job.math_restored += math_restored
+
+                    # A redirect or rel=canonical leading to a page already scraped
+                    if canonicalizer is not None and await _skip_url_variant(
+                        job,
+                        url,
+                        canonicalizer.learn(
+                            url, fetch_info.final_url, fetch_info.canonical
+                        ),
+                        f"{i + 1}/{len(urls)}",
+                    ):
+                        return
 
                     # PR 2.3: check for blocked response (bot-check pages)
                     if is_blocked_response(markdown):
@@ -558,7 +730,9 @@ async def run_job(
                         seen_hashes.add(h)
 
                     chunks = chunk_markdown(
-                        markdown, native_token_count=native_token_count
+                        markdown,
+                        native_token_count=native_token_count,
+                        noise_patterns=request.noise_patterns,
                     )
 
                     await _log(
@@ -605,8 +779,17 @@ async def run_job(
                         if job.is_cancelled:
                             break
 
+                        # Profile once; the skip check and cleanup share it (no rescans)
+                        profile = profile_chunk(
+                            chunk,
+                            math_preserved=bool(math_restored)
+                            and has_restored_math(chunk),
+                        )
+                        if tables_repaired and heavy_avoided_by_tables(chunk, profile):
+                            job.heavy_calls_avoided += 1
+
                         # Skip LLM cleanup for already-clean chunks
-                        if not needs_llm_cleanup(chunk):
+                        if not _needs_cleanup(job, url, chunk, profile):
                             cleaned_chunks.append(chunk)
                             if len(chunks) > 1:
                                 await _log(
@@ -621,9 +804,12 @@ async def run_job(
 
                         try:
                             chunk_start = time.monotonic()
-                            cleaned = await cleanup_markdown(chunk, _pipeline_model)
+                            cleaned = await cleanup_markdown(
+                                chunk, _pipeline_model, profile=profile
+                            )
                             chunk_time = time.monotonic() - chunk_start
                             cleaned_chunks.append(cleaned)
+                            _record_cleanup(url, chunk, cleaned, profile)
 
                             if len(chunks) > 1:
                                 await _log(
@@ -730,6 +916,9 @@ async def run_job(
 
                 await asyncio.sleep(delay_s)
 
+        streamed_by = (
+            "discovery finds" if request.stream_discovery else "LLM filtering accepts"
+        )
         # PR 3.3: opt-in pipeline mode (producer/consumer) vs default concurrent scraping
         if request.use_pipeline_mode:
             # Notify UI of scraping phase start (fixes UI stuck on "filtering")
@@ -738,7 +927,11 @@ async def run_job(
                 "phase_change",
                 {
                     "phase": "scraping",
-                    "message": f"Processing {len(urls)} pages (pipeline mode)...",
+                    "message": (
+                        f"Processing pages as {streamed_by} them (pipeline mode)..."
+                        if url_stream is not None
+                        else f"Processing {len(urls)} pages (pipeline mode)..."
+                    ),
                     "progress": f"0/{len(urls)}",
                 },
             )
@@ -765,6 +958,9 @@ async def run_job(
                 failed_urls=failed_urls,
                 delay_s=delay_s,
                 converter=_converter,
+                url_stream=url_stream,
+                html_handoff=html_handoff,
+                canonicalizer=canonicalizer,
             )
         else:
             # Notify UI of scraping phase start before loop (fixes UI stuck on "filtering")
@@ -773,12 +969,27 @@ async def run_job(
                 "phase_change",
                 {
                     "phase": "scraping",
-                    "message": f"Processing {len(urls)} pages...",
+                    "message": (
+                        f"Processing pages as {streamed_by} them..."
+                        if url_stream is not None
+                        else f"Processing {len(urls)} pages..."
+                    ),
                     "progress": f"0/{len(urls)}",
                 },
             )
             # Launch all pages concurrently, semaphore controls actual parallelism
-            await asyncio.gather(*[_process_page(i, url) for i, url in enumerate(urls)])
+            await _gather_streamed(job, urls, url_stream, _process_page)
+
+        if filter_task is not None:
+            if filter_task.done():
+                # Final LLM reading order, used for the index and saved state
+                urls = filter_task.result()
+            else:  # cancelled while filtering
+                filter_task.cancel()
+                await asyncio.gather(filter_task, return_exceptions=True)
+            job.pages_total = len(urls)
+        if html_handoff is not None:
+            html_handoff.clear()
 
         # PR 3.1: save final state checkpoint (completed or paused)
         pending_urls = [
@@ -797,9 +1008,13 @@ async def run_job(
             )
         except Exception as state_err:
             logger.warning(f"Failed to save job state: {state_err}")
+        cleanup_stats.save()
 
         if not job.is_cancelled:
             _generate_index(urls, output_path)
+            redirect_map = (
+                canonicalizer.save_redirect_map(output_path) if canonicalizer else None
+            )
 
             job.status = "completed"
             job.completed_at = time.time()  # PR 1.5
@@ -831,8 +1046,22 @@ async def run_job(
                     "pages_playwright": pages_playwright,
                     "pages_skipped": job.pages_skipped,
                     "pages_blocked": job.pages_blocked,
+                    "tables_rendered": job.tables_rendered,
+                    "heavy_calls_avoided": job.heavy_calls_avoided,
+                    "math_restored": job.math_restored,
+                    "cleanup_learned_skips": job.cleanup_learned_skips,
+                    "cleanup_stats": cleanup_stats.site_summary(
+                        urlparse(base_url).netloc
+                    ),
                     "cache_hits": page_cache.hits if page_cache else 0,
                     "cache_misses": page_cache.misses if page_cache else 0,
+                    "discovery_html_reused": (
+                        html_handoff.served if html_handoff else 0
+                    ),
+                    "url_variants_skipped": (
+                        canonicalizer.skipped if canonicalizer else 0
+                    ),
+                    "redirect_map": str(redirect_map) if redirect_map else None,
                     "output_path": str(output_path),
                     "message": f"Done: {pages_ok} ok, {pages_partial} partial, {pages_failed} failed",
                 },
@@ -854,6 +1083,11 @@ async def run_job(
         except Exception as emit_err:
             logger.error(f"Job {job.id}: failed to emit error event: {emit_err}")
     finally:
+        # Cancelled, or failed while scraping: stop filtering/discovery too
+        if filter_task is not None and not filter_task.done():
+            filter_task.cancel()
+            await asyncio.gather(filter_task, return_exceptions=True)
+
         # Stop browser — catch errors so they don't prevent terminal event
         try:
             await scraper.stop()
@@ -876,6 +1110,55 @@ async def run_job(
                 pass
 
 
+def _needs_cleanup(job: Job, url: str, chunk: str, profile: ChunkProfile) -> bool:
+    """needs_llm_cleanup() with the site's learned skip threshold applied.
+
+    Chunks that would only be skipped because cleanup_stats raised the site's
+    threshold are counted on the job, except for periodic probes that are
+    still cleaned so the site's statistics keep updating.
+    """
+    site = urlparse(url).netloc
+    if needs_llm_cleanup(chunk, profile, cleanup_stats.skip_threshold(site)):
+        return True
+    if not needs_llm_cleanup(chunk, profile):
+        return False
+    if cleanup_stats.should_probe(site):
+        return True
+    job.cleanup_learned_skips += 1
+    return False
+
+
+def _record_cleanup(url: str, chunk: str, cleaned: str, profile: ChunkProfile) -> None:
+    """Feed the input/output edit distance of one cleaned chunk to cleanup_stats."""
+    try:
+        cleanup_stats.record(
+            urlparse(url).netloc,
+            feature_key(chunk, profile),
+            normalized_edit_distance(chunk, cleaned),
+        )
+    except Exception as e:  # statistics must never fail a page
+        logger.debug(f"Could not record cleanup stats for {url}: {e}")
+
+
+async def _skip_url_variant(
+    job: Job, url: str, original: str | None, progress: str
+) -> bool:
+    """Count and log *url* as skipped if it is the same page as *original*."""
+    if original is None:
+        return False
+    job.pages_skipped += 1
+    job.pages_completed += 1
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "scraping",
+            "message": f"[{progress}] ⚡ same page as {original}, skipping {url}",
+        },
+    )
+    return True
+
+
 def _url_to_filepath(url: str, base_url: str, output_path: Path) -> Path:
     """Convert URL to file path, preserving structure."""
     parsed = urlparse(url)
@@ -898,6 +1181,504 @@ def _url_to_filepath(url: str, base_url: str, output_path: Path) -> Path:
     return output_path / f"{path}.md"
 
 
+async def _discover(
+    job: Job,
+    base_url: str,
+    html_handoff: HtmlHandoff | None,
+    on_urls: Callable[[list[str]], None] | None = None,
+    page_pool: PagePool | None = None,
+    alternates: HreflangAlternates | None = None,
+) -> list[str]:
+    """Run the DISCOVERY phase and log its outcome; returns the discovered URLs.
+
+    hreflang groups found along the way are added to *alternates*, if given.
+    """
+    request = job.request
+    phase_start = time.monotonic()
+    await _log(
+        job,
+        "phase_change",
+        {
+            "phase": "discovery",
+            "message": "Crawling site structure...",
+        },
+    )
+
+    discovery = DiscoveryReport()
+    if alternates is not None:
+        discovery.alternates = alternates
+    ticker = asyncio.create_task(_report_crawl_progress(job, discovery))
+    try:
+        urls = await discover_urls(
+            base_url,
+            request.max_depth,
+            request.filter_sitemap_by_path,
+            # Sitemap bodies share the opt-in page cache directory (PR 2.4)
+            sitemap_cache=(
+                PageCache(Path(request.output_path) / ".cache")
+                if request.use_cache
+                else None
+            ),
+            sitemap_early_stop=request.sitemap_early_stop,
+            discovery_cache=(discovery_cache if request.use_discovery_cache else None),
+            report=discovery,
+            html_handoff=html_handoff,
+            on_urls=on_urls,
+            race=request.race_discovery,
+            page_pool=page_pool,
+        )
+    finally:
+        ticker.cancel()
+
+    discovery_time = time.monotonic() - phase_start
+    job.discovered_from_cache = discovery.from_cache
+    message = f"Found {len(urls)} URLs ({discovery_time:.1f}s)"
+    if discovery.from_cache:
+        how = "revalidated" if discovery.revalidated else "fresh"
+        message += (
+            f" — discovered from cache ({discovery.strategy}, "
+            f"{discovery.cache_age / 60:.0f} min old, {how})"
+        )
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "discovery",
+            "message": message,
+            "from_cache": discovery.from_cache,
+        },
+    )
+    if discovery.from_cache and (on_urls is not None or html_handoff is not None):
+        skipped = []
+        if on_urls is not None:
+            skipped.append("stream_discovery gets the cached URLs at once")
+        if html_handoff is not None:
+            skipped.append("reuse_discovery_html has no crawled pages to reuse")
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "discovery",
+                "message": f"Discovery cache hit, nothing crawled: {'; '.join(skipped)}",
+            },
+        )
+    if discovery.strategies:
+        timings = ", ".join(
+            f"{t.name} {t.seconds:.1f}s ({t.outcome}, {t.urls} URLs)"
+            if t.outcome != "skipped"
+            else f"{t.name} skipped"
+            for t in discovery.strategies
+        )
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "discovery",
+                "message": f"Strategies: {timings}",
+                "strategies": [_asdict(t) for t in discovery.strategies],
+            },
+        )
+    traps = discovery.traps
+    if traps.suppressed:
+        top = ", ".join(f"{p} ({n})" for p, n in traps.suppressed.most_common(5))
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "discovery",
+                "message": (
+                    f"Suppressed {traps.total_suppressed} crawler-trap URLs: {top}"
+                ),
+                "suppressed": dict(traps.suppressed),
+            },
+        )
+    if html_handoff is not None and (html_handoff.kept or html_handoff.spilled):
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "discovery",
+                "message": (
+                    f"Keeping {html_handoff.kept} crawled pages for scraping "
+                    f"({html_handoff.memory_bytes / 1e6:.1f} MB in memory, "
+                    f"{html_handoff.spilled} spilled to disk, "
+                    f"{html_handoff.dropped} dropped)"
+                ),
+            },
+        )
+    return urls
+
+
+async def _stream_discovery(
+    job: Job,
+    base_url: str,
+    robots: RobotsParser,
+    html_handoff: HtmlHandoff | None,
+    stream: "asyncio.Queue[list[str] | None]",
+    page_pool: PagePool | None = None,
+) -> list[str]:
+    """Run discovery with filtering on each batch of URLs as it is found.
+
+    Discovered URLs go through filter_urls, hreflang groups, robots.txt and
+    (with a crawl_model) LLM filtering in batches of DISCOVERY_STREAM_BATCH,
+    or whatever is pending once discovery has been idle for
+    DISCOVERY_STREAM_IDLE seconds. Accepted URLs are put on *stream* once
+    each; ``None`` closes it. The recursive crawl reports URLs page by
+    page; sitemap and nav results arrive at once when discovery returns.
+
+    Which version of a versioned tree to keep is only known once the whole
+    tree is, so URLs with a version-like segment are held back until
+    discovery ends (unless doc_version is "all"), then version-filtered and
+    passed on. hreflang groups are applied as far as they are known when a
+    batch is filtered: a URL streamed before the page declaring its group
+    was crawled is kept.
+
+    Returns the final index order: sorted without LLM filtering, the LLM
+    reading order of each batch, batch after batch, with it.
+    """
+    request = job.request
+    found: asyncio.Queue[list[str] | None] = asyncio.Queue()
+    seen: set[str] = set()
+    accepted: list[str] = []
+    pending_llm: list[str] = []
+    held_versions: list[str] = []  # in a version tree: decided at the end
+    counts = {"discovered": 0, "basic": 0, "versions": 0, "hreflang": 0, "robots": 0}
+    classified = ClassifierReport()
+    rules = UrlRules(
+        base_url, request.language, request.include_globs, request.exclude_globs
+    )
+    alternates = HreflangAlternates()
+    hreflang = HreflangReport()
+    hreflang_rules = UrlRules(
+        base_url, "all", request.include_globs, request.exclude_globs
+    )
+
+    async def run_discovery() -> None:
+        try:
+            urls = await _discover(
+                job,
+                base_url,
+                html_handoff,
+                found.put_nowait,
+                page_pool,
+                alternates=alternates,
+            )
+            found.put_nowait(urls)  # sitemap/nav results; crawl URLs already seen
+        finally:
+            found.put_nowait(None)
+
+    async def accept(batch: list[str]) -> None:
+        if batch:
+            accepted.extend(batch)
+            await stream.put(batch)
+
+    async def flush_llm() -> None:
+        batch = pending_llm[:]
+        pending_llm.clear()
+        assert request.crawl_model is not None
+        start = time.monotonic()
+        kept = await filter_urls_with_llm(
+            batch,
+            request.crawl_model,
+            classifier=_classifier_for(job),
+            classifier_report=classified,
+        )
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "filtering",
+                "active_model": request.crawl_model,
+                "message": f"LLM batch: {len(batch)} → {len(kept)} URLs "
+                f"({time.monotonic() - start:.1f}s, streamed into scraping)",
+            },
+        )
+        await accept([u for u in kept if u in seen])
+
+    async def process(fresh: list[str]) -> None:
+        """hreflang, robots.txt and LLM filtering of URLs new to the job."""
+        counts["versions"] += len(fresh)
+        batch = set(fresh)
+        kept: list[str] = []
+        for url in filter_hreflang(
+            fresh, request.language, alternates, hreflang_rules, hreflang
+        ):
+            if url in batch:
+                kept.append(url)
+            elif url not in seen:  # a group's URL standing in for the batch's
+                seen.add(url)
+                kept.append(url)
+        fresh = kept
+        counts["hreflang"] += len(fresh)
+        if request.respect_robots_txt:
+            fresh = [u for u in fresh if robots.is_allowed(u)]
+        counts["robots"] += len(fresh)
+        if request.crawl_model is None:
+            await accept(fresh)
+            return
+        pending_llm.extend(fresh)
+        if len(pending_llm) >= DISCOVERY_STREAM_BATCH:
+            await flush_llm()
+
+    discovery_task = asyncio.create_task(run_discovery())
+    try:
+        while True:
+            try:
+                batch = await asyncio.wait_for(
+                    found.get(), timeout=DISCOVERY_STREAM_IDLE
+                )
+            except asyncio.TimeoutError:
+                if pending_llm:
+                    await flush_llm()
+                continue
+            if batch is None:
+                break
+            counts["discovered"] += len(batch)
+            fresh = [
+                u
+                for u in filter_urls(batch, base_url, request.language, rules)
+                if u not in seen
+            ]
+            seen.update(fresh)
+            counts["basic"] += len(fresh)
+            if request.doc_version != "all":
+                held_versions.extend(u for u in fresh if has_version_segment(u))
+                fresh = [u for u in fresh if not has_version_segment(u)]
+            await process(fresh)
+        await discovery_task  # re-raise discovery errors
+        if held_versions:
+            versions = VersionReport()
+            kept = filter_versions(held_versions, request.doc_version, versions)
+            await _log_version_filtering(job, versions, len(held_versions), len(kept))
+            await process(kept)
+        if pending_llm:
+            await flush_llm()
+    finally:
+        if not discovery_task.done():
+            discovery_task.cancel()
+            await asyncio.gather(discovery_task, return_exceptions=True)
+        await stream.put(None)
+
+    if request.crawl_model is not None:
+        await _log_classifier_decisions(job, classified)
+    await _log_hreflang_filtering(job, hreflang, counts["versions"], counts["hreflang"])
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "filtering",
+            "message": f"Streamed filtering: {counts['discovered']} discovered → "
+            f"{counts['basic']} after basic filters → {counts['versions']} after "
+            f"versions → {counts['hreflang']} after hreflang → {counts['robots']} "
+            f"after robots.txt → {len(accepted)} scraped",
+            "rule_hits": dict(rules.hits),
+        },
+    )
+    await _log_glob_hits(job, rules)
+    return accepted if request.crawl_model is not None else sorted(accepted)
+
+
+async def _log_version_filtering(
+    job: Job, versions: VersionReport, before: int, after: int
+) -> None:
+    """Log which version filter_versions kept per tree, if it dropped any URL."""
+    if not versions.dropped:
+        return
+    kept = ", ".join(f"{v} in {t}" for t, v in versions.kept.items())
+    dropped = ", ".join(f"{v} ({n})" for v, n in versions.dropped.items())
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "filtering",
+            "message": (
+                f"Version filtering: {before} → {after} URLs, "
+                f"kept {kept}; dropped {dropped}"
+            ),
+            "versions_dropped": versions.dropped,
+        },
+    )
+
+
+async def _log_hreflang_filtering(
+    job: Job, hreflang: HreflangReport, before: int, after: int
+) -> None:
+    """Log the other-language URLs filter_hreflang dropped, if any."""
+    if not hreflang.dropped:
+        return
+    language = job.request.language
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "filtering",
+            "message": (
+                f"hreflang filtering: {before} → {after} URLs "
+                f"({hreflang.groups} alternate groups, kept "
+                f"'{language}', dropped {hreflang.dropped} "
+                f"other-language URLs)"
+            ),
+            "hreflang_dropped": hreflang.dropped,
+        },
+    )
+
+
+async def _log_glob_hits(job: Job, rules: UrlRules) -> None:
+    """Log how many URLs each include/exclude glob of the job matched."""
+    if not rules.include and not rules.exclude:
+        return
+    counts = [f"exclude {g} ({rules.hits[f'exclude {g}']})" for g in rules.exclude]
+    counts += [f"include {g} ({rules.hits[f'include {g}']})" for g in rules.include]
+    if rules.include:
+        counts.append(f"matched no include ({rules.hits['include']})")
+    await _log(
+        job,
+        "log",
+        {"phase": "filtering", "message": f"URL globs: {', '.join(counts)}"},
+    )
+
+
+async def _report_crawl_progress(job: Job, discovery: DiscoveryReport) -> None:
+    """Emit live recursive-crawl counters while discovery runs (cancel to stop)."""
+    crawl = discovery.crawl
+    last = 0  # nothing to report until the crawl strategy fetches pages
+    while True:
+        await asyncio.sleep(CRAWL_PROGRESS_INTERVAL)
+        if crawl.fetched == last:
+            continue
+        last = crawl.fetched
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "discovery",
+                "message": (
+                    f"Crawling: {crawl.discovered} URLs found, {crawl.fetched} "
+                    f"pages fetched, {crawl.queued + crawl.in_flight} pending, "
+                    f"depth {crawl.depth}"
+                ),
+                "crawl": _asdict(crawl),
+            },
+        )
+
+
+def _classifier_for(job: Job) -> UrlClassifier | None:
+    """The process-wide URL classifier, unless the job turned it off."""
+    return url_classifier if job.request.use_url_classifier else None
+
+
+async def _log_classifier_decisions(job: Job, report: ClassifierReport) -> None:
+    """Persist the URL classifier and log how many URLs it decided locally."""
+    if not job.request.use_url_classifier:
+        return
+    url_classifier.save()
+    local = report.kept + report.dropped
+    if local:
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "filtering",
+                "message": f"URL classifier decided {local} URLs locally "
+                f"(kept {report.kept}, dropped {report.dropped}); "
+                f"{report.uncertain} sent to LLM",
+            },
+        )
+
+
+async def _stream_llm_filter(
+    job: Job,
+    urls: list[str],
+    model: str,
+    stream: "asyncio.Queue[list[str] | None]",
+    on_batch: Callable[[FilterBatchReport], Awaitable[None]],
+) -> list[str]:
+    """Run LLM filtering, putting accepted URLs on *stream* as batches finish.
+
+    Each accepted URL is put once; ``None`` closes the stream. Returns the
+    final (merged) reading order, or the order URLs were streamed in if
+    filtering fails part-way (they are being scraped already).
+    """
+    start = time.monotonic()
+    sent: set[str] = set()
+    streamed: list[str] = []
+    classified = ClassifierReport()
+
+    async def _accept(batch: list[str]) -> None:
+        fresh = [u for u in batch if u not in sent]
+        sent.update(fresh)
+        streamed.extend(fresh)
+        if fresh:
+            await stream.put(fresh)
+
+    try:
+        result = await filter_urls_with_llm(
+            urls,
+            model,
+            on_batch=on_batch,
+            classifier=_classifier_for(job),
+            on_accept=_accept,
+            classifier_report=classified,
+        )
+        await _accept(result)  # anything the filter did not deliver incrementally
+    except Exception as e:
+        logger.warning(f"[{job.id[:8]}] Streamed LLM filtering failed: {e}")
+        await _log(
+            job,
+            "log",
+            {
+                "phase": "filtering",
+                "active_model": model,
+                "message": f"LLM filtering failed ({e}); keeping the "
+                f"{len(streamed)} URLs accepted so far in streamed order",
+            },
+        )
+        return streamed
+    finally:
+        await stream.put(None)
+
+    await _log_classifier_decisions(job, classified)
+    await _log(
+        job,
+        "log",
+        {
+            "phase": "filtering",
+            "active_model": model,
+            "message": f"LLM result: {len(urls)} → {len(result)} URLs "
+            f"({time.monotonic() - start:.1f}s, streamed into scraping)",
+        },
+    )
+    return result
+
+
+async def _gather_streamed(
+    job: Job,
+    urls: list[str],
+    stream: "asyncio.Queue[list[str] | None] | None",
+    process: Callable[[int, str], Coroutine[Any, Any, None]],
+) -> None:
+    """Run ``process(i, url)`` for every URL in *urls* and every URL streamed in.
+
+    Streamed URLs are appended to *urls* (so progress totals grow with it) and
+    started as they arrive; ``job.pages_total`` follows. Stops reading the
+    stream once it is closed (``None``) or the job is cancelled.
+    """
+    tasks = [asyncio.create_task(process(i, url)) for i, url in enumerate(urls)]
+    if stream is not None:
+        while not job.is_cancelled:
+            try:
+                batch = await asyncio.wait_for(stream.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            if batch is None:
+                break
+            for url in batch:
+                urls.append(url)
+                tasks.append(asyncio.create_task(process(len(urls) - 1, url)))
+            job.pages_total = len(urls)
+    await asyncio.gather(*tasks)
+
+
 def _generate_index(urls: list[str], output_path: Path) -> None:
     """Generate _index.md with table of contents."""
     lines = ["# Documentation Index\n"]
@@ -929,6 +1710,8 @@ class ScrapedPage:
     native_token_count: int | None
     fetch_method: str
     load_time: float
+    tables_repaired: int = 0  # tables the table stage rendered that markdownify breaks
+    math_restored: int = 0  # math expressions restored to TeX by the math stage
 
 
 _PIPELINE_SENTINEL: ScrapedPage | None = None  # signals producer is done
@@ -950,6 +1733,9 @@ async def _run_pipeline_mode(
     failed_urls: list[str],
     delay_s: float,
     converter: "MarkdownConverter",
+    url_stream: "asyncio.Queue[list[str] | None] | None" = None,
+    html_handoff: "HtmlHandoff | None" = None,
+    canonicalizer: UrlCanonicalizer | None = None,
 ) -> tuple[int, int, int, int, int, int, int]:
     """Producer/Consumer pipeline for page fetching + LLM cleanup (PR 3.3).
 
@@ -978,12 +1764,18 @@ async def _run_pipeline_mode(
             await job.wait_if_paused()
             if job.is_cancelled:
                 return
+            progress = f"{i + 1}/{len(urls)}"
+            if canonicalizer is not None and await _skip_url_variant(
+                job, url, canonicalizer.claim(url), progress
+            ):
+                return
             try:
                 page_start = time.monotonic()
                 markdown: str | None = None
                 raw_html: str | None = None
                 fetch_method = "playwright"
                 native_token_count: int | None = None
+                fetch_info = PageFetchInfo()
 
                 # PR 2.4: cache hit
                 if page_cache is not None:
@@ -991,7 +1783,27 @@ async def _run_pipeline_mode(
                     if cached_html:
                         raw_html = cached_html
                         markdown = converter.convert(cached_html)  # PR 3.4
+                        record_stage_counts(converter, fetch_info)
                         fetch_method = "cache"
+                        fetch_info.canonical = extract_canonical(cached_html, url)
+
+                # Page body already downloaded by the recursive crawl
+                if markdown is None and html_handoff is not None:
+                    handed = html_handoff.take(url)
+                    fast_md = (
+                        convert_html_fast(
+                            handed.html, info=fetch_info, converter=converter
+                        )
+                        if handed
+                        else None
+                    )
+                    if handed and fast_md:
+                        markdown = fast_md
+                        raw_html = handed.html
+                        fetch_method = "discovery"
+                        fetch_info.canonical = extract_canonical(handed.html, url)
+                        async with _counter_lock:
+                            c["http_fast"] += 1
 
                 # Native markdown (Ollama endpoint)
                 if markdown is None and request.use_native_markdown:
@@ -1015,7 +1827,9 @@ async def _run_pipeline_mode(
 
                 # HTTP fast-path (PR 1.3)
                 if markdown is None and request.use_http_fast_path:
-                    fast_md = await fetch_html_fast(url)
+                    fast_md = await fetch_html_fast(
+                        url, info=fetch_info, converter=converter
+                    )
                     if fast_md:
                         markdown = fast_md
                         fetch_method = "http_fast"
@@ -1031,6 +1845,7 @@ async def _run_pipeline_mode(
                                 pool=page_pool,
                                 content_selectors=request.content_selectors,
                                 noise_selectors=request.noise_selectors,
+                                info=fetch_info,
                             )
                             break
                         except asyncio.CancelledError:
@@ -1051,11 +1866,23 @@ async def _run_pipeline_mode(
                                 raise
                     raw_html = html
                     markdown = converter.convert(html)  # PR 3.4
+                    record_stage_counts(converter, fetch_info)
                     async with _counter_lock:
                         c["playwright"] += 1
                     if page_cache is not None and not is_blocked_response(markdown):
                         page_cache.put(url, html)
+                job.tables_rendered += fetch_info.tables_rendered
+                job.math_restored += fetch_info.math_restored
 
+                if canonicalizer is not None and await _skip_url_variant(
+                    job,
+                    url,
+                    canonicalizer.learn(
+                        url, fetch_info.final_url, fetch_info.canonical
+                    ),
+                    progress,
+                ):
+                    return
                 load_time = time.monotonic() - page_start
                 await queue.put(
                     ScrapedPage(
@@ -1066,6 +1893,8 @@ async def _run_pipeline_mode(
                         native_token_count=native_token_count,
                         fetch_method=fetch_method,
                         load_time=load_time,
+                        tables_repaired=fetch_info.tables_repaired,
+                        math_restored=fetch_info.math_restored,
                     )
                 )
             except Exception as e:
@@ -1077,7 +1906,7 @@ async def _run_pipeline_mode(
 
     async def _producer() -> None:
         try:
-            await asyncio.gather(*[_fetch_one(i, url) for i, url in enumerate(urls)])
+            await _gather_streamed(job, urls, url_stream, _fetch_one)
         finally:
             await queue.put(_PIPELINE_SENTINEL)
 
@@ -1137,7 +1966,9 @@ async def _run_pipeline_mode(
                 # (enforced by JobRequest.validate_models_required)
                 _pipeline_model: str = request.pipeline_model or ""
                 chunks = chunk_markdown(
-                    markdown, native_token_count=page.native_token_count
+                    markdown,
+                    native_token_count=page.native_token_count,
+                    noise_patterns=request.noise_patterns,
                 )
                 chunks_failed = 0
                 cleaned_chunks: list[str] = []
@@ -1145,8 +1976,20 @@ async def _run_pipeline_mode(
                     if job.is_cancelled:
                         break
                     try:
-                        if needs_llm_cleanup(chunk):
-                            cleaned = await cleanup_markdown(chunk, _pipeline_model)
+                        profile = profile_chunk(
+                            chunk,
+                            math_preserved=bool(page.math_restored)
+                            and has_restored_math(chunk),
+                        )
+                        if page.tables_repaired and heavy_avoided_by_tables(
+                            chunk, profile
+                        ):
+                            job.heavy_calls_avoided += 1
+                        if _needs_cleanup(job, url, chunk, profile):
+                            cleaned = await cleanup_markdown(
+                                chunk, _pipeline_model, profile=profile
+                            )
+                            _record_cleanup(url, chunk, cleaned, profile)
                         else:
                             cleaned = chunk
                         cleaned_chunks.append(cleaned)
@@ -3,6 +3,7 @@
 import asyncio
 import re
 import logging
+from dataclasses import dataclass, replace
 from typing import Any, Literal
 
 from src.llm.client import generate
@@ -36,6 +37,10 @@ BASE_TIMEOUT = 45  # seconds for small chunks
 TIMEOUT_PER_KB = 10  # extra seconds per KB of content
 MAX_TIMEOUT = 90  # cap
 
+# Noise-free, non-heavy chunks shorter than this skip LLM cleanup. Sites where
+# cleanup is consistently a no-op get a higher per-site value (cleanup_stats).
+SKIP_BELOW_CHARS = 2000
+
 # Noise indicators for needs_llm_cleanup()
 _NOISE_INDICATORS = [
     "cookie",
@@ -84,72 +89,201 @@ def _has_broken_tables(markdown: str) -> bool:
     return len(sep_rows) == 0
 
 
-def _has_latex(markdown: str) -> bool:
-    """Return True if the markdown likely contains LaTeX math expressions.
-
-    Mitigates false positives from price strings like $9.99 by requiring
-    at least one unambiguous LaTeX command match.
-    """
+def _latex_score(markdown: str) -> tuple[int, int]:
+    """Return (number of LaTeX patterns matched, number of price-like strings)."""
     latex_matches = sum(1 for p in _LATEX_PATTERNS if p.search(markdown))
+    if latex_matches == 0:
+        return 0, 0
+    return latex_matches, len(_PRICE_RE.findall(markdown))
+
+
+def _latex_from_score(latex_matches: int, price_matches: int) -> bool:
+    """Apply the $9.99 false-positive rule to a LaTeX score."""
     if latex_matches == 0:
         return False
     # If only dollar-sign matches and they look like prices, skip
-    price_matches = len(_PRICE_RE.findall(markdown))
     if latex_matches == 1 and price_matches > 0:
         return False
     return True
 
 
+def _has_latex(markdown: str) -> bool:
+    """Return True if the markdown likely contains LaTeX math expressions.
+
+    Mitigates false positives from price strings like $9.99 by requiring
+    at least one unambiguous LaTeX command match.
+    """
+    return _latex_from_score(*_latex_score(markdown))
+
+
+def _code_chars(markdown: str) -> int:
+    """Return the number of characters inside fenced code blocks."""
+    return sum(m.end() - m.start() for m in _CODE_BLOCK_RE.finditer(markdown))
+
+
 def _code_density(markdown: str) -> float:
     """Return fraction of the markdown that is inside fenced code blocks."""
     if not markdown:
         return 0.0
-    code_blocks = _CODE_BLOCK_RE.findall(markdown)
-    code_chars = sum(len(b) for b in code_blocks)
-    return code_chars / len(markdown)
+    return _code_chars(markdown) / len(markdown)
 
 
-def classify_chunk(markdown: str) -> CleanupLevel:
+def _tokens_for(length: int, density: float) -> int:
+    """Code-density-adjusted token estimate for a text of the given length."""
+    if density > 0.5:
+        ratio = 3.0
+    elif density > 0.2:
+        ratio = 3.5
+    else:
+        ratio = 4.0
+    return max(1, int(length / ratio))
+
+
+@dataclass(frozen=True)
+class ChunkProfile:
+    """Features of a chunk, computed once and shared by every cleanup heuristic.
+
+    Build it with profile_chunk(). classify_chunk(), _estimate_tokens(),
+    _cleanup_options(), _calculate_timeout() and cleanup_markdown() all accept
+    an optional profile so the runner scans each chunk exactly once instead of
+    re-running the code-fence, noise, table and LaTeX regexes per call.
+    """
+
+    length: int
+    code_chars: int
+    noise_hits: int
+    table_rows: int
+    table_separators: int
+    latex_matches: int
+    price_matches: int
+
+    @property
+    def code_density(self) -> float:
+        return self.code_chars / self.length if self.length else 0.0
+
+    @property
+    def has_noise(self) -> bool:
+        return self.noise_hits > 0
+
+    @property
+    def has_broken_tables(self) -> bool:
+        return self.table_rows >= 2 and self.table_separators == 0
+
+    @property
+    def has_latex(self) -> bool:
+        return _latex_from_score(self.latex_matches, self.price_matches)
+
+    @property
+    def estimated_tokens(self) -> int:
+        return _tokens_for(self.length, self.code_density)
+
+
+def profile_chunk(markdown: str, math_preserved: bool = False) -> ChunkProfile:
+    """Scan a chunk once and return its ChunkProfile.
+
+    Every feature is computed with a single pass of its own compiled
+    pattern (or one substring sweep of the lower-cased text for noise),
+    and the table/LaTeX passes are skipped entirely when the trigger
+    character (``|`` / ``\\`` or ``$``) does not occur in the chunk.
+
+    ``math_preserved`` means the converter restored math from the page's TeX
+    source, so LaTeX in the chunk is already lossless and is not counted as
+    needing repair.
+    """
+    lower = markdown.lower()
+    noise_hits = sum(1 for indicator in _NOISE_INDICATORS if indicator in lower)
+
+    table_rows = table_separators = 0
+    if "|" in markdown:
+        table_rows = len(_TABLE_ROW_RE.findall(markdown))
+        if table_rows >= 2:
+            table_separators = len(_TABLE_SEP_RE.findall(markdown))
+
+    latex_matches = price_matches = 0
+    if not math_preserved and ("\\" in markdown or "$" in markdown):
+        latex_matches, price_matches = _latex_score(markdown)
+
+    return ChunkProfile(
+        length=len(markdown),
+        code_chars=_code_chars(markdown) if "```" in markdown else 0,
+        noise_hits=noise_hits,
+        table_rows=table_rows,
+        table_separators=table_separators,
+        latex_matches=latex_matches,
+        price_matches=price_matches,
+    )
+
+
+def classify_chunk(
+    markdown: str,
+    profile: ChunkProfile | None = None,
+    skip_below: int = SKIP_BELOW_CHARS,
+) -> CleanupLevel:
     """Classify a chunk by the level of LLM cleanup needed.
 
+    Pass a precomputed ``profile`` to avoid rescanning the chunk.
+    ``skip_below`` is the length under which noise-free, non-heavy text is
+    skipped (raised per site by cleanup_stats).
+
     Returns:
         "skip"    — chunk is already clean (mostly code, or short without noise)
         "cleanup" — standard LLM cleanup needed
         "heavy"   — cleanup + table repair + LaTeX fix needed (PR 2.2)
     """
-    lower = markdown.lower()
+    if profile is None:
+        profile = profile_chunk(markdown)
 
     # Check for noise indicators — always needs at least cleanup
-    has_noise = any(indicator in lower for indicator in _NOISE_INDICATORS)
+    has_noise = profile.has_noise
 
     # Mostly-code chunks are clean
-    if _code_density(markdown) > 0.6:
+    if profile.code_density > 0.6:
         return "skip"
 
-    # Short clean text without noise
-    if len(markdown) < 2000 and not has_noise:
+    # Short clean text without noise (a raised skip_below never hides heavy chunks)
+    if profile.length < min(skip_below, SKIP_BELOW_CHARS) and not has_noise:
         return "skip"
 
     # Heavy cleanup for complex content
-    if _has_broken_tables(markdown) or _has_latex(markdown):
+    if profile.has_broken_tables or profile.has_latex:
         return "heavy"
 
     if has_noise:
         return "cleanup"
 
-    return "cleanup" if len(markdown) >= 2000 else "skip"
+    return "cleanup" if profile.length >= skip_below else "skip"
+
+
+def heavy_avoided_by_tables(markdown: str, profile: ChunkProfile | None = None) -> bool:
+    """Return True if the chunk is below "heavy" only because its tables are valid.
+
+    Counterfactual used to report heavy-tier calls saved by the deterministic
+    table stage: the same chunk with its separator rows missing (what a broken
+    table looks like) would have been classified "heavy".
+    """
+    if profile is None:
+        profile = profile_chunk(markdown)
+    if profile.table_rows < 2 or profile.table_separators == 0:
+        return False
+    if classify_chunk(markdown, profile) == "heavy":
+        return False
+    return classify_chunk(markdown, replace(profile, table_separators=0)) == "heavy"
 
 
-def needs_llm_cleanup(markdown: str) -> bool:
+def needs_llm_cleanup(
+    markdown: str,
+    profile: ChunkProfile | None = None,
+    skip_below: int = SKIP_BELOW_CHARS,
+) -> bool:
     """Check if a chunk needs LLM cleanup or is already clean.
 
     Backward-compatible wrapper around classify_chunk() (PR 2.2).
     Returns False only for "skip" level.
     """
-    return classify_chunk(markdown) != "skip"
+    return classify_chunk(markdown, profile, skip_below) != "skip"
 
 
-def _estimate_tokens(text: str) -> int:
+def _estimate_tokens(text: str, profile: ChunkProfile | None = None) -> int:
     """Estimate token count using code-density-adjusted char/token ratios (PR 2.5).
 
     Ratios (chars per token):
@@ -159,23 +293,21 @@ def _estimate_tokens(text: str) -> int:
 
     This replaces the flat len(text) // 4 heuristic throughout cleanup and filter.
     """
-    density = _code_density(text)
-    if density > 0.5:
-        ratio = 3.0
-    elif density > 0.2:
-        ratio = 3.5
-    else:
-        ratio = 4.0
-    return max(1, int(len(text) / ratio))
+    if profile is not None:
+        return profile.estimated_tokens
+    return _tokens_for(len(text), _code_density(text))
 
 
-def _cleanup_options(markdown: str) -> dict[str, Any]:
+def _cleanup_options(
+    markdown: str, profile: ChunkProfile | None = None
+) -> dict[str, Any]:
     """Calculate Ollama options optimized for cleanup tasks.
 
     num_ctx is sized to the actual content so Ollama never silently truncates
     the input — closes CONS-011 / issue #57.
     """
-    estimated_input_tokens = _estimate_tokens(markdown)  # PR 2.5: adaptive ratio
+    # PR 2.5: adaptive ratio
+    estimated_input_tokens = _estimate_tokens(markdown, profile)
     # Reserve ~512 tokens for system prompt + cleanup prompt overhead
     num_ctx = max(2048, estimated_input_tokens + 1024)
     return {
@@ -186,30 +318,35 @@ def _cleanup_options(markdown: str) -> dict[str, Any]:
     }
 
 
-def _calculate_timeout(content: str) -> int:
+def _calculate_timeout(content: str, profile: ChunkProfile | None = None) -> int:
     """Calculate dynamic timeout based on chunk size and token estimate (PR 2.5)."""
-    tokens = _estimate_tokens(content)
+    tokens = _estimate_tokens(content, profile)
     timeout = int(BASE_TIMEOUT + (tokens / 250) * 10)
     return min(timeout, MAX_TIMEOUT)
 
 
-async def cleanup_markdown(markdown: str, model: str) -> str:
+async def cleanup_markdown(
+    markdown: str, model: str, profile: ChunkProfile | None = None
+) -> str:
     """Use LLM to clean up markdown content.
 
     Uses dynamic timeout based on chunk size. Retries with backoff.
     Selects standard or heavy prompt based on classify_chunk() (PR 2.2).
+    ``profile`` is the chunk's ChunkProfile if the caller already computed it.
     Raises RuntimeError if all retries are exhausted so the caller can
     handle the failure (e.g. increment pages_partial counter).
     """
     # Wrap content in XML delimiters to isolate scraped data from prompt — closes CONS-006 / issue #58
     wrapped = f"<document>\n{markdown}\n</document>"
-    level = classify_chunk(markdown)
+    if profile is None:
+        profile = profile_chunk(markdown)
+    level = classify_chunk(markdown, profile)
     template = (
         HEAVY_CLEANUP_PROMPT_TEMPLATE if level == "heavy" else CLEANUP_PROMPT_TEMPLATE
     )
     prompt = template.format(markdown=wrapped)
-    timeout = _calculate_timeout(markdown)
-    options = _cleanup_options(markdown)
+    timeout = _calculate_timeout(markdown, profile)
+    options = _cleanup_options(markdown, profile)
 
     for attempt in range(MAX_RETRIES):
         try:
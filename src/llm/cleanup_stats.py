@@ -0,0 +1,247 @@
+"""Cleanup effectiveness feedback: how much does LLM cleanup change a chunk?
+
+Every cleaned chunk records the normalized edit distance between the chunk
+sent to the LLM and the text that came back, aggregated per site (host) and
+per chunk feature (classify_chunk level + the ChunkProfile signals behind
+it). Sites where cleanup is consistently a near no-op get a higher skip
+threshold, so long clean chunks stop paying for an LLM round-trip.
+
+Design decisions:
+- distance is word-level (difflib over whitespace tokens): whitespace-only
+  reflows do not count as changes and the cost stays linear-ish in practice
+- thresholds are only raised for non-heavy chunks; table/LaTeX repair is
+  never skipped on the basis of these stats
+- only the chunks a raised threshold can skip count as evidence for it:
+  noise-free "cleanup" buckets, never noise or heavy ones
+- the highest threshold stays below DEFAULT_CHUNK_SIZE, so a full-size
+  chunk is always cleaned
+- 1 in PROBE_EVERY chunks that are skipped only because of a raised
+  threshold is still cleaned, so a site whose content changes can recover
+- process-wide store; persisted to CLEANUP_STATS_PATH (JSON, atomic write)
+  when that env var is set, in-memory only otherwise
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from src.llm.cleanup import SKIP_BELOW_CHARS, ChunkProfile, classify_chunk
+from src.scraper.markdown import DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+NEAR_NOOP_DISTANCE = 0.02  # <2% of words changed counts as a no-op
+MIN_SAMPLES = 20  # site needs this many cleaned chunks before thresholds move
+MAX_SKIP_THRESHOLD = DEFAULT_CHUNK_SIZE * 3 // 4  # full-size chunks stay cleaned
+# (no-op rate, skip threshold) steps, highest first
+THRESHOLD_STEPS = (
+    (0.97, min(SKIP_BELOW_CHARS * 4, MAX_SKIP_THRESHOLD)),
+    (0.9, min(SKIP_BELOW_CHARS * 2, MAX_SKIP_THRESHOLD)),
+)
+PROBE_EVERY = 10
+
+
+def normalized_edit_distance(before: str, after: str) -> float:
+    """Word-level edit distance between two texts, normalized to [0, 1].
+
+    0.0 means identical token streams, 1.0 means nothing in common.
+    """
+    if before == after:
+        return 0.0
+    a, b = before.split(), after.split()
+    if not a and not b:
+        return 0.0
+    if not a or not b:
+        return 1.0
+    return 1.0 - difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def feature_key(markdown: str, profile: ChunkProfile) -> str:
+    """Bucket a chunk by its classify_chunk level and the signals that drove it.
+
+    Examples: ``cleanup/plain``, ``cleanup/noise``, ``heavy/tables+latex``.
+    """
+    flags = [
+        name
+        for name, present in (
+            ("noise", profile.has_noise),
+            ("tables", profile.has_broken_tables),
+            ("latex", profile.has_latex),
+            ("code", profile.code_density > 0.2),
+        )
+        if present
+    ]
+    return f"{classify_chunk(markdown, profile)}/{'+'.join(flags) or 'plain'}"
+
+
+def _skippable_bucket(feature: str) -> bool:
+    """True for feature_key buckets of chunks a raised skip threshold can skip."""
+    level, _, flags = feature.partition("/")
+    return level == "cleanup" and "noise" not in flags.split("+")
+
+
+@dataclass
+class EditStats:
+    """Running aggregate of edit distances for one site or feature bucket."""
+
+    samples: int = 0
+    total_distance: float = 0.0
+    near_noop: int = 0
+
+    def add(self, distance: float) -> None:
+        self.samples += 1
+        self.total_distance += distance
+        if distance < NEAR_NOOP_DISTANCE:
+            self.near_noop += 1
+
+    @property
+    def mean_distance(self) -> float:
+        return self.total_distance / self.samples if self.samples else 0.0
+
+    @property
+    def noop_rate(self) -> float:
+        return self.near_noop / self.samples if self.samples else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "mean_distance": round(self.mean_distance, 4),
+            "noop_rate": round(self.noop_rate, 4),
+        }
+
+
+@dataclass
+class SiteStats:
+    """Per-site aggregate plus the same data split by feature bucket."""
+
+    overall: EditStats = field(default_factory=EditStats)
+    by_feature: dict[str, EditStats] = field(default_factory=dict)
+    skipped: int = 0  # chunks skipped because of a raised threshold
+    probes: int = 0
+
+
+class CleanupStatsStore:
+    """Process-wide cleanup effectiveness statistics with learned thresholds.
+
+    Args:
+        path: JSON file to load from / save to. None keeps stats in memory.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._sites: dict[str, SiteStats] = {}
+        self._features: dict[str, EditStats] = {}
+        self._skip_counter: dict[str, int] = {}
+        if path is not None:
+            self.load()
+
+    def _site(self, site: str) -> SiteStats:
+        if site not in self._sites:
+            self._sites[site] = SiteStats()
+        return self._sites[site]
+
+    def record(self, site: str, feature: str, distance: float) -> None:
+        """Record one cleaned chunk's edit distance."""
+        stats = self._site(site)
+        stats.overall.add(distance)
+        stats.by_feature.setdefault(feature, EditStats()).add(distance)
+        self._features.setdefault(feature, EditStats()).add(distance)
+
+    def skip_threshold(self, site: str) -> int:
+        """Chunk length below which noise-free, non-heavy chunks skip cleanup."""
+        stats = self._sites.get(site)
+        if stats is None or stats.overall.samples < MIN_SAMPLES:
+            return SKIP_BELOW_CHARS
+        # Noisy and heavy chunks are never skipped, so only the buckets a
+        # raised threshold applies to count as evidence
+        comparable = EditStats()
+        for key, bucket in stats.by_feature.items():
+            if _skippable_bucket(key):
+                comparable.samples += bucket.samples
+                comparable.near_noop += bucket.near_noop
+        if comparable.samples < MIN_SAMPLES:
+            return SKIP_BELOW_CHARS
+        for rate, threshold in THRESHOLD_STEPS:
+            if comparable.noop_rate >= rate:
+                return threshold
+        return SKIP_BELOW_CHARS
+
+    def should_probe(self, site: str) -> bool:
+        """Count a learned skip; True for every PROBE_EVERY-th one (clean anyway)."""
+        count = self._skip_counter.get(site, 0) + 1
+        self._skip_counter[site] = count
+        stats = self._site(site)
+        if count % PROBE_EVERY == 0:
+            stats.probes += 1
+            return True
+        stats.skipped += 1
+        return False
+
+    def site_summary(self, site: str) -> dict:
+        """Stats for one site, including its current skip threshold."""
+        stats = self._sites.get(site) or SiteStats()
+        return {
+            **stats.overall.to_dict(),
+            "skip_threshold": self.skip_threshold(site),
+            "skipped": stats.skipped,
+            "probes": stats.probes,
+            "by_feature": {k: v.to_dict() for k, v in sorted(stats.by_feature.items())},
+        }
+
+    def snapshot(self) -> dict:
+        """All statistics, by site and by feature bucket."""
+        return {
+            "sites": {site: self.site_summary(site) for site in sorted(self._sites)},
+            "features": {k: v.to_dict() for k, v in sorted(self._features.items())},
+        }
+
+    def reset(self) -> None:
+        self._sites.clear()
+        self._features.clear()
+        self._skip_counter.clear()
+
+    def load(self) -> None:
+        """Load persisted stats; a missing or corrupt file starts empty."""
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            for site, raw in data.get("sites", {}).items():
+                self._sites[site] = SiteStats(
+                    overall=EditStats(**raw["overall"]),
+                    by_feature={
+                        k: EditStats(**v) for k, v in raw["by_feature"].items()
+                    },
+                    skipped=raw.get("skipped", 0),
+                    probes=raw.get("probes", 0),
+                )
+            for key, raw in data.get("features", {}).items():
+                self._features[key] = EditStats(**raw)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cleanup stats {self._path}: {e}")
+            self.reset()
+
+    def save(self) -> None:
+        """Persist stats atomically (.tmp → os.replace); no-op without a path."""
+        if self._path is None:
+            return
+        data = {
+            "sites": {site: asdict(stats) for site, stats in self._sites.items()},
+            "features": {k: asdict(v) for k, v in self._features.items()},
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to save cleanup stats to {self._path}: {e}")
+
+
+_stats_path = os.environ.get("CLEANUP_STATS_PATH")
+cleanup_stats = CleanupStatsStore(Path(_stats_path) if _stats_path else None)
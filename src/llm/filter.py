@@ -3,10 +3,15 @@
 import asyncio
 import json
 import logging
-from typing import Any
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
 
 from src.llm.client import generate
 from src.llm.cleanup import _estimate_tokens  # PR 2.5: adaptive token estimate
+from src.llm.url_classifier import ClassifierReport, UrlClassifier
+from src.llm.url_groups import expand_groups, group_urls
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +29,19 @@ URLs:
 Return a JSON array of filtered URLs, ordered by suggested reading order (basics first, advanced later).
 Only return the JSON array, no other text."""
 
+GROUP_PROMPT_TEMPLATE = """Filter these documentation URL groups, keeping only actual documentation pages.
+Each entry is either a single URL or a path prefix ending in "/*" that stands for every page under it,
+followed by its page count and example pages.
+Remove: blog posts, changelogs, release notes, download pages, asset files.
+Keep: guides, tutorials, concepts, reference docs, getting started.
+
+Entries:
+{urls}
+
+Return a JSON array of the entries to keep, each written exactly as the URL or "/*" prefix above
+(without the page count or examples), ordered by suggested reading order (basics first, advanced later).
+Only return the JSON array, no other text."""
+
 
 def _filter_options(urls: list[str]) -> dict[str, Any]:
     """Build Ollama options scaled to the actual URL list size.
@@ -44,20 +62,63 @@ def _filter_options(urls: list[str]) -> dict[str, Any]:
 
 FILTER_MAX_RETRIES = 3
 
+# Batched filtering: one prompt per FILTER_BATCH_SIZE URLs so the reprinted
+# list fits the 4096-token num_predict cap (~20 tokens per URL); at most
+# FILTER_CONCURRENCY batches are in flight at once.
+FILTER_BATCH_SIZE = int(os.environ.get("FILTER_BATCH_SIZE", "150"))
+FILTER_CONCURRENCY = int(os.environ.get("FILTER_CONCURRENCY", "3"))
+# Prefix grouping (url_groups) is used from FILTER_GROUP_MIN_URLS URLs on, and
+# only when it shrinks the prompt to at most FILTER_GROUP_MAX_RATIO entries per URL.
+FILTER_GROUP_MIN_URLS = int(os.environ.get("FILTER_GROUP_MIN_URLS", "50"))
+FILTER_GROUP_MAX_RATIO = 0.5
+
+
+@dataclass
+class FilterBatchReport:
+    """Outcome and timing of one LLM filtering batch."""
+
+    index: int  # 0-based batch number
+    batches: int  # total batches in this filtering run
+    urls_in: int
+    urls_out: int
+    duration: float  # seconds, including retries and backoff
+    attempts: int
+    fell_back: bool  # all attempts failed; batch kept unfiltered
+    unit: str = "URLs"  # what urls_in/urls_out count ("entries" when prefix-grouped)
+
+
+def _parse_filter_response(response: str) -> Any:
+    """Decode the model's JSON answer, stripping a markdown code fence."""
+    response = response.strip()
+    if response.startswith("```"):
+        lines = response.split("\n")
+        response = "\n".join(lines[1:-1])
+    return json.loads(response)
 
-async def filter_urls_with_llm(urls: list[str], model: str) -> list[str]:
-    """
-    Use LLM to filter and order documentation URLs.
 
-    Retries up to FILTER_MAX_RETRIES times with exponential backoff.
-    Falls back to original list if all retries fail.
+async def _filter_batch(
+    urls: list[str],
+    model: str,
+    index: int,
+    batches: int,
+    lines: list[str] | None = None,
+    template: str = FILTER_PROMPT_TEMPLATE,
+    unit: str = "URLs",
+) -> tuple[list[str], FilterBatchReport]:
+    """Filter one batch, retrying with exponential backoff.
+
+    *urls* are the keys the model may return; *lines* (one per key) are what
+    the prompt shows, defaulting to the keys themselves. Falls back to the
+    batch itself if every attempt fails, so one bad batch never drops URLs
+    from the others.
     """
-    if not urls:
-        return urls
+    start = time.monotonic()
+    allowed = set(urls)
+    shown = lines or urls
 
     # Wrap URLs in XML delimiters to isolate user content from prompt — closes CONS-006 / issue #58
-    urls_block = "<urls>\n" + "\n".join(urls) + "\n</urls>"
-    prompt = FILTER_PROMPT_TEMPLATE.format(urls=urls_block)
+    urls_block = "<urls>\n" + "\n".join(shown) + "\n</urls>"
+    prompt = template.format(urls=urls_block)
 
     for attempt in range(FILTER_MAX_RETRIES):
         try:
@@ -65,33 +126,256 @@ async def filter_urls_with_llm(urls: list[str], model: str) -> list[str]:
                 model,
                 prompt,
                 system=FILTER_SYSTEM_PROMPT,
-                options=_filter_options(urls),
+                options=_filter_options(shown),
             )
 
-            # Try to parse JSON from response
-            # Handle potential markdown code blocks
-            response = response.strip()
-            if response.startswith("```"):
-                lines = response.split("\n")
-                response = "\n".join(lines[1:-1])
-
-            filtered = json.loads(response)
+            filtered = _parse_filter_response(response)
             if isinstance(filtered, list):
-                # Validate all items are from original list
-                valid = [url for url in filtered if url in urls]
-                logger.info(f"LLM filtered {len(urls)} URLs to {len(valid)}")
-                return valid
+                # Keep only URLs from this batch, first occurrence wins
+                valid: list[str] = []
+                seen: set[str] = set()
+                for url in filtered:
+                    if isinstance(url, str) and f"{url}*" in allowed:
+                        url = f"{url}*"  # prefix echoed without its wildcard
+                    if isinstance(url, str) and url in allowed and url not in seen:
+                        seen.add(url)
+                        valid.append(url)
+                report = FilterBatchReport(
+                    index=index,
+                    batches=batches,
+                    urls_in=len(urls),
+                    urls_out=len(valid),
+                    duration=time.monotonic() - start,
+                    attempts=attempt + 1,
+                    fell_back=False,
+                    unit=unit,
+                )
+                return valid, report
 
         except Exception as e:
             if attempt < FILTER_MAX_RETRIES - 1:
                 wait = 2**attempt  # 1s, 2s, 4s
                 logger.warning(
-                    f"LLM filtering attempt {attempt + 1} failed, retrying in {wait}s: {e}"
+                    f"LLM filtering batch {index + 1}/{batches} attempt {attempt + 1} failed, retrying in {wait}s: {e}"
                 )
                 await asyncio.sleep(wait)
             else:
                 logger.warning(
-                    f"LLM filtering failed after {FILTER_MAX_RETRIES} attempts, using original list: {e}"
+                    f"LLM filtering batch {index + 1}/{batches} failed after {FILTER_MAX_RETRIES} attempts, using original list: {e}"
                 )
 
-    return urls
+    report = FilterBatchReport(
+        index=index,
+        batches=batches,
+        urls_in=len(urls),
+        urls_out=len(urls),
+        duration=time.monotonic() - start,
+        attempts=FILTER_MAX_RETRIES,
+        fell_back=True,
+        unit=unit,
+    )
+    return list(urls), report
+
+
+def merge_batch_orders(orders: list[list[str]]) -> list[str]:
+    """Merge per-batch reading orders into one global order.
+
+    Each URL is placed by its relative position within its own batch, so the
+    "basics first" head of every batch comes before any batch's advanced tail.
+    Order within a batch is preserved; ties go to the earlier batch.
+    """
+    ranked: list[tuple[float, int, int, str]] = []
+    for batch_index, order in enumerate(orders):
+        size = len(order)
+        for pos, url in enumerate(order):
+            ranked.append(((pos + 0.5) / size, batch_index, pos, url))
+    ranked.sort()
+    merged: list[str] = []
+    seen: set[str] = set()
+    for _, _, _, url in ranked:
+        if url not in seen:
+            seen.add(url)
+            merged.append(url)
+    return merged
+
+
+async def _filter_in_batches(
+    urls: list[str],
+    model: str,
+    on_batch: Callable[[FilterBatchReport], Awaitable[None]] | None,
+    batch_size: int | None,
+    concurrency: int | None,
+    lines: dict[str, str] | None = None,
+    template: str = FILTER_PROMPT_TEMPLATE,
+    unit: str = "URLs",
+    on_accept: Callable[[list[str]], Awaitable[None]] | None = None,
+) -> tuple[list[str], list[str], int]:
+    """Filter *urls* in bounded parallel batches.
+
+    Returns (merged order, keys the LLM actually decided, batch count); keys
+    of batches that fell back are not in the decided list.
+    """
+    size = max(1, batch_size or FILTER_BATCH_SIZE)
+    batches = [urls[i : i + size] for i in range(0, len(urls), size)]
+    semaphore = asyncio.Semaphore(max(1, concurrency or FILTER_CONCURRENCY))
+
+    decided: list[str] = []
+
+    async def run(index: int, batch: list[str]) -> list[str]:
+        shown = [lines[key] for key in batch] if lines else None
+        async with semaphore:
+            kept, report = await _filter_batch(
+                batch, model, index, len(batches), shown, template, unit
+            )
+        logger.info(
+            f"LLM filter batch {index + 1}/{len(batches)}: "
+            f"{report.urls_in} → {report.urls_out} {unit} in {report.duration:.1f}s"
+            + (" (fallback)" if report.fell_back else "")
+        )
+        if not report.fell_back:
+            decided.extend(batch)
+        if on_batch is not None:
+            await on_batch(report)
+        if on_accept is not None and kept:
+            await on_accept(kept)
+        return kept
+
+    orders = await asyncio.gather(*(run(i, b) for i, b in enumerate(batches)))
+    return merge_batch_orders(list(orders)), decided, len(batches)
+
+
+async def filter_urls_with_llm(
+    urls: list[str],
+    model: str,
+    on_batch: Callable[[FilterBatchReport], Awaitable[None]] | None = None,
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    group_prefixes: bool = True,
+    classifier: UrlClassifier | None = None,
+    on_accept: Callable[[list[str]], Awaitable[None]] | None = None,
+    classifier_report: ClassifierReport | None = None,
+) -> list[str]:
+    """
+    Use LLM to filter and order documentation URLs.
+
+    With a ``classifier``, URLs it classifies confidently are kept or dropped
+    locally and only the uncertain rest goes to the LLM; the LLM's decisions
+    are then learned. Locally kept URLs are merged into the LLM's reading
+    order by relative position (see merge_batch_orders).
+
+    From FILTER_GROUP_MIN_URLS URLs on, sibling paths are collapsed into
+    prefix groups (see url_groups) and the LLM classifies the groups; the
+    decisions are expanded back to URLs, keeping discovery order inside each
+    group. Sites that do not compress (flat URL spaces) are filtered URL by
+    URL.
+
+    Either way the entries are split into batches of ``batch_size``
+    (FILTER_BATCH_SIZE), filtered with at most ``concurrency``
+    (FILTER_CONCURRENCY) prompts in flight, and the per-batch orders are
+    merged into one global order. Each batch retries up to
+    FILTER_MAX_RETRIES times with exponential backoff and falls back to its
+    own entries if all retries fail.
+
+    Args:
+        urls: Candidate URLs, in discovery order.
+        model: Model used for filtering.
+        on_batch: Awaited with a FilterBatchReport as each batch finishes.
+        batch_size: Override FILTER_BATCH_SIZE.
+        concurrency: Override FILTER_CONCURRENCY.
+        group_prefixes: Allow prefix grouping for large lists.
+        classifier: Local classifier to consult first and train afterwards.
+        on_accept: Awaited with newly accepted URLs as soon as they are known
+            (locally kept URLs first, then each batch's keeps), so callers can
+            start scraping before the final order is available. Every URL of
+            the returned list is delivered exactly once.
+        classifier_report: Incremented with the classifier's local decisions
+            (per call, so concurrent jobs do not see each other's counts).
+    """
+    if not urls:
+        return urls
+
+    if classifier is None:
+        merged, _ = await _filter_with_llm(
+            urls, model, on_batch, batch_size, concurrency, group_prefixes, on_accept
+        )
+        return merged
+
+    split = classifier.partition(urls)
+    if classifier_report is not None:
+        classifier_report.add(split)
+    logger.info(
+        f"URL classifier: kept {len(split.keep)}, dropped {len(split.drop)} locally, "
+        f"{len(split.uncertain)} uncertain"
+    )
+    if on_accept is not None and split.keep:
+        await on_accept(split.keep)
+    if not split.uncertain:
+        return split.keep
+
+    merged, decided = await _filter_with_llm(
+        split.uncertain,
+        model,
+        on_batch,
+        batch_size,
+        concurrency,
+        group_prefixes,
+        on_accept,
+    )
+    classifier.learn_many(decided, set(merged))
+    if not split.keep:
+        return merged
+    return merge_batch_orders([merged, split.keep])
+
+
+async def _filter_with_llm(
+    urls: list[str],
+    model: str,
+    on_batch: Callable[[FilterBatchReport], Awaitable[None]] | None,
+    batch_size: int | None,
+    concurrency: int | None,
+    group_prefixes: bool,
+    on_accept: Callable[[list[str]], Awaitable[None]] | None = None,
+) -> tuple[list[str], list[str]]:
+    """LLM filtering for filter_urls_with_llm; returns (kept URLs, decided URLs)."""
+    start = time.monotonic()
+    if group_prefixes and len(urls) >= FILTER_GROUP_MIN_URLS:
+        groups = group_urls(urls)
+        if len(groups) <= len(urls) * FILTER_GROUP_MAX_RATIO:
+            accept_groups = None
+            if on_accept is not None:
+                deliver = on_accept
+
+                async def accept_groups(keys: list[str]) -> None:
+                    await deliver(expand_groups(keys, groups))
+
+            prefix_count = sum(1 for g in groups if g.is_prefix)
+            logger.info(
+                f"Grouped {len(urls)} URLs into {prefix_count} prefix groups "
+                f"+ {len(groups) - prefix_count} single URLs"
+            )
+            keys, decided, batches = await _filter_in_batches(
+                [g.key for g in groups],
+                model,
+                on_batch,
+                batch_size,
+                concurrency,
+                lines={g.key: g.describe() for g in groups},
+                template=GROUP_PROMPT_TEMPLATE,
+                unit="entries",
+                on_accept=accept_groups,
+            )
+            merged = expand_groups(keys, groups)
+            logger.info(
+                f"LLM filtered {len(urls)} URLs to {len(merged)} via "
+                f"{len(groups)} groups ({batches} batches, {time.monotonic() - start:.1f}s)"
+            )
+            return merged, expand_groups(decided, groups)
+
+    merged, decided, batches = await _filter_in_batches(
+        urls, model, on_batch, batch_size, concurrency, on_accept=on_accept
+    )
+    logger.info(
+        f"LLM filtered {len(urls)} URLs to {len(merged)} "
+        f"({batches} batches, {time.monotonic() - start:.1f}s)"
+    )
+    return merged, decided
@@ -0,0 +1,209 @@
+"""Local URL keep/drop classifier trained from LLM filtering decisions.
+
+Every job pays for a full LLM filtering pass, yet the decisions are highly
+predictable from path tokens (``/blog/``, ``/changelog/``, ``/docs/guide/``)
+and repeat across jobs for the same site or doc platform. ``UrlClassifier``
+is a naive Bayes model over hashed path-token features, trained
+incrementally on the URLs the LLM actually decided:
+
+- confidently classified URLs are decided locally (no tokens, microseconds)
+- only the uncertain rest is sent to the LLM, whose answers are learned
+- 1 in PROBE_EVERY confident URLs is still sent to the LLM, so the model
+  keeps getting labels from outside its own predictions
+- nothing is decided locally before MIN_TRAINING_URLS labelled URLs, or for
+  URLs with fewer than MIN_KNOWN_FEATURES features seen in training
+
+Features are hashed with crc32 (stable across processes) into N_FEATURES
+buckets, so the model size is bounded regardless of how many sites it sees.
+Process-wide; persisted to URL_CLASSIFIER_PATH (JSON, atomic write) when
+that env var is set, in-memory only otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 1 << 20
+KEEP_ABOVE = 0.98  # posterior P(keep) at or above which a URL is kept locally
+DROP_BELOW = 0.02  # posterior P(keep) at or below which a URL is dropped locally
+MIN_TRAINING_URLS = 200
+MIN_KNOWN_FEATURES = 2
+PROBE_EVERY = 20
+_ALPHA = 1.0  # Laplace smoothing
+
+_WORD_RE = re.compile(r"[a-z]+|\d+")
+_VERSION_RE = re.compile(r"^v?\d+(\.\d+)*$")
+
+
+def url_features(url: str) -> list[int]:
+    """Hashed path-token features for *url*.
+
+    Tokens: host, each segment with and without its depth, words inside
+    segments, adjacent-segment bigrams, the file extension and the depth.
+    Version-like segments (``v2``, ``1.4.0``) are normalised to one token.
+    """
+    parts = urlsplit(url.lower())
+    segments = [s for s in parts.path.split("/") if s]
+    tokens = [f"host:{parts.netloc}", f"depth:{min(len(segments), 6)}"]
+    previous = "^"
+    for depth, segment in enumerate(segments):
+        if _VERSION_RE.match(segment):
+            segment = "<version>"
+        tokens.append(f"seg:{segment}")
+        tokens.append(f"seg{min(depth, 4)}:{segment}")
+        tokens.append(f"pair:{previous}/{segment}")
+        tokens.extend(f"word:{w}" for w in _WORD_RE.findall(segment))
+        previous = segment
+    if segments and "." in segments[-1]:
+        tokens.append(f"ext:{segments[-1].rsplit('.', 1)[1]}")
+    if parts.query:
+        tokens.append("has:query")
+    return sorted({zlib.crc32(t.encode()) % N_FEATURES for t in tokens})
+
+
+@dataclass
+class Partition:
+    """URLs split by the classifier, each list in input order."""
+
+    keep: list[str]
+    drop: list[str]
+    uncertain: list[str]
+
+
+@dataclass
+class ClassifierReport:
+    """URLs decided by the classifier over one job's partition() calls."""
+
+    kept: int = 0
+    dropped: int = 0
+    uncertain: int = 0
+
+    def add(self, split: Partition) -> None:
+        self.kept += len(split.keep)
+        self.dropped += len(split.drop)
+        self.uncertain += len(split.uncertain)
+
+
+class UrlClassifier:
+    """Incrementally trained naive Bayes keep/drop classifier for URLs.
+
+    Args:
+        path: JSON file to load from / save to. None keeps the model in memory.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        # class (0 = drop, 1 = keep) -> feature bucket -> count
+        self._counts: tuple[dict[int, int], dict[int, int]] = ({}, {})
+        self._totals = [0, 0]  # feature occurrences per class
+        self._docs = [0, 0]  # labelled URLs per class
+        if path is not None:
+            self.load()
+
+    @property
+    def trained_urls(self) -> int:
+        return self._docs[0] + self._docs[1]
+
+    def learn(self, url: str, keep: bool) -> None:
+        """Add one labelled URL to the model."""
+        label = int(keep)
+        counts = self._counts[label]
+        features = url_features(url)
+        for f in features:
+            counts[f] = counts.get(f, 0) + 1
+        self._totals[label] += len(features)
+        self._docs[label] += 1
+
+    def learn_many(self, urls: list[str], kept: set[str]) -> None:
+        for url in urls:
+            self.learn(url, url in kept)
+
+    def predict(self, url: str) -> tuple[float, int]:
+        """Return (P(keep), number of the URL's features seen in training)."""
+        features = url_features(url)
+        known = sum(1 for f in features if f in self._counts[0] or f in self._counts[1])
+        if self._docs[0] == 0 or self._docs[1] == 0:
+            return (1.0 if self._docs[1] else 0.0), known
+        log_odds = math.log(self._docs[1] / self._docs[0])
+        denom0 = self._totals[0] + _ALPHA * N_FEATURES
+        denom1 = self._totals[1] + _ALPHA * N_FEATURES
+        for f in features:
+            p1 = (self._counts[1].get(f, 0) + _ALPHA) / denom1
+            p0 = (self._counts[0].get(f, 0) + _ALPHA) / denom0
+            log_odds += math.log(p1 / p0)
+        log_odds = max(-50.0, min(50.0, log_odds))
+        return 1.0 / (1.0 + math.exp(-log_odds)), known
+
+    def _is_probe(self, url: str) -> bool:
+        return zlib.crc32(url.encode()) % PROBE_EVERY == 0
+
+    def partition(self, urls: list[str]) -> Partition:
+        """Split *urls* into confident keeps, confident drops and uncertain URLs."""
+        result = Partition([], [], [])
+        ready = self.trained_urls >= MIN_TRAINING_URLS and all(self._docs)
+        for url in urls:
+            if not ready or self._is_probe(url):
+                result.uncertain.append(url)
+                continue
+            p_keep, known = self.predict(url)
+            if known < MIN_KNOWN_FEATURES:
+                result.uncertain.append(url)
+            elif p_keep >= KEEP_ABOVE:
+                result.keep.append(url)
+            elif p_keep <= DROP_BELOW:
+                result.drop.append(url)
+            else:
+                result.uncertain.append(url)
+        return result
+
+    def reset(self) -> None:
+        self._counts = ({}, {})
+        self._totals = [0, 0]
+        self._docs = [0, 0]
+
+    def load(self) -> None:
+        """Load a persisted model; a missing or corrupt file starts empty."""
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            self._counts = tuple(  # type: ignore[assignment]
+                {int(k): int(v) for k, v in data["counts"][label].items()}
+                for label in (0, 1)
+            )
+            self._totals = [int(x) for x in data["totals"]]
+            self._docs = [int(x) for x in data["docs"]]
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+            logger.warning(f"Ignoring unreadable URL classifier {self._path}: {e}")
+            self.reset()
+
+    def save(self) -> None:
+        """Persist the model atomically (.tmp → os.replace); no-op without a path."""
+        if self._path is None:
+            return
+        data = {
+            "counts": [self._counts[0], self._counts[1]],
+            "totals": self._totals,
+            "docs": self._docs,
+        }
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning(f"Failed to save URL classifier to {self._path}: {e}")
+
+
+_classifier_path = os.environ.get("URL_CLASSIFIER_PATH")
+url_classifier = UrlClassifier(Path(_classifier_path) if _classifier_path else None)
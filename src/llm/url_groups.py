@@ -0,0 +1,112 @@
+"""URL-tree summarizer: collapse sibling paths into prefix groups.
+
+Documentation sites cluster heavily — ``/docs/api/v2/`` can hold hundreds of
+pages that all get the same keep/drop decision. Instead of listing every URL
+in the filtering prompt, ``group_urls()`` builds prefix groups that the LLM
+classifies as a whole (``https://host/docs/api/v2/*``, with a page count and
+a few sample members), and ``expand_groups()`` maps the decisions back to
+URLs. Prompt size then scales with the site's structure, not its page count.
+
+Grouping rules:
+- a URL's siblings are the pages in the same directory (``/a/b/c`` and
+  ``/a/b/`` both belong to ``/a/``)
+- directories with fewer than ``min_size`` pages are rolled up into their
+  parent, deepest first, but never into the site root
+- whatever is still too small (or sits at the root) is listed as single URLs
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+URL_GROUP_MIN_SIZE = int(os.environ.get("URL_GROUP_MIN_SIZE", "5"))
+GROUP_SAMPLES = 3
+
+
+@dataclass
+class UrlGroup:
+    """A prefix group (``is_prefix``) or a single URL listed on its own."""
+
+    prefix: str  # origin + directory path, or the URL itself for singletons
+    urls: list[str]
+    is_prefix: bool
+
+    @property
+    def key(self) -> str:
+        """The identifier the LLM echoes back to keep this entry."""
+        return f"{self.prefix}*" if self.is_prefix else self.prefix
+
+    def describe(self, samples: int = GROUP_SAMPLES) -> str:
+        """One prompt line: the key, plus page count and sample members."""
+        if not self.is_prefix:
+            return self.prefix
+        # Spread the samples over the group instead of taking the first few
+        step = max(1, len(self.urls) // samples)
+        picked = self.urls[::step][:samples]
+        names = ", ".join(url[len(self.prefix) :] or "/" for url in picked)
+        return f"{self.key} ({len(self.urls)} pages, e.g. {names})"
+
+
+def _directory(url: str) -> tuple[str, int]:
+    """Return (origin + parent directory, directory depth) for *url*."""
+    parts = urlsplit(url)
+    path = (parts.path or "/").rstrip("/")
+    directory = path[: path.rfind("/") + 1] or "/"
+    return f"{parts.scheme}://{parts.netloc}{directory}", directory.count("/") - 1
+
+
+def _parent(prefix: str) -> str:
+    return prefix[: prefix.rstrip("/").rfind("/") + 1]
+
+
+def group_urls(urls: list[str], min_size: int | None = None) -> list[UrlGroup]:
+    """Collapse *urls* into prefix groups and single URLs.
+
+    Groups appear in order of their first member in *urls*, and members keep
+    their original relative order. Duplicate URLs are listed once.
+    """
+    min_size = max(2, min_size or URL_GROUP_MIN_SIZE)
+    position: dict[str, int] = {}
+    for url in urls:
+        position.setdefault(url, len(position))
+
+    members: dict[str, list[str]] = {}
+    depth: dict[str, int] = {}
+    for url in position:
+        prefix, level = _directory(url)
+        members.setdefault(prefix, []).append(url)
+        depth[prefix] = level
+
+    # Roll small directories up one level at a time, deepest first, so a
+    # parent sees all of its rolled-up children before its own size check.
+    for level in range(max(depth.values(), default=0), 1, -1):
+        for prefix in [p for p, d in depth.items() if d == level]:
+            if len(members[prefix]) >= min_size:
+                continue
+            parent = _parent(prefix)
+            members.setdefault(parent, []).extend(members.pop(prefix))
+            depth.pop(prefix)
+            depth.setdefault(parent, level - 1)
+
+    groups: list[UrlGroup] = []
+    for prefix, group_urls_ in members.items():
+        group_urls_.sort(key=position.__getitem__)
+        if depth[prefix] >= 1 and len(group_urls_) >= min_size:
+            groups.append(UrlGroup(prefix, group_urls_, is_prefix=True))
+        else:
+            groups.extend(UrlGroup(url, [url], is_prefix=False) for url in group_urls_)
+    groups.sort(key=lambda g: position[g.urls[0]])
+    return groups
+
+
+def expand_groups(keys: list[str], groups: list[UrlGroup]) -> list[str]:
+    """Expand kept group keys (in the given order) back to their URLs."""
+    by_key = {group.key: group for group in groups}
+    expanded: list[str] = []
+    for key in keys:
+        group = by_key.get(key)
+        if group is not None:
+            expanded.extend(group.urls)
+    return expanded
@@ -1,7 +1,11 @@
 """Per-job page HTML cache with TTL and atomic writes (PR 2.4).
 
 Cache layout: {output_path}/.cache/{url_hash}.json
-Each entry: {"url": str, "html": str, "timestamp": float}
+Each entry: {"url": str, "html": str, "timestamp": float, "etag": str | null}
+
+Binary entries (get_bytes/put_bytes, e.g. raw or gzipped sitemaps) live at
+{url_hash}.bin: one JSON header line {"url": str, "timestamp": float}, then
+the raw bytes.
 
 Design decisions:
 - opt-in via JobRequest.use_cache (default False)
@@ -38,10 +42,10 @@ class PageCache:
         self._misses = 0
         cache_dir.mkdir(parents=True, exist_ok=True)
 
-    def _path(self, url: str) -> Path:
+    def _path(self, url: str, suffix: str = ".json") -> Path:
         """Derive a stable cache file path from the URL."""
         url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
-        return self._dir / f"{url_hash}.json"
+        return self._dir / f"{url_hash}{suffix}"
 
     def get(self, url: str) -> str | None:
         """Return cached HTML for url, or None if cache miss / expired."""
@@ -72,12 +76,14 @@ class PageCache:
             self._misses += 1
             return None
 
-    def put(self, url: str, html: str) -> None:
-        """Store HTML in cache using atomic write (.tmp → rename)."""
+    def put(self, url: str, html: str, etag: str | None = None) -> None:
+        """Store HTML (and its ETag, if known) using atomic write (.tmp → rename)."""
         path = self._path(url)
         tmp_path = path.with_suffix(".tmp")
         try:
-            data = json.dumps({"url": url, "html": html, "timestamp": time.time()})
+            data = json.dumps(
+                {"url": url, "html": html, "timestamp": time.time(), "etag": etag}
+            )
             tmp_path.write_text(data, encoding="utf-8")
             os.replace(tmp_path, path)  # atomic on Windows and POSIX
         except Exception as e:
@@ -87,6 +93,67 @@ class PageCache:
             except Exception:
                 pass
 
+    def etag(self, url: str) -> str | None:
+        """Return the ETag stored with the HTML entry for url, if any.
+
+        Does not check the TTL or count as a hit/miss.
+        """
+        try:
+            data = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        return data.get("etag") if data.get("url") == url else None
+
+    def get_bytes(self, url: str) -> bytes | None:
+        """Return cached raw bytes for url, or None if cache miss / expired.
+
+        Falls back to a text entry stored with put() (UTF-8 encoded), so
+        caches written before binary entries existed stay usable.
+        """
+        path = self._path(url, ".bin")
+        if not path.exists():
+            text = self.get(url)
+            return text.encode("utf-8") if text is not None else None
+
+        try:
+            raw = path.read_bytes()
+            header, sep, body = raw.partition(b"\n")
+            meta = json.loads(header)
+            if not sep:
+                raise ValueError("missing header terminator")
+            ts = float(meta.get("timestamp", 0))
+            if self._ttl > 0 and (time.time() - ts) > self._ttl:
+                path.unlink(missing_ok=True)
+                self._misses += 1
+                return None
+            if meta.get("url") != url:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return body
+        except Exception:
+            try:
+                path.unlink(missing_ok=True)
+            except Exception:
+                pass
+            self._misses += 1
+            return None
+
+    def put_bytes(self, url: str, data: bytes) -> None:
+        """Store raw bytes in cache using atomic write (.tmp → rename)."""
+        path = self._path(url, ".bin")
+        tmp_path = path.with_suffix(".bin.tmp")
+        try:
+            header = json.dumps({"url": url, "timestamp": time.time()})
+            tmp_path.write_bytes(header.encode("utf-8") + b"\n" + data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Cache write failed for {url}: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except Exception:
+                pass
+
     @property
     def hits(self) -> int:
         return self._hits
@@ -0,0 +1,198 @@
+"""Math-preservation stage: rendered KaTeX/MathJax → original TeX source.
+
+Rendered math is a pile of nested spans (or MathML) that converters turn into
+garbled text, which is why math-heavy chunks end up in the heavy LLM tier to
+"fix LaTeX". The original TeX is still in the page:
+
+- KaTeX / MathJax 3 / MathML: ``<annotation encoding="application/x-tex">``
+- MathJax 2: ``<script type="math/tex">`` (``; mode=display`` for blocks)
+- Pages scraped by PageScraper: ``<span class="docrawl-tex">`` markers, which
+  PRESERVE_MATH_JS leaves in place of MathJax 2 scripts before
+  NOISE_SELECTORS removes every ``script`` element
+
+``MathAwareConverter`` wraps any converter. It swaps each math element for a
+placeholder, delegates, then puts the TeX back as ``$...$`` (inline) or
+``$$...$$`` (display) so converters cannot escape ``_``/``*`` inside it.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from bs4 import BeautifulSoup, Tag
+
+if TYPE_CHECKING:
+    from src.scraper.converters import MarkdownConverter
+
+MARKER_CLASS = "docrawl-tex"
+
+# Runs in the browser before noise removal: MathJax 2 keeps its TeX in
+# <script type="math/tex">, which NOISE_SELECTORS deletes. Replace each such
+# script (and the rendered MathJax siblings in front of it) with a marker span.
+PRESERVE_MATH_JS = f"""() => {{
+    let count = 0;
+    document.querySelectorAll('script[type^="math/tex"]').forEach(script => {{
+        let prev = script.previousElementSibling;
+        while (prev && /(^|\\s)MathJax/.test(prev.className || "")) {{
+            const el = prev;
+            prev = prev.previousElementSibling;
+            el.remove();
+        }}
+        const span = document.createElement("span");
+        span.className = "{MARKER_CLASS}";
+        span.dataset.display = script.type.includes("mode=display") ? "true" : "false";
+        span.textContent = script.textContent;
+        script.replaceWith(span);
+        count++;
+    }});
+    return count;
+}}"""
+
+_MATH_HINT_RE = re.compile(r"application/x-tex|math/tex|" + MARKER_CLASS, re.IGNORECASE)
+_PLACEHOLDER = "DOCRAWLMATH{}PLACEHOLDER"
+_RENDERED_WRAPPERS = ("katex-display", "katex", "MathJax_Display", "MathJax")
+# Elements between an annotation and its rendered wrapper
+_PASS_THROUGH_TAGS = ("semantics", "mjx-assistive-mml")
+_PASS_THROUGH_CLASSES = ("katex-mathml",)
+# ``$$...$$`` or ``$...$`` as written by _format (no space inside the
+# delimiters of inline math, so "$5 and $10" does not match)
+_RESTORED_TEX_RE = re.compile(r"\$\$.+?\$\$|\$[^\s$](?:[^$\n]*[^\s$])?\$", re.DOTALL)
+
+
+def _classes(el: Tag) -> list[str]:
+    value = el.get("class")
+    if value is None:
+        return []
+    return value.split() if isinstance(value, str) else list(value)
+
+
+def _rendered_root(annotation: Tag) -> tuple[Tag, bool]:
+    """Return the outermost rendered-math element for a TeX annotation.
+
+    Walks up through ``<math>``, ``mjx-container`` and KaTeX/MathJax wrapper
+    spans so the whole rendering (MathML + visual HTML) is replaced at once.
+    """
+    root: Tag = annotation
+    display = False
+    for parent in annotation.parents:
+        if not isinstance(parent, Tag) or parent.name in ("[document]", "body"):
+            break
+        classes = _classes(parent)
+        if parent.name == "math":
+            display = display or parent.get("display") == "block"
+            root = parent
+        elif parent.name == "mjx-container":
+            display = display or parent.get("display") == "true"
+            root = parent
+        elif any(c in _RENDERED_WRAPPERS for c in classes):
+            display = display or "katex-display" in classes
+            display = display or "MathJax_Display" in classes
+            root = parent
+        elif parent.name in _PASS_THROUGH_TAGS or any(
+            c in _PASS_THROUGH_CLASSES for c in classes
+        ):
+            continue
+        else:
+            break
+    return root, display
+
+
+def _format(tex: str, display: bool, in_table: bool) -> str | None:
+    tex = tex.strip()
+    if not tex:
+        return None
+    if in_table:
+        # Rendered tables are single-line GFM; "|" must be escaped there
+        tex = " ".join(tex.split()).replace("|", "\\|")
+    return f"$${tex}$$" if display else f"${tex}$"
+
+
+def has_restored_math(markdown: str) -> bool:
+    """True if *markdown* contains ``$``-delimited TeX like the restored math."""
+    return "$" in markdown and _RESTORED_TEX_RE.search(markdown) is not None
+
+
+def extract_math(soup: BeautifulSoup) -> list[str]:
+    """Replace math in *soup* with placeholders; return the TeX for each one.
+
+    The i-th returned string is the Markdown for placeholder ``i``.
+    """
+    found: list[tuple[Tag, str, bool]] = []
+
+    for span in soup.find_all("span", class_=MARKER_CLASS):
+        found.append((span, span.get_text(), span.get("data-display") == "true"))
+
+    for script in soup.find_all("script"):
+        script_type = str(script.get("type") or "")
+        if script_type.startswith("math/tex"):
+            found.append((script, script.get_text(), "mode=display" in script_type))
+
+    for annotation in soup.find_all("annotation"):
+        if str(annotation.get("encoding") or "").lower() != "application/x-tex":
+            continue
+        root, display = _rendered_root(annotation)
+        found.append((root, annotation.get_text(), display))
+
+    rendered: list[str] = []
+    for el, tex, display in found:
+        if el.parent is None:  # already replaced as part of an outer element
+            continue
+        in_table = el.find_parent(["td", "th"]) is not None
+        markdown = _format(tex, display, in_table)
+        if markdown is None:
+            el.decompose()
+            continue
+        el.replace_with(_PLACEHOLDER.format(len(rendered)))
+        rendered.append(markdown)
+    return rendered
+
+
+class MathAwareConverter:
+    """Converter stage that restores TeX source for rendered math.
+
+    Implements the MarkdownConverter protocol by wrapping another converter;
+    pages without math markers are passed straight through untouched.
+
+    Counters:
+        math_extracted: expressions restored over the instance's lifetime
+        last_math_extracted: expressions restored by the latest convert()
+    """
+
+    def __init__(self, inner: MarkdownConverter) -> None:
+        self.inner = inner
+        self.math_extracted = 0
+        self.last_math_extracted = 0
+
+    def supports_tables(self) -> bool:
+        return self.inner.supports_tables()
+
+    def supports_code_blocks(self) -> bool:
+        return self.inner.supports_code_blocks()
+
+    def convert(self, html: str) -> str:
+        self.last_math_extracted = 0
+        if not _MATH_HINT_RE.search(html):
+            return self.inner.convert(html)
+
+        soup = BeautifulSoup(html, "html.parser")
+        rendered = extract_math(soup)
+        if not rendered:
+            return self.inner.convert(html)
+
+        # The inner converter runs once: with an LLM backend a second pass
+        # over the original page would repeat the whole conversion
+        output = self.inner.convert(str(soup))
+        restored = 0
+        for i, markdown in enumerate(rendered):
+            token = _PLACEHOLDER.format(i)
+            if token not in output:
+                # Dropped or rewritten by the inner converter (e.g. an LLM
+                # backend): the expression is lost, the output stays as is
+                continue
+            output = output.replace(token, markdown, 1)
+            restored += 1
+
+        self.math_extracted += restored
+        self.last_math_extracted = restored
+        return output
@@ -0,0 +1,296 @@
+"""Deterministic HTML table -> GFM rendering stage for any converter.
+
+Tables are the main source of "heavy" cleanup chunks: rowspan/colspan,
+multi-row ``<thead>`` blocks, pipes inside cells and block content inside
+cells all come out of markdownify (or ReaderLM) as tables whose rows do not
+line up or that lack a separator row, and ``classify_chunk()`` then sends
+the chunk to the LLM with HEAVY_CLEANUP_PROMPT_TEMPLATE to repair it.
+
+``TableAwareConverter`` wraps any registered converter. Before delegating it
+renders every top-level data table into a valid GFM table itself, swaps it
+for a placeholder paragraph, and splices the rendered tables back into the
+inner converter's output. Rendering rules:
+
+- colspan: the value goes in the first column, spanned columns stay empty
+- rowspan: the value is repeated in every spanned row
+- header: merged ``<thead>`` rows, else leading all-``<th>`` rows, else a
+  first row whose cells are all bold; otherwise an empty header row
+- inline markup (links, code, emphasis) is kept; line breaks become ``<br>``
+  and ``|`` is escaped
+- inside ``<li>`` / ``<blockquote>``, every table line gets the indentation
+  or ``> `` prefix markdownify gave the placeholder
+- a placeholder after text on its line becomes a block of its own; one
+  the inner converter drops loses its table, as the page is never
+  converted twice
+
+Layout tables (single cell, nested tables, or ``<pre>`` in a cell) cannot be
+expressed in GFM and are left to the inner converter unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from bs4 import BeautifulSoup, Tag
+from markdownify import markdownify as _md
+
+if TYPE_CHECKING:
+    from src.scraper.converters import MarkdownConverter
+
+_TABLE_OPEN_RE = re.compile(r"<table\b", re.IGNORECASE)
+_WS_RE = re.compile(r"[ \t\r\f\v]+")
+_PLACEHOLDER = "DOCRAWLTABLE{}PLACEHOLDER"
+_MAX_SPAN = 1000  # same clamp markdownify applies to colspan
+# What may precede a placeholder on its line: indentation, blockquote
+# markers and list markers (a table inside <li> / <blockquote>)
+_BLOCK_PREFIX_RE = re.compile(
+    r"(?:[ \t]*(?:>|[*+-](?=[ \t])|\d{1,9}[.)](?=[ \t])))*[ \t]*"
+)
+_LIST_MARKER_RE = re.compile(r"[*+-]|\d{1,9}[.)]")
+
+
+def _span(cell: Tag, attr: str) -> int:
+    value = str(cell.get(attr) or "1").strip()
+    return max(1, min(_MAX_SPAN, int(value))) if value.isdigit() else 1
+
+
+def _own_rows(table: Tag) -> list[Tag]:
+    """Return the <tr> elements of *table*, excluding rows of nested tables."""
+    return [tr for tr in table.find_all("tr") if tr.find_parent("table") is table]
+
+
+def _cells(row: Tag) -> list[Tag]:
+    return row.find_all(["td", "th"], recursive=False)
+
+
+def _is_layout_table(table: Tag, rows: list[Tag]) -> bool:
+    if table.find("table") is not None or table.find("pre") is not None:
+        return True
+    return sum(len(_cells(r)) for r in rows) < 2
+
+
+def _cell_text(cell: Tag) -> str:
+    """Render a cell's content as single-line GFM cell text."""
+    if any(isinstance(child, Tag) for child in cell.children):
+        text = _md(cell.decode_contents(), heading_style="ATX")
+    else:
+        text = cell.get_text()
+    lines = [_WS_RE.sub(" ", line).strip() for line in text.splitlines()]
+    return "<br>".join(line for line in lines if line).replace("|", "\\|")
+
+
+def _is_bold_row(row: Tag) -> bool:
+    cells = _cells(row)
+    if not cells:
+        return False
+    for cell in cells:
+        if not cell.get_text(strip=True):
+            return False
+        strong = cell.find(["b", "strong"])
+        if strong is None or strong.get_text(strip=True) != cell.get_text(strip=True):
+            return False
+    return True
+
+
+def _header_row_count(table: Tag, rows: list[Tag]) -> int:
+    """Return how many leading rows of *rows* form the header."""
+    thead = table.find("thead")
+    if thead is not None and thead.find_parent("table") is table:
+        return sum(1 for r in rows if r.find_parent("thead") is thead)
+    count = 0
+    for row in rows:
+        cells = _cells(row)
+        if not cells or any(c.name != "th" for c in cells):
+            break
+        count += 1
+    if count == 0 and rows and _is_bold_row(rows[0]):
+        count = 1
+    return count
+
+
+def _grid(rows: list[Tag]) -> list[list[str]]:
+    """Lay out *rows* on a rectangular grid, resolving colspan and rowspan."""
+    grid: list[list[str]] = []
+    carry: dict[int, tuple[int, str]] = {}  # column -> (rows remaining, text)
+    for row in rows:
+        out: list[str] = []
+
+        def fill_carried() -> None:
+            while len(out) in carry:
+                remaining, text = carry.pop(len(out))
+                out.append(text)
+                if remaining > 1:
+                    carry[len(out) - 1] = (remaining - 1, text)
+
+        for cell in _cells(row):
+            text = _cell_text(cell)
+            rowspan = _span(cell, "rowspan")
+            for offset in range(_span(cell, "colspan")):
+                # Columns still covered by a rowspan from above are skipped,
+                # as browsers do, before each spanned column is placed.
+                fill_carried()
+                value = text if offset == 0 else ""
+                if rowspan > 1:
+                    carry[len(out)] = (rowspan - 1, value)
+                out.append(value)
+        # Rowspans that cover columns past this row's last explicit cell
+        while carry and max(carry) >= len(out):
+            if len(out) in carry:
+                fill_carried()
+            else:
+                out.append("")
+        grid.append(out)
+    width = max((len(r) for r in grid), default=0)
+    return [r + [""] * (width - len(r)) for r in grid]
+
+
+def _format_row(cells: list[str]) -> str:
+    return "| " + " | ".join(cells) + " |"
+
+
+def render_table(table: Tag) -> str | None:
+    """Render *table* as a GFM table, or None if it is a layout table."""
+    rows = _own_rows(table)
+    if not rows or _is_layout_table(table, rows):
+        return None
+    header_rows = _header_row_count(table, rows)
+    grid = _grid(rows)
+    width = len(grid[0])
+
+    if header_rows:
+        header = []
+        for col in range(width):
+            parts: list[str] = []
+            for row in grid[:header_rows]:
+                if row[col] and row[col] not in parts:
+                    parts.append(row[col])
+            header.append(" ".join(parts))
+    else:
+        header = [""] * width
+
+    lines = [_format_row(header), _format_row(["---"] * width)]
+    lines.extend(_format_row(row) for row in grid[header_rows:])
+
+    caption = table.find("caption")
+    if caption is not None and caption.find_parent("table") is table:
+        title = _cell_text(caption)
+        if title:
+            lines.insert(0, f"**{title}**\n")
+    return "\n".join(lines)
+
+
+def legacy_would_break(table: Tag) -> bool:
+    """Return True if plain markdownify output for *table* would be malformed.
+
+    markdownify misaligns rows under rowspan, drops the separator row for a
+    multi-row ``<thead>``, splits rows on block content inside cells and
+    lets a literal ``|`` add columns — exactly the shapes that reach the
+    heavy cleanup tier.
+    """
+    rows = _own_rows(table)
+    for row in rows:
+        for cell in _cells(row):
+            if _span(cell, "rowspan") > 1 or _span(cell, "colspan") > 1:
+                return True
+            if "|" in cell.get_text():
+                return True
+            if cell.find(["p", "br", "ul", "ol", "div"]) is not None:
+                return True
+    thead = table.find("thead")
+    return thead is not None and len(thead.find_all("tr")) > 1
+
+
+def _splice(output: str, token: str, markdown: str) -> str | None:
+    """Replace *token* with *markdown*, repeating the token's line prefix.
+
+    markdownify indents a placeholder inside ``<li>`` and prefixes it with
+    ``> `` inside ``<blockquote>``; every table line needs the same prefix
+    (list markers turned into spaces) to stay in that block. None if the
+    token is preceded by anything else on its line.
+    """
+    start = output.index(token)
+    line_start = output.rfind("\n", 0, start) + 1
+    prefix = output[line_start:start]
+    if not _BLOCK_PREFIX_RE.fullmatch(prefix):
+        return None
+    continuation = _LIST_MARKER_RE.sub(lambda m: " " * len(m.group()), prefix)
+    body = markdown.replace("\n", "\n" + continuation)
+    return output[:start] + body + output[start + len(token) :]
+
+
+class TableAwareConverter:
+    """Converter stage that renders HTML tables to GFM before delegating.
+
+    Implements the MarkdownConverter protocol by wrapping another converter.
+    Pages without a ``<table>`` are passed straight through untouched.
+
+    Counters (cumulative over the instance's lifetime):
+        tables_rendered:  tables rendered deterministically by this stage
+        tables_repaired:  of those, tables plain markdownify would have broken
+        last_tables_rendered: tables_rendered delta for the latest convert()
+        last_tables_repaired: tables_repaired delta for the latest convert()
+    """
+
+    def __init__(self, inner: MarkdownConverter) -> None:
+        self.inner = inner
+        self.tables_rendered = 0
+        self.tables_repaired = 0
+        self.last_tables_rendered = 0
+        self.last_tables_repaired = 0
+
+    def supports_tables(self) -> bool:
+        return True
+
+    def supports_code_blocks(self) -> bool:
+        return self.inner.supports_code_blocks()
+
+    def convert(self, html: str) -> str:
+        self.last_tables_rendered = self.last_tables_repaired = 0
+        if not _TABLE_OPEN_RE.search(html):
+            return self.inner.convert(html)
+
+        soup = BeautifulSoup(html, "html.parser")
+        rendered: list[tuple[str, bool]] = []  # (markdown, markdownify breaks it)
+        for table in soup.find_all("table"):
+            if table.find_parent("table") is not None:
+                continue
+            markdown = render_table(table)
+            if markdown is None:
+                continue
+            placeholder = soup.new_tag("p")
+            placeholder.string = _PLACEHOLDER.format(len(rendered))
+            rendered.append((markdown, legacy_would_break(table)))
+            table.replace_with(placeholder)
+
+        if not rendered:
+            return self.inner.convert(html)
+
+        # The inner converter runs once: with an LLM backend a second pass
+        # over the original page would repeat the whole conversion
+        output = self.inner.convert(str(soup))
+        placed = repaired = 0
+        for i, (markdown, breaks) in enumerate(rendered):
+            token = _PLACEHOLDER.format(i)
+            if token not in output:
+                # Dropped or rewritten by the inner converter (e.g. an LLM
+                # backend): nowhere to put the table, the output stays as is
+                continue
+            spliced = _splice(output, token, markdown)
+            if spliced is None:
+                # Text before the token on its line: the table gets its own block
+                start = output.index(token)
+                spliced = (
+                    output[:start].rstrip(" ")
+                    + f"\n\n{markdown}\n\n"
+                    + output[start + len(token) :].lstrip(" ")
+                )
+            output = spliced
+            placed += 1
+            repaired += breaks
+
+        self.tables_rendered += placed
+        self.tables_repaired += repaired
+        self.last_tables_rendered = placed
+        self.last_tables_repaired = repaired
+        return output
@@ -2,6 +2,9 @@
 
 import re
 import logging
+from functools import lru_cache
+from typing import Iterable
+
 from markdownify import markdownify as md
 
 logger = logging.getLogger(__name__)
@@ -36,14 +39,100 @@ NOISE_LINE_PATTERNS = [
 ]
 
 
-def _pre_clean_markdown(text: str) -> str:
-    """Remove noise patterns from markdown before chunking."""
-    # Remove lines matching noise patterns
-    lines = text.split("\n")
+# Leading global inline flags, e.g. "(?i)foo" — rewritten as a scoped group
+# so the pattern can be embedded inside a larger alternation.
+_GLOBAL_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def _scoped(pattern: re.Pattern[str] | str) -> str:
+    """Return a pattern's source as a group that keeps its own flags.
+
+    Lets patterns with different flags (e.g. IGNORECASE) share one alternation.
+    """
+    if isinstance(pattern, str):
+        source, flags = pattern, ""
+        m = _GLOBAL_FLAGS_RE.match(source)
+        if m:
+            source, flags = source[m.end() :], m.group(1)
+    else:
+        source = pattern.pattern
+        flags = "i" if pattern.flags & re.IGNORECASE else ""
+    return f"(?{flags}:{source})" if flags else f"(?:{source})"
+
+
+def _foldable(pattern: re.Pattern[str]) -> str | None:
+    """Return an extra pattern's scoped source if it can join the alternation.
+
+    Patterns with groups (and so possibly backreferences) and verbose patterns,
+    whose ``#`` comments would swallow the rest of the alternation, are not.
+    """
+    if pattern.groups or pattern.flags & re.VERBOSE:
+        return None
+    scoped = _scoped(pattern.pattern)
+    try:
+        re.compile(scoped)
+    except re.error:  # e.g. several leading flag groups
+        return None
+    return scoped
+
+
+class NoiseLineMatcher:
+    """Classifies markdown lines as noise with two regex calls per line, plus
+    one per extra pattern that has groups.
+
+    NOISE_LINE_PATTERNS (``match`` semantics) are folded into one anchored
+    alternation tried only at the start of the line; NOISE_PATTERNS (``search``
+    semantics) and per-job extra patterns without groups into one floating
+    alternation. Extra patterns with groups are searched one by one: joined
+    into the alternation, their numbered groups and backreferences would point
+    at another pattern's groups. A line is noise iff the per-pattern loop
+    would have matched.
+    """
+
+    def __init__(self, extra_patterns: Iterable[str] = ()) -> None:
+        floating = [_scoped(p) for p in NOISE_PATTERNS]
+        anchored = [_scoped(p) for p in NOISE_LINE_PATTERNS]
+        separate: list[re.Pattern[str]] = []
+        for source in extra_patterns:
+            compiled = re.compile(source)  # re.error for an invalid pattern
+            scoped = _foldable(compiled)
+            if scoped is None:
+                separate.append(compiled)
+            else:
+                floating.append(scoped)
+        self._anchored = re.compile("|".join(anchored)).match
+        self._floating = re.compile("|".join(floating)).search
+        self._extra = [p.search for p in separate]
+
+    def is_noise(self, line: str) -> bool:
+        """Return True if the line matches any noise pattern."""
+        if self._anchored(line) is not None or self._floating(line) is not None:
+            return True
+        return any(search(line) is not None for search in self._extra)
+
+
+@lru_cache(maxsize=32)
+def get_noise_matcher(extra_patterns: tuple[str, ...] = ()) -> NoiseLineMatcher:
+    """Return a compiled NoiseLineMatcher, cached per set of extra patterns.
+
+    Jobs sharing the same ``noise_patterns`` share one compiled matcher.
+    Raises re.error if an extra pattern is not a valid regex.
+    """
+    return NoiseLineMatcher(extra_patterns)
+
+
+def _pre_clean_markdown(text: str, matcher: NoiseLineMatcher | None = None) -> str:
+    """Remove noise patterns from markdown before chunking.
+
+    Single pass over the lines: CSS/JS block skipping, noise-line removal
+    and collapsing of 3+ consecutive newlines all happen in the same loop.
+    """
+    is_noise = (matcher or get_noise_matcher()).is_noise
     cleaned_lines: list[str] = []
     in_noise_block = False
+    prev_blank = False
 
-    for line in lines:
+    for line in text.split("\n"):
         stripped = line.strip()
 
         # Skip CSS/JS blocks (lines between lone { and })
@@ -56,21 +145,20 @@ def _pre_clean_markdown(text: str) -> str:
             continue
 
         # Skip lines matching noise patterns
-        if any(p.search(line) for p in NOISE_PATTERNS):
+        if is_noise(line):
             continue
 
-        # Skip noise lines
-        if any(p.match(line) for p in NOISE_LINE_PATTERNS):
-            continue
+        # Collapse 3+ consecutive newlines (2+ empty lines) to a single empty line
+        if not line:
+            if prev_blank:
+                continue
+            prev_blank = True
+        else:
+            prev_blank = False
 
         cleaned_lines.append(line)
 
-    result = "\n".join(cleaned_lines)
-
-    # Collapse 3+ consecutive blank lines to 2
-    result = re.sub(r"\n{3,}", "\n\n", result)
-
-    return result.strip()
+    return "\n".join(cleaned_lines).strip()
 
 
 def html_to_markdown(html: str) -> str:
@@ -179,16 +267,17 @@ def chunk_markdown(
     text: str,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
     native_token_count: int | None = None,
+    noise_patterns: list[str] | None = None,
 ) -> list[str]:
     """Split markdown into chunks for LLM processing.
 
-    Pre-cleans markdown, then:
+    Pre-cleans markdown (plus any per-job ``noise_patterns``), then:
     1. Tries heading-based semantic splits (PR 2.1) — natural section boundaries.
     2. Falls back to size-based splitting if fewer than 2 headings are found.
     Skips tiny fragments (< 50 chars).
     """
     # Pre-clean before chunking
-    text = _pre_clean_markdown(text)
+    text = _pre_clean_markdown(text, get_noise_matcher(tuple(noise_patterns or ())))
 
     # If server provided a token count and it fits in one chunk, skip splitting.
     # Rough heuristic: 1 token ≈ 4 chars, so multiply token count by 4 to compare.
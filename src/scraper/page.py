@@ -4,23 +4,72 @@ import asyncio
 import logging
 import httpx
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import AsyncGenerator
 from playwright.async_api import async_playwright, Browser, Page
 
+from src.scraper.converters import MarkdownConverter
+from src.scraper.converters.math_tex import PRESERVE_MATH_JS, MathAwareConverter
+from src.scraper.converters.tables import TableAwareConverter
 from src.utils.security import validate_url_not_ssrf
 
 logger = logging.getLogger(__name__)
 
+# Absolute rel=canonical target of the loaded page, or null
+_CANONICAL_JS = """
+() => {
+    const link = document.querySelector('link[rel~="canonical" i][href]');
+    return link ? link.href : null;
+}
+"""
 
-async def fetch_html_fast(url: str) -> str | None:
+
+@dataclass
+class PageFetchInfo:
+    """Where fetching a page led, filled in by fetch_html_fast / get_html."""
+
+    final_url: str | None = None  # URL after redirects
+    canonical: str | None = None  # absolute <link rel="canonical"> target
+    # Converter stage counts of the page's markdown (record_stage_counts)
+    tables_rendered: int = 0  # tables rendered to GFM by the table stage
+    tables_repaired: int = 0  # of those, tables plain markdownify breaks
+    math_restored: int = 0  # math expressions restored to TeX
+
+
+def record_stage_counts(converter: MarkdownConverter, info: PageFetchInfo) -> None:
+    """Copy the stage counts of *converter*'s latest convert() into *info*.
+
+    Walks the MathAwareConverter → TableAwareConverter chain run_job builds;
+    plain converters count nothing. Call it right after convert(), before any
+    await, since the chain is shared by the job's concurrent pages.
+    """
+    info.tables_rendered = info.tables_repaired = info.math_restored = 0
+    if isinstance(converter, MathAwareConverter):
+        info.math_restored = converter.last_math_extracted
+        converter = converter.inner
+    if isinstance(converter, TableAwareConverter):
+        info.tables_rendered = converter.last_tables_rendered
+        info.tables_repaired = converter.last_tables_repaired
+
+
+async def fetch_html_fast(
+    url: str,
+    info: PageFetchInfo | None = None,
+    converter: MarkdownConverter | None = None,
+) -> str | None:
     """Try to fetch and convert a page to markdown without Playwright (HTTP fast-path).
 
-    Uses httpx for a plain HTTP GET, converts the HTML response with markdownify,
-    and returns the markdown only if it meets a minimum quality threshold (≥500 chars).
+    Uses httpx for a plain HTTP GET, converts the HTML response with markdownify
+    (tables and math via the deterministic converter stages), and returns the markdown
+    only if it meets a minimum quality threshold (≥500 chars).
     Returns None if the page is JS-rendered, too short, or any error occurs.
 
     PR 1.3 — inserting before Playwright in the fallback chain saves
     browser overhead for static or server-rendered documentation sites.
+
+    If *info* is given, it receives the final URL and the rel=canonical
+    target of any HTML response, usable or not, and the converter stage
+    counts of returned markdown. *converter* is passed to convert_html_fast.
     """
     validate_url_not_ssrf(url)
     try:
@@ -35,21 +84,49 @@ async def fetch_html_fast(url: str) -> str | None:
             content_type = resp.headers.get("content-type", "")
             if "text/html" not in content_type:
                 return None
+            if info is not None:
+                from src.crawler.canonical import extract_canonical
 
-            from markdownify import markdownify as md_convert
-
-            markdown = md_convert(
-                resp.text,
-                heading_style="ATX",
-                strip=["script", "style", "nav", "footer"],
-            )
-            if len(markdown) >= 500:
-                return markdown
+                info.final_url = str(resp.url)
+                info.canonical = extract_canonical(resp.text, info.final_url)
+            return convert_html_fast(resp.text, info=info, converter=converter)
     except Exception:
         pass
     return None
 
 
+def convert_html_fast(
+    html: str,
+    info: PageFetchInfo | None = None,
+    converter: MarkdownConverter | None = None,
+) -> str | None:
+    """Convert already-fetched HTML with the HTTP fast-path converter.
+
+    Returns the markdown if it meets the fast-path quality threshold
+    (≥500 chars), None otherwise. Shared by fetch_html_fast and pages handed
+    over from discovery (reuse_discovery_html).
+
+    Args:
+        html: Page HTML
+        info: If given and the markdown is returned, receives its stage counts
+        converter: The job's converter chain (request.converter wrapped in
+                   the table and math stages). Defaults to that chain around
+                   markdownify.
+    """
+    if converter is None:
+        from src.scraper.converters.markdownify_converter import (
+            MarkdownifyConverter,
+        )
+
+        converter = MathAwareConverter(TableAwareConverter(MarkdownifyConverter()))
+    markdown = converter.convert(html)
+    if len(markdown) >= 500:
+        if info is not None:
+            record_stage_counts(converter, info)
+        return markdown
+    return None
+
+
 async def fetch_markdown_native(url: str) -> tuple[str | None, int | None]:
     """Try to get native markdown via Accept: text/markdown content negotiation.
 
@@ -177,6 +254,24 @@ class PageScraper:
             await self._playwright.stop()  # type: ignore[union-attr,attr-defined]
             self._playwright = None
 
+    async def _record_info(self, page: Page, info: PageFetchInfo | None) -> None:
+        """Fill *info* with the loaded page's final URL and canonical target."""
+        if info is None:
+            return
+        info.final_url = page.url
+        info.canonical = await page.evaluate(_CANONICAL_JS)
+
+    async def _preserve_math(self, page: Page) -> None:
+        """Swap MathJax 2 ``<script type="math/tex">`` sources for marker spans.
+
+        Must run before _remove_noise(): NOISE_SELECTORS removes every
+        ``script``, which would lose the TeX. KaTeX/MathJax 3 annotations live
+        in MathML and survive; MathAwareConverter handles all forms later.
+        """
+        preserved = await page.evaluate(PRESERVE_MATH_JS)
+        if preserved:
+            logger.debug(f"Preserved TeX source for {preserved} math scripts")
+
     async def _remove_noise(
         self, page: Page, noise_selectors: list[str] | None = None
     ) -> None:
@@ -251,6 +346,7 @@ class PageScraper:
         pool: "PagePool | None" = None,
         content_selectors: list[str] | None = None,
         noise_selectors: list[str] | None = None,
+        info: PageFetchInfo | None = None,
     ) -> str:
         """Navigate to URL, clean DOM, and extract content HTML.
 
@@ -260,6 +356,7 @@ class PageScraper:
             pool: If provided, borrows a page from the pool instead of creating one (PR 1.2).
             content_selectors: Custom content selectors to try before defaults
             noise_selectors: Custom noise selectors to remove before extraction
+            info: If provided, receives the final URL and rel=canonical target
         """
         if not self._browser and pool is None:
             raise RuntimeError("Browser not started")
@@ -270,6 +367,8 @@ class PageScraper:
         if pool is not None:
             async with pool.acquire() as page:
                 await page.goto(url, timeout=timeout, wait_until="networkidle")
+                await self._record_info(page, info)
+                await self._preserve_math(page)
                 await self._remove_noise(page, noise_selectors)
                 return await self._extract_content(page, content_selectors)
 
@@ -277,6 +376,8 @@ class PageScraper:
         page = await self._browser.new_page()
         try:
             await page.goto(url, timeout=timeout, wait_until="networkidle")
+            await self._record_info(page, info)
+            await self._preserve_math(page)
             await self._remove_noise(page, noise_selectors)
             html = await self._extract_content(page, content_selectors)
             return html
@@ -192,6 +192,11 @@ class TestJobRequestDefaults:
         req = JobRequest(**_minimal_request())
         assert req.respect_robots_txt is True
 
+    def test_use_url_classifier_default(self):
+        """use_url_classifier should default to True."""
+        req = JobRequest(**_minimal_request())
+        assert req.use_url_classifier is True
+
     def test_use_native_markdown_default(self):
         """use_native_markdown should default to True."""
         req = JobRequest(**_minimal_request())
@@ -486,6 +491,81 @@ class TestValidateSelectors:
         assert "too long" in str(exc_info.value)
 
 
+# ---------------------------------------------------------------------------
+# validate_noise_patterns
+# ---------------------------------------------------------------------------
+
+
+class TestValidateNoisePatterns:
+    """Tests for JobRequest.validate_noise_patterns."""
+
+    def test_noise_patterns_none_default(self):
+        """noise_patterns should default to None."""
+        req = JobRequest(**_minimal_request())
+        assert req.noise_patterns is None
+
+    def test_valid_patterns_accepted(self):
+        """Valid regexes (including leading inline flags) are accepted."""
+        req = JobRequest(
+            **_minimal_request(noise_patterns=[r"^Sponsored", "(?i)share this"])
+        )
+        assert req.noise_patterns == [r"^Sponsored", "(?i)share this"]
+
+    def test_invalid_regex_rejected(self):
+        """A pattern that does not compile should be rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            JobRequest(**_minimal_request(noise_patterns=["(unclosed"]))
+        assert "Invalid noise pattern" in str(exc_info.value)
+
+    def test_max_20_items(self):
+        """More than 20 noise patterns should be rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            JobRequest(**_minimal_request(noise_patterns=[f"p{i}" for i in range(21)]))
+        assert "max 20 items" in str(exc_info.value)
+
+    def test_max_200_chars(self):
+        """A pattern longer than 200 chars should be rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            JobRequest(**_minimal_request(noise_patterns=["x" * 201]))
+        assert "too long" in str(exc_info.value)
+
+
+# ---------------------------------------------------------------------------
+# validate_globs
+# ---------------------------------------------------------------------------
+
+
+class TestValidateGlobs:
+    """Tests for JobRequest.validate_globs (include_globs / exclude_globs)."""
+
+    def test_globs_default_none(self):
+        req = JobRequest(**_minimal_request())
+        assert req.include_globs is None
+        assert req.exclude_globs is None
+
+    def test_valid_globs_accepted(self):
+        req = JobRequest(
+            **_minimal_request(
+                include_globs=["/docs/*"], exclude_globs=["https://*/internal/*"]
+            )
+        )
+        assert req.include_globs == ["/docs/*"]
+        assert req.exclude_globs == ["https://*/internal/*"]
+
+    @pytest.mark.parametrize(
+        "globs, message",
+        [
+            ([f"/p{i}/*" for i in range(21)], "max 20 items"),
+            (["/" + "x" * 200], "too long"),
+            ([""], "Empty glob"),
+        ],
+    )
+    def test_invalid_globs_rejected(self, globs, message):
+        with pytest.raises(ValidationError) as exc_info:
+            JobRequest(**_minimal_request(exclude_globs=globs))
+        assert message in str(exc_info.value)
+
+
 # ---------------------------------------------------------------------------
 # validate_selectors — unsafe character rejection (Issue #177)
 # ---------------------------------------------------------------------------
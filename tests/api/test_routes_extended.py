@@ -528,3 +528,24 @@ class TestListModelsWithProvider:
         assert "name" in item
         assert "provider" in item
         assert "is_free" in item
+
+
+# ---------------------------------------------------------------------------
+# GET /api/cleanup/stats
+# ---------------------------------------------------------------------------
+
+
+class TestCleanupStats:
+    """GET /api/cleanup/stats — LLM cleanup effectiveness statistics."""
+
+    def test_returns_sites_and_features(self, client: TestClient):
+        from src.llm.cleanup_stats import cleanup_stats
+
+        cleanup_stats.record("docs.example.com", "cleanup/noise", 0.0)
+        response = client.get("/api/cleanup/stats")
+        assert response.status_code == 200
+        data = response.json()
+        site = data["sites"]["docs.example.com"]
+        assert site["samples"] == 1
+        assert site["by_feature"]["cleanup/noise"]["noop_rate"] == 1.0
+        assert data["features"]["cleanup/noise"]["samples"] == 1
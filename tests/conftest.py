@@ -15,6 +15,46 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def _reset_cleanup_stats():
+    """Cleanup stats are process-wide; keep learned thresholds out of other tests."""
+    from src.llm.cleanup_stats import cleanup_stats
+
+    cleanup_stats.reset()
+    yield
+    cleanup_stats.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_url_classifier():
+    """The URL classifier is process-wide; keep learned decisions out of other tests."""
+    from src.llm.url_classifier import url_classifier
+
+    url_classifier.reset()
+    yield
+    url_classifier.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_discovery_cache():
+    """The discovery cache is process-wide; keep cached URL lists out of other tests."""
+    from src.crawler.discovery_cache import discovery_cache
+
+    discovery_cache.reset()
+    yield
+    discovery_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def _reset_robots_cache():
+    """The robots.txt cache is process-wide; keep parsed hosts out of other tests."""
+    from src.crawler.robots import robots_cache
+
+    robots_cache.reset()
+    yield
+    robots_cache.reset()
+
+
 @pytest.fixture
 def sample_urls():
     """Sample URLs for testing."""
@@ -0,0 +1,121 @@
+"""Unit tests for canonical and redirect-aware URL deduplication.
+
+Tests cover:
+- canonical_url tracking-param and index-file stripping
+- extract_canonical reading <link rel="canonical"> from the head only
+- UrlCanonicalizer pending-list dedup, claims, learned redirects and
+  canonicals, and the redirect map file
+"""
+
+import json
+
+from src.crawler.canonical import (
+    REDIRECT_MAP_FILE,
+    UrlCanonicalizer,
+    canonical_url,
+    extract_canonical,
+)
+
+
+class TestCanonicalUrl:
+    def test_tracking_params_stripped(self):
+        assert (
+            canonical_url(
+                "https://x.com/guide/?utm_source=a&UTM_medium=b&lang=en&gclid=1"
+            )
+            == "https://x.com/guide?lang=en"
+        )
+        assert (
+            canonical_url("https://x.com/guide?utm_source=a") == "https://x.com/guide"
+        )
+
+    def test_index_file_dropped(self):
+        assert canonical_url("https://x.com/guide/index.html") == "https://x.com/guide"
+        assert canonical_url("https://x.com/INDEX.HTM") == "https://x.com/"
+
+    def test_other_urls_unchanged(self):
+        assert canonical_url("https://x.com/a?page=2") == "https://x.com/a?page=2"
+        assert (
+            canonical_url("https://x.com/reindex.html") == "https://x.com/reindex.html"
+        )
+
+
+class TestExtractCanonical:
+    def test_relative_href_resolved(self):
+        html = "<html><head><LINK href='../intro' rel='Canonical'></head><body>"
+        assert (
+            extract_canonical(html, "https://x.com/docs/a/")
+            == "https://x.com/docs/intro"
+        )
+
+    def test_rel_among_several_values(self):
+        html = '<link rel="alternate canonical" href="https://x.com/b">'
+        assert extract_canonical(html, "https://x.com/a") == "https://x.com/b"
+
+    def test_body_links_ignored(self):
+        html = '<head><title>t</title></head><body><link rel="canonical" href="/b">'
+        assert extract_canonical(html, "https://x.com/a") is None
+
+    def test_no_canonical(self):
+        assert (
+            extract_canonical('<link rel="stylesheet" href="/s.css">', "https://x.com/")
+            is None
+        )
+
+
+class TestUrlCanonicalizer:
+    def test_dedupe_keeps_first_variant_in_order(self):
+        canon = UrlCanonicalizer()
+        urls = [
+            "https://x.com/guide",
+            "https://x.com/api",
+            "https://x.com/guide/index.html",
+            "https://x.com/guide?utm_campaign=z",
+        ]
+        assert canon.dedupe(urls) == ["https://x.com/guide", "https://x.com/api"]
+        assert canon.skipped == 2
+
+    def test_redirect_learned_skips_later_alias_before_fetch(self):
+        canon = UrlCanonicalizer()
+        assert canon.claim("https://x.com/old") is None
+        assert canon.learn("https://x.com/old", final_url="https://x.com/new/") is None
+        # /new is the page /old already fetched
+        assert canon.claim("https://x.com/new") == "https://x.com/old"
+        assert canon.redirects == {"https://x.com/old": "https://x.com/new/"}
+
+    def test_fetched_page_resolving_to_claimed_page_is_duplicate(self):
+        canon = UrlCanonicalizer()
+        assert canon.claim("https://x.com/a") is None
+        assert canon.claim("https://x.com/b") is None
+        assert canon.learn("https://x.com/a") is None
+        assert (
+            canon.learn("https://x.com/b", canonical="https://x.com/a")
+            == "https://x.com/a"
+        )
+        assert canon.canonicals == {"https://x.com/b": "https://x.com/a"}
+        assert canon.skipped == 1
+
+    def test_cross_host_canonical_ignored(self):
+        canon = UrlCanonicalizer()
+        canon.learn("https://x.com/a", canonical="https://mirror.org/a")
+        assert canon.canonicals == {}
+        assert canon.claim("https://x.com/a") is None
+
+    def test_self_canonical_and_alias_cycles_are_harmless(self):
+        canon = UrlCanonicalizer()
+        assert canon.learn("https://x.com/a", canonical="https://x.com/a/") is None
+        canon.learn("https://x.com/b", final_url="https://x.com/c")
+        canon.learn("https://x.com/c", canonical="https://x.com/b")
+        assert canon.resolve("https://x.com/b") == canon.resolve("https://x.com/c")
+
+    def test_redirect_map_written_only_when_learned(self, tmp_path):
+        canon = UrlCanonicalizer()
+        assert canon.save_redirect_map(tmp_path) is None
+        canon.learn("https://x.com/old", final_url="https://x.com/new")
+        path = canon.save_redirect_map(tmp_path)
+        assert path == tmp_path / REDIRECT_MAP_FILE
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data == {
+            "redirects": {"https://x.com/old": "https://x.com/new"},
+            "canonicals": {},
+        }
@@ -6,6 +6,7 @@ Tests cover:
 - Sitemap parsing (valid XML, invalid XML, gzipped, nested, 404s)
 - Navigation parsing edge cases
 - Recursive crawl (BFS, deduplication, rate limiting, 404s)
+- Link extraction (<base href>, skipped schemes, bulk normalization)
 - Strategy selection logic
 - Error handling and fallbacks
 """
@@ -14,6 +15,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.crawler.discovery import (
+    extract_links,
     normalize_url,
     discover_urls,
     try_nav_parse,
@@ -211,6 +213,101 @@ class TestRecursiveCrawl:
                     mock_crawl.assert_not_called()
 
 
+class TestExtractLinks:
+    """Test the lxml link extractor used by the recursive crawl."""
+
+    PAGE = "https://example.com/docs/guide/intro"
+
+    def test_relative_links_resolved_normalized_and_deduplicated(self):
+        html = (
+            '<a href="setup/">a</a><a href="setup">b</a><a href="../api#x">c</a>'
+            '<a href="/search?q=1">d</a><a href="HTTPS://EXAMPLE.com/Up">e</a>'
+        )
+        assert extract_links(html, self.PAGE, "example.com") == [
+            "https://example.com/docs/guide/setup",
+            "https://example.com/docs/api",
+            "https://example.com/search?q=1",
+            "https://example.com/Up",
+        ]
+
+    @pytest.mark.parametrize(
+        "href",
+        [
+            "/a/",
+            "/a?b=1#c",
+            "/a?",
+            "/a;p",
+            "/a/;p",
+            "/A/B//",
+            "/a?x=1/",
+            "/a/../b",
+            "/a\tb",
+            "/é",
+            "/",
+        ],
+    )
+    def test_root_relative_shortcut_matches_urljoin_path(self, href):
+        """Plain root-relative hrefs skip urljoin but must normalize the same."""
+        from urllib.parse import urljoin, urlsplit
+
+        parts = urlsplit(urljoin(self.PAGE, href))
+        clean = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        expected = normalize_url(clean + (f"?{parts.query}" if parts.query else ""))
+        html = f'<a href="{href}">x</a>'
+        assert extract_links(html, self.PAGE, "example.com") == [expected]
+
+    def test_base_href_honoured(self):
+        html = (
+            '<html><head><base href="https://example.com/v2/"></head>'
+            '<body><a href="start">s</a></body></html>'
+        )
+        assert extract_links(html, self.PAGE, "example.com") == [
+            "https://example.com/v2/start"
+        ]
+
+    def test_skipped_links(self):
+        html = (
+            '<a href="javascript:void(0)">j</a><a href=" MAILTO:a@b.c">m</a>'
+            '<a href="tel:123">t</a><a href="#top">f</a><a href="">e</a>'
+            '<a href="https://other.com/page">o</a><a href="ftp://example.com/f">x</a>'
+            "<a>no href</a>"
+        )
+        assert extract_links(html, self.PAGE, "example.com") == []
+
+    def test_links_inside_scripts_ignored(self):
+        html = "<script>document.write('<a href=\"/fake\">x</a>')</script>"
+        assert extract_links(html, self.PAGE, "example.com") == []
+
+    def test_empty_and_declared_encoding_documents(self):
+        assert extract_links("", self.PAGE, "example.com") == []
+        html = '<?xml version="1.0" encoding="utf-8"?><html><a href="/ü">u</a></html>'
+        assert extract_links(html, self.PAGE, "example.com") == [
+            "https://example.com/ü"
+        ]
+
+    async def test_large_pages_parsed_off_loop(self):
+        from src.crawler.discovery import _extract_links
+        import asyncio
+
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"content-type": "text/html"}
+        response.text = '<a href="/big">b</a>'
+        client = AsyncMock()
+        client.get = AsyncMock(return_value=response)
+
+        with patch("src.crawler.discovery.LINK_EXTRACT_OFFLOOP_BYTES", 10):
+            with patch(
+                "src.crawler.discovery.asyncio.to_thread",
+                side_effect=asyncio.to_thread,
+            ) as to_thread:
+                links = await _extract_links(
+                    self.PAGE, "example.com", client, asyncio.Semaphore(1), False
+                )
+        assert links == ["https://example.com/big"]
+        to_thread.assert_called_once()
+
+
 class TestStrategySelection:
     """Test discovery strategy selection logic."""
 
@@ -415,7 +512,7 @@ class TestTryNavParseBrowserCleanup:
             page_mock.goto = AsyncMock(side_effect=page_goto_side_effect)
         else:
             page_mock.goto = AsyncMock(return_value=None)
-        page_mock.query_selector_all = AsyncMock(return_value=[])
+        page_mock.evaluate = AsyncMock(return_value=[])
 
         browser_mock = AsyncMock()
         browser_mock.__aenter__ = AsyncMock(return_value=browser_mock)
@@ -573,7 +670,7 @@ class TestSitemapCache:
         with patch("src.crawler.discovery.httpx.AsyncClient", return_value=mock_client):
             await try_sitemap("https://example.com/", sitemap_cache=cache)
 
-        assert cache.get(sitemap_url) is not None
+        assert cache.get_bytes(sitemap_url) == self.SITEMAP_XML.encode("utf-8")
 
     @pytest.mark.asyncio
     async def test_second_call_uses_cache_not_http(self, tmp_path):
@@ -627,25 +724,29 @@ class TestSitemapCache:
         assert sitemap_url in fetched_urls
 
     @pytest.mark.asyncio
-    async def test_gz_sitemap_not_cached(self, tmp_path):
-        """Gzipped sitemaps bypass cache (binary content stored as text is invalid)."""
+    async def test_gz_sitemap_cached_as_bytes(self, tmp_path):
+        """Gzipped sitemaps are cached as raw bytes and reused without HTTP."""
         import gzip as gzip_module
         from src.scraper.cache import PageCache
 
         cache = PageCache(tmp_path / ".cache")
         gz_url = "https://example.com/sitemap.xml.gz"
         gz_content = gzip_module.compress(self.SITEMAP_XML.encode("utf-8"))
+        fetched: list[str] = []
 
         async def fake_get(url, **kwargs):
+            fetched.append(url)
             resp = MagicMock()
-            if url == gz_url:
+            resp.status_code = 404
+            resp.content = b""
+            resp.text = ""
+            if url.endswith("/robots.txt"):
+                resp.status_code = 200
+                resp.text = f"Sitemap: {gz_url}\n"
+            elif url == gz_url:
                 resp.status_code = 200
                 resp.content = gz_content
                 resp.text = gz_content.decode("latin-1")
-            else:
-                resp.status_code = 404
-                resp.content = b""
-                resp.text = ""
             return resp
 
         mock_client = AsyncMock()
@@ -654,7 +755,12 @@ class TestSitemapCache:
         mock_client.__aexit__ = AsyncMock(return_value=None)
 
         with patch("src.crawler.discovery.httpx.AsyncClient", return_value=mock_client):
-            await try_sitemap("https://example.com/", sitemap_cache=cache)
-
-        # .gz URL should NOT be in cache
-        assert cache.get(gz_url) is None
+            first = await try_sitemap("https://example.com/", sitemap_cache=cache)
+            assert gz_url in fetched
+            fetched.clear()
+            second = await try_sitemap("https://example.com/", sitemap_cache=cache)
+
+        # Cached byte-for-byte (text get() cannot represent it) and reused
+        assert cache.get_bytes(gz_url) == gz_content
+        assert gz_url not in fetched
+        assert first == second == ["https://example.com/page1"]
@@ -0,0 +1,321 @@
+"""Unit tests for the cross-job discovery cache.
+
+Tests cover:
+- DiscoveryCache storage, TTL, eviction and persistence
+- discover_urls serving fresh entries without any discovery
+- Expired sitemap results revalidated with ETag / Last-Modified
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.crawler.discovery import (
+    DiscoveryReport,
+    SitemapReport,
+    discover_urls,
+    try_sitemap,
+)
+from src.crawler.discovery_cache import (
+    DiscoveryCache,
+    DiscoveryEntry,
+    SitemapValidators,
+)
+
+BASE = "https://example.com/docs/"
+URLS = ["https://example.com/docs/a", "https://example.com/docs/b"]
+
+
+def _sitemap_with_validators(urls=URLS, etag='"v1"'):
+    """try_sitemap stand-in that reports one sitemap read with an ETag."""
+
+    async def fake(base_url, filter_by_path, cache, report=None, **kwargs):
+        if report is not None:
+            report.append(
+                SitemapReport(url="https://example.com/sitemap.xml", etag=etag)
+            )
+        return list(urls)
+
+    return AsyncMock(side_effect=fake)
+
+
+def _revalidation_client(status: int, log: list):
+    async def fake_get(url, headers=None, **kwargs):
+        log.append((url, headers or {}))
+        return MagicMock(status_code=status)
+
+    client = AsyncMock()
+    client.get = fake_get
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    return client
+
+
+class TestDiscoveryCacheStore:
+    def test_key_covers_url_depth_path_filter_and_early_stop(self):
+        keys = {
+            DiscoveryCache.key(BASE, 5, True),
+            DiscoveryCache.key(BASE, 3, True),
+            DiscoveryCache.key(BASE, 5, False),
+            DiscoveryCache.key(BASE, 5, True, sitemap_early_stop=True),
+        }
+        assert len(keys) == 4
+
+    def test_fresh_until_ttl(self):
+        cache = DiscoveryCache(ttl=60)
+        cache.put("k", DiscoveryEntry(URLS, "sitemap"))
+        entry = cache.get("k")
+        assert entry is not None and cache.is_fresh(entry)
+
+        entry.timestamp = time.time() - 120
+        assert not cache.is_fresh(entry)
+        cache.renew("k")
+        assert cache.is_fresh(entry)
+
+    def test_oldest_entry_evicted(self):
+        cache = DiscoveryCache()
+        with patch("src.crawler.discovery_cache.MAX_ENTRIES", 2):
+            for i in range(3):
+                cache.put(f"k{i}", DiscoveryEntry(URLS, "nav", timestamp=1000.0 + i))
+        assert cache.get("k0") is None
+        assert cache.get("k2") is not None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "discovery.json"
+        validators = [SitemapValidators("https://example.com/s.xml", '"e"', None)]
+        DiscoveryCache(path).put("k", DiscoveryEntry(URLS, "sitemap", 5.0, validators))
+
+        entry = DiscoveryCache(path).get("k")
+
+        assert entry == DiscoveryEntry(URLS, "sitemap", 5.0, validators)
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "discovery.json"
+        path.write_text("{not json")
+        assert DiscoveryCache(path).get("k") is None
+
+    def test_conditional_headers(self):
+        v = SitemapValidators("u", etag='"x"', last_modified="Mon, 01 Jan 2024")
+        assert v.conditional_headers() == {
+            "If-None-Match": '"x"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
+
+
+class TestDiscoverUrlsWithCache:
+    async def test_second_discovery_served_from_cache(self):
+        cache = DiscoveryCache()
+        sitemap = _sitemap_with_validators()
+        report = DiscoveryReport()
+
+        with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+            first = await discover_urls(BASE, discovery_cache=cache)
+            second = await discover_urls(BASE, discovery_cache=cache, report=report)
+
+        assert first == second == URLS
+        assert sitemap.await_count == 1
+        assert report.from_cache and report.strategy == "sitemap"
+        assert not report.revalidated
+
+    async def test_other_depth_is_a_different_entry(self):
+        cache = DiscoveryCache()
+        sitemap = _sitemap_with_validators()
+
+        with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+            await discover_urls(BASE, max_depth=5, discovery_cache=cache)
+            await discover_urls(BASE, max_depth=2, discovery_cache=cache)
+
+        assert sitemap.await_count == 2
+
+    async def test_early_stopped_result_not_served_to_full_reads(self):
+        cache = DiscoveryCache()
+        sitemap = _sitemap_with_validators()
+
+        with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+            await discover_urls(BASE, discovery_cache=cache, sitemap_early_stop=True)
+            await discover_urls(BASE, discovery_cache=cache)
+            await discover_urls(BASE, discovery_cache=cache, sitemap_early_stop=True)
+
+        assert sitemap.await_count == 2
+
+    async def test_expired_entry_revalidated_by_304(self):
+        cache = DiscoveryCache(ttl=60)
+        sitemap = _sitemap_with_validators()
+        log: list = []
+        report = DiscoveryReport()
+
+        with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+            await discover_urls(BASE, discovery_cache=cache)
+            key = DiscoveryCache.key("https://example.com/docs", 5, True)
+            cache.get(key).timestamp = time.time() - 600
+            with patch(
+                "src.crawler.discovery.httpx.AsyncClient",
+                return_value=_revalidation_client(304, log),
+            ):
+                result = await discover_urls(BASE, discovery_cache=cache, report=report)
+
+        assert result == URLS
+        assert sitemap.await_count == 1
+        assert log == [("https://example.com/sitemap.xml", {"If-None-Match": '"v1"'})]
+        assert report.from_cache and report.revalidated
+        assert report.cache_age >= 600
+        assert cache.is_fresh(cache.get(key))
+
+    async def test_expired_entry_rediscovered_when_sitemap_changed(self):
+        cache = DiscoveryCache(ttl=60)
+        changed = URLS + ["https://example.com/docs/c"]
+        sitemap = _sitemap_with_validators()
+        report = DiscoveryReport()
+
+        with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+            await discover_urls(BASE, discovery_cache=cache)
+        key = DiscoveryCache.key("https://example.com/docs", 5, True)
+        cache.get(key).timestamp = time.time() - 600
+
+        with patch(
+            "src.crawler.discovery.try_sitemap", new=_sitemap_with_validators(changed)
+        ):
+            with patch(
+                "src.crawler.discovery.httpx.AsyncClient",
+                return_value=_revalidation_client(200, []),
+            ):
+                result = await discover_urls(BASE, discovery_cache=cache, report=report)
+
+        assert result == sorted(changed)
+        assert not report.from_cache
+        assert cache.get(key).urls == sorted(changed)
+
+    async def test_partly_unvalidated_sitemaps_not_revalidated(self):
+        """One sitemap from the page cache (or failed) makes the entry just expire."""
+        for other in ("cached", "timeout"):
+            cache = DiscoveryCache()
+
+            async def sitemap(base_url, filter_by_path, cache, report=None, **kw):
+                report.append(
+                    SitemapReport(url="https://example.com/a.xml", etag='"v1"')
+                )
+                report.append(
+                    SitemapReport(url="https://example.com/b.xml", status=other)
+                )
+                return list(URLS)
+
+            with patch("src.crawler.discovery.try_sitemap", new=sitemap):
+                await discover_urls(BASE, discovery_cache=cache)
+
+            key = DiscoveryCache.key("https://example.com/docs", 5, True)
+            assert cache.get(key).urls == URLS
+            assert cache.get(key).sitemaps == []
+
+    async def test_results_without_validators_just_expire(self):
+        """Nav results (and sitemaps without ETag/Last-Modified) are not revalidated."""
+        cache = DiscoveryCache(ttl=60)
+        no_sitemap = AsyncMock(return_value=[])
+        nav = AsyncMock(return_value=URLS)
+
+        with patch("src.crawler.discovery.try_sitemap", new=no_sitemap):
+            with patch("src.crawler.discovery.try_nav_parse", new=nav):
+                await discover_urls(BASE, discovery_cache=cache)
+                key = DiscoveryCache.key("https://example.com/docs", 5, True)
+                assert cache.get(key).sitemaps == []
+                cache.get(key).timestamp = time.time() - 600
+                with patch("src.crawler.discovery.httpx.AsyncClient") as client:
+                    await discover_urls(BASE, discovery_cache=cache)
+
+        client.assert_not_called()
+        assert nav.await_count == 2
+
+    async def test_fallback_result_not_cached(self):
+        cache = DiscoveryCache()
+        empty = AsyncMock(return_value=[])
+
+        with patch("src.crawler.discovery.try_sitemap", new=empty):
+            with patch("src.crawler.discovery.try_nav_parse", new=empty):
+                with patch("src.crawler.discovery.recursive_crawl", new=empty):
+                    await discover_urls(BASE, discovery_cache=cache)
+
+        assert (
+            cache.get(DiscoveryCache.key("https://example.com/docs", 5, True)) is None
+        )
+
+    async def test_base_url_only_result_not_cached(self):
+        """A nav/crawl result that found nothing but the base URL is not stored."""
+        cache = DiscoveryCache()
+        empty = AsyncMock(return_value=[])
+        base_only = AsyncMock(return_value=["https://example.com/docs"])
+
+        with patch("src.crawler.discovery.try_sitemap", new=empty):
+            with patch("src.crawler.discovery.try_nav_parse", new=base_only):
+                await discover_urls(BASE, discovery_cache=cache)
+                await discover_urls(BASE, discovery_cache=cache)
+
+        assert base_only.await_count == 2
+        assert (
+            cache.get(DiscoveryCache.key("https://example.com/docs", 5, True)) is None
+        )
+
+    async def test_capped_crawl_not_cached(self):
+        cache = DiscoveryCache()
+        empty = AsyncMock(return_value=[])
+
+        async def crawl(base_url, max_depth, progress=None, **kwargs):
+            progress.capped = True
+            return URLS
+
+        with patch("src.crawler.discovery.try_sitemap", new=empty):
+            with patch("src.crawler.discovery.try_nav_parse", new=empty):
+                with patch("src.crawler.discovery.recursive_crawl", new=crawl):
+                    result = await discover_urls(BASE, discovery_cache=cache)
+
+        assert result == URLS
+        assert (
+            cache.get(DiscoveryCache.key("https://example.com/docs", 5, True)) is None
+        )
+
+    async def test_small_result_not_cached(self):
+        cache = DiscoveryCache()
+        with patch("src.crawler.discovery.DISCOVERY_MIN_URLS", 3):
+            with patch(
+                "src.crawler.discovery.try_sitemap", new=_sitemap_with_validators()
+            ):
+                with patch(
+                    "src.crawler.discovery.try_nav_parse",
+                    new=AsyncMock(return_value=[]),
+                ):
+                    with patch(
+                        "src.crawler.discovery.recursive_crawl",
+                        new=AsyncMock(return_value=URLS),
+                    ):
+                        await discover_urls(BASE, discovery_cache=cache)
+
+        assert (
+            cache.get(DiscoveryCache.key("https://example.com/docs", 5, True)) is None
+        )
+
+
+class TestSitemapValidatorsRecorded:
+    async def test_try_sitemap_records_etag_and_last_modified(self):
+        xml = (
+            '<?xml version="1.0"?><urlset '
+            'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            "<url><loc>https://example.com/docs/a</loc></url></urlset>"
+        )
+
+        async def fake_get(url, **kwargs):
+            if url.endswith("/sitemap.xml"):
+                resp = MagicMock(status_code=200, content=xml.encode(), text=xml)
+                resp.headers = {"etag": '"abc"', "last-modified": "Tue, 02 Jan 2024"}
+                return resp
+            return MagicMock(status_code=404, content=b"", text="")
+
+        client = AsyncMock()
+        client.get = fake_get
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+        report: list[SitemapReport] = []
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            await try_sitemap(BASE, report=report)
+
+        ok = [r for r in report if r.status == "ok"]
+        assert [(r.etag, r.last_modified) for r in ok] == [
+            ('"abc"', "Tue, 02 Jan 2024")
+        ]
@@ -7,12 +7,17 @@ Covers all previously-uncovered branches and lines identified in the
 asyncio_mode = "auto" is set in pytest.ini, so async tests need no decorator.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 from urllib.parse import urlparse
 
 from src.crawler.discovery import (
+    MAX_NAV_URLS,
+    NAV_SELECTORS,
+    CrawlProgress,
+    UrlSeenSet,
     discover_urls,
     normalize_url,
     recursive_crawl,
@@ -359,6 +364,204 @@ class TestRecursiveCrawlUncoveredBranches:
         assert result == ["https://example.com/"]
 
 
+class TestFrontierCrawl:
+    """Continuous frontier-queue workers, URL cap and live progress."""
+
+    @staticmethod
+    def _client(fake_get) -> AsyncMock:
+        client = AsyncMock()
+        client.get = fake_get
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+        return client
+
+    async def test_slow_page_does_not_stall_deeper_pages(self):
+        """/fast's child is fetched while /slow is still in flight.
+
+        A level-synchronous BFS would wait for /slow before depth 2 and
+        deadlock here; the frontier workers keep going.
+        """
+        fast_child_fetched = asyncio.Event()
+        pages = {
+            "https://example.com/": '<a href="/slow">s</a><a href="/fast">f</a>',
+            "https://example.com/fast": '<a href="/fast/child">c</a>',
+        }
+
+        async def fake_get(url, **kwargs):
+            if url == "https://example.com/slow":
+                await fast_child_fetched.wait()
+            if url == "https://example.com/fast/child":
+                fast_child_fetched.set()
+            return _make_resp(200, body=pages.get(url, ""))
+
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await asyncio.wait_for(
+                recursive_crawl("https://example.com/", max_depth=3, concurrency=2),
+                timeout=5,
+            )
+        assert "https://example.com/fast/child" in result
+        assert "https://example.com/slow" in result
+
+    async def test_max_urls_caps_discovery_and_stops_fetching(self):
+        fetched: list[str] = []
+
+        async def fake_get(url, **kwargs):
+            fetched.append(url)
+            links = "".join(f'<a href="{url.rstrip("/")}/{i}">x</a>' for i in range(5))
+            return _make_resp(200, body=links)
+
+        progress = CrawlProgress()
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                result = await recursive_crawl(
+                    "https://example.com/",
+                    max_depth=5,
+                    concurrency=1,
+                    max_urls=12,
+                    progress=progress,
+                )
+        assert len(result) == 12
+        assert progress.capped is True
+        # Once capped, queued pages are drained without being fetched
+        assert len(fetched) < 12
+
+    async def test_max_urls_defaults_to_env_configured_cap(self):
+        async def fake_get(url, **kwargs):
+            return _make_resp(200, body='<a href="/a">a</a><a href="/b">b</a>')
+
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                with patch("src.crawler.discovery.DISCOVERY_MAX_URLS", 2):
+                    result = await recursive_crawl(
+                        "https://example.com/", max_depth=2, concurrency=1
+                    )
+        assert result == ["https://example.com/", "https://example.com/a"]
+
+    async def test_progress_counters_and_per_url_depth(self):
+        pages = {
+            "https://example.com/": '<a href="/a">a</a><a href="/b">b</a>',
+            "https://example.com/a": '<a href="/a/deep">d</a>',
+        }
+
+        async def fake_get(url, **kwargs):
+            return _make_resp(200, body=pages.get(url, ""))
+
+        progress = CrawlProgress()
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                result = await recursive_crawl(
+                    "https://example.com/",
+                    max_depth=2,
+                    concurrency=3,
+                    progress=progress,
+                )
+        # /a/deep sits at depth 2: discovered but not fetched
+        assert set(result) == {
+            "https://example.com/",
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/a/deep",
+        }
+        assert progress.discovered == 4
+        assert progress.fetched == 3
+        assert progress.depth == 1
+        assert progress.queued == 0
+        assert progress.in_flight == 0
+        assert progress.capped is False
+
+    async def test_on_urls_receives_new_urls_page_by_page(self):
+        pages = {
+            "https://example.com/": '<a href="/a">a</a><a href="/b">b</a>',
+            "https://example.com/a": '<a href="/b">b</a><a href="/c">c</a>',
+        }
+
+        async def fake_get(url, **kwargs):
+            return _make_resp(200, body=pages.get(url, ""))
+
+        batches: list[list[str]] = []
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                result = await recursive_crawl(
+                    "https://example.com/",
+                    max_depth=3,
+                    concurrency=1,
+                    on_urls=batches.append,
+                )
+        assert batches == [
+            ["https://example.com/"],
+            ["https://example.com/a", "https://example.com/b"],
+            ["https://example.com/c"],
+        ]
+        assert result == [u for batch in batches for u in batch]
+
+    async def test_failing_page_does_not_stop_the_crawl(self):
+        """An exception after the fetch is logged; the worker keeps going."""
+        pages = {
+            "https://example.com/": '<a href="/a">a</a><a href="/b">b</a>',
+            "https://example.com/b": '<a href="/c">c</a>',
+        }
+
+        async def fake_get(url, **kwargs):
+            return _make_resp(200, body=pages.get(url, ""))
+
+        def on_urls(batch):
+            if "https://example.com/a" in batch:
+                raise RuntimeError("consumer failed")
+
+        client = self._client(fake_get)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                result = await asyncio.wait_for(
+                    recursive_crawl(
+                        "https://example.com/",
+                        max_depth=3,
+                        concurrency=1,
+                        on_urls=on_urls,
+                    ),
+                    timeout=5,
+                )
+        assert "https://example.com/c" in result
+
+    async def test_discover_urls_exposes_crawl_progress_on_report(self):
+        from src.crawler.discovery import DiscoveryReport
+
+        report = DiscoveryReport()
+
+        async def fake_crawl(base_url, max_depth, progress=None, **kw):
+            progress.fetched = 7
+            return ["https://example.com/x"]
+
+        with (
+            patch("src.crawler.discovery.try_sitemap", AsyncMock(return_value=[])),
+            patch("src.crawler.discovery.try_nav_parse", AsyncMock(return_value=[])),
+            patch("src.crawler.discovery.recursive_crawl", side_effect=fake_crawl),
+        ):
+            await discover_urls("https://example.com/", max_depth=2, report=report)
+        assert report.strategy == "crawl"
+        assert report.crawl.fetched == 7
+
+
+class TestUrlSeenSet:
+    def test_add_reports_new_and_duplicate(self):
+        seen = UrlSeenSet()
+        assert seen.add("https://example.com/a") is True
+        assert seen.add("https://example.com/a") is False
+        assert seen.add("https://example.com/b") is True
+        assert len(seen) == 2
+
+    def test_contains(self):
+        seen = UrlSeenSet()
+        seen.add("https://example.com/a")
+        assert "https://example.com/a" in seen
+        assert "https://example.com/b" not in seen
+        assert 42 not in seen
+
+
 # ===========================================================================
 # try_sitemap()
 # ===========================================================================
@@ -732,7 +935,7 @@ class TestTrySitemapUncoveredBranches:
     async def test_generic_exception_in_parse_sitemap_xml_logs_warning(self):
         """Unexpected exception in parse_sitemap_xml must log a warning."""
 
-        # Trigger via patch on ET.fromstring raising an unexpected error type
+        # Trigger via patch on the streaming parser raising an unexpected error type
         async def fake_get(url, **kwargs):
             resp = MagicMock()
             if "sitemap.xml" in url and "sitemap_index" not in url:
@@ -752,7 +955,7 @@ class TestTrySitemapUncoveredBranches:
 
         with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
             with patch(
-                "src.crawler.discovery.ET.fromstring",
+                "src.crawler.discovery.parse_sitemap_stream",
                 side_effect=RuntimeError("unexpected"),
             ):
                 result = await try_sitemap("https://example.com/")
@@ -767,11 +970,11 @@ class TestTrySitemapUncoveredBranches:
 def _make_playwright_stack(
     *,
     page_goto_side_effect=None,
-    links_per_selector=None,
+    hrefs=None,
 ):
     """
     Build a minimal Playwright mock hierarchy.
-    links_per_selector: list of lists of link mocks per selector call.
+    hrefs: what the in-page nav collector (page.evaluate) returns.
     """
     page_mock = AsyncMock()
     page_mock.__aenter__ = AsyncMock(return_value=page_mock)
@@ -781,11 +984,7 @@ def _make_playwright_stack(
         page_mock.goto = AsyncMock(side_effect=page_goto_side_effect)
     else:
         page_mock.goto = AsyncMock(return_value=None)
-
-    if links_per_selector is not None:
-        page_mock.query_selector_all = AsyncMock(side_effect=links_per_selector)
-    else:
-        page_mock.query_selector_all = AsyncMock(return_value=[])
+    page_mock.evaluate = AsyncMock(return_value=hrefs or [])
 
     browser_mock = AsyncMock()
     browser_mock.__aenter__ = AsyncMock(return_value=browser_mock)
@@ -802,11 +1001,11 @@ def _make_playwright_stack(
     return pw_cm, browser_mock, page_mock
 
 
-def _make_link(href):
-    """Build a fake Playwright element handle for an anchor tag."""
-    link = AsyncMock()
-    link.get_attribute = AsyncMock(return_value=href)
-    return link
+async def _nav_parse(hrefs, base_url="https://example.com/"):
+    pw_cm, _, page_mock = _make_playwright_stack(hrefs=hrefs)
+    with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
+        with patch("src.crawler.discovery.validate_url_not_ssrf", return_value=None):
+            return await try_nav_parse(base_url)
 
 
 class TestTryNavParseUncoveredBranches:
@@ -820,127 +1019,102 @@ class TestTryNavParseUncoveredBranches:
         assert result == []
 
     async def test_nav_url_cap_at_100_stops_adding(self):
-        """When 100 URLs are collected, further links must be skipped."""
-        # Create 120 valid same-domain links from a single selector
-        links = [_make_link(f"/page{i}") for i in range(120)]
-
-        # Only the first selector (nav a) needs to return many links;
-        # the rest return nothing because the cap stops iteration.
-        links_per_selector = [links] + [[] for _ in range(6)]
-
-        pw_cm, _, _ = _make_playwright_stack(links_per_selector=links_per_selector)
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert len(result) <= 100
+        """Never more than MAX_NAV_URLS URLs, even if the page returns more."""
+        result = await _nav_parse([f"/page{i}" for i in range(120)])
+        assert len(result) == 100
 
     async def test_mailto_links_filtered_in_nav(self):
         """mailto: hrefs are skipped in nav parsing."""
-        links = [_make_link("mailto:admin@example.com")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert result == []
+        assert await _nav_parse(["mailto:admin@example.com"]) == []
 
     async def test_javascript_links_filtered_in_nav(self):
         """javascript: hrefs are skipped in nav parsing."""
-        links = [_make_link("javascript:void(0)")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert result == []
+        assert await _nav_parse(["javascript:void(0)"]) == []
 
     async def test_external_domain_links_filtered_in_nav(self):
         """Links to external domains are excluded from nav results."""
-        links = [_make_link("https://other.com/page")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
+        assert await _nav_parse(["https://other.com/page"]) == []
 
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert result == []
-
-    async def test_link_with_no_href_is_skipped(self):
-        """An element with href=None must be skipped without error."""
-        links = [_make_link(None)]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert result == []
+    async def test_empty_href_is_skipped(self):
+        """Empty or null hrefs must be skipped without error."""
+        assert await _nav_parse(["", None]) == []
 
     async def test_fragment_href_skipped_in_nav(self):
         """Fragment-only hrefs (#section) are skipped in nav parsing."""
-        links = [_make_link("#section")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert result == []
-
-    async def test_selector_exception_continues_to_next_selector(self):
-        """query_selector_all raising an exception must continue to the next selector."""
-        # First selector throws, second returns a valid link
-        good_link = _make_link("/valid-page")
-
-        side_effects = [
-            RuntimeError("selector failed"),
-            [good_link],
-        ] + [[] for _ in range(5)]
-
-        pw_cm, _, page_mock = _make_playwright_stack()
-        page_mock.query_selector_all = AsyncMock(side_effect=side_effects)
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
-        assert "https://example.com/valid-page" in result
+        assert await _nav_parse(["#section"]) == []
 
     async def test_valid_same_domain_links_included(self):
         """Valid same-domain links are returned by try_nav_parse."""
-        links = [_make_link("/docs/intro"), _make_link("/docs/api")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
+        result = await _nav_parse(["/docs/intro", "/docs/api", "/docs/intro#top"])
+        assert result == [
+            "https://example.com/docs/intro",
+            "https://example.com/docs/api",
+        ]
 
+    async def test_all_selectors_read_in_one_evaluate_call(self):
+        """Nav hrefs come from a single page.evaluate, never per-link calls."""
+        pw_cm, _, page_mock = _make_playwright_stack(hrefs=["/a"])
         with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
             with patch(
                 "src.crawler.discovery.validate_url_not_ssrf", return_value=None
             ):
-                result = await try_nav_parse("https://example.com/")
-        assert "https://example.com/docs/intro" in result
-        assert "https://example.com/docs/api" in result
+                await try_nav_parse("https://example.com/")
+        page_mock.evaluate.assert_awaited_once()
+        args = page_mock.evaluate.call_args.args[1]
+        assert args == {
+            "selectors": NAV_SELECTORS,
+            "base": "https://example.com/",
+            "limit": MAX_NAV_URLS,
+        }
+        page_mock.query_selector_all.assert_not_called()
+
+
+class TestTryNavParsePagePool:
+    """try_nav_parse(pool=...) borrows a page instead of launching a browser."""
+
+    @staticmethod
+    def _pool(page_mock):
+        pool = MagicMock()
+        acquire = MagicMock()
+        acquire.__aenter__ = AsyncMock(return_value=page_mock)
+        acquire.__aexit__ = AsyncMock(return_value=False)
+        pool.acquire = MagicMock(return_value=acquire)
+        return pool, acquire
+
+    async def test_pool_page_used_and_no_browser_launched(self):
+        _, _, page_mock = _make_playwright_stack(hrefs=["/docs/intro"])
+        pool, acquire = self._pool(page_mock)
+        with (
+            patch("src.crawler.discovery.async_playwright") as launch,
+            patch("src.crawler.discovery.validate_url_not_ssrf", return_value=None),
+        ):
+            result = await try_nav_parse("https://example.com/", pool)
+        assert result == ["https://example.com/docs/intro"]
+        launch.assert_not_called()
+        page_mock.goto.assert_awaited_once()
+        acquire.__aexit__.assert_awaited_once()
+
+    async def test_pool_page_released_on_timeout(self):
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+        _, _, page_mock = _make_playwright_stack(
+            page_goto_side_effect=PlaywrightTimeout("load timed out")
+        )
+        pool, acquire = self._pool(page_mock)
+        with patch("src.crawler.discovery.validate_url_not_ssrf", return_value=None):
+            result = await try_nav_parse("https://example.com/", pool)
+        assert result == []
+        acquire.__aexit__.assert_awaited_once()
+
+    async def test_discover_urls_passes_pool_to_nav(self):
+        pool = MagicMock()
+        nav = AsyncMock(return_value=["https://example.com/n"])
+        with (
+            patch("src.crawler.discovery.try_sitemap", AsyncMock(return_value=[])),
+            patch("src.crawler.discovery.try_nav_parse", nav),
+        ):
+            await discover_urls("https://example.com/", page_pool=pool)
+        nav.assert_awaited_once_with("https://example.com/", pool)
 
 
 # ===========================================================================
@@ -977,6 +1151,14 @@ class TestDiscoverUrlsUncoveredBranches:
         )
         assert passed_cache is cache
 
+    async def test_sitemap_early_stop_forwarded_to_try_sitemap(self):
+        """sitemap_early_stop must reach try_sitemap as early_stop."""
+        with patch(
+            "src.crawler.discovery.try_sitemap", return_value=["https://example.com/p"]
+        ) as mock_sitemap:
+            await discover_urls("https://example.com/docs/", sitemap_early_stop=True)
+        assert mock_sitemap.call_args[1].get("early_stop") is True
+
     async def test_nav_exception_does_not_stop_recursive_crawl(self):
         """Exception in try_nav_parse is caught; recursive_crawl still runs."""
         with patch("src.crawler.discovery.try_sitemap", return_value=[]):
@@ -1132,16 +1314,7 @@ class TestRemainingGaps:
     # ---- Line 321: query param in try_nav_parse link building ----
 
     async def test_nav_parse_link_with_query_param_preserved(self):
-        links = [_make_link("/search?q=docs")]
-        pw_cm, _, _ = _make_playwright_stack(
-            links_per_selector=[links] + [[] for _ in range(6)]
-        )
-
-        with patch("src.crawler.discovery.async_playwright", return_value=pw_cm):
-            with patch(
-                "src.crawler.discovery.validate_url_not_ssrf", return_value=None
-            ):
-                result = await try_nav_parse("https://example.com/")
+        result = await _nav_parse(["/search?q=docs"])
         assert any("q=docs" in u for u in result)
 
     # ---- Sitemap: empty <loc/> tag (url_text falsy) → branch 454->452 ----
@@ -1285,7 +1458,7 @@ class TestRemainingGaps:
                 resp.content = SITEMAP_INDEX_XML.encode()
                 resp.text = SITEMAP_INDEX_XML
             elif "sitemap1.xml" in url:
-                # Returns valid HTTP but broken XML that fails ET.fromstring
+                # Returns valid HTTP but broken XML that fails the sitemap parser
                 resp.status_code = 200
                 resp.content = child_xml
                 resp.text = child_xml.decode("utf-8", errors="replace")
@@ -1305,3 +1478,142 @@ class TestRemainingGaps:
             result = await try_sitemap("https://example.com/")
         # No URLs from broken child, but function completes normally
         assert isinstance(result, list)
+
+
+class TestDiscoveryStrategyRace:
+    """discover_urls(race=True) and per-strategy time-to-result."""
+
+    BASE = "https://example.com/"
+
+    @staticmethod
+    def _never() -> AsyncMock:
+        async def hang(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        return AsyncMock(side_effect=hang)
+
+    async def _discover(self, sitemap, nav, crawl, **kwargs):
+        from src.crawler.discovery import DiscoveryReport
+
+        report = DiscoveryReport()
+        with (
+            patch("src.crawler.discovery.try_sitemap", sitemap),
+            patch("src.crawler.discovery.try_nav_parse", nav),
+            patch("src.crawler.discovery.recursive_crawl", crawl),
+        ):
+            urls = await asyncio.wait_for(
+                discover_urls(self.BASE, max_depth=2, report=report, **kwargs),
+                timeout=5,
+            )
+        outcomes = {t.name: t.outcome for t in report.strategies}
+        return urls, report, outcomes
+
+    async def test_higher_priority_result_wins_even_if_slower(self):
+        async def slow_sitemap(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return ["https://example.com/s"]
+
+        urls, report, outcomes = await self._discover(
+            AsyncMock(side_effect=slow_sitemap),
+            AsyncMock(return_value=["https://example.com/n"]),
+            self._never(),
+            race=True,
+        )
+        assert urls == ["https://example.com/s"]
+        assert report.strategy == "sitemap"
+        assert outcomes == {"sitemap": "won", "nav": "unused", "crawl": "cancelled"}
+        sitemap_timing = report.strategies[0]
+        assert sitemap_timing.seconds >= 0.05
+        assert sitemap_timing.urls == 1
+        assert report.strategies[1].urls == 1
+
+    async def test_lower_priority_cancelled_once_winner_known(self):
+        urls, report, outcomes = await self._discover(
+            AsyncMock(return_value=[]),
+            AsyncMock(return_value=["https://example.com/n"]),
+            self._never(),
+            race=True,
+        )
+        assert urls == ["https://example.com/n"]
+        assert outcomes == {"sitemap": "empty", "nav": "won", "crawl": "cancelled"}
+
+    async def test_failures_fall_through_to_crawl(self):
+        urls, report, outcomes = await self._discover(
+            AsyncMock(side_effect=RuntimeError("boom")),
+            AsyncMock(return_value=[]),
+            AsyncMock(return_value=["https://example.com/c"]),
+            race=True,
+        )
+        assert urls == ["https://example.com/c"]
+        assert outcomes == {"sitemap": "failed", "nav": "empty", "crawl": "won"}
+
+    async def test_crawl_urls_streamed_only_once_crawl_is_used(self):
+        sitemap_done = asyncio.Event()
+        streamed: list[tuple[bool, list[str]]] = []
+
+        async def sitemap(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            sitemap_done.set()
+            return []
+
+        async def crawl(*args, on_urls=None, **kwargs):
+            on_urls(["https://example.com/c"])  # before the sitemap comes back
+            await sitemap_done.wait()
+            return ["https://example.com/c"]
+
+        urls, _, _ = await self._discover(
+            AsyncMock(side_effect=sitemap),
+            AsyncMock(return_value=[]),
+            AsyncMock(side_effect=crawl),
+            race=True,
+            on_urls=lambda batch: streamed.append((sitemap_done.is_set(), batch)),
+        )
+        assert urls == ["https://example.com/c"]
+        assert streamed == [(True, ["https://example.com/c"])]
+
+    async def test_crawl_urls_not_streamed_when_sitemap_wins(self):
+        streamed: list[list[str]] = []
+
+        async def crawl(*args, on_urls=None, **kwargs):
+            on_urls(["https://example.com/c"])
+            await asyncio.Event().wait()
+
+        await self._discover(
+            AsyncMock(return_value=["https://example.com/s"]),
+            AsyncMock(return_value=[]),
+            AsyncMock(side_effect=crawl),
+            race=True,
+            on_urls=streamed.append,
+        )
+        assert streamed == []
+
+    async def test_cascade_reports_skipped_strategies(self):
+        nav = AsyncMock(return_value=["https://example.com/n"])
+        urls, report, outcomes = await self._discover(
+            AsyncMock(return_value=["https://example.com/s"]), nav, self._never()
+        )
+        assert outcomes == {"sitemap": "won", "nav": "skipped", "crawl": "skipped"}
+        nav.assert_not_called()
+
+    async def test_min_urls_makes_short_results_insufficient(self):
+        with patch("src.crawler.discovery.DISCOVERY_MIN_URLS", 2):
+            urls, report, outcomes = await self._discover(
+                AsyncMock(return_value=["https://example.com/s"]),
+                AsyncMock(
+                    return_value=["https://example.com/a", "https://example.com/b"]
+                ),
+                self._never(),
+            )
+        assert report.strategy == "nav"
+        assert outcomes == {"sitemap": "empty", "nav": "won", "crawl": "skipped"}
+
+    async def test_short_result_used_when_nothing_is_sufficient(self):
+        with patch("src.crawler.discovery.DISCOVERY_MIN_URLS", 5):
+            urls, report, outcomes = await self._discover(
+                AsyncMock(return_value=[]),
+                AsyncMock(return_value=["https://example.com/n"]),
+                AsyncMock(return_value=["https://example.com/c"]),
+                race=True,
+            )
+        assert urls == ["https://example.com/n"]
+        assert outcomes["nav"] == "won"
@@ -11,12 +11,25 @@ Tests cover:
 - Language detection and filtering
 - Deduplication
 - Edge cases
+- Versioned documentation trees
+- hreflang alternate groups
+- UrlRules: compiled rules, include/exclude globs, per-rule hit counts
 """
 
+from urllib.parse import urlparse
+
 from src.crawler.filter import (
+    EXCLUDED_EXTENSIONS,
+    EXCLUDED_PATTERNS,
+    HreflangReport,
+    UrlRules,
+    VersionReport,
+    filter_hreflang,
     filter_urls,
+    filter_versions,
     _matches_language,
 )
+from src.crawler.hreflang import HreflangAlternates
 
 
 class TestFilterUrls:
@@ -392,3 +405,249 @@ class TestIntegrationScenarios:
         assert len(result) == 2
         assert "https://example.com/docs/guide.html" in result
         assert "https://example.com/tutorial/index.html" in result
+
+
+class TestVersionFiltering:
+    """filter_versions keeps one version per versioned doc tree."""
+
+    URLS = [
+        "https://x.com/docs/v1/intro",
+        "https://x.com/docs/v2/intro",
+        "https://x.com/docs/v2/api",
+        "https://x.com/docs/v10/intro",
+        "https://x.com/docs/faq",
+        "https://x.com/blog/2024/post",
+    ]
+
+    def test_highest_version_kept_by_default(self):
+        report = VersionReport()
+        result = filter_versions(self.URLS, report=report)
+        assert result == [
+            "https://x.com/docs/v10/intro",
+            "https://x.com/docs/faq",
+            "https://x.com/blog/2024/post",
+        ]
+        assert report.kept == {"https://x.com/docs/": "v10"}
+        assert report.dropped == {"v1": 1, "v2": 2}
+
+    def test_requested_version_kept(self):
+        report = VersionReport()
+        result = filter_versions(self.URLS, "2", report)
+        assert result[:2] == [
+            "https://x.com/docs/v2/intro",
+            "https://x.com/docs/v2/api",
+        ]
+        assert report.dropped == {"v1": 1, "v10": 1}
+
+    def test_stable_alias_preferred_over_numbers(self):
+        urls = [
+            "https://x.readthedocs.io/en/3.2/a",
+            "https://x.readthedocs.io/en/stable/a",
+            "https://x.readthedocs.io/en/latest/a",
+            "https://x.readthedocs.io/en/3.1.x/a",
+        ]
+        assert filter_versions(urls) == ["https://x.readthedocs.io/en/stable/a"]
+        assert filter_versions(urls, "latest") == [
+            "https://x.readthedocs.io/en/latest/a"
+        ]
+
+    def test_unknown_requested_version_falls_back_to_auto(self):
+        urls = ["https://x.com/v1.4/a", "https://x.com/v1.10/a"]
+        assert filter_versions(urls, "9") == ["https://x.com/v1.10/a"]
+
+    def test_single_version_and_all_untouched(self):
+        urls = ["https://x.com/docs/v2/a", "https://x.com/docs/v2/b"]
+        assert filter_versions(urls) == urls
+        assert filter_versions(self.URLS, "all") == self.URLS
+
+    def test_trees_are_independent(self):
+        urls = [
+            "https://x.com/sdk/v1/a",
+            "https://x.com/sdk/v2/a",
+            "https://x.com/cli/1.0/a",
+            "https://x.com/cli/2.0/a",
+            "https://x.com/cli/next/a",
+        ]
+        report = VersionReport()
+        assert filter_versions(urls, report=report) == [
+            "https://x.com/sdk/v2/a",
+            "https://x.com/cli/2.0/a",
+        ]
+        assert report.dropped == {"v1": 1, "1.0": 1, "next": 1}
+
+    def test_final_segment_is_a_page_not_a_version(self):
+        urls = [
+            "https://x.com/docs/whatsnew/3.11",
+            "https://x.com/docs/whatsnew/3.12",
+            "https://x.com/guide/main",
+            "https://x.com/guide/next",
+        ]
+        report = VersionReport()
+        assert filter_versions(urls, report=report) == urls
+        assert report.kept == {}
+
+    def test_version_root_page_follows_its_directory(self):
+        urls = [
+            "https://x.com/docs/v1",
+            "https://x.com/docs/v1/intro",
+            "https://x.com/docs/v2/",
+            "https://x.com/docs/v2/intro",
+        ]
+        assert filter_versions(urls) == [
+            "https://x.com/docs/v2/",
+            "https://x.com/docs/v2/intro",
+        ]
+
+    def test_development_branches_only_all_kept(self):
+        urls = [
+            "https://x.com/guide/main/a",
+            "https://x.com/guide/next/a",
+            "https://x.com/guide/dev/b",
+        ]
+        report = VersionReport()
+        assert filter_versions(urls, report=report) == urls
+        assert report.kept == {}
+        assert filter_versions(urls, "next") == ["https://x.com/guide/next/a"]
+
+
+class TestHreflangFiltering:
+    """filter_hreflang keeps one URL per alternate group."""
+
+    RULES = UrlRules("https://x.com/docs", "all")
+
+    def _alternates(self, *groups):
+        alternates = HreflangAlternates()
+        for group in groups:
+            alternates.add(group)
+        return alternates
+
+    def test_requested_language_kept(self):
+        urls = [
+            "https://x.com/docs/a",
+            "https://x.com/docs/a-de",
+            "https://x.com/docs/b",
+        ]
+        alternates = self._alternates(
+            {"en": "https://x.com/docs/a", "de": "https://x.com/docs/a-de"}
+        )
+        report = HreflangReport()
+        assert filter_hreflang(urls, "en", alternates, self.RULES, report) == [
+            "https://x.com/docs/a",
+            "https://x.com/docs/b",
+        ]
+        assert filter_hreflang(urls, "de", alternates, self.RULES) == [
+            "https://x.com/docs/a-de",
+            "https://x.com/docs/b",
+        ]
+        assert (report.groups, report.dropped) == (1, 1)
+
+    def test_regional_and_default_fallbacks(self):
+        group = {
+            "en-gb": "https://x.com/docs/a-gb",
+            "en-us": "https://x.com/docs/a-us",
+            "x-default": "https://x.com/docs/a",
+            "fr": "https://x.com/docs/a-fr",
+        }
+        urls = list(group.values())
+        alternates = self._alternates(group)
+        assert filter_hreflang(urls, "en-US", alternates) == ["https://x.com/docs/a-us"]
+        assert filter_hreflang(urls, "en", alternates) == ["https://x.com/docs/a-gb"]
+        assert filter_hreflang(urls, "ja", alternates) == ["https://x.com/docs/a"]
+
+    def test_undiscovered_target_substituted_if_admissible(self):
+        alternates = self._alternates(
+            {"en": "https://x.com/docs/a", "fr": "https://x.com/docs/a-fr"},
+            {"en": "https://x.com/docs/b", "fr": "https://y.com/docs/b"},
+        )
+        urls = ["https://x.com/docs/a", "https://x.com/docs/b"]
+        report = HreflangReport()
+        assert filter_hreflang(urls, "fr", alternates, self.RULES, report) == [
+            "https://x.com/docs/a-fr",
+            "https://x.com/docs/b",  # fr version is off-site: group kept as is
+        ]
+        assert report.substituted == 1
+
+    def test_all_or_no_groups_untouched(self):
+        urls = ["https://x.com/docs/a", "https://x.com/docs/a-de"]
+        alternates = self._alternates(
+            {"en": "https://x.com/docs/a", "de": "https://x.com/docs/a-de"}
+        )
+        assert filter_hreflang(urls, "all", alternates) == urls
+        assert filter_hreflang(urls, "en", HreflangAlternates()) == urls
+
+
+class TestUrlRules:
+    """Compiled per-job rules behind filter_urls."""
+
+    URLS = [
+        "https://x.com/docs/guide/intro",
+        "https://x.com/docs/guide/setup/",
+        "https://x.com/docs/internal/notes",
+        "https://x.com/docs/api/ref?page=2",
+        "https://x.com/docs/blog/post",
+        "https://x.com/docs/files/manual.PDF",
+        "https://x.com/docs/fr/guide",
+        "https://x.com/docs;jsessionid=1/guide",
+        "https://y.com/docs/guide",
+        "https://x.com/other",
+    ]
+
+    def test_same_result_as_per_url_checks(self):
+        for language in ("en", "fr", "all", "xx"):
+            for base in (
+                "https://x.com/docs/",
+                "https://x.com/docs/en/",
+                "https://x.com",
+            ):
+                rules = UrlRules(base, language)
+                expected = sorted(
+                    {
+                        f"{p.scheme}://{p.netloc}{p.path.rstrip('/')}"
+                        for url in self.URLS
+                        if (p := urlparse(url)).netloc == "x.com"
+                        and p.path.rstrip("/").startswith(
+                            urlparse(base).path.rstrip("/")
+                        )
+                        and not any(
+                            p.path.rstrip("/").lower().endswith(e)
+                            for e in EXCLUDED_EXTENSIONS
+                        )
+                        and not any(x in p.path.lower() for x in EXCLUDED_PATTERNS)
+                        and _matches_language(p.path.rstrip("/"), language, base)
+                    }
+                )
+                assert rules.filter(self.URLS) == expected, (base, language)
+
+    def test_hits_per_builtin_rule(self):
+        rules = UrlRules("https://x.com/docs/", "en")
+        rules.filter(self.URLS)
+        assert rules.hits == {
+            "domain": 1,
+            "base path": 1,
+            "pattern /blog/": 1,
+            "extension .pdf": 1,
+            "language": 1,
+        }
+
+    def test_include_and_exclude_globs(self):
+        rules = UrlRules(
+            "https://x.com/docs/",
+            "en",
+            include=["/docs/guide*", "https://x.com/docs/api/*"],
+            exclude=["*/setup"],
+        )
+        assert rules.filter(self.URLS) == [
+            "https://x.com/docs/api/ref",
+            "https://x.com/docs/guide/intro",
+        ]
+        assert rules.hits["exclude */setup"] == 1
+        assert rules.hits["include /docs/guide*"] == 1
+        assert rules.hits["include https://x.com/docs/api/*"] == 1
+        assert rules.hits["include"] == 2  # internal/notes, docs;jsessionid=1/guide
+
+    def test_filter_urls_reuses_rules(self):
+        rules = UrlRules("https://x.com/docs/", "en", exclude=["*/internal/*"])
+        filter_urls(self.URLS[:3], "ignored", "ignored", rules)
+        filter_urls(self.URLS[3:], "ignored", "ignored", rules)
+        assert rules.hits["exclude */internal/*"] == 1
+        assert sum(rules.hits.values()) == 6
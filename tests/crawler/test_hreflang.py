@@ -0,0 +1,225 @@
+"""Unit tests for hreflang alternate collection.
+
+Tests cover:
+- extract_hreflang / parse_link_header reading head links and Link headers
+- HreflangAlternates merging declarations that share a URL
+- try_sitemap collecting <xhtml:link hreflang> alternates of kept URLs
+- recursive_crawl collecting the alternates declared by crawled pages, in the
+  form filter_urls emits
+- discovery cache entries carrying the groups
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.crawler.discovery import (
+    DiscoveryReport,
+    discover_urls,
+    recursive_crawl,
+    try_sitemap,
+)
+from src.crawler.discovery_cache import DiscoveryCache, DiscoveryEntry
+from src.crawler.filter import HreflangReport, filter_hreflang, filter_urls
+from src.crawler.hreflang import (
+    HreflangAlternates,
+    extract_hreflang,
+    language_tag,
+    parse_link_header,
+)
+
+BASE = "https://example.com"
+
+
+def _client(pages: dict[str, str], headers: dict[str, dict] | None = None):
+    """Mock AsyncClient serving exact-URL bodies; everything else is 404."""
+
+    async def fake_get(url, **kwargs):
+        resp = MagicMock()
+        body = pages.get(url)
+        resp.status_code = 200 if body is not None else 404
+        resp.headers = {"content-type": "text/html", **(headers or {}).get(url, {})}
+        resp.text = body or ""
+        resp.content = (body or "").encode()
+        return resp
+
+    client = AsyncMock()
+    client.get = fake_get
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    return client
+
+
+class TestExtraction:
+    def test_language_tag_normalized(self):
+        assert language_tag("en_US") == "en-us"
+        assert language_tag(" X-Default ") == "x-default"
+        assert language_tag("not a tag") is None
+
+    def test_head_links(self):
+        html = (
+            "<html><head>"
+            '<link rel="alternate" hreflang="en" href="/guide">'
+            "<link rel='alternate' hreflang='fr' href='https://fr.example.com/guide'>"
+            '<link rel="alternate" type="application/rss+xml" href="/feed">'
+            '<link rel="stylesheet" hreflang="de" href="/de.css">'
+            "</head><body>"
+            '<link rel="alternate" hreflang="es" href="/es/guide">'
+            "</body></html>"
+        )
+        assert extract_hreflang(html, f"{BASE}/guide") == {
+            "en": f"{BASE}/guide",
+            "fr": "https://fr.example.com/guide",
+        }
+
+    def test_link_header(self):
+        header = (
+            '<https://example.com/guide>; rel="alternate"; hreflang="en", '
+            "</de/guide>; rel=alternate; hreflang=de, "
+            '<https://example.com/next>; rel="next"'
+        )
+        assert parse_link_header(header, f"{BASE}/guide") == {
+            "en": f"{BASE}/guide",
+            "de": f"{BASE}/de/guide",
+        }
+
+
+class TestHreflangAlternates:
+    def test_declarations_sharing_a_url_merge(self):
+        alternates = HreflangAlternates()
+        alternates.add({"en": f"{BASE}/a", "fr": f"{BASE}/a-fr"})
+        alternates.add({"fr": f"{BASE}/a-fr", "de": f"{BASE}/a-de"})
+        alternates.add({"en": f"{BASE}/b", "fr": f"{BASE}/b-fr"})
+        assert len(alternates) == 2
+        assert alternates.group(f"{BASE}/a-de") == {
+            "en": f"{BASE}/a",
+            "fr": f"{BASE}/a-fr",
+            "de": f"{BASE}/a-de",
+        }
+        assert alternates.group(f"{BASE}/a") is alternates.group(f"{BASE}/a-de")
+
+    def test_single_language_declaration_ignored(self):
+        alternates = HreflangAlternates()
+        alternates.add({"en": f"{BASE}/a"})
+        assert len(alternates) == 0
+        assert alternates.group(f"{BASE}/a") is None
+
+    def test_two_groups_joined_by_a_declaration(self):
+        alternates = HreflangAlternates()
+        alternates.add({"en": f"{BASE}/a", "fr": f"{BASE}/a-fr"})
+        alternates.add({"de": f"{BASE}/a-de", "es": f"{BASE}/a-es"})
+        alternates.add({"fr": f"{BASE}/a-fr", "es": f"{BASE}/a-es"})
+        assert len(alternates) == 1
+        assert set(alternates.groups()[0]) == {"en", "fr", "de", "es"}
+
+
+class TestSitemapAlternates:
+    async def test_xhtml_links_of_kept_urls_collected(self):
+        sitemap = (
+            '<?xml version="1.0"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:xhtml="http://www.w3.org/1999/xhtml">'
+            f"<url><loc>{BASE}/docs/a</loc>"
+            f'<xhtml:link rel="alternate" hreflang="en" href="{BASE}/docs/a"/>'
+            f'<xhtml:link rel="alternate" hreflang="ja" href="{BASE}/docs/a?hl=ja"/>'
+            "</url>"
+            f"<url><loc>{BASE}/blog/x</loc>"
+            f'<xhtml:link rel="alternate" hreflang="en" href="{BASE}/blog/x"/>'
+            f'<xhtml:link rel="alternate" hreflang="ja" href="{BASE}/blog/x-ja"/>'
+            "</url>"
+            "</urlset>"
+        )
+        client = _client({f"{BASE}/sitemap.xml": sitemap})
+        alternates = HreflangAlternates()
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            urls = await try_sitemap(f"{BASE}/docs/", alternates=alternates)
+
+        assert urls == [f"{BASE}/docs/a"]
+        # The /blog/ entry was filtered out, so its group is not recorded
+        assert alternates.groups() == [
+            {"en": f"{BASE}/docs/a", "ja": f"{BASE}/docs/a?hl=ja"}
+        ]
+
+
+class TestCrawlAlternates:
+    async def test_head_and_header_alternates_collected(self):
+        pages = {
+            f"{BASE}/": (
+                '<head><link rel="alternate" hreflang="en" href="/">'
+                '<link rel="alternate" hreflang="fr" href="/accueil"></head>'
+                '<a href="/guide">g</a>'
+            ),
+            f"{BASE}/guide": "<p>no head links</p>",
+        }
+        headers = {
+            f"{BASE}/guide": {
+                "link": '</guide>; rel="alternate"; hreflang="en", '
+                '</guide-fr>; rel="alternate"; hreflang="fr"'
+            }
+        }
+        alternates = HreflangAlternates()
+        with patch(
+            "src.crawler.discovery.httpx.AsyncClient",
+            return_value=_client(pages, headers),
+        ):
+            await recursive_crawl(
+                f"{BASE}/", max_depth=2, concurrency=1, alternates=alternates
+            )
+
+        assert alternates.group(f"{BASE}/accueil") == {
+            "en": BASE,
+            "fr": f"{BASE}/accueil",
+        }
+        assert alternates.group(f"{BASE}/guide-fr") == {
+            "en": f"{BASE}/guide",
+            "fr": f"{BASE}/guide-fr",
+        }
+
+    async def test_root_group_matches_filter_urls_output(self):
+        head = (
+            '<head><link rel="alternate" hreflang="en" href="/">'
+            '<link rel="alternate" hreflang="fr" href="/fr/">'
+            '<link rel="alternate" hreflang="de" href="/de/"></head>'
+        )
+        pages = {
+            f"{BASE}/": head + '<a href="/fr/">fr</a><a href="/de/">de</a>',
+            f"{BASE}/fr": head,
+            f"{BASE}/de": head,
+        }
+        alternates = HreflangAlternates()
+        with patch(
+            "src.crawler.discovery.httpx.AsyncClient", return_value=_client(pages)
+        ):
+            urls = await recursive_crawl(
+                f"{BASE}/", max_depth=2, concurrency=1, alternates=alternates
+            )
+
+        report = HreflangReport()
+        kept = filter_hreflang(
+            filter_urls(urls, f"{BASE}/", language="all"),
+            "en",
+            alternates,
+            report=report,
+        )
+        assert kept == [BASE]
+        assert report.dropped == 2
+
+
+class TestCachedAlternates:
+    async def test_cache_hit_restores_groups(self, tmp_path):
+        cache = DiscoveryCache(tmp_path / "discovery.json")
+        group = {"en": f"{BASE}/a", "fr": f"{BASE}/a-fr"}
+        cache.put(
+            cache.key(BASE, 2, True),
+            DiscoveryEntry([f"{BASE}/a"], "sitemap", alternates=[group]),
+        )
+
+        report = DiscoveryReport()
+        urls = await discover_urls(
+            BASE,
+            2,
+            discovery_cache=DiscoveryCache(tmp_path / "discovery.json"),
+            report=report,
+        )
+
+        assert urls == [f"{BASE}/a"]
+        assert report.from_cache
+        assert report.alternates.group(f"{BASE}/a-fr") == group
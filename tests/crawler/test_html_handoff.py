@@ -0,0 +1,115 @@
+"""Unit tests for handing discovery-fetched HTML over to scraping.
+
+Tests cover:
+- HtmlHandoff memory budget, spill to its own directory (with ETag) and drop
+- recursive_crawl feeding crawled HTML pages to the handoff
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.crawler.discovery import recursive_crawl
+from src.crawler.html_handoff import HtmlHandoff
+from src.scraper.cache import PageCache
+
+
+class TestHtmlHandoff:
+    def test_take_returns_page_once_and_releases_memory(self):
+        handoff = HtmlHandoff()
+        handoff.put("https://example.com/a", "<p>a</p>", etag='"1"')
+        assert handoff.memory_bytes == len("<p>a</p>")
+
+        page = handoff.take("https://example.com/a")
+        assert page is not None
+        assert (page.html, page.etag) == ("<p>a</p>", '"1"')
+        assert handoff.take("https://example.com/a") is None
+        assert handoff.memory_bytes == 0
+        assert (handoff.kept, handoff.served) == (1, 1)
+
+    def test_urls_matched_in_normalized_form(self):
+        handoff = HtmlHandoff()
+        handoff.put("https://example.com/a/#intro", "<p>a</p>")
+        assert handoff.take("https://example.com/a") is not None
+
+    def test_duplicate_put_ignored(self):
+        handoff = HtmlHandoff()
+        handoff.put("https://example.com/a", "<p>first</p>")
+        handoff.put("https://example.com/a", "<p>second</p>")
+        assert handoff.kept == 1
+        assert handoff.take("https://example.com/a").html == "<p>first</p>"
+
+    def test_over_budget_spills_to_disk_with_etag(self, tmp_path):
+        spill_dir = tmp_path / "cache" / "handoff"
+        handoff = HtmlHandoff(spill_dir=spill_dir, max_bytes=10)
+        handoff.put("https://example.com/a", "x" * 8)
+        handoff.put("https://example.com/b", "y" * 8, etag='"b"')
+
+        assert (handoff.kept, handoff.spilled, handoff.dropped) == (1, 1, 0)
+        page = handoff.take("https://example.com/b")
+        assert (page.html, page.etag) == ("y" * 8, '"b"')
+        assert handoff.served == 1
+        # Taken pages are deleted; the page cache never sees them
+        assert handoff.take("https://example.com/b") is None
+        assert list(spill_dir.iterdir()) == []
+        assert PageCache(tmp_path / "cache").get("https://example.com/b") is None
+
+    def test_clear_deletes_spilled_pages(self, tmp_path):
+        spill_dir = tmp_path / "handoff"
+        handoff = HtmlHandoff(spill_dir=spill_dir, max_bytes=0)
+        handoff.put("https://example.com/a", "<p>a</p>")
+        assert len(list(spill_dir.iterdir())) == 1
+        handoff.clear()
+        assert list(spill_dir.iterdir()) == []
+        assert handoff.take("https://example.com/a") is None
+
+    def test_over_budget_without_cache_drops(self):
+        handoff = HtmlHandoff(max_bytes=10)
+        handoff.put("https://example.com/a", "x" * 8)
+        handoff.put("https://example.com/b", "y" * 8)
+        assert (handoff.kept, handoff.dropped) == (1, 1)
+        assert handoff.take("https://example.com/b") is None
+
+    def test_clear_releases_untaken_pages(self):
+        handoff = HtmlHandoff()
+        handoff.put("https://example.com/a", "<p>a</p>")
+        handoff.clear()
+        assert handoff.memory_bytes == 0
+        assert handoff.take("https://example.com/a") is None
+
+
+class TestCrawlFeedsHandoff:
+    async def test_crawled_html_pages_handed_over(self):
+        pages = {
+            "https://example.com/": '<a href="/a">a</a><a href="/feed.xml">f</a>',
+            "https://example.com/a": "<p>page a</p>",
+        }
+
+        async def fake_get(url, **kwargs):
+            resp = MagicMock()
+            resp.status_code = 200
+            is_xml = url.endswith(".xml")
+            resp.headers = {
+                "content-type": "application/xml" if is_xml else "text/html",
+                "etag": f'"{url[-1]}"',
+            }
+            resp.text = pages.get(url, "<rss/>")
+            return resp
+
+        client = AsyncMock()
+        client.get = fake_get
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+
+        handoff = HtmlHandoff()
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                await recursive_crawl(
+                    "https://example.com/", max_depth=2, concurrency=1, handoff=handoff
+                )
+
+        # Non-HTML responses are not kept
+        assert handoff.kept == 2
+        page = handoff.take("https://example.com/a")
+        assert (page.html, page.etag) == ("<p>page a</p>", '"a"')
+        assert (
+            handoff.take("https://example.com/").html == pages["https://example.com/"]
+        )
@@ -10,13 +10,19 @@ Tests cover:
 - Crawl-delay parsing
 - is_allowed checks
 - Error handling
+- Wildcard (``*``, ``$``) rules and RFC 9309 grouping
+- The process-wide robots_cache shared with try_sitemap
 """
 
+import asyncio
+import time
+
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 
-from src.crawler.robots import RobotsParser
+from src.crawler.discovery import try_sitemap
+from src.crawler.robots import RobotsCache, RobotsMatcher, RobotsParser, robots_cache
 
 
 class TestRobotsParser:
@@ -421,3 +427,222 @@ class TestAllowDirective:
         assert parser.is_allowed("https://example.com/api/v1/users") is True
         assert parser.is_allowed("https://example.com/api/v2/users") is False
         assert parser.is_allowed("https://example.com/admin/") is False
+
+
+class TestWildcardRules:
+    """``*`` / ``$`` wildcards, case-sensitive paths and longest-match precedence."""
+
+    def test_path_case_preserved(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: *\nDisallow: /Private/\n")
+        assert parser.disallowed == ["/Private/"]
+        assert parser.is_allowed("https://example.com/Private/x") is False
+        assert parser.is_allowed("https://example.com/private/x") is True
+
+    def test_star_matches_any_run(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: *\nDisallow: /*/draft/\nDisallow: /*.pdf\n")
+        assert parser.is_allowed("https://example.com/docs/v2/draft/a") is False
+        assert parser.is_allowed("https://example.com/files/guide.pdf") is False
+        assert parser.is_allowed("https://example.com/files/guide.pdf.html") is False
+        assert parser.is_allowed("https://example.com/docs/drafts") is True
+
+    def test_dollar_anchors_end(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: *\nDisallow: /*.pdf$\nDisallow: /exact$\n")
+        assert parser.is_allowed("https://example.com/a/guide.pdf") is False
+        assert parser.is_allowed("https://example.com/a/guide.pdf.html") is True
+        assert parser.is_allowed("https://example.com/exact") is False
+        assert parser.is_allowed("https://example.com/exact/more") is True
+
+    def test_query_string_matched(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: *\nDisallow: /*?print=\nDisallow: /search?\n")
+        assert parser.is_allowed("https://example.com/guide?print=1") is False
+        assert parser.is_allowed("https://example.com/search?q=x") is False
+        assert parser.is_allowed("https://example.com/search") is True
+        assert parser.is_allowed("https://example.com/guide#print=1") is True
+
+    def test_longest_rule_wins_across_trie_and_wildcards(self):
+        parser = RobotsParser()
+        parser._parse(
+            "User-agent: *\n"
+            "Disallow: /docs/\n"
+            "Allow: /docs/*/public\n"
+            "Disallow: /docs/v1/public/secret\n"
+        )
+        assert parser.is_allowed("https://example.com/docs/v2/public/a") is True
+        assert parser.is_allowed("https://example.com/docs/v1/public/secret") is False
+        assert parser.is_allowed("https://example.com/docs/v2/internal") is False
+
+    def test_leading_star_matches_from_root(self):
+        matcher = RobotsMatcher(allowed=[], disallowed=["*private", "/a/*/b$"])
+        assert matcher.is_allowed("/docs/private/x") is False
+        assert matcher.is_allowed("/a/x/y/b") is False
+        assert matcher.is_allowed("/a/x/b/c") is True
+
+    def test_allow_wins_tie_with_wildcard(self):
+        matcher = RobotsMatcher(allowed=["/a*"], disallowed=["/a*", "/ab"])
+        assert matcher.is_allowed("/ab") is True  # /a* and /ab tie on length
+        matcher = RobotsMatcher(allowed=["/a*"], disallowed=["/abc"])
+        assert matcher.is_allowed("/abcd") is False
+
+    def test_reassigned_rules_recompiled(self):
+        parser = RobotsParser()
+        assert parser.is_allowed("https://example.com/x") is True
+        parser.disallowed = ["/x"]
+        assert parser.is_allowed("https://example.com/x") is False
+        parser.allowed = ["/x"]
+        assert parser.is_allowed("https://example.com/x") is True
+
+
+class TestGrouping:
+    """RFC 9309 groups, comments and Sitemap lines."""
+
+    def test_consecutive_user_agents_share_a_group(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: GoogleBot\nUser-agent: *\nDisallow: /shared/\n")
+        assert parser.disallowed == ["/shared/"]
+
+    def test_own_group_replaces_star_group(self):
+        parser = RobotsParser()
+        parser._parse(
+            "User-agent: *\nDisallow: /all/\nCrawl-delay: 1\n\n"
+            "User-agent: DocRawl\nDisallow: /mine/\nCrawl-delay: 3\n"
+        )
+        assert parser.disallowed == ["/mine/"]
+        assert parser.crawl_delay == 3.0
+
+    def test_star_groups_merged(self):
+        parser = RobotsParser()
+        parser._parse(
+            "User-agent: *\nDisallow: /a/\n\n"
+            "User-agent: BadBot\nDisallow: /\n\n"
+            "User-agent: *\nDisallow: /b/\n"
+        )
+        assert parser.disallowed == ["/a/", "/b/"]
+
+    def test_inline_comments_stripped(self):
+        parser = RobotsParser()
+        parser._parse("User-agent: * # everyone\nDisallow: /tmp/ # scratch\n")
+        assert parser.disallowed == ["/tmp/"]
+
+    def test_sitemaps_read_outside_groups(self):
+        parser = RobotsParser()
+        parser._parse(
+            "Sitemap: https://example.com/a.xml\n"
+            "User-agent: BadBot\nDisallow: /\n"
+            "SITEMAP: https://example.com/b.xml\n"
+        )
+        assert parser.sitemaps == [
+            "https://example.com/a.xml",
+            "https://example.com/b.xml",
+        ]
+
+
+def _robots_client(body: str | None, calls: list[str]):
+    """Mock AsyncClient serving *body* as robots.txt (None: 404); records robots fetches."""
+
+    async def fake_get(url, **kwargs):
+        resp = MagicMock()
+        if url.endswith("/robots.txt"):
+            calls.append(url)
+            resp.status_code = 200 if body is not None else 404
+            resp.text = body or ""
+        else:
+            resp.status_code = 404
+            resp.text = ""
+        resp.content = resp.text.encode()
+        resp.headers = {}
+        return resp
+
+    client = AsyncMock()
+    client.get = fake_get
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    return client
+
+
+class TestRobotsCache:
+    """Process-wide per-host cache shared by discovery and filtering."""
+
+    async def test_one_fetch_for_discovery_and_filtering(self):
+        calls: list[str] = []
+        client = _robots_client(
+            "User-agent: *\nDisallow: /private/\n"
+            "Sitemap: https://example.com/custom.xml\n",
+            calls,
+        )
+        with (
+            patch("src.crawler.discovery.httpx.AsyncClient", return_value=client),
+            patch("src.crawler.robots.httpx.AsyncClient", return_value=client),
+        ):
+            await try_sitemap("https://example.com/")
+            parser = RobotsParser()
+            assert await parser.load("https://example.com/docs/") is True
+            assert await RobotsParser().load("https://EXAMPLE.com/other") is True
+
+        assert calls == ["https://example.com/robots.txt"]
+        assert parser.is_allowed("https://example.com/private/x") is False
+        assert parser.sitemaps == ["https://example.com/custom.xml"]
+
+    async def test_hosts_cached_separately(self):
+        calls: list[str] = []
+        client = _robots_client("User-agent: *\nDisallow: /\n", calls)
+        cache = RobotsCache()
+        await cache.get("https://a.example.com/x", client=client)
+        await cache.get("https://b.example.com/x", client=client)
+        await cache.get("http://a.example.com/x", client=client)
+        assert len(calls) == 3
+
+    async def test_entry_expires_after_ttl(self):
+        calls: list[str] = []
+        client = _robots_client("User-agent: *\nDisallow: /\n", calls)
+        cache = RobotsCache(ttl=60)
+        await cache.get("https://example.com/", client=client)
+        with patch("src.crawler.robots.time.time", return_value=time.time() + 61):
+            await cache.get("https://example.com/", client=client)
+        assert len(calls) == 2
+
+    async def test_missing_robots_cached(self):
+        calls: list[str] = []
+        client = _robots_client(None, calls)
+        cache = RobotsCache()
+        assert await cache.get("https://example.com/", client=client) is None
+        assert await cache.get("https://example.com/", client=client) is None
+        assert cache.fetches == 1
+
+    async def test_errors_not_cached(self):
+        client = AsyncMock()
+        client.get.side_effect = httpx.ConnectError("connection failed")
+        cache = RobotsCache()
+        assert await cache.get("https://example.com/", client=client) is None
+        assert await cache.get("https://example.com/", client=client) is None
+        assert cache.fetches == 2
+
+    async def test_concurrent_gets_share_one_fetch(self):
+        calls: list[str] = []
+        client = _robots_client("User-agent: *\nDisallow: /x\n", calls)
+        results = await asyncio.gather(
+            *(robots_cache.get("https://example.com/", client=client) for _ in range(5))
+        )
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    async def test_locks_bounded_by_entries(self):
+        calls: list[str] = []
+        client = _robots_client("User-agent: *\nDisallow: /\n", calls)
+        cache = RobotsCache()
+        with patch("src.crawler.robots.MAX_ENTRIES", 3):
+            for i in range(10):
+                await cache.get(f"https://h{i}.example.com/", client=client)
+        assert len(cache._entries) == 3
+        assert set(cache._locks) <= set(cache._entries)
+
+    async def test_lock_dropped_after_failed_fetch(self):
+        client = AsyncMock()
+        client.get.side_effect = httpx.ConnectError("connection failed")
+        cache = RobotsCache()
+        for i in range(5):
+            assert await cache.get(f"https://h{i}.example.com/", client=client) is None
+        assert cache._locks == {}
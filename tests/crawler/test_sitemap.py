@@ -0,0 +1,354 @@
+"""Unit tests for sitemap discovery in src/crawler/discovery.py — try_sitemap().
+
+Tests cover:
+- Child sitemaps fetched concurrently, bounded by the semaphore
+- Each sitemap URL fetched once (duplicates, robots.txt repeats, cycles)
+- Per-sitemap fetch/parse timing reports
+- Streaming parse: chunked gunzip, XXE safety, on-the-fly path filtering
+- Lazy index expansion: name pruning and sampled early stop
+"""
+
+import asyncio
+import gzip
+import zlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from defusedxml import EntitiesForbidden
+
+from src.crawler.discovery import (
+    SitemapReport,
+    iter_sitemap_chunks,
+    off_topic_sitemap,
+    parse_sitemap_stream,
+    try_sitemap,
+)
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(*locs: str) -> str:
+    body = "".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'
+
+
+def _index(*locs: str) -> str:
+    body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0"?><sitemapindex {NS}>{body}</sitemapindex>'
+
+
+def _client(pages: dict[str, str], delay: float = 0.0, log: list | None = None):
+    """Mock AsyncClient serving exact-URL bodies; everything else is 404."""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def fake_get(url, **kwargs):
+        if log is not None:
+            log.append(url)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            resp = MagicMock()
+            body = pages.get(url)
+            resp.status_code = 200 if body is not None else 404
+            resp.text = body or ""
+            resp.content = (body or "").encode()
+            return resp
+        finally:
+            state["in_flight"] -= 1
+
+    client = AsyncMock()
+    client.get = fake_get
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    return client, state
+
+
+BASE = "https://example.com"
+
+
+class TestConcurrentSitemapFetching:
+    """Sitemap indexes fan out to their children concurrently."""
+
+    async def test_children_fetched_concurrently_and_bounded(self):
+        children = [f"{BASE}/sm{i}.xml" for i in range(12)]
+        pages = {f"{BASE}/sitemap.xml": _index(*children)}
+        pages.update({c: _urlset(f"{BASE}/p{i}") for i, c in enumerate(children)})
+        client, state = _client(pages, delay=0.01)
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/", concurrency=4)
+
+        assert sorted(result) == sorted(f"{BASE}/p{i}" for i in range(12))
+        assert state["peak"] == 4
+
+    async def test_each_sitemap_fetched_once(self):
+        """Repeated children, robots.txt repeats and index cycles are fetched once."""
+        child = f"{BASE}/child.xml"
+        pages = {
+            f"{BASE}/robots.txt": f"Sitemap: {BASE}/sitemap.xml\nSitemap: {child}\n",
+            f"{BASE}/sitemap.xml": _index(child, child, f"{BASE}/sitemap.xml"),
+            child: _urlset(f"{BASE}/a"),
+        }
+        log: list[str] = []
+        client, _ = _client(pages, log=log)
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/")
+
+        assert result == [f"{BASE}/a"]
+        assert log.count(f"{BASE}/sitemap.xml") == 1
+        assert log.count(child) == 1
+
+    async def test_failed_child_does_not_stop_siblings(self):
+        children = [f"{BASE}/ok.xml", f"{BASE}/broken.xml", f"{BASE}/missing.xml"]
+        pages = {
+            f"{BASE}/sitemap.xml": _index(*children),
+            children[0]: _urlset(f"{BASE}/ok"),
+            children[1]: "<urlset><url>",
+        }
+        client, _ = _client(pages)
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/")
+
+        assert result == [f"{BASE}/ok"]
+
+
+class TestSitemapReport:
+    """try_sitemap(report=...) records per-sitemap timing and outcome."""
+
+    async def test_report_per_sitemap(self):
+        child = f"{BASE}/child.xml"
+        pages = {
+            f"{BASE}/sitemap.xml": _index(child),
+            child: _urlset(f"{BASE}/a", f"{BASE}/b"),
+        }
+        client, _ = _client(pages)
+        report: list[SitemapReport] = []
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            await try_sitemap(f"{BASE}/", report=report)
+
+        by_url = {r.url: r for r in report}
+        assert by_url[f"{BASE}/sitemap.xml"].children == 1
+        assert by_url[child].urls == 2
+        assert by_url[child].size == len(pages[child])
+        assert by_url[child].fetch_time >= 0 and by_url[child].parse_time >= 0
+        assert by_url[f"{BASE}/sitemap_index.xml"].status == "not_found"
+
+
+class TestStreamingSitemapParser:
+    """parse_sitemap_stream / iter_sitemap_chunks never build a full tree."""
+
+    def test_locs_split_across_chunks(self):
+        xml = _urlset(*(f"{BASE}/page{i}" for i in range(50))).encode()
+        found: list[str] = []
+
+        children = parse_sitemap_stream(iter_sitemap_chunks(xml, 7), found.append)
+
+        assert children == []
+        assert found == [f"{BASE}/page{i}" for i in range(50)]
+
+    def test_index_children_and_whitespace(self):
+        xml = _index(f" {BASE}/a.xml\n", f"{BASE}/b.xml").encode()
+        found: list[str] = []
+
+        children = parse_sitemap_stream([xml], found.append)
+
+        assert children == [f"{BASE}/a.xml", f"{BASE}/b.xml"]
+        assert found == []
+
+    def test_gzip_streamed_in_bounded_chunks(self):
+        xml = _urlset(*(f"{BASE}/p{i}" for i in range(2000))).encode()
+        data = gzip.compress(xml)
+
+        chunks = list(iter_sitemap_chunks(data, 1024))
+
+        assert b"".join(chunks) == xml
+        assert max(len(c) for c in chunks) <= 1024
+
+    def test_multi_member_gzip(self):
+        data = gzip.compress(b"<a>") + gzip.compress(b"</a>")
+        assert b"".join(iter_sitemap_chunks(data, 4)) == b"<a></a>"
+
+    def test_truncated_and_corrupt_gzip_raise(self):
+        data = gzip.compress(_urlset(f"{BASE}/a").encode())
+        with pytest.raises(EOFError):
+            list(iter_sitemap_chunks(data[:-10]))
+        with pytest.raises(zlib.error):
+            list(iter_sitemap_chunks(data[:10] + b"garbage" * 10))
+
+    def test_entities_rejected(self):
+        """XXE / billion-laughs style entity declarations are refused."""
+        xml = (
+            b'<?xml version="1.0"?><!DOCTYPE u [<!ENTITY x "boom">]>'
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b"<url><loc>&x;</loc></url></urlset>"
+        )
+        with pytest.raises(EntitiesForbidden):
+            parse_sitemap_stream([xml], lambda url: None)
+
+    async def test_gzip_sitemap_filtered_by_path(self):
+        """A served .gz body is gunzipped and path-filtered on the fly."""
+        gz_url = f"{BASE}/docs/sitemap.xml.gz"
+        xml = _urlset(f"{BASE}/docs/a", f"{BASE}/blog/b", "https://other.com/docs/c")
+        pages = {f"{BASE}/robots.txt": f"Sitemap: {gz_url}\n"}
+        client, _ = _client(pages)
+        base_get = client.get
+
+        async def get(url, **kwargs):
+            if url == gz_url:
+                return MagicMock(status_code=200, content=gzip.compress(xml.encode()))
+            return await base_get(url, **kwargs)
+
+        client.get = get
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/docs/")
+
+        assert result == [f"{BASE}/docs/a"]
+
+    async def test_malformed_xml_keeps_no_partial_urls(self):
+        broken = _urlset(f"{BASE}/a", f"{BASE}/b")[:-5]
+        client, _ = _client({f"{BASE}/sitemap.xml": broken})
+        report: list[SitemapReport] = []
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/", report=report)
+
+        assert result == []
+        assert report[0].status == "invalid"
+
+
+class _StreamResponse:
+    """Minimal httpx streaming response serving *body* in small pieces."""
+
+    def __init__(self, body: str | None, chunk: int = 256):
+        self.status_code = 200 if body is not None else 404
+        self._body = (body or "").encode()
+        self._chunk = chunk
+        self.headers = {"content-length": str(len(self._body))}
+        self.num_bytes_downloaded = 0
+
+    async def aiter_bytes(self):
+        for i in range(0, len(self._body), self._chunk):
+            piece = self._body[i : i + self._chunk]
+            self.num_bytes_downloaded += len(piece)
+            yield piece
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+def _streaming_client(pages: dict[str, str], log: list):
+    client, _ = _client(pages, log=log)
+
+    def stream(method, url, **kwargs):
+        log.append(url)
+        return _StreamResponse(pages.get(url))
+
+    client.stream = stream
+    return client
+
+
+class TestLazyIndexExpansion:
+    """Child sitemaps that cannot hold base-path URLs are skipped or abandoned."""
+
+    def test_off_topic_sitemap_names(self):
+        assert off_topic_sitemap(f"{BASE}/sitemap-blog-3.xml", "/docs") == "blog"
+        assert off_topic_sitemap(f"{BASE}/post-sitemap.xml.gz", "/docs") == "post"
+        assert off_topic_sitemap(f"{BASE}/careers.xml", "/docs/x") == "careers"
+        assert off_topic_sitemap(f"{BASE}/sitemap-docs.xml", "/docs") is None
+        assert off_topic_sitemap(f"{BASE}/sitemap-2.xml", "/docs") is None
+        # The base path itself is about that section
+        assert off_topic_sitemap(f"{BASE}/blog-sitemap.xml", "/blog") is None
+
+    async def test_children_pruned_by_name(self, caplog):
+        children = [
+            f"{BASE}/sitemap-blog.xml",
+            f"{BASE}/careers.xml",
+            f"{BASE}/docs.xml",
+        ]
+        pages = {
+            f"{BASE}/sitemap.xml": _index(*children),
+            children[0]: _urlset(f"{BASE}/blog/a"),
+            children[1]: _urlset(f"{BASE}/careers/b"),
+            children[2]: _urlset(f"{BASE}/docs/c"),
+        }
+        log: list[str] = []
+        client, _ = _client(pages, log=log)
+        report: list[SitemapReport] = []
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with caplog.at_level("INFO", logger="src.crawler.discovery"):
+                result = await try_sitemap(f"{BASE}/docs/", report=report)
+
+        assert result == [f"{BASE}/docs/c"]
+        assert children[0] not in log and children[1] not in log
+        status = {r.url: r.status for r in report}
+        assert status[children[0]] == status[children[1]] == "pruned"
+        assert "2 child sitemaps skipped by name" in caplog.text
+        assert "saved 2 requests" in caplog.text
+
+    async def test_no_pruning_for_root_base_or_without_path_filter(self):
+        child = f"{BASE}/sitemap-blog.xml"
+        pages = {f"{BASE}/sitemap.xml": _index(child), child: _urlset(f"{BASE}/blog/a")}
+        client, _ = _client(pages)
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            root = await try_sitemap(f"{BASE}/")
+            unfiltered = await try_sitemap(f"{BASE}/docs/", filter_by_path=False)
+
+        assert root == unfiltered == [f"{BASE}/blog/a"]
+
+    async def test_early_stop_abandons_irrelevant_child(self):
+        marketing = f"{BASE}/sitemap-2.xml"
+        docs = f"{BASE}/sitemap-3.xml"
+        pages = {
+            f"{BASE}/sitemap.xml": _index(marketing, docs),
+            marketing: _urlset(*(f"{BASE}/solutions/p{i}" for i in range(500))),
+            docs: _urlset(*(f"{BASE}/docs/d{i}" for i in range(80))),
+        }
+        log: list[str] = []
+        client = _streaming_client(pages, log)
+        report: list[SitemapReport] = []
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/docs/", report=report, early_stop=True)
+
+        assert sorted(result) == sorted(f"{BASE}/docs/d{i}" for i in range(80))
+        entries = {r.url: r for r in report}
+        assert entries[marketing].status == "stopped"
+        assert 0 < entries[marketing].size < len(pages[marketing])
+        assert entries[marketing].bytes_saved == (
+            len(pages[marketing]) - entries[marketing].size
+        )
+        assert entries[docs].status == "ok"
+        assert entries[docs].urls == 80
+
+    async def test_early_stop_keeps_child_with_relevant_sample(self):
+        """One base-path URL among the first entries is enough to read it all."""
+        child = f"{BASE}/sitemap-1.xml"
+        locs = [f"{BASE}/about/p{i}" for i in range(300)]
+        locs[10] = f"{BASE}/docs/first"
+        locs[-1] = f"{BASE}/docs/last"
+        pages = {f"{BASE}/sitemap.xml": _index(child), child: _urlset(*locs)}
+        client = _streaming_client(pages, [])
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/docs/", early_stop=True)
+
+        assert sorted(result) == [f"{BASE}/docs/first", f"{BASE}/docs/last"]
+
+    async def test_top_level_sitemap_never_stopped(self):
+        locs = [f"{BASE}/about/p{i}" for i in range(300)] + [f"{BASE}/docs/a"]
+        client = _streaming_client({f"{BASE}/sitemap.xml": _urlset(*locs)}, [])
+
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            result = await try_sitemap(f"{BASE}/docs/", early_stop=True)
+
+        assert result == [f"{BASE}/docs/a"]
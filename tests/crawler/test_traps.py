@@ -0,0 +1,110 @@
+"""Unit tests for crawler trap detection.
+
+Tests cover:
+- url_pattern wildcards for numeric, date and ID segments
+- CrawlTrapDetector query-param stripping, repeated segments, query
+  cardinality and per-pattern fan-out, with per-pattern suppressed counts
+- recursive_crawl not spending its URL cap on a pagination trap
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.crawler.discovery import CrawlProgress, recursive_crawl
+from src.crawler.traps import CrawlTrapDetector, url_pattern
+
+
+class TestUrlPattern:
+    def test_dynamic_segments_become_wildcards(self):
+        assert url_pattern("https://x.com/blog/2024/01/15") == "/blog/{n}/{n}/{n}"
+        assert url_pattern("https://x.com/releases/1.4.0") == "/releases/{n}"
+        assert (
+            url_pattern("https://x.com/s/3f2a9c0e-1b2d-4c5e-8f90-123456789abc")
+            == "/s/{id}"
+        )
+
+    def test_words_and_versions_kept(self):
+        assert url_pattern("https://x.com/docs/v2/guide") == "/docs/v2/guide"
+
+    def test_query_reduced_to_sorted_names(self):
+        assert url_pattern("https://x.com/search?q=a&page=2&q=b") == "/search?page&q"
+
+
+class TestCrawlTrapDetector:
+    def test_clean_strips_configured_params(self):
+        traps = CrawlTrapDetector(strip_params=["jsessionid", "utm_*"])
+        assert (
+            traps.clean("https://x.com/a?JSESSIONID=1&utm_source=x&lang=en")
+            == "https://x.com/a?lang=en"
+        )
+        assert traps.clean("https://x.com/a?lang=en") == "https://x.com/a?lang=en"
+        assert traps.clean("https://x.com/a?jsessionid=1") == "https://x.com/a"
+
+    def test_repeated_segments_suppressed(self):
+        traps = CrawlTrapDetector(max_repeats=2)
+        assert traps.admit("https://x.com/docs/api/docs")
+        assert not traps.admit("https://x.com/docs/api/docs/api/docs")
+        assert traps.suppressed == {"/docs/api/docs/api/docs": 1}
+
+    def test_query_cardinality_capped_per_param(self):
+        traps = CrawlTrapDetector(query_values=3, fanout=0)
+        admitted = [
+            traps.admit(f"https://x.com/calendar?month={m}") for m in range(1, 6)
+        ]
+        assert admitted == [True, True, True, False, False]
+        # Other paths keep their own budget
+        assert traps.admit("https://x.com/list?month=9")
+        assert traps.suppressed == {"/calendar?month=*": 2}
+
+    def test_fanout_limited_per_pattern(self):
+        traps = CrawlTrapDetector(fanout=2, query_values=0)
+        for n in range(4):
+            traps.admit(f"https://x.com/page/{n}")
+        assert traps.admit("https://x.com/guide")
+        assert traps.suppressed == {"/page/{n}": 2}
+        assert traps.total_suppressed == 2
+
+    def test_zero_disables_checks(self):
+        traps = CrawlTrapDetector(fanout=0, max_repeats=0, query_values=0)
+        assert all(traps.admit(f"https://x.com/a/a/a?p={n}") for n in range(50))
+        assert not traps.suppressed
+
+
+class TestCrawlSkipsTraps:
+    async def test_pagination_trap_does_not_use_up_the_cap(self):
+        """Endless ?page=N links stop at the cardinality cap; docs still found."""
+
+        async def fake_get(url, **kwargs):
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.headers = {"content-type": "text/html"}
+            page = int(url.rsplit("=", 1)[1]) if "?page=" in url else 0
+            body = f'<a href="/list?page={page + 1}&sessionid=s{page}">next</a>'
+            if url == "https://example.com/":
+                body += '<a href="/docs/guide">g</a><a href="/docs/api">a</a>'
+            resp.text = body
+            return resp
+
+        client = AsyncMock()
+        client.get = fake_get
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=None)
+
+        progress = CrawlProgress()
+        traps = CrawlTrapDetector(query_values=5)
+        with patch("src.crawler.discovery.httpx.AsyncClient", return_value=client):
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                result = await recursive_crawl(
+                    "https://example.com/",
+                    max_depth=50,
+                    concurrency=1,
+                    max_urls=20,
+                    progress=progress,
+                    traps=traps,
+                )
+
+        assert "https://example.com/docs/guide" in result
+        assert "https://example.com/list?page=1" in result  # session ID stripped
+        assert sum("?page=" in url for url in result) == 5
+        assert progress.capped is False
+        assert progress.suppressed == 1
+        assert traps.suppressed == {"/list?page=*": 1}
@@ -7,12 +7,16 @@ lines 60, 84, 270, 298-302, 328, 390, 417->431, 432-443, 454-462, 474->490,
 """
 
 import asyncio
+import json
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from src.api.models import JobRequest
 from src.jobs.manager import Job
 from src.jobs.runner import run_job
+from src.scraper.cache import PageCache
 
 
 # ---------------------------------------------------------------------------
@@ -1859,7 +1863,7 @@ class TestIsCancelledInsideChunkLoop:
         scraper, converter, robots = _base_patches(tmp_path)
 
         # Cancel on the first cleanup call
-        async def _cancel_on_cleanup(chunk, model):
+        async def _cancel_on_cleanup(chunk, model, **kwargs):
             job._cancelled = True
             return "# cleaned"
 
@@ -2230,3 +2234,1114 @@ class TestCancelledDuringPlaywrightRetry:
 
         # Job should not be completed when cancelled during retry
         assert job.status != "completed"
+
+
+# ---------------------------------------------------------------------------
+# 35. table stage — tables rendered deterministically, heavy tier avoided
+# ---------------------------------------------------------------------------
+
+
+class TestTableStageHeavyAvoided:
+    """run_job wraps the converter in TableAwareConverter and reports savings."""
+
+    async def test_rowspan_table_counts_heavy_call_avoided(self, tmp_path):
+        req = _make_request(
+            output_path=str(tmp_path / "tables"),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        html = (
+            "<h1>Options</h1><p>"
+            + "Documentation text about options. " * 80
+            + "</p><table><tr><th>Name</th><th>Value</th></tr>"
+            "<tr><td rowspan='2'>depth</td><td>1</td></tr><tr><td>2</td></tr></table>"
+        )
+        scraper, _converter, robots = _base_patches(tmp_path, scraper_html=html)
+
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                    with patch(
+                        "src.jobs.runner.cleanup_markdown",
+                        new=AsyncMock(side_effect=lambda chunk, *a, **kw: chunk),
+                    ):
+                        with patch("src.jobs.runner.save_job_state"):
+                            await run_job(
+                                job, resume_urls=["https://example.com/page1"]
+                            )
+
+        assert job.status == "completed"
+        assert job.tables_rendered == 1
+        assert job.heavy_calls_avoided == 1
+        done = [
+            call.args[1]
+            for call in job.emit_event.call_args_list
+            if call.args[0] == "job_done"
+        ][0]
+        assert done["tables_rendered"] == 1
+        assert done["heavy_calls_avoided"] == 1
+        saved = (tmp_path / "tables").rglob("*.md")
+        assert any("| depth | 2 |" in p.read_text() for p in saved)
+
+    @pytest.mark.parametrize("pipeline", [False, True])
+    async def test_fast_path_tables_use_job_converter(self, tmp_path, pipeline):
+        """Fast-path pages go through the job's converter chain and are counted."""
+        from src.scraper.converters.markdownify_converter import MarkdownifyConverter
+        from src.scraper.page import convert_html_fast
+
+        req = _make_request(
+            output_path=str(tmp_path / "tables-fast"),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+            use_http_fast_path=True,
+            use_pipeline_mode=pipeline,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        html = (
+            "<h1>Options</h1><p>"
+            + "Documentation text about options. " * 80
+            + "</p><table><tr><th>Name</th><th>Value</th></tr>"
+            "<tr><td rowspan='2'>depth</td><td>1</td></tr><tr><td>2</td></tr></table>"
+        )
+        scraper, _converter, robots = _base_patches(tmp_path)
+        inner = MagicMock(wraps=MarkdownifyConverter())
+        chains = []
+
+        async def fast(url, info=None, converter=None):
+            chains.append(converter)
+            return convert_html_fast(html, info=info, converter=converter)
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=inner),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.fetch_html_fast", new=fast),
+            patch(
+                "src.jobs.runner.cleanup_markdown",
+                new=AsyncMock(side_effect=lambda chunk, *a, **kw: chunk),
+            ),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job, resume_urls=["https://example.com/page1"])
+
+        scraper.get_html.assert_not_called()
+        assert chains[0].inner.inner is inner
+        inner.convert.assert_called_once()
+        assert job.tables_rendered == 1
+        assert job.heavy_calls_avoided == 1
+
+    async def test_restored_math_is_not_sent_to_latex_repair(self, tmp_path):
+        """Pages whose math was restored to TeX are profiled without LaTeX."""
+        req = _make_request(
+            output_path=str(tmp_path / "math"),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        html = (
+            "<p>"
+            + "Documentation text about norms. " * 80
+            + '<span class="docrawl-tex" data-display="false">\\frac{a}{b}</span>'
+            + "</p>"
+        )
+        scraper, _converter, robots = _base_patches(tmp_path, scraper_html=html)
+        cleanup = AsyncMock(side_effect=lambda chunk, *a, **kw: chunk)
+
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                    with patch("src.jobs.runner.cleanup_markdown", new=cleanup):
+                        with patch("src.jobs.runner.save_job_state"):
+                            await run_job(
+                                job, resume_urls=["https://example.com/page1"]
+                            )
+
+        assert job.math_restored == 1
+        assert "$\\frac{a}{b}$" in cleanup.call_args.args[0]
+        assert cleanup.call_args.kwargs["profile"].has_latex is False
+
+    @pytest.mark.parametrize("pipeline", [False, True])
+    async def test_fast_path_math_is_reported(self, tmp_path, pipeline):
+        """Math restored by the HTTP fast-path converter counts like Playwright's."""
+        from src.scraper.page import convert_html_fast
+
+        req = _make_request(
+            output_path=str(tmp_path / "math-fast"),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+            use_http_fast_path=True,
+            use_pipeline_mode=pipeline,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        html = (
+            "<p>"
+            + "Documentation text about norms. " * 80
+            + '<span class="docrawl-tex" data-display="false">\\frac{a}{b}</span>'
+            + "</p>"
+        )
+        scraper, _converter, robots = _base_patches(tmp_path)
+        cleanup = AsyncMock(side_effect=lambda chunk, *a, **kw: chunk)
+
+        async def fast(url, info=None, converter=None):
+            return convert_html_fast(html, info=info, converter=converter)
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.fetch_html_fast", new=fast),
+            patch("src.jobs.runner.cleanup_markdown", new=cleanup),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job, resume_urls=["https://example.com/page1"])
+
+        scraper.get_html.assert_not_called()
+        assert job.math_restored == 1
+        assert cleanup.call_args.kwargs["profile"].has_latex is False
+
+    async def test_chunks_without_restored_math_keep_latex_detection(self, tmp_path):
+        """Only chunks holding restored TeX skip LaTeX detection; others on the page don't."""
+        req = _make_request(
+            output_path=str(tmp_path / "math-chunks"),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        html = (
+            "<h2>Restored</h2><p>"
+            + "Documentation text about norms. " * 80
+            + '<span class="docrawl-tex" data-display="false">\\frac{a}{b}</span>'
+            + "</p><h2>Garbled</h2><p>"
+            + "More documentation text. " * 200
+            + "\\begin{align} x \\end{align}</p>"
+        )
+        scraper, _converter, robots = _base_patches(tmp_path, scraper_html=html)
+        cleanup = AsyncMock(side_effect=lambda chunk, *a, **kw: chunk)
+
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                    with patch("src.jobs.runner.cleanup_markdown", new=cleanup):
+                        with patch("src.jobs.runner.save_job_state"):
+                            await run_job(
+                                job, resume_urls=["https://example.com/page1"]
+                            )
+
+        assert job.math_restored == 1
+        profiles = {
+            key: c.kwargs["profile"]
+            for c in cleanup.call_args_list
+            for key, marker in (("restored", "$\\frac"), ("garbled", "\\begin{align}"))
+            if marker in c.args[0]
+        }
+        assert profiles["restored"].has_latex is False
+        assert profiles["garbled"].has_latex is True
+
+
+# ---------------------------------------------------------------------------
+# 36. cleanup effectiveness — learned per-site skip threshold
+# ---------------------------------------------------------------------------
+
+
+class TestLearnedCleanupSkips:
+    """Sites where cleanup is a no-op stop sending long clean chunks to the LLM."""
+
+    async def _run(self, tmp_path, name, cleanup):
+        req = _make_request(
+            output_path=str(tmp_path / name),
+            crawl_model=None,
+            pipeline_model="ollama/qwen3:14b",
+            reasoning_model=None,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, _converter, robots = _base_patches(
+            tmp_path, scraper_html="<p>" + "Clean documentation prose. " * 120 + "</p>"
+        )
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                    with patch("src.jobs.runner.cleanup_markdown", new=cleanup):
+                        with patch("src.jobs.runner.save_job_state"):
+                            await run_job(
+                                job, resume_urls=["https://example.com/page1"]
+                            )
+        return job
+
+    async def test_noop_site_is_recorded_then_skipped(self, tmp_path):
+        from src.llm.cleanup_stats import MIN_SAMPLES, cleanup_stats
+
+        noop = AsyncMock(side_effect=lambda chunk, *a, **kw: chunk)
+        job = await self._run(tmp_path, "first", noop)
+        assert noop.await_count == 1
+        assert cleanup_stats.site_summary("example.com")["samples"] == 1
+        assert job.cleanup_learned_skips == 0
+
+        for _ in range(MIN_SAMPLES):
+            cleanup_stats.record("example.com", "cleanup/plain", 0.0)
+        noop.reset_mock()
+        job = await self._run(tmp_path, "second", noop)
+        noop.assert_not_called()
+        assert job.cleanup_learned_skips == 1
+        done = [
+            c.args[1] for c in job.emit_event.call_args_list if c.args[0] == "job_done"
+        ][0]
+        assert done["cleanup_learned_skips"] == 1
+        assert done["cleanup_stats"]["skip_threshold"] > 2000
+
+
+class TestStreamedLlmFilter:
+    """Accepted URLs are scraped while LLM filtering is still running."""
+
+    URLS = [f"https://example.com/p{i}" for i in range(4)]
+
+    async def _run(self, tmp_path, name, llm_filter, fetched, **overrides):
+        req = _make_request(
+            output_path=str(tmp_path / name),
+            crawl_model="ollama/qwen3:14b",
+            use_http_fast_path=True,
+            pipeline_model=None,
+            **overrides,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+
+        async def fetch(url, **kwargs):
+            fetched.append(url)
+            return "# x"
+
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.get_converter", return_value=converter):
+                    with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                        with patch(
+                            "src.jobs.runner.discover_urls", return_value=self.URLS
+                        ):
+                            with patch(
+                                "src.jobs.runner.filter_urls", return_value=self.URLS
+                            ):
+                                with patch(
+                                    "src.jobs.runner.filter_urls_with_llm",
+                                    new=llm_filter,
+                                ):
+                                    with patch(
+                                        "src.jobs.runner.fetch_html_fast",
+                                        side_effect=fetch,
+                                    ):
+                                        with patch(
+                                            "src.jobs.runner.content_hash",
+                                            side_effect=lambda md: str(len(fetched)),
+                                        ):
+                                            with patch(
+                                                "src.jobs.runner.save_job_state"
+                                            ):
+                                                await run_job(job)
+        return job
+
+    def _index_names(self, job) -> list[str]:
+        index = (Path(job.request.output_path) / "_index.md").read_text()
+        return [
+            line.split("](")[1].rstrip(")")
+            for line in index.splitlines()
+            if line.startswith("- [")
+        ]
+
+    async def test_scraping_overlaps_filtering(self, tmp_path):
+        """Batch 1 is fetched before batch 2 is accepted; index uses final order."""
+        fetched: list[str] = []
+
+        async def llm_filter(urls, model, on_accept=None, **kwargs):
+            await on_accept([self.URLS[0], self.URLS[1]])
+            for _ in range(200):  # wait until scraping has picked up batch 1
+                if fetched:
+                    break
+                await asyncio.sleep(0.01)
+            assert fetched, "batch 1 was not scraped while filtering ran"
+            await on_accept([self.URLS[3]])
+            return [self.URLS[3], self.URLS[1], self.URLS[0]]
+
+        job = await self._run(tmp_path, "stream", llm_filter, fetched)
+
+        assert job.status == "completed"
+        assert sorted(fetched) == sorted([self.URLS[0], self.URLS[1], self.URLS[3]])
+        assert job.pages_total == 3
+        assert self._index_names(job) == ["p3.md", "p1.md", "p0.md"]
+
+    async def test_urls_only_in_final_result_are_still_scraped(self, tmp_path):
+        """A filter that never calls on_accept still has every kept URL scraped."""
+        fetched: list[str] = []
+        llm_filter = AsyncMock(return_value=[self.URLS[2], self.URLS[0]])
+
+        job = await self._run(tmp_path, "final-only", llm_filter, fetched)
+
+        assert sorted(fetched) == sorted([self.URLS[0], self.URLS[2]])
+        assert self._index_names(job) == ["p2.md", "p0.md"]
+
+    async def test_pipeline_mode_consumes_stream(self, tmp_path):
+        fetched: list[str] = []
+
+        async def llm_filter(urls, model, on_accept=None, **kwargs):
+            await on_accept([self.URLS[1]])
+            await on_accept([self.URLS[2]])
+            return [self.URLS[2], self.URLS[1]]
+
+        job = await self._run(
+            tmp_path, "stream-pipeline", llm_filter, fetched, use_pipeline_mode=True
+        )
+
+        assert job.status == "completed"
+        assert sorted(fetched) == [self.URLS[1], self.URLS[2]]
+        assert self._index_names(job) == ["p2.md", "p1.md"]
+
+    async def test_streaming_disabled_waits_for_full_list(self, tmp_path):
+        fetched: list[str] = []
+        llm_filter = AsyncMock(return_value=[self.URLS[1]])
+
+        await self._run(
+            tmp_path, "no-stream", llm_filter, fetched, stream_llm_filter=False
+        )
+
+        assert "on_accept" not in llm_filter.await_args.kwargs
+        assert fetched == [self.URLS[1]]
+
+    async def test_filter_error_keeps_streamed_urls(self, tmp_path):
+        """A failing filter does not fail the job; streamed URLs keep their order."""
+        fetched: list[str] = []
+
+        async def llm_filter(urls, model, on_accept=None, **kwargs):
+            await on_accept([self.URLS[2], self.URLS[0]])
+            raise RuntimeError("model crashed")
+
+        job = await self._run(tmp_path, "stream-error", llm_filter, fetched)
+
+        assert job.status == "completed"
+        assert sorted(fetched) == [self.URLS[0], self.URLS[2]]
+        assert self._index_names(job) == ["p2.md", "p0.md"]
+        messages = [c.args[1].get("message", "") for c in job.emit_event.call_args_list]
+        assert any("LLM filtering failed (model crashed)" in m for m in messages)
+
+    async def test_filter_task_cancelled_when_job_returns_early(self, tmp_path):
+        """A job cancelled before scraping does not leave the LLM filter running."""
+        req = _make_request(
+            output_path=str(tmp_path / "cancel"),
+            crawl_model="ollama/qwen3:14b",
+            pipeline_model=None,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+
+        def basic_filter(urls, *args, **kwargs):
+            job.cancel()  # cancelled right before LLM filtering starts
+            return self.URLS
+
+        async def llm_filter(urls, model, **kwargs):
+            await asyncio.Event().wait()  # would filter forever
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", return_value=self.URLS),
+            patch("src.jobs.runner.filter_urls", side_effect=basic_filter),
+            patch("src.jobs.runner.filter_urls_with_llm", new=llm_filter),
+        ):
+            await run_job(job)
+
+        running = [
+            t
+            for t in asyncio.all_tasks()
+            if not t.done() and t.get_coro().__qualname__ == "_stream_llm_filter"
+        ]
+        assert running == []
+
+    async def test_url_classifier_can_be_turned_off(self, tmp_path):
+        """use_url_classifier=False sends every URL to the LLM (no classifier)."""
+        from src.llm.url_classifier import url_classifier
+
+        for name, overrides, expected in (
+            ("clf-on", {}, url_classifier),
+            ("clf-off", {"use_url_classifier": False}, None),
+            (
+                "clf-off-batch",
+                {"use_url_classifier": False, "stream_llm_filter": False},
+                None,
+            ),
+        ):
+            llm_filter = AsyncMock(return_value=[self.URLS[0]])
+            await self._run(tmp_path, name, llm_filter, [], **overrides)
+            assert llm_filter.await_args.kwargs["classifier"] is expected
+            assert llm_filter.await_args.kwargs["classifier_report"] is not None
+
+
+class TestDiscoveryCacheInRunner:
+    """run_job threads the discovery cache and surfaces cache hits."""
+
+    async def _run(self, tmp_path, discover, **overrides):
+        req = _make_request(output_path=str(tmp_path / "out"), **overrides)
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        with patch("src.jobs.runner.validate_models", return_value=[]):
+            with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                with patch("src.jobs.runner.get_converter", return_value=converter):
+                    with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                        with patch("src.jobs.runner.discover_urls", new=discover):
+                            with patch("src.jobs.runner.filter_urls", return_value=[]):
+                                await run_job(job)
+        return job
+
+    async def test_cache_hit_reported_in_job_and_events(self, tmp_path):
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            report.from_cache = True
+            report.strategy = "sitemap"
+            report.cache_age = 1200
+            return ["https://example.com/a"]
+
+        job = await self._run(tmp_path, AsyncMock(side_effect=discover))
+
+        assert job.discovered_from_cache is True
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        hit = [p for p in payloads if p.get("from_cache")]
+        assert len(hit) == 1
+        assert "discovered from cache (sitemap, 20 min old, fresh)" in hit[0]["message"]
+
+    async def test_cache_passed_unless_disabled(self, tmp_path):
+        from src.crawler.discovery_cache import discovery_cache
+
+        discover = AsyncMock(return_value=["https://example.com/a"])
+        await self._run(tmp_path, discover)
+        assert discover.call_args.kwargs["discovery_cache"] is discovery_cache
+        assert discover.call_args.kwargs["sitemap_cache"] is None
+
+        discover.reset_mock()
+        await self._run(tmp_path, discover, use_discovery_cache=False, use_cache=True)
+        assert discover.call_args.kwargs["discovery_cache"] is None
+        assert discover.call_args.kwargs["sitemap_cache"] is not None
+
+    async def test_cache_hit_logs_skipped_handoff(self, tmp_path):
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            report.from_cache = True
+            report.strategy = "sitemap"
+            return ["https://example.com/a"]
+
+        job = await self._run(
+            tmp_path, AsyncMock(side_effect=discover), reuse_discovery_html=True
+        )
+
+        messages = [c.args[1].get("message", "") for c in job.emit_event.call_args_list]
+        skipped = [m for m in messages if m.startswith("Discovery cache hit")]
+        assert len(skipped) == 1
+        assert "reuse_discovery_html has no crawled pages" in skipped[0]
+
+    async def test_cache_miss_logs_nothing_skipped(self, tmp_path):
+        discover = AsyncMock(return_value=["https://example.com/a"])
+        job = await self._run(tmp_path, discover, reuse_discovery_html=True)
+
+        messages = [c.args[1].get("message", "") for c in job.emit_event.call_args_list]
+        assert not any(m.startswith("Discovery cache hit") for m in messages)
+
+
+class TestCrawlProgressInRunner:
+    """Live recursive-crawl counters are streamed while discovery runs."""
+
+    async def test_progress_events_emitted_during_crawl(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"))
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            for fetched in (1, 2, 3):
+                report.crawl.fetched = fetched
+                report.crawl.discovered = fetched * 10
+                await asyncio.sleep(0.05)
+            return ["https://example.com/a"]
+
+        scraper, converter, robots = _base_patches(tmp_path)
+        with patch("src.jobs.runner.CRAWL_PROGRESS_INTERVAL", 0.01):
+            with patch("src.jobs.runner.validate_models", return_value=[]):
+                with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                    with patch("src.jobs.runner.get_converter", return_value=converter):
+                        with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                            with patch(
+                                "src.jobs.runner.discover_urls",
+                                new=AsyncMock(side_effect=discover),
+                            ):
+                                with patch(
+                                    "src.jobs.runner.filter_urls", return_value=[]
+                                ):
+                                    await run_job(job)
+
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        crawl = [p for p in payloads if "crawl" in p]
+        # One event per change in fetched pages, none while nothing was fetched
+        assert [p["crawl"]["fetched"] for p in crawl] == [1, 2, 3]
+        assert crawl[-1]["message"].startswith("Crawling: 30 URLs found, 3 pages")
+
+    async def test_no_progress_events_without_crawl(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"))
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            await asyncio.sleep(0.05)
+            return ["https://example.com/a"]
+
+        scraper, converter, robots = _base_patches(tmp_path)
+        with patch("src.jobs.runner.CRAWL_PROGRESS_INTERVAL", 0.01):
+            with patch("src.jobs.runner.validate_models", return_value=[]):
+                with patch("src.jobs.runner.PageScraper", return_value=scraper):
+                    with patch("src.jobs.runner.get_converter", return_value=converter):
+                        with patch("src.jobs.runner.RobotsParser", return_value=robots):
+                            with patch(
+                                "src.jobs.runner.discover_urls",
+                                new=AsyncMock(side_effect=discover),
+                            ):
+                                with patch(
+                                    "src.jobs.runner.filter_urls", return_value=[]
+                                ):
+                                    await run_job(job)
+
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        assert not [p for p in payloads if "crawl" in p]
+
+
+class TestDiscoveryHtmlReuse:
+    """reuse_discovery_html: crawled pages are scraped without a second fetch."""
+
+    async def _run(self, tmp_path, **overrides):
+        req = _make_request(
+            output_path=str(tmp_path / "out"),
+            use_http_fast_path=True,
+            reuse_discovery_html=True,
+            **overrides,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        handoffs = []
+
+        async def discover(base_url, max_depth, filter_by_path, **kw):
+            handoffs.append(kw["html_handoff"])
+            kw["html_handoff"].put("https://example.com/a", "<p>crawled</p>", "W/1")
+            return ["https://example.com/a", "https://example.com/b"]
+
+        fast = AsyncMock(return_value="# Fetched")
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=AsyncMock(side_effect=discover)),
+            patch("src.jobs.runner.filter_urls", side_effect=lambda urls, *a: urls),
+            patch("src.jobs.runner.convert_html_fast", return_value="# Reused"),
+            patch("src.jobs.runner.fetch_html_fast", new=fast),
+            patch(
+                "src.jobs.runner.chunk_markdown", side_effect=lambda md, *a, **k: [md]
+            ),
+            patch("src.jobs.runner.needs_llm_cleanup", return_value=False),
+        ):
+            await run_job(job)
+        return job, handoffs, fast, scraper
+
+    async def test_crawled_page_converted_without_fetch(self, tmp_path):
+        job, handoffs, fast, scraper = await self._run(tmp_path)
+
+        assert job.status == "completed"
+        # Only the page discovery did not download is fetched again
+        assert [c.args[0] for c in fast.call_args_list] == ["https://example.com/b"]
+        scraper.get_html.assert_not_called()
+        assert (tmp_path / "out" / "a.md").read_text().startswith("# Reused")
+        done = [
+            c.args[1] for c in job.emit_event.call_args_list if c.args[0] == "job_done"
+        ]
+        assert done[0]["discovery_html_reused"] == 1
+        assert handoffs[0].memory_bytes == 0  # released once the job is done
+
+    async def test_spilled_page_reused_and_kept_out_of_page_cache(self, tmp_path):
+        with patch("src.crawler.html_handoff.HTML_HANDOFF_MAX_MB", 0):
+            job, handoffs, fast, scraper = await self._run(tmp_path, use_cache=True)
+
+        assert handoffs[0].spilled == 1
+        assert [c.args[0] for c in fast.call_args_list] == ["https://example.com/b"]
+        assert (tmp_path / "out" / "a.md").read_text().startswith("# Reused")
+        cache_dir = tmp_path / "out" / ".cache"
+        assert PageCache(cache_dir).get("https://example.com/a") is None
+        assert list((cache_dir / "handoff").iterdir()) == []
+
+    async def test_crawled_page_reused_in_pipeline_mode(self, tmp_path):
+        job, _, fast, scraper = await self._run(tmp_path, use_pipeline_mode=True)
+
+        assert job.status == "completed"
+        assert [c.args[0] for c in fast.call_args_list] == ["https://example.com/b"]
+        scraper.get_html.assert_not_called()
+
+    async def test_no_handoff_unless_requested(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"))
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        discover = AsyncMock(return_value=["https://example.com/a"])
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=discover),
+            patch("src.jobs.runner.filter_urls", return_value=[]),
+        ):
+            await run_job(job)
+        assert discover.call_args.kwargs["html_handoff"] is None
+
+
+class TestStreamDiscovery:
+    """stream_discovery: URLs are filtered and scraped while discovery runs."""
+
+    async def _run(
+        self, tmp_path, discover, robots_allowed=None, on_scrape=None, **overrides
+    ):
+        req = _make_request(
+            output_path=str(tmp_path / "out"),
+            use_http_fast_path=True,
+            stream_discovery=True,
+            **overrides,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        if robots_allowed is not None:
+            robots.is_allowed = MagicMock(side_effect=robots_allowed)
+        scraped: list[str] = []
+
+        async def fast(url, **kwargs):
+            scraped.append(url)
+            if on_scrape is not None:
+                on_scrape(url)
+            return f"# {url}"
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=AsyncMock(side_effect=discover)),
+            patch("src.jobs.runner.fetch_html_fast", side_effect=fast),
+            patch(
+                "src.jobs.runner.chunk_markdown", side_effect=lambda md, *a, **k: [md]
+            ),
+            patch("src.jobs.runner.needs_llm_cleanup", return_value=False),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await asyncio.wait_for(run_job(job), timeout=10)
+        return job, scraped
+
+    async def test_pages_scraped_before_discovery_finishes(self, tmp_path):
+        first_scraped = asyncio.Event()
+        scraped_during_discovery: list[int] = []
+
+        async def discover(base_url, max_depth, filter_by_path, on_urls=None, **kw):
+            on_urls(["https://example.com/a", "https://example.com/b"])
+            # Would deadlock if scraping waited for discovery to return
+            await first_scraped.wait()
+            scraped_during_discovery.append(1)
+            on_urls(["https://example.com/c", "https://example.com/a"])
+            return [
+                "https://example.com/a",
+                "https://example.com/b",
+                "https://example.com/c",
+            ]
+
+        job, scraped = await self._run(
+            tmp_path, discover, on_scrape=lambda url: first_scraped.set()
+        )
+
+        assert job.status == "completed"
+        assert scraped_during_discovery == [1]
+        assert sorted(scraped) == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+        assert job.pages_total == 3
+
+    async def test_batches_filtered_and_robots_checked(self, tmp_path):
+        async def discover(base_url, max_depth, filter_by_path, on_urls=None, **kw):
+            on_urls(
+                [
+                    "https://example.com/b",
+                    "https://example.com/logo.png",
+                    "https://other.com/x",
+                    "https://example.com/private",
+                ]
+            )
+            # Sitemap/nav results only arrive as the return value
+            return ["https://example.com/a"]
+
+        job, scraped = await self._run(
+            tmp_path,
+            discover,
+            robots_allowed=lambda u: not u.endswith("/private"),
+            respect_robots_txt=True,
+        )
+        assert sorted(scraped) == ["https://example.com/a", "https://example.com/b"]
+        index = (tmp_path / "out" / "_index.md").read_text()
+        # Without LLM filtering the index is sorted
+        assert index.index("[a](a.md)") < index.index("[b](b.md)")
+
+    async def test_llm_filter_runs_in_batches(self, tmp_path):
+        async def discover(base_url, max_depth, filter_by_path, on_urls=None, **kw):
+            on_urls(["https://example.com/a", "https://example.com/blog-ish"])
+            on_urls(["https://example.com/c"])
+            return []
+
+        llm_calls: list[list[str]] = []
+
+        async def llm(urls, model, **kw):
+            llm_calls.append(list(urls))
+            return [u for u in urls if "blog" not in u]
+
+        with (
+            patch("src.jobs.runner.DISCOVERY_STREAM_BATCH", 2),
+            patch("src.jobs.runner.filter_urls_with_llm", side_effect=llm),
+        ):
+            job, scraped = await self._run(
+                tmp_path, discover, crawl_model="ollama/qwen3:14b"
+            )
+        assert llm_calls == [
+            ["https://example.com/a", "https://example.com/blog-ish"],
+            ["https://example.com/c"],
+        ]
+        assert sorted(scraped) == ["https://example.com/a", "https://example.com/c"]
+        assert job.pages_total == 2
+
+    async def test_versioned_urls_filtered_once_discovery_ends(self, tmp_path):
+        async def discover(base_url, max_depth, filter_by_path, on_urls=None, **kw):
+            on_urls(["https://example.com/docs/v1/a", "https://example.com/guide"])
+            on_urls(["https://example.com/docs/v2/a"])
+            return ["https://example.com/docs/v2/b"]
+
+        job, scraped = await self._run(tmp_path, discover)
+
+        assert sorted(scraped) == [
+            "https://example.com/docs/v2/a",
+            "https://example.com/docs/v2/b",
+            "https://example.com/guide",
+        ]
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        versions = [p for p in payloads if "versions_dropped" in p][0]
+        assert versions["versions_dropped"] == {"v1": 1}
+
+    async def test_hreflang_groups_applied_to_streamed_urls(self, tmp_path):
+        async def discover(
+            base_url, max_depth, filter_by_path, on_urls=None, report=None, **kw
+        ):
+            report.alternates.add(
+                {"en": "https://example.com/a", "ja": "https://example.com/a-ja"}
+            )
+            on_urls(["https://example.com/a", "https://example.com/a-ja"])
+            report.alternates.add(
+                {"en": "https://example.com/b", "ja": "https://example.com/b-ja"}
+            )
+            return ["https://example.com/b-ja", "https://example.com/c"]
+
+        job, scraped = await self._run(tmp_path, discover, language="en")
+
+        # b-ja is replaced by the undiscovered English page b
+        assert sorted(scraped) == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        hreflang = [p for p in payloads if "hreflang_dropped" in p][0]
+        assert hreflang["hreflang_dropped"] == 2
+
+
+class TestDiscoveryStrategiesInRunner:
+    async def test_race_flag_passed_and_timings_logged(self, tmp_path):
+        from src.crawler.discovery import StrategyTiming
+
+        req = _make_request(output_path=str(tmp_path / "out"), race_discovery=True)
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            report.strategies = [
+                StrategyTiming("sitemap", "empty", 0.4, 0),
+                StrategyTiming("nav", "won", 1.2, 30),
+                StrategyTiming("crawl", "cancelled", 1.2, 0),
+            ]
+            return ["https://example.com/a"]
+
+        mock = AsyncMock(side_effect=discover)
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=mock),
+            patch("src.jobs.runner.filter_urls", return_value=[]),
+        ):
+            await run_job(job)
+
+        assert mock.call_args.kwargs["race"] is True
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        timing = [p for p in payloads if "strategies" in p]
+        assert timing[0]["message"] == (
+            "Strategies: sitemap 0.4s (empty, 0 URLs), nav 1.2s (won, 30 URLs), "
+            "crawl 1.2s (cancelled, 0 URLs)"
+        )
+        assert timing[0]["strategies"][1]["outcome"] == "won"
+
+    async def test_page_pool_shared_with_nav_parsing(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"))
+        job = _make_job(req)
+        scraper, converter, robots = _base_patches(tmp_path)
+        pool = MagicMock()
+        mock = AsyncMock(return_value=["https://example.com/a"])
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=mock),
+            patch("src.jobs.runner.filter_urls", return_value=[]),
+        ):
+            await run_job(job, page_pool=pool)
+
+        assert mock.call_args.kwargs["page_pool"] is pool
+
+    async def test_suppressed_trap_urls_logged_per_pattern(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"))
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            report.traps.suppressed.update({"/list?page=*": 40, "/tag/{n}": 2})
+            return ["https://example.com/a"]
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=AsyncMock(side_effect=discover)),
+            patch("src.jobs.runner.filter_urls", return_value=[]),
+        ):
+            await run_job(job)
+
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        traps = [p for p in payloads if "suppressed" in p]
+        assert traps[0]["message"] == (
+            "Suppressed 42 crawler-trap URLs: /list?page=* (40), /tag/{n} (2)"
+        )
+        assert traps[0]["suppressed"] == {"/list?page=*": 40, "/tag/{n}": 2}
+
+
+class TestCanonicalDedup:
+    """canonical_dedup: URL variants of one page are skipped before fetching."""
+
+    URLS = [
+        "https://example.com/old",
+        "https://example.com/guide",
+        "https://example.com/guide?utm_source=news",
+        "https://example.com/guide/index.html",
+        "https://example.com/other",
+    ]
+
+    @pytest.mark.parametrize("pipeline", [False, True])
+    async def test_variants_and_redirect_targets_not_fetched(self, tmp_path, pipeline):
+        req = _make_request(
+            output_path=str(tmp_path / "out"),
+            use_http_fast_path=True,
+            canonical_dedup=True,
+            max_concurrent=1,
+            use_pipeline_mode=pipeline,
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        scraped: list[str] = []
+
+        async def fast(url, info=None, converter=None):
+            scraped.append(url)
+            if url.endswith("/old"):
+                info.final_url = "https://example.com/guide/"
+            return f"# {url}"
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch(
+                "src.jobs.runner.discover_urls", new=AsyncMock(return_value=self.URLS)
+            ),
+            patch(
+                "src.jobs.runner.filter_urls", side_effect=lambda urls, *a, **k: urls
+            ),
+            patch("src.jobs.runner.fetch_html_fast", side_effect=fast),
+            patch(
+                "src.jobs.runner.chunk_markdown", side_effect=lambda md, *a, **k: [md]
+            ),
+            patch("src.jobs.runner.needs_llm_cleanup", return_value=False),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job)
+
+        assert job.status == "completed"
+        assert scraped == ["https://example.com/old", "https://example.com/other"]
+        assert job.pages_total == 3
+        assert job.pages_skipped == 1
+
+        done = [
+            c.args[1] for c in job.emit_event.call_args_list if c.args[0] == "job_done"
+        ][0]
+        assert done["url_variants_skipped"] == 3
+        redirects = json.loads(Path(done["redirect_map"]).read_text(encoding="utf-8"))
+        assert redirects["redirects"] == {
+            "https://example.com/old": "https://example.com/guide/"
+        }
+
+
+class TestVersionFilteringInRunner:
+    async def test_other_versions_dropped_before_scraping(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"), doc_version="auto")
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        discovered = [
+            "https://example.com/docs/v1/a",
+            "https://example.com/docs/v2/a",
+            "https://example.com/docs/v2/b",
+        ]
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch(
+                "src.jobs.runner.discover_urls", new=AsyncMock(return_value=discovered)
+            ),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job)
+
+        assert job.pages_total == 2
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        versions = [p for p in payloads if "versions_dropped" in p][0]
+        assert versions["versions_dropped"] == {"v1": 1}
+        assert versions["message"] == (
+            "Version filtering: 3 → 2 URLs, kept v2 in https://example.com/docs/; "
+            "dropped v1 (1)"
+        )
+
+
+class TestHreflangFilteringInRunner:
+    async def test_other_languages_dropped_before_scraping(self, tmp_path):
+        req = _make_request(output_path=str(tmp_path / "out"), language="en")
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+
+        async def discover(base_url, max_depth, filter_by_path, report=None, **kw):
+            for page in ("a", "b"):
+                report.alternates.add(
+                    {
+                        "en": f"https://example.com/{page}",
+                        "ja": f"https://example.com/{page}-ja",
+                    }
+                )
+            return [
+                "https://example.com/a",
+                "https://example.com/a-ja",
+                "https://example.com/b-ja",
+                "https://example.com/c",
+            ]
+
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch("src.jobs.runner.discover_urls", new=discover),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job)
+
+        # b-ja is replaced by the undiscovered English page b
+        assert job.pages_total == 3
+        fetched = {c.args[0] for c in scraper.get_html.call_args_list}
+        assert fetched == {
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        }
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        hreflang = [p for p in payloads if "hreflang_dropped" in p][0]
+        assert hreflang["hreflang_dropped"] == 2
+        assert hreflang["message"] == (
+            "hreflang filtering: 4 → 3 URLs (2 alternate groups, kept 'en', "
+            "dropped 2 other-language URLs)"
+        )
+
+
+class TestUrlGlobsInRunner:
+    async def test_globs_applied_with_hit_counts(self, tmp_path):
+        req = _make_request(
+            output_path=str(tmp_path / "out"),
+            include_globs=["/guide/*"],
+            exclude_globs=["*/draft-*"],
+        )
+        job = _make_job(req)
+        job.emit_event = AsyncMock()
+        scraper, converter, robots = _base_patches(tmp_path)
+        discovered = [
+            "https://example.com/guide/a",
+            "https://example.com/guide/draft-b",
+            "https://example.com/about",
+            "https://example.com/logo.png",
+        ]
+        with (
+            patch("src.jobs.runner.validate_models", return_value=[]),
+            patch("src.jobs.runner.PageScraper", return_value=scraper),
+            patch("src.jobs.runner.get_converter", return_value=converter),
+            patch("src.jobs.runner.RobotsParser", return_value=robots),
+            patch(
+                "src.jobs.runner.discover_urls", new=AsyncMock(return_value=discovered)
+            ),
+            patch("src.jobs.runner.save_job_state"),
+        ):
+            await run_job(job)
+
+        assert job.pages_total == 1
+        payloads = [c.args[1] for c in job.emit_event.call_args_list]
+        basic = [p for p in payloads if "rule_hits" in p][0]
+        assert basic["rule_hits"] == {
+            "extension .png": 1,
+            "exclude */draft-*": 1,
+            "include /guide/*": 1,
+            "include": 1,
+        }
+        assert any(
+            p.get("message")
+            == "URL globs: exclude */draft-* (1), include /guide/* (1), "
+            "matched no include (1)"
+            for p in payloads
+        )
@@ -1,13 +1,22 @@
 """Unit tests for cleanup heuristics (PR 2.2 + 2.5) in src/llm/cleanup.py.
 
-Covers: _has_broken_tables, _has_latex, classify_chunk, _estimate_tokens.
+Covers: _has_broken_tables, _has_latex, classify_chunk, _estimate_tokens,
+profile_chunk / ChunkProfile, heavy_avoided_by_tables.
 """
 
+from unittest.mock import AsyncMock, patch
+
 from src.llm.cleanup import (
+    _calculate_timeout,
+    _cleanup_options,
+    _code_density,
     _estimate_tokens,
     _has_broken_tables,
     _has_latex,
     classify_chunk,
+    cleanup_markdown,
+    heavy_avoided_by_tables,
+    profile_chunk,
 )
 
 
@@ -149,3 +158,91 @@ class TestEstimateTokens:
         short = "Hello world."
         long = "Hello world. " * 100
         assert _estimate_tokens(long) > _estimate_tokens(short)
+
+
+# Mixed corpus exercising every heuristic branch (noise, code, tables, LaTeX, prices)
+_FILLER = "Some documentation text. " * 100
+_PROFILE_CORPUS = [
+    "",
+    "Short clean text.",
+    "cookie banner",
+    _FILLER,
+    "Cookie Policy " + _FILLER,
+    "```python\n" + ("x = 1\n" * 300) + "```",
+    "Intro.\n```\ncode\n```\nmore ```\nunclosed",
+    _FILLER + "\n| A | B |\n| v1 | v2 |",
+    _FILLER + "\n| A | B |\n|---|---|\n| v1 | v2 |",
+    _FILLER + r" The formula $\frac{a}{b}$ is shown.",
+    _FILLER + " It costs $9.99 and $x$ is $5.",
+    _FILLER + r" \textbf{bold} text",
+    _FILLER + r" \begin{equation} E = mc^2 \end{equation}",
+    "Skip to content\nOn this page\n" + _FILLER,
+]
+
+
+class TestChunkProfile:
+    """Tests for profile_chunk() / ChunkProfile — single scan shared by all heuristics."""
+
+    def test_profile_matches_standalone_heuristics(self):
+        """Profile features agree with the standalone per-feature helpers."""
+        for chunk in _PROFILE_CORPUS:
+            profile = profile_chunk(chunk)
+            assert profile.length == len(chunk)
+            assert profile.code_density == _code_density(chunk)
+            assert profile.has_broken_tables == _has_broken_tables(chunk)
+            assert profile.has_latex == _has_latex(chunk)
+            assert profile.estimated_tokens == _estimate_tokens(chunk)
+
+    def test_classify_with_profile_matches_without(self):
+        """classify_chunk() returns the same level with and without a profile."""
+        for chunk in _PROFILE_CORPUS:
+            assert classify_chunk(chunk, profile_chunk(chunk)) == classify_chunk(chunk)
+
+    def test_options_and_timeout_use_profile(self):
+        """_cleanup_options/_calculate_timeout give identical results from the profile."""
+        for chunk in _PROFILE_CORPUS:
+            profile = profile_chunk(chunk)
+            assert _cleanup_options(chunk, profile) == _cleanup_options(chunk)
+            assert _calculate_timeout(chunk, profile) == _calculate_timeout(chunk)
+
+    def test_noise_hits_counts_distinct_indicators(self):
+        """noise_hits counts each matched indicator once, case-insensitively."""
+        profile = profile_chunk("COOKIE cookie Privacy Policy")
+        assert profile.noise_hits == 2
+        assert profile.has_noise is True
+        assert profile_chunk("clean prose").has_noise is False
+
+    async def test_cleanup_markdown_does_not_rescan_with_profile(self):
+        """cleanup_markdown() reuses the given profile instead of profiling again."""
+        chunk = _FILLER + "\n| A | B |\n| v1 | v2 |"
+        profile = profile_chunk(chunk)
+        with patch(
+            "src.llm.cleanup.generate", new=AsyncMock(return_value="cleaned")
+        ) as mock_gen:
+            with patch("src.llm.cleanup.profile_chunk") as mock_profile:
+                result = await cleanup_markdown(chunk, "model", profile=profile)
+        assert result == "cleaned"
+        mock_profile.assert_not_called()
+        # Broken table → heavy prompt
+        assert "Repair broken Markdown tables" in mock_gen.call_args[0][1]
+
+
+class TestHeavyAvoidedByTables:
+    """Tests for heavy_avoided_by_tables() — counterfactual for the table stage."""
+
+    def test_valid_table_in_long_chunk_counts(self):
+        """A long chunk with a valid table would be heavy if the table were broken."""
+        chunk = _FILLER + "\n| A | B |\n|---|---|\n| v1 | v2 |"
+        assert classify_chunk(chunk) == "cleanup"
+        assert heavy_avoided_by_tables(chunk) is True
+
+    def test_short_chunk_is_skipped_anyway(self):
+        """Short clean chunks are "skip" either way, so nothing was avoided."""
+        assert heavy_avoided_by_tables("| A | B |\n|---|---|\n| 1 | 2 |") is False
+
+    def test_already_heavy_or_tableless_chunks_do_not_count(self):
+        """Broken tables, LaTeX-heavy chunks and chunks without tables never count."""
+        assert heavy_avoided_by_tables(_FILLER + "\n| A | B |\n| v1 | v2 |") is False
+        latex = _FILLER + r" $\frac{a}{b}$" + "\n| A | B |\n|---|---|\n| 1 | 2 |"
+        assert heavy_avoided_by_tables(latex) is False
+        assert heavy_avoided_by_tables(_FILLER) is False
@@ -0,0 +1,147 @@
+"""Unit tests for cleanup effectiveness statistics (src/llm/cleanup_stats.py)."""
+
+import json
+
+from src.llm.cleanup import SKIP_BELOW_CHARS, classify_chunk, profile_chunk
+from src.llm.cleanup_stats import (
+    MAX_SKIP_THRESHOLD,
+    MIN_SAMPLES,
+    PROBE_EVERY,
+    CleanupStatsStore,
+    feature_key,
+    normalized_edit_distance,
+)
+from src.scraper.markdown import DEFAULT_CHUNK_SIZE
+
+_LONG_CLEAN = "Documentation paragraph about configuration. " * 60  # ~2700 chars
+
+
+class TestNormalizedEditDistance:
+    """Tests for normalized_edit_distance()."""
+
+    def test_identical_and_whitespace_only_changes_are_zero(self):
+        assert normalized_edit_distance("a b c", "a b c") == 0.0
+        assert normalized_edit_distance("a  b\nc", "a b c") == 0.0
+        assert normalized_edit_distance("", "  ") == 0.0
+
+    def test_disjoint_texts_are_one(self):
+        assert normalized_edit_distance("a b c", "x y z") == 1.0
+        assert normalized_edit_distance("a b", "") == 1.0
+
+    def test_partial_change_is_proportional(self):
+        before = " ".join(f"w{i}" for i in range(100))
+        after = " ".join(f"w{i}" for i in range(90))  # 10 words removed
+        assert 0.0 < normalized_edit_distance(before, after) < 0.1
+
+
+class TestFeatureKey:
+    """Tests for feature_key()."""
+
+    def test_buckets_by_level_and_signals(self):
+        assert feature_key(_LONG_CLEAN, profile_chunk(_LONG_CLEAN)) == "cleanup/plain"
+        noisy = "Cookie policy. " + _LONG_CLEAN
+        assert feature_key(noisy, profile_chunk(noisy)) == "cleanup/noise"
+        table = _LONG_CLEAN + "\n| a | b |\n| 1 | 2 |"
+        assert feature_key(table, profile_chunk(table)) == "heavy/tables"
+
+
+class TestClassifySkipBelow:
+    """classify_chunk(skip_below=...) is the threshold the stats raise."""
+
+    def test_raised_threshold_skips_long_clean_chunks(self):
+        assert classify_chunk(_LONG_CLEAN) == "cleanup"
+        assert classify_chunk(_LONG_CLEAN, skip_below=SKIP_BELOW_CHARS * 2) == "skip"
+
+    def test_raised_threshold_never_skips_noise_or_heavy(self):
+        noisy = "Cookie policy. " + _LONG_CLEAN
+        table = _LONG_CLEAN + "\n| a | b |\n| 1 | 2 |"
+        assert classify_chunk(noisy, skip_below=10**6) == "cleanup"
+        assert classify_chunk(table, skip_below=10**6) == "heavy"
+
+
+class TestCleanupStatsStore:
+    """Tests for CleanupStatsStore thresholds, probing and persistence."""
+
+    def test_threshold_stays_at_default_until_min_samples(self):
+        store = CleanupStatsStore()
+        for _ in range(MIN_SAMPLES - 1):
+            store.record("a.com", "cleanup/plain", 0.0)
+        assert store.skip_threshold("a.com") == SKIP_BELOW_CHARS
+        store.record("a.com", "cleanup/plain", 0.0)
+        assert store.skip_threshold("a.com") == MAX_SKIP_THRESHOLD
+
+    def test_threshold_is_graded_by_noop_rate(self):
+        store = CleanupStatsStore()
+        for i in range(MIN_SAMPLES):
+            store.record("a.com", "cleanup/plain", 0.5 if i < 2 else 0.0)  # 90%
+        assert store.skip_threshold("a.com") == SKIP_BELOW_CHARS * 2
+        for _ in range(MIN_SAMPLES):
+            store.record("b.com", "cleanup/noise", 0.3)
+        assert store.skip_threshold("b.com") == SKIP_BELOW_CHARS
+
+    def test_heavy_samples_do_not_raise_threshold(self):
+        store = CleanupStatsStore()
+        for _ in range(MIN_SAMPLES * 2):
+            store.record("a.com", "heavy/tables", 0.0)
+        assert store.skip_threshold("a.com") == SKIP_BELOW_CHARS
+
+    def test_noisy_samples_do_not_raise_threshold(self):
+        store = CleanupStatsStore()
+        for _ in range(MIN_SAMPLES * 2):
+            store.record("a.com", "cleanup/noise+code", 0.0)
+        assert store.skip_threshold("a.com") == SKIP_BELOW_CHARS
+        # Noise-free evidence alone decides, however many noisy no-ops there are
+        for i in range(MIN_SAMPLES):
+            store.record("a.com", "cleanup/code", 0.5 if i < 4 else 0.0)  # 80%
+        assert store.skip_threshold("a.com") == SKIP_BELOW_CHARS
+
+    def test_threshold_stays_below_chunk_size(self):
+        store = CleanupStatsStore()
+        for _ in range(MIN_SAMPLES):
+            store.record("a.com", "cleanup/plain", 0.0)
+        threshold = store.skip_threshold("a.com")
+        assert SKIP_BELOW_CHARS < threshold < DEFAULT_CHUNK_SIZE
+        assert classify_chunk("x " * (DEFAULT_CHUNK_SIZE // 2), None, threshold) == (
+            "cleanup"
+        )
+
+    def test_every_nth_learned_skip_is_a_probe(self):
+        store = CleanupStatsStore()
+        probes = [store.should_probe("a.com") for _ in range(PROBE_EVERY * 2)]
+        assert probes.count(True) == 2
+        summary = store.site_summary("a.com")
+        assert summary["probes"] == 2
+        assert summary["skipped"] == PROBE_EVERY * 2 - 2
+
+    def test_snapshot_aggregates_by_site_and_feature(self):
+        store = CleanupStatsStore()
+        store.record("a.com", "cleanup/noise", 0.0)
+        store.record("b.com", "cleanup/noise", 0.5)
+        snap = store.snapshot()
+        assert set(snap["sites"]) == {"a.com", "b.com"}
+        assert snap["features"]["cleanup/noise"] == {
+            "samples": 2,
+            "mean_distance": 0.25,
+            "noop_rate": 0.5,
+        }
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / "stats" / "cleanup.json"
+        store = CleanupStatsStore(path)
+        for _ in range(MIN_SAMPLES):
+            store.record("a.com", "cleanup/plain", 0.0)
+        store.save()
+        assert not path.with_suffix(".tmp").exists()
+
+        reloaded = CleanupStatsStore(path)
+        assert reloaded.snapshot() == store.snapshot()
+        assert reloaded.skip_threshold("a.com") == MAX_SKIP_THRESHOLD
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "cleanup.json"
+        path.write_text(json.dumps({"sites": {"a.com": {"overall": 1}}}))
+        store = CleanupStatsStore(path)
+        assert store.snapshot() == {"sites": {}, "features": {}}
+
+    def test_in_memory_store_save_is_noop(self, tmp_path):
+        CleanupStatsStore().save()  # must not raise or write anywhere
@@ -8,11 +8,19 @@ Tests cover:
 - LLM returns invalid JSON → falls back to original list
 - LLM raises exception → falls back to original list
 - LLM returns URLs not in original → only valid (intersection) URLs returned
+- Large lists are filtered in bounded parallel batches with merged ordering
+- Large clustered lists are classified as prefix groups and expanded back
 """
 
+import asyncio
+import json
 from unittest.mock import patch, AsyncMock
 
-from src.llm.filter import filter_urls_with_llm
+from src.llm.filter import (
+    FilterBatchReport,
+    filter_urls_with_llm,
+    merge_batch_orders,
+)
 
 
 SAMPLE_URLS = [
@@ -198,3 +206,225 @@ class TestFilterUrlsWithLlmIntersection:
             result = await filter_urls_with_llm(SAMPLE_URLS, "mistral:7b")
 
         assert result == []
+
+
+def _batch_generate(drop: set[str] | None = None, reverse: bool = False):
+    """Fake generate() that answers each prompt with its own <urls> block."""
+
+    async def fake(model, prompt, system=None, options=None):
+        block = prompt.split("<urls>\n", 1)[1].split("\n</urls>", 1)[0]
+        urls = [u for u in block.split("\n") if u not in (drop or set())]
+        return json.dumps(urls[::-1] if reverse else urls)
+
+    return fake
+
+
+class TestFilterUrlsWithLlmBatching:
+    """Large URL lists are split into bounded, parallel batches."""
+
+    async def test_one_prompt_per_batch(self):
+        """Each batch gets its own prompt containing only its URLs."""
+        urls = [f"https://docs.example.com/p{i}" for i in range(10)]
+        mock = AsyncMock(side_effect=_batch_generate())
+        with patch("src.llm.filter.generate", mock):
+            result = await filter_urls_with_llm(urls, "m", batch_size=4)
+
+        assert mock.await_count == 3
+        assert sorted(result) == sorted(urls)
+        first_prompt = mock.await_args_list[0].args[1]
+        assert urls[3] in first_prompt and urls[4] not in first_prompt
+
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` batches are in flight at once."""
+        in_flight = 0
+        peak = 0
+        inner = _batch_generate()
+
+        async def slow(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await inner(*args, **kwargs)
+
+        urls = [f"https://docs.example.com/p{i}" for i in range(20)]
+        with patch("src.llm.filter.generate", side_effect=slow):
+            await filter_urls_with_llm(urls, "m", batch_size=2, concurrency=3)
+
+        assert peak == 3
+
+    async def test_failed_batch_falls_back_alone(self):
+        """A batch that fails every retry keeps its own URLs; others are filtered."""
+        urls = [f"https://docs.example.com/p{i}" for i in range(4)]
+        inner = _batch_generate(drop={urls[0], urls[1], urls[3]})
+
+        async def flaky(model, prompt, **kwargs):
+            if urls[2] in prompt:
+                raise RuntimeError("boom")
+            return await inner(model, prompt, **kwargs)
+
+        with patch("src.llm.filter.generate", side_effect=flaky):
+            with patch("src.llm.filter.asyncio.sleep", new_callable=AsyncMock):
+                result = await filter_urls_with_llm(urls, "m", batch_size=2)
+
+        assert result == [urls[2], urls[3]]
+
+    async def test_duplicates_and_cross_batch_urls_rejected(self):
+        """Validation is per batch: repeats and URLs from other batches are dropped."""
+        urls = [f"https://docs.example.com/p{i}" for i in range(4)]
+
+        async def answer(model, prompt, **kwargs):
+            if urls[0] in prompt:
+                return json.dumps([urls[1], urls[1], urls[2], 42])
+            return json.dumps([urls[3]])
+
+        with patch("src.llm.filter.generate", side_effect=answer):
+            result = await filter_urls_with_llm(urls, "m", batch_size=2)
+
+        assert result == [urls[1], urls[3]]
+
+    async def test_on_batch_receives_timing_reports(self):
+        """on_batch is awaited once per batch with counts and timing."""
+        urls = [f"https://docs.example.com/p{i}" for i in range(5)]
+        reports: list[FilterBatchReport] = []
+
+        async def collect(report: FilterBatchReport) -> None:
+            reports.append(report)
+
+        with patch(
+            "src.llm.filter.generate",
+            side_effect=_batch_generate(drop={urls[4]}),
+        ):
+            await filter_urls_with_llm(urls, "m", on_batch=collect, batch_size=2)
+
+        reports.sort(key=lambda r: r.index)
+        assert [r.urls_in for r in reports] == [2, 2, 1]
+        assert [r.urls_out for r in reports] == [2, 2, 0]
+        assert all(r.batches == 3 and r.attempts == 1 for r in reports)
+        assert all(r.duration >= 0 and not r.fell_back for r in reports)
+
+
+class TestMergeBatchOrders:
+    """Tests for merge_batch_orders()."""
+
+    def test_single_batch_order_unchanged(self):
+        assert merge_batch_orders([["c", "a", "b"]]) == ["c", "a", "b"]
+
+    def test_interleaves_by_relative_rank(self):
+        """Heads of all batches come before any batch's tail."""
+        merged = merge_batch_orders([["a1", "a2", "a3", "a4"], ["b1", "b2"]])
+        assert merged == ["a1", "b1", "a2", "a3", "b2", "a4"]
+
+    def test_preserves_each_batch_order(self):
+        orders = [["x3", "x1", "x2"], ["y2", "y1"], [], ["z1"]]
+        merged = merge_batch_orders(orders)
+        for order in orders:
+            assert [u for u in merged if u in order] == order
+
+
+class TestFilterUrlsWithLlmPrefixGroups:
+    """Large clustered URL lists are classified by prefix group."""
+
+    BASE = "https://docs.example.com"
+
+    def _site(self) -> list[str]:
+        return [f"{self.BASE}/guide/p{i}" for i in range(30)] + [
+            f"{self.BASE}/blog/p{i}" for i in range(30)
+        ]
+
+    async def test_groups_classified_and_expanded(self):
+        """One prompt lists prefix groups; kept groups expand to their URLs."""
+        urls = self._site()
+        mock = AsyncMock(return_value=json.dumps([f"{self.BASE}/guide/*"]))
+        with patch("src.llm.filter.generate", mock):
+            result = await filter_urls_with_llm(urls, "m")
+
+        assert mock.await_count == 1
+        prompt = mock.await_args.args[1]
+        assert f"{self.BASE}/blog/* (30 pages" in prompt
+        assert f"{self.BASE}/guide/p7" not in prompt
+        assert result == urls[:30]
+
+    async def test_prefix_without_wildcard_accepted(self):
+        """A prefix echoed without its trailing '*' still counts."""
+        urls = self._site()
+        with patch(
+            "src.llm.filter.generate",
+            new_callable=AsyncMock,
+            return_value=json.dumps([f"{self.BASE}/blog/", f"{self.BASE}/guide/*"]),
+        ):
+            result = await filter_urls_with_llm(urls, "m")
+
+        assert result == urls[30:] + urls[:30]
+
+    async def test_flat_sites_filtered_per_url(self):
+        """Without enough shared prefixes, URLs are sent individually."""
+        urls = [f"{self.BASE}/p{i}" for i in range(60)]
+        mock = AsyncMock(side_effect=_batch_generate())
+        with patch("src.llm.filter.generate", mock):
+            result = await filter_urls_with_llm(urls, "m")
+
+        assert result == urls
+        assert "/*" not in mock.await_args.args[1]
+
+    async def test_grouping_can_be_disabled(self):
+        urls = self._site()
+        mock = AsyncMock(side_effect=_batch_generate())
+        with patch("src.llm.filter.generate", mock):
+            await filter_urls_with_llm(urls, "m", group_prefixes=False)
+
+        assert f"{self.BASE}/guide/p7" in mock.await_args.args[1]
+
+    async def test_failed_group_batch_keeps_all_urls(self):
+        urls = self._site()
+        with patch(
+            "src.llm.filter.generate",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("down"),
+        ):
+            with patch("src.llm.filter.asyncio.sleep", new_callable=AsyncMock):
+                result = await filter_urls_with_llm(urls, "m")
+
+        assert sorted(result) == sorted(urls)
+
+
+class TestFilterUrlsWithLlmOnAccept:
+    """on_accept streams each batch's accepted URLs as soon as it finishes."""
+
+    async def test_each_kept_url_delivered_once_per_batch(self):
+        urls = [f"https://docs.example.com/p{i}" for i in range(6)]
+        delivered: list[list[str]] = []
+
+        async def accept(batch: list[str]) -> None:
+            delivered.append(batch)
+
+        with patch(
+            "src.llm.filter.generate",
+            side_effect=_batch_generate(drop={urls[4], urls[5]}),
+        ):
+            result = await filter_urls_with_llm(
+                urls, "m", batch_size=2, on_accept=accept
+            )
+
+        assert sorted(map(len, delivered)) == [2, 2]
+        assert sorted(u for batch in delivered for u in batch) == sorted(result)
+
+    async def test_prefix_groups_delivered_as_urls(self):
+        base = "https://docs.example.com"
+        urls = [f"{base}/guide/p{i}" for i in range(30)] + [
+            f"{base}/blog/p{i}" for i in range(30)
+        ]
+        delivered: list[str] = []
+
+        async def accept(batch: list[str]) -> None:
+            delivered.extend(batch)
+
+        with patch(
+            "src.llm.filter.generate",
+            new_callable=AsyncMock,
+            return_value=json.dumps([f"{base}/guide/*"]),
+        ):
+            await filter_urls_with_llm(urls, "m", on_accept=accept)
+
+        assert delivered == urls[:30]
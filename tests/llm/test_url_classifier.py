@@ -0,0 +1,159 @@
+"""Unit tests for the local URL keep/drop classifier.
+
+Source module: src/llm/url_classifier.py
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from src.llm import url_classifier as uc
+from src.llm.filter import filter_urls_with_llm
+from src.llm.url_classifier import ClassifierReport, UrlClassifier, url_features
+
+BASE = "https://docs.example.com"
+TOPICS = ["install", "config", "routing", "auth", "deploy", "testing", "cli"]
+
+
+def _docs(n: int, start: int = 0) -> list[str]:
+    return [
+        f"{BASE}/docs/guide/{TOPICS[i % len(TOPICS)]}-{i}"
+        for i in range(start, start + n)
+    ]
+
+
+def _blog(n: int, start: int = 0) -> list[str]:
+    return [f"{BASE}/blog/2024/post-{i}" for i in range(start, start + n)]
+
+
+def _trained(n: int = 150) -> UrlClassifier:
+    clf = UrlClassifier()
+    clf.learn_many(_docs(n) + _blog(n), set(_docs(n)))
+    return clf
+
+
+class TestUrlFeatures:
+    """Tests for url_features()."""
+
+    def test_stable_and_bounded(self):
+        a = url_features(f"{BASE}/docs/guide/intro")
+        assert a == url_features(f"{BASE}/docs/guide/intro")
+        assert all(0 <= f < uc.N_FEATURES for f in a)
+
+    def test_version_segments_share_features(self):
+        """v1 and v2.3 paths hash to the same feature set."""
+        assert url_features(f"{BASE}/api/v1/x") == url_features(f"{BASE}/api/2.3/x")
+
+    def test_case_insensitive(self):
+        assert url_features(f"{BASE}/Docs/Intro") == url_features(f"{BASE}/docs/intro")
+
+
+class TestUrlClassifier:
+    """Tests for UrlClassifier."""
+
+    def test_untrained_model_defers_everything(self):
+        """Below MIN_TRAINING_URLS nothing is decided locally."""
+        clf = UrlClassifier()
+        clf.learn_many(_docs(10) + _blog(10), set(_docs(10)))
+        split = clf.partition(_docs(5, 500) + _blog(5, 500))
+        assert split.keep == [] and split.drop == []
+        assert len(split.uncertain) == 10
+
+    def test_confident_urls_decided_locally(self):
+        """Unseen URLs under learned prefixes are kept or dropped locally."""
+        clf = _trained()
+        docs, blog = _docs(40, 1000), _blog(40, 1000)
+        split = clf.partition(docs + blog)
+        assert set(split.keep) <= set(docs)
+        assert set(split.drop) <= set(blog)
+        # Only hash-selected probes (~1 in PROBE_EVERY) reach the LLM
+        assert len(split.uncertain) < 20
+
+    def test_unfamiliar_urls_are_uncertain(self):
+        """URLs sharing too few features with the training data are deferred."""
+        clf = _trained()
+        split = clf.partition(["https://other.org/zzz"])
+        assert split.uncertain == ["https://other.org/zzz"]
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / "clf.json"
+        clf = UrlClassifier(path)
+        clf.learn_many(_docs(150) + _blog(150), set(_docs(150)))
+        clf.save()
+
+        loaded = UrlClassifier(path)
+        assert loaded.trained_urls == 300
+        url = _docs(1, 999)[0]
+        assert loaded.predict(url) == clf.predict(url)
+
+    def test_corrupt_file_starts_empty(self, tmp_path):
+        path = tmp_path / "clf.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert UrlClassifier(path).trained_urls == 0
+
+
+class TestFilterWithClassifier:
+    """filter_urls_with_llm(..., classifier=...) integration."""
+
+    async def test_only_uncertain_urls_reach_llm(self):
+        clf = _trained()
+        docs, blog = _docs(20, 2000), _blog(20, 2000)
+        prompts: list[str] = []
+
+        async def answer(model, prompt, **kwargs):
+            prompts.append(prompt)
+            block = prompt.split("<urls>\n", 1)[1].split("\n</urls>", 1)[0]
+            return json.dumps([u for u in block.split("\n") if "/docs/" in u])
+
+        report = ClassifierReport()
+        with patch("src.llm.filter.generate", side_effect=answer):
+            result = await filter_urls_with_llm(
+                docs + blog, "m", classifier=clf, classifier_report=report
+            )
+
+        assert sorted(result) == sorted(docs)
+        sent = sum(p.count(BASE) for p in prompts)
+        assert sent == report.uncertain < 40
+        assert report.kept + report.dropped + report.uncertain == 40
+
+    async def test_reports_are_per_call(self):
+        """Concurrent callers each get their own classifier counts."""
+        clf = _trained()
+        first, second = ClassifierReport(), ClassifierReport()
+        with patch(
+            "src.llm.filter.generate", new_callable=AsyncMock, return_value="[]"
+        ):
+            await filter_urls_with_llm(
+                _docs(10, 3000), "m", classifier=clf, classifier_report=first
+            )
+            await filter_urls_with_llm(
+                _blog(30, 3000), "m", classifier=clf, classifier_report=second
+            )
+
+        assert first.kept + first.dropped + first.uncertain == 10
+        assert second.kept + second.dropped + second.uncertain == 30
+        assert first.dropped == 0 and second.kept == 0
+
+    async def test_llm_decisions_are_learned(self):
+        clf = UrlClassifier()
+        urls = _docs(3) + _blog(3)
+        with patch(
+            "src.llm.filter.generate",
+            new_callable=AsyncMock,
+            return_value=json.dumps(_docs(3)),
+        ):
+            await filter_urls_with_llm(urls, "m", classifier=clf)
+
+        assert clf.trained_urls == 6
+
+    async def test_fallback_batches_are_not_learned(self):
+        clf = UrlClassifier()
+        with patch(
+            "src.llm.filter.generate",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("down"),
+        ):
+            with patch("src.llm.filter.asyncio.sleep", new_callable=AsyncMock):
+                result = await filter_urls_with_llm(_docs(3), "m", classifier=clf)
+
+        assert result == _docs(3)
+        assert clf.trained_urls == 0
@@ -0,0 +1,80 @@
+"""Unit tests for the URL-tree summarizer.
+
+Source module: src/llm/url_groups.py
+"""
+
+from src.llm.url_groups import UrlGroup, expand_groups, group_urls
+
+BASE = "https://docs.example.com"
+
+
+def _urls(directory: str, count: int) -> list[str]:
+    return [f"{BASE}{directory}page{i}" for i in range(count)]
+
+
+class TestGroupUrls:
+    """Tests for group_urls()."""
+
+    def test_siblings_collapse_into_prefix_group(self):
+        """Pages in the same directory become one prefix group."""
+        groups = group_urls(_urls("/docs/api/v2/", 6), min_size=5)
+        assert len(groups) == 1
+        assert groups[0].is_prefix
+        assert groups[0].key == f"{BASE}/docs/api/v2/*"
+        assert len(groups[0].urls) == 6
+
+    def test_directory_index_belongs_to_parent(self):
+        """/a/b/ is a sibling of /a/c, not a member of /a/b/."""
+        urls = _urls("/docs/", 4) + [f"{BASE}/docs/api/"]
+        groups = group_urls(urls, min_size=5)
+        assert [g.key for g in groups] == [f"{BASE}/docs/*"]
+
+    def test_small_directories_roll_up_to_parent(self):
+        """Tiny sibling directories merge into their parent's group."""
+        urls = _urls("/docs/a/", 2) + _urls("/docs/b/", 2) + _urls("/docs/c/", 2)
+        groups = group_urls(urls, min_size=5)
+        assert [g.key for g in groups] == [f"{BASE}/docs/*"]
+        assert groups[0].urls == urls
+
+    def test_never_rolls_up_to_site_root(self):
+        """Root pages and small top-level directories stay single URLs."""
+        urls = [f"{BASE}/about", f"{BASE}/pricing"] + _urls("/blog/", 2)
+        groups = group_urls(urls, min_size=5)
+        assert all(not g.is_prefix for g in groups)
+        assert [g.key for g in groups] == urls
+
+    def test_groups_and_members_keep_discovery_order(self):
+        """Groups appear by first member; duplicates are listed once."""
+        guide = _urls("/guide/", 5)
+        api = _urls("/api/", 5)
+        urls = [guide[0], api[0]] + guide[1:] + api[1:] + [guide[0]]
+        groups = group_urls(urls, min_size=5)
+        assert [g.key for g in groups] == [f"{BASE}/guide/*", f"{BASE}/api/*"]
+        assert groups[0].urls == guide
+
+    def test_hosts_are_grouped_separately(self):
+        """The same path on two hosts yields two groups."""
+        urls = _urls("/docs/", 5) + [
+            u.replace("docs.example.com", "api.example.com") for u in _urls("/docs/", 5)
+        ]
+        assert len(group_urls(urls, min_size=5)) == 2
+
+
+class TestUrlGroup:
+    """Tests for UrlGroup.describe() and expand_groups()."""
+
+    def test_describe_shows_count_and_spread_samples(self):
+        group = UrlGroup(f"{BASE}/docs/", _urls("/docs/", 9), is_prefix=True)
+        assert group.describe() == (
+            f"{BASE}/docs/* (9 pages, e.g. page0, page3, page6)"
+        )
+
+    def test_single_url_described_as_itself(self):
+        group = UrlGroup(f"{BASE}/about", [f"{BASE}/about"], is_prefix=False)
+        assert group.describe() == f"{BASE}/about"
+        assert group.key == f"{BASE}/about"
+
+    def test_expand_follows_key_order_and_skips_unknown(self):
+        groups = group_urls(_urls("/a/", 5) + _urls("/b/", 5), min_size=5)
+        expanded = expand_groups([f"{BASE}/b/*", "bogus", f"{BASE}/a/*"], groups)
+        assert expanded == _urls("/b/", 5) + _urls("/a/", 5)
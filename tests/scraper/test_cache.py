@@ -114,6 +114,17 @@ class TestPageCachePut:
         assert data["html"] == _HTML
         assert "timestamp" in data
 
+    def test_put_keeps_etag_without_counting_a_lookup(self, tmp_path: Path):
+        cache = PageCache(cache_dir=tmp_path / "cache", ttl=3600)
+        cache.put(_URL, _HTML, etag='"abc"')
+        cache.put("https://example.com/other", _HTML)
+
+        assert cache.etag(_URL) == '"abc"'
+        assert cache.etag("https://example.com/other") is None
+        assert cache.etag("https://example.com/missing") is None
+        assert (cache.hits, cache.misses) == (0, 0)
+        assert cache.get(_URL) == _HTML
+
 
 class TestPageCacheCounters:
     """Tests for hits and misses counters."""
@@ -150,3 +161,50 @@ class TestPageCacheCounters:
 
         assert cache.hits == 1
         assert cache.misses == 1
+
+
+class TestPageCacheBytes:
+    """Tests for PageCache.get_bytes() / put_bytes()."""
+
+    def test_round_trips_binary_data(self, tmp_path: Path):
+        """Arbitrary bytes (e.g. a gzipped sitemap) come back unchanged."""
+        import gzip
+
+        cache = PageCache(cache_dir=tmp_path / "cache", ttl=3600)
+        data = gzip.compress(b"<urlset>\n\x00\xff</urlset>")
+
+        cache.put_bytes(_URL, data)
+
+        assert cache.get_bytes(_URL) == data
+        assert (tmp_path / "cache" / f"{_url_hash(_URL)}.bin").exists()
+        assert cache.hits == 1
+
+    def test_falls_back_to_text_entry(self, tmp_path: Path):
+        """A text entry written with put() is returned UTF-8 encoded."""
+        cache = PageCache(cache_dir=tmp_path / "cache", ttl=3600)
+        cache.put(_URL, "<p>café</p>")
+
+        assert cache.get_bytes(_URL) == "<p>café</p>".encode("utf-8")
+
+    def test_miss_and_expiry(self, tmp_path: Path):
+        """Missing and expired binary entries return None and count as misses."""
+        cache_dir = tmp_path / "cache"
+        cache = PageCache(cache_dir=cache_dir, ttl=3600)
+        assert cache.get_bytes(_URL) is None
+
+        cache.put_bytes(_URL, b"data")
+        with patch("src.scraper.cache.time.time", return_value=1e12):
+            assert cache.get_bytes(_URL) is None
+
+        assert not (cache_dir / f"{_url_hash(_URL)}.bin").exists()
+        assert cache.misses == 2
+
+    def test_corrupt_binary_entry_is_removed(self, tmp_path: Path):
+        """A .bin file without a valid header is treated as a miss and deleted."""
+        cache_dir = tmp_path / "cache"
+        cache = PageCache(cache_dir=cache_dir, ttl=3600)
+        path = cache_dir / f"{_url_hash(_URL)}.bin"
+        path.write_bytes(b"\x1f\x8bnot a header")
+
+        assert cache.get_bytes(_URL) is None
+        assert not path.exists()
@@ -6,14 +6,24 @@ test_markdown_semantic.py:
 - _chunk_by_size: overlap, heading split, paragraph split edge cases
 - chunk_markdown: very short text < 50 chars (both branches)
 - _chunk_by_headings: sections smaller than 50 chars are skipped
+- NoiseLineMatcher: single-pass output identical to the per-pattern loop
 """
 
+import random
+import re
+
+import pytest
+
 from src.scraper.markdown import (
     DEFAULT_CHUNK_SIZE,
+    NOISE_LINE_PATTERNS,
+    NOISE_PATTERNS,
+    NoiseLineMatcher,
     _chunk_by_size,
     _chunk_by_headings,
     _pre_clean_markdown,
     chunk_markdown,
+    get_noise_matcher,
 )
 
 
@@ -224,3 +234,147 @@ class TestChunkByHeadingsEdgeCases:
         result = _chunk_by_headings(text, chunk_size=DEFAULT_CHUNK_SIZE)
         # Either None or empty list — both trigger fallback
         assert result is None or result == []
+
+
+# ---------------------------------------------------------------------------
+# TestNoiseLineMatcherEquivalence
+# ---------------------------------------------------------------------------
+
+
+def _legacy_pre_clean(text: str) -> str:
+    """The original per-pattern implementation, kept as the equivalence oracle."""
+    cleaned: list[str] = []
+    in_noise_block = False
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if stripped == "{" and not in_noise_block:
+            in_noise_block = True
+            continue
+        if in_noise_block:
+            if stripped == "}" or stripped == "};":
+                in_noise_block = False
+            continue
+        if any(p.search(line) for p in NOISE_PATTERNS):
+            continue
+        if any(p.match(line) for p in NOISE_LINE_PATTERNS):
+            continue
+        cleaned.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(cleaned)).strip()
+
+
+_CORPUS_LINES = [
+    "# Heading",
+    "Regular documentation prose.",
+    "",
+    "",
+    "   ",
+    "\t",
+    "\r",
+    "{",
+    "}",
+    "};",
+    "On this page",
+    "  ON THIS PAGE  ",
+    "Edit this page",
+    "Was this page helpful?",
+    "Last updated on 2024-01-31",
+    "Last updated 12/01/2023",
+    "Skip to main content",
+    "Table of contents",
+    "Previous",
+    "  next ",
+    "Next steps are described below.",
+    "self.__next_f.push([1, 'x'])",
+    "SELF.__NEXT_DATA = {}",
+    "const x = document.querySelectorAll('.a')",
+    "document.getElementById('root')",
+    "window.addEventListener('load', fn)",
+    '<div data-page-mode = "x">',
+    "suppressHydrationWarning",
+    "```python",
+    "```",
+]
+
+
+class TestNoiseLineMatcherEquivalence:
+    """The combined single-pass classifier must reproduce the legacy output exactly."""
+
+    def test_equivalent_on_random_corpus(self):
+        """Randomised documents built from noise/non-noise lines match the oracle."""
+        rng = random.Random(1234)
+        for _ in range(2000):
+            lines = [rng.choice(_CORPUS_LINES) for _ in range(rng.randint(0, 40))]
+            text = "\n".join(lines)
+            assert _pre_clean_markdown(text) == _legacy_pre_clean(text), repr(text)
+
+    def test_equivalent_on_realistic_page(self):
+        """A realistic page with nav residue, blank runs and a JS block matches."""
+        text = (
+            "Skip to content\n\n\n\n# Install\n\nOn this page\n\n"
+            "Run the installer.\n{\nbody { color: red; }\n}\n\n\n\n"
+            "## Next\n\nPrevious\nNext\n\nWas this page helpful?\n"
+        )
+        assert _pre_clean_markdown(text) == _legacy_pre_clean(text)
+
+    def test_extra_patterns_remove_matching_lines(self):
+        """Per-job extra patterns are applied in the same pass as the defaults."""
+        matcher = get_noise_matcher((r"Sponsored by \w+", "(?i)^share this"))
+        text = "Intro\nSponsored by Acme\nSHARE THIS page\nOn this page\nBody"
+        assert _pre_clean_markdown(text, matcher) == "Intro\nBody"
+
+    def test_extra_pattern_groups_stay_independent(self):
+        """Backreferences and named groups in one pattern do not see another's."""
+        matcher = get_noise_matcher(
+            (r"^(\w+) \1$", r"^(-+)=\1$", r"(?P<w>ad)", r"(?P<w>promo)")
+        )
+        assert matcher.is_noise("again again")
+        assert matcher.is_noise("--=--")
+        assert matcher.is_noise("promo code")
+        assert not matcher.is_noise("again once")
+        assert not matcher.is_noise("--=-")
+
+    def test_extra_patterns_without_groups_folded(self):
+        """Only extra patterns with groups, or that cannot be scoped, are searched
+        separately; the rest give the same answers inside the alternation."""
+        patterns = (
+            r"Sponsored by \w+",
+            "(?i)^share this",
+            r"^(\w+) \1$",
+            "(?x) foo  # verbose comment",
+            "(?i)(?m)^zz",
+            r"^\d+ views$",
+        )
+        matcher = NoiseLineMatcher(patterns)
+        assert len(matcher._extra) == 3
+        compiled = [re.compile(p) for p in patterns]
+        for line in _CORPUS_LINES + [
+            "Sponsored by Acme",
+            "share THIS",
+            "a share this",
+            "again again",
+            "foo",
+            "ZZ top",
+            "12 views",
+            "12 views today",
+        ]:
+            expected = any(p.search(line) for p in NOISE_PATTERNS + compiled) or any(
+                p.match(line) for p in NOISE_LINE_PATTERNS
+            )
+            assert matcher.is_noise(line) == expected, line
+
+    def test_matcher_is_cached_per_pattern_set(self):
+        """The same pattern tuple reuses one compiled matcher across jobs."""
+        patterns = (r"^Sponsored",)
+        assert get_noise_matcher(patterns) is get_noise_matcher(patterns)
+        assert get_noise_matcher(()) is get_noise_matcher(())
+
+    def test_invalid_extra_pattern_raises(self):
+        """Invalid regexes surface as re.error when the matcher is built."""
+        with pytest.raises(re.error):
+            get_noise_matcher(("(unclosed",))
+
+    def test_chunk_markdown_accepts_noise_patterns(self):
+        """chunk_markdown() threads noise_patterns through to pre-cleaning."""
+        text = "Useful line that stays in the output.\nAdvertisement: buy now"
+        result = chunk_markdown(text, noise_patterns=["^Advertisement:"])
+        assert result == ["Useful line that stays in the output."]
@@ -0,0 +1,146 @@
+"""Unit tests for the math-preservation converter stage.
+
+Source module: src/scraper/converters/math_tex.py
+"""
+
+from unittest.mock import MagicMock
+
+from src.llm.cleanup import classify_chunk, profile_chunk
+from src.scraper.converters.markdownify_converter import MarkdownifyConverter
+from src.scraper.converters.math_tex import (
+    PRESERVE_MATH_JS,
+    MathAwareConverter,
+    has_restored_math,
+)
+from src.scraper.converters.tables import TableAwareConverter
+
+_KATEX_INLINE = (
+    '<span class="katex"><span class="katex-mathml"><math><semantics>'
+    "<mrow><msub><mi>a</mi><mn>1</mn></msub></mrow>"
+    '<annotation encoding="application/x-tex">a_1 * b_2</annotation>'
+    '</semantics></math></span><span class="katex-html" aria-hidden="true">'
+    '<span class="base">a1∗b2</span></span></span>'
+)
+_KATEX_DISPLAY = (
+    '<span class="katex-display"><span class="katex"><span class="katex-mathml">'
+    '<math display="block"><semantics><mrow></mrow>'
+    '<annotation encoding="application/x-tex">\\frac{a}{b}</annotation>'
+    '</semantics></math></span><span class="katex-html">ab</span></span></span>'
+)
+_MATHJAX3 = (
+    '<mjx-container class="MathJax" jax="CHTML" display="true">'
+    '<mjx-math>x2</mjx-math><mjx-assistive-mml><math display="block">'
+    "<semantics><msup><mi>x</mi><mn>2</mn></msup>"
+    '<annotation encoding="application/x-tex">x^2</annotation></semantics>'
+    "</math></mjx-assistive-mml></mjx-container>"
+)
+
+
+def _convert(html: str) -> str:
+    return MathAwareConverter(MarkdownifyConverter()).convert(html)
+
+
+class TestMathAwareConverter:
+    """Tests for MathAwareConverter."""
+
+    def test_katex_inline_restored_without_rendered_text(self):
+        """KaTeX annotation becomes $...$ and the visual HTML is dropped."""
+        md = _convert(f"<p>Let {_KATEX_INLINE} hold.</p>")
+        assert md == "Let $a_1 * b_2$ hold."
+
+    def test_katex_display_uses_double_dollars(self):
+        """.katex-display wrappers become $$...$$."""
+        md = _convert(f"<p>Ratio:</p>{_KATEX_DISPLAY}")
+        assert "$$\\frac{a}{b}$$" in md
+        assert "ab" not in md.replace("$$\\frac{a}{b}$$", "")
+
+    def test_mathjax3_container(self):
+        """mjx-container with an assistive MathML annotation is restored."""
+        md = _convert(f"<p>Square:</p>{_MATHJAX3}")
+        assert "$$x^2$$" in md
+        assert "x2" not in md
+
+    def test_mathjax2_scripts_inline_and_display(self):
+        """Raw MathJax 2 scripts (HTTP fast path) are restored, not stripped."""
+        md = _convert(
+            '<p>Inline <script type="math/tex">e^{i\\pi}</script>.</p>'
+            '<script type="math/tex; mode=display">\\sum_i x_i</script>'
+        )
+        assert "$e^{i\\pi}$" in md
+        assert "$$\\sum_i x_i$$" in md
+
+    def test_marker_spans_from_page_scraper(self):
+        """docrawl-tex marker spans left by PRESERVE_MATH_JS are restored."""
+        md = _convert(
+            '<p>See <span class="docrawl-tex" data-display="false">a_b</span>.</p>'
+            '<span class="docrawl-tex" data-display="true">c_d</span>'
+        )
+        assert "$a_b$" in md
+        assert "$$c_d$$" in md
+
+    def test_tex_is_not_escaped_by_the_inner_converter(self):
+        """Underscores/asterisks in TeX stay raw while prose is still escaped."""
+        md = _convert(f"<p>snake_case {_KATEX_INLINE}</p>")
+        assert "snake\\_case" in md
+        assert "$a_1 * b_2$" in md
+
+    def test_math_in_table_cells_escapes_pipes(self):
+        """Math inside rendered GFM tables keeps the table single-line and valid."""
+        converter = MathAwareConverter(TableAwareConverter(MarkdownifyConverter()))
+        md = converter.convert(
+            "<table><tr><th>Norm</th><th>Value</th></tr><tr><td>"
+            '<span class="docrawl-tex" data-display="false">|x|</span>'
+            "</td><td>1</td></tr></table>"
+        )
+        assert "| $\\|x\\|$ | 1 |" in md
+
+    def test_counts_and_passthrough(self):
+        """Pages without math skip parsing; counters track restored expressions."""
+        inner = MagicMock()
+        inner.convert.return_value = "plain"
+        converter = MathAwareConverter(inner)
+        assert converter.convert("<p>no math</p>") == "plain"
+        inner.convert.assert_called_once_with("<p>no math</p>")
+        assert converter.last_math_extracted == 0
+
+        converter = MathAwareConverter(MarkdownifyConverter())
+        converter.convert(f"<p>{_KATEX_INLINE} and {_KATEX_DISPLAY}</p>")
+        assert converter.last_math_extracted == 2
+        assert converter.math_extracted == 2
+
+    def test_missing_placeholder_keeps_inner_output(self):
+        """A placeholder the inner converter drops is not converted again."""
+        inner = MagicMock()
+        inner.convert.return_value = "model output"
+        converter = MathAwareConverter(inner)
+        assert converter.convert(f"<p>{_KATEX_INLINE}</p>") == "model output"
+        inner.convert.assert_called_once()
+        assert converter.math_extracted == 0
+
+    def test_empty_tex_is_dropped(self):
+        """Empty TeX sources do not leave placeholders or empty $$ behind."""
+        md = _convert('<p>a <script type="math/tex"> </script> b</p>')
+        assert "$" not in md
+        assert "PLACEHOLDER" not in md
+
+    def test_preserve_js_targets_math_scripts(self):
+        """The browser-side snippet rewrites math/tex scripts into marker spans."""
+        assert 'script[type^="math/tex"]' in PRESERVE_MATH_JS
+        assert "docrawl-tex" in PRESERVE_MATH_JS
+
+
+class TestMathPreservedProfile:
+    """Restored math must not push chunks into the heavy LaTeX-repair tier."""
+
+    def test_math_preserved_disables_latex_heuristic(self):
+        chunk = "Documentation text. " * 120 + "$\\frac{a}{b}$ and $x_i$."
+        assert classify_chunk(chunk) == "heavy"
+        profile = profile_chunk(chunk, math_preserved=True)
+        assert profile.has_latex is False
+        assert classify_chunk(chunk, profile) == "cleanup"
+
+    def test_has_restored_math(self):
+        assert has_restored_math("see $x_i$ here")
+        assert has_restored_math("$$\n\\frac{a}{b}\n$$")
+        assert not has_restored_math("costs $5 and $10")
+        assert not has_restored_math("\\begin{align} x \\end{align}")
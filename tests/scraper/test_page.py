@@ -363,3 +363,42 @@ class TestPageScraperCustomSelectors:
         mock_page.query_selector.assert_called()
 
         await scraper.stop()
+
+
+class TestPageScraperMathPreservation:
+    """Math TeX sources must be captured before noise removal drops <script>."""
+
+    async def test_preserve_math_runs_before_noise_removal(self):
+        """get_html() evaluates the math snippet before the noise-removal snippet."""
+        scraper = PageScraper()
+        mock_page = AsyncMock()
+        mock_page.query_selector = AsyncMock(return_value=None)
+        mock_page.inner_html = AsyncMock(return_value="<body>content</body>")
+        mock_page.evaluate = AsyncMock(return_value=0)
+        mock_browser = AsyncMock()
+        mock_browser.new_page = AsyncMock(return_value=mock_page)
+        scraper._browser = mock_browser
+
+        await scraper.get_html("https://example.com")
+
+        scripts = [c.args[0] for c in mock_page.evaluate.call_args_list]
+        assert 'script[type^="math/tex"]' in scripts[0]
+        assert "querySelectorAll(`" in scripts[1]  # noise removal
+
+    async def test_preserve_math_with_pool(self):
+        """The pooled path also preserves math before removing noise."""
+        scraper = PageScraper()
+        mock_page = AsyncMock()
+        mock_page.query_selector = AsyncMock(return_value=None)
+        mock_page.inner_html = AsyncMock(return_value="<body>content</body>")
+        mock_page.evaluate = AsyncMock(return_value=3)
+        mock_pool = AsyncMock()
+        mock_acquire_cm = AsyncMock()
+        mock_acquire_cm.__aenter__ = AsyncMock(return_value=mock_page)
+        mock_acquire_cm.__aexit__ = AsyncMock(return_value=False)
+        mock_pool.acquire = MagicMock(return_value=mock_acquire_cm)
+
+        await scraper.get_html("https://example.com", pool=mock_pool)
+
+        first_script = mock_page.evaluate.call_args_list[0].args[0]
+        assert "docrawl-tex" in first_script
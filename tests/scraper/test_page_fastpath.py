@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 
-from src.scraper.page import fetch_html_fast
+from src.scraper.page import PageFetchInfo, convert_html_fast, fetch_html_fast
 
 # A real HTML string that markdownify will convert to ≥500 chars of markdown.
 # Each paragraph sentence is distinct text that survives markdownify stripping,
@@ -129,3 +129,68 @@ class TestFetchHtmlFast:
                 result = await fetch_html_fast("https://docs.example.com/api.json")
 
         assert result is None
+
+    async def test_info_receives_final_url_and_canonical(self):
+        """The final URL and rel=canonical target are reported even if too short."""
+        resp = _make_response(
+            text='<html><head><link rel="canonical" href="/guide"></head>'
+            "<body><p>hi</p></body></html>"
+        )
+        resp.url = "https://docs.example.com/guide/"
+        info = PageFetchInfo()
+        with patch("src.scraper.page.validate_url_not_ssrf"):
+            with patch("httpx.AsyncClient") as mock_client_cls:
+                mock_client = AsyncMock()
+                mock_client_cls.return_value.__aenter__ = AsyncMock(
+                    return_value=mock_client
+                )
+                mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+                mock_client.get = AsyncMock(return_value=resp)
+
+                result = await fetch_html_fast("https://docs.example.com/old", info)
+
+        assert result is None
+        assert info.final_url == "https://docs.example.com/guide/"
+        assert info.canonical == "https://docs.example.com/guide"
+
+
+class TestConvertHtmlFast:
+    """convert_html_fast() applies the fast-path converter to HTML in hand."""
+
+    def test_long_html_converted(self):
+        result = convert_html_fast(_LONG_HTML)
+        assert result is not None
+        assert "paragraph number 9" in result
+
+    def test_short_html_below_threshold_returns_none(self):
+        assert convert_html_fast(_SHORT_HTML) is None
+
+    def test_info_receives_math_count_of_returned_markdown(self):
+        tex = '<span class="docrawl-tex" data-display="false">\\frac{a}{b}</span>'
+        info = PageFetchInfo()
+        assert convert_html_fast(_SHORT_HTML.replace("hi", tex), info) is None
+        assert info.math_restored == 0
+
+        result = convert_html_fast(_LONG_HTML.replace("</body>", tex + "</body>"), info)
+        assert "$\\frac{a}{b}$" in result
+        assert info.math_restored == 1
+
+    def test_given_converter_used_and_counted(self):
+        from src.scraper.converters.markdownify_converter import MarkdownifyConverter
+        from src.scraper.converters.math_tex import MathAwareConverter
+        from src.scraper.converters.tables import TableAwareConverter
+
+        inner = MagicMock(wraps=MarkdownifyConverter())
+        chain = MathAwareConverter(TableAwareConverter(inner))
+        table = (
+            "<table><tr><th>Name</th><th>Value</th></tr>"
+            "<tr><td rowspan='2'>depth</td><td>1</td></tr><tr><td>2</td></tr></table>"
+        )
+        info = PageFetchInfo()
+        result = convert_html_fast(
+            _LONG_HTML.replace("</body>", table + "</body>"), info, converter=chain
+        )
+
+        assert "| depth | 2 |" in result
+        inner.convert.assert_called_once()
+        assert (info.tables_rendered, info.tables_repaired) == (1, 1)
@@ -0,0 +1,268 @@
+"""Unit tests for the deterministic HTML table -> GFM stage.
+
+Source module: src/scraper/converters/tables.py
+"""
+
+from unittest.mock import MagicMock
+
+from bs4 import BeautifulSoup
+
+from src.llm.cleanup import _has_broken_tables, classify_chunk
+from src.scraper.converters.markdownify_converter import MarkdownifyConverter
+from src.scraper.converters.tables import (
+    TableAwareConverter,
+    legacy_would_break,
+    render_table,
+)
+
+
+def _table(html: str):
+    return BeautifulSoup(html, "html.parser").find("table")
+
+
+def _rows(markdown: str) -> list[str]:
+    return [line for line in markdown.splitlines() if line.startswith("|")]
+
+
+class TestRenderTable:
+    """Tests for render_table()."""
+
+    def test_th_first_row_becomes_header(self):
+        """A leading all-<th> row is used as the GFM header."""
+        md = render_table(
+            _table(
+                "<table><tr><th>Name</th><th>Type</th></tr>"
+                "<tr><td>depth</td><td>int</td></tr></table>"
+            )
+        )
+        assert md == "| Name | Type |\n| --- | --- |\n| depth | int |"
+
+    def test_table_without_header_gets_empty_header_row(self):
+        """Tables with no detectable header get an empty header + separator."""
+        md = render_table(
+            _table("<table><tr><td>a</td><td>b</td></tr><tr><td>1</td><td>2</td></tr>")
+        )
+        assert md == "|  |  |\n| --- | --- |\n| a | b |\n| 1 | 2 |"
+
+    def test_bold_first_row_detected_as_header(self):
+        """A first row whose cells are entirely bold is treated as the header."""
+        md = render_table(
+            _table(
+                "<table><tr><td><b>Key</b></td><td><strong>Value</strong></td></tr>"
+                "<tr><td>x</td><td>1</td></tr></table>"
+            )
+        )
+        assert md is not None
+        assert md.splitlines()[0] == "| **Key** | **Value** |"
+        assert len(_rows(md)) == 3
+
+    def test_colspan_keeps_columns_aligned(self):
+        """colspan puts the value in the first column and pads the rest."""
+        md = render_table(
+            _table(
+                "<table><tr><th>A</th><th>B</th><th>C</th></tr>"
+                "<tr><td colspan='2'>wide</td><td>c</td></tr></table>"
+            )
+        )
+        assert md is not None
+        assert _rows(md)[-1] == "| wide |  | c |"
+
+    def test_rowspan_repeats_value_in_spanned_rows(self):
+        """rowspan repeats the value so every row has the full column count."""
+        md = render_table(
+            _table(
+                "<table><tr><th>Group</th><th>Item</th></tr>"
+                "<tr><td rowspan='2'>g1</td><td>a</td></tr>"
+                "<tr><td>b</td></tr></table>"
+            )
+        )
+        assert md is not None
+        assert _rows(md)[2:] == ["| g1 | a |", "| g1 | b |"]
+
+    def test_multi_row_thead_is_merged(self):
+        """Multi-row <thead> blocks are merged into a single header row."""
+        md = render_table(
+            _table(
+                "<table><thead><tr><th rowspan='2'>Name</th><th colspan='2'>Q1</th></tr>"
+                "<tr><th>Jan</th><th>Feb</th></tr></thead>"
+                "<tbody><tr><td>x</td><td>1</td><td>2</td></tr></tbody></table>"
+            )
+        )
+        assert md is not None
+        assert _rows(md)[0] == "| Name | Q1 Jan | Feb |"
+        assert len(_rows(md)) == 3
+
+    def test_inline_markup_pipes_and_line_breaks(self):
+        """Links/code survive, '|' is escaped, block content joins with <br>."""
+        md = render_table(
+            _table(
+                "<table><tr><th>Col</th><th>Other</th></tr>"
+                "<tr><td><a href='/x'>link</a></td><td>a|b</td></tr>"
+                "<tr><td><code>x()</code></td><td><p>one</p><p>two</p></td></tr>"
+                "</table>"
+            )
+        )
+        assert md is not None
+        rows = _rows(md)
+        assert rows[2] == "| [link](/x) | a\\|b |"
+        assert rows[3] == "| `x()` | one<br>two |"
+
+    def test_caption_rendered_above_table(self):
+        """<caption> is emitted as a bold line before the table."""
+        md = render_table(
+            _table(
+                "<table><caption>Limits</caption><tr><th>A</th><th>B</th></tr></table>"
+            )
+        )
+        assert md is not None
+        assert md.startswith("**Limits**\n")
+
+    def test_layout_tables_are_not_rendered(self):
+        """Single-cell, nested and <pre>-containing tables are left alone."""
+        assert render_table(_table("<table><tr><td>only</td></tr></table>")) is None
+        assert (
+            render_table(
+                _table(
+                    "<table><tr><td><table><tr><td>a</td><td>b</td></tr></table>"
+                    "</td><td>x</td></tr></table>"
+                )
+            )
+            is None
+        )
+        assert (
+            render_table(
+                _table("<table><tr><td><pre>code</pre></td><td>x</td></tr></table>")
+            )
+            is None
+        )
+
+    def test_every_row_has_the_same_column_count(self):
+        """Ragged rows and overlapping spans still produce a rectangular table."""
+        md = render_table(
+            _table(
+                "<table><tr><td rowspan='3'>a</td><td>b</td><td rowspan='2'>c</td></tr>"
+                "<tr><td colspan='2'>d</td></tr><tr></tr><tr><td>e</td></tr></table>"
+            )
+        )
+        assert md is not None
+        assert len({row.count(" | ") for row in _rows(md)}) == 1
+
+
+class TestLegacyWouldBreak:
+    """Tests for legacy_would_break()."""
+
+    def test_simple_table_is_fine(self):
+        """markdownify handles plain header + body tables correctly."""
+        table = _table(
+            "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>"
+        )
+        assert legacy_would_break(table) is False
+
+    def test_spans_pipes_blocks_and_multirow_thead_break(self):
+        """Each shape markdownify mangles is flagged."""
+        for html in (
+            "<table><tr><td rowspan='2'>a</td><td>b</td></tr></table>",
+            "<table><tr><td colspan='2'>a</td></tr></table>",
+            "<table><tr><td>a|b</td><td>c</td></tr></table>",
+            "<table><tr><td><p>a</p><p>b</p></td><td>c</td></tr></table>",
+            "<table><thead><tr><th>a</th></tr><tr><th>b</th></tr></thead></table>",
+        ):
+            assert legacy_would_break(_table(html)) is True, html
+
+
+class TestTableAwareConverter:
+    """Tests for TableAwareConverter."""
+
+    def test_pages_without_tables_pass_through(self):
+        """HTML without <table> is handed to the inner converter unchanged."""
+        inner = MagicMock()
+        inner.convert.return_value = "# Title"
+        converter = TableAwareConverter(inner)
+        assert converter.convert("<h1>Title</h1>") == "# Title"
+        inner.convert.assert_called_once_with("<h1>Title</h1>")
+        assert converter.tables_rendered == 0
+
+    def test_tables_spliced_into_inner_output(self):
+        """Rendered tables replace their placeholders in the converted page."""
+        converter = TableAwareConverter(MarkdownifyConverter())
+        html = (
+            "<h1>Options</h1><p>Intro.</p>"
+            "<table><tr><td rowspan='2'>depth</td><td>int</td></tr>"
+            "<tr><td>default 5</td></tr></table><p>Outro.</p>"
+        )
+        md = converter.convert(html)
+        assert md.index("# Options") < md.index("| depth | int |")
+        assert md.index("| depth | default 5 |") < md.index("Outro.")
+        assert "PLACEHOLDER" not in md
+        assert converter.tables_rendered == 1
+        assert converter.tables_repaired == 1
+        assert converter.last_tables_repaired == 1
+
+    def test_output_never_classified_heavy_for_tables(self):
+        """Tables markdownify breaks come out as valid GFM the heuristics accept."""
+        rows = "".join(
+            f"<tr><td rowspan='2'>r{i}</td><td><p>a</p><p>b</p></td></tr>"
+            f"<tr><td>x|y</td></tr>"
+            for i in range(40)
+        )
+        html = "<p>" + "Documentation text. " * 100 + "</p><table>" + rows + "</table>"
+        md = TableAwareConverter(MarkdownifyConverter()).convert(html)
+        assert _has_broken_tables(md) is False
+        assert classify_chunk(md) != "heavy"
+
+    def test_table_in_list_item_keeps_indent(self):
+        """Every row of a table inside <li> is indented into the list item."""
+        html = (
+            "<ul><li>Item<table><tr><th>A</th><th>B</th></tr>"
+            "<tr><td>1</td><td>2</td></tr></table></li><li>Two</li></ul>"
+        )
+        md = TableAwareConverter(MarkdownifyConverter()).convert(html)
+        assert md == ("* Item\n\n  | A | B |\n  | --- | --- |\n  | 1 | 2 |\n* Two")
+
+    def test_table_opening_list_item_aligned_under_marker(self):
+        """A table right after the list marker continues at the marker's width."""
+        html = "<ol><li><table><tr><th>A</th><th>B</th></tr></table></li></ol>"
+        md = TableAwareConverter(MarkdownifyConverter()).convert(html)
+        assert md == "1. | A | B |\n   | --- | --- |"
+
+    def test_table_in_blockquote_keeps_marker(self):
+        """Every row of a table inside <blockquote> keeps the ``> `` prefix."""
+        html = (
+            "<blockquote><p>Note</p><table><tr><th>A</th><th>B</th></tr>"
+            "<tr><td>1</td><td>2</td></tr></table></blockquote>"
+        )
+        md = TableAwareConverter(MarkdownifyConverter()).convert(html)
+        assert md == "> Note\n>\n> | A | B |\n> | --- | --- |\n> | 1 | 2 |"
+
+    def test_placeholder_after_text_gets_its_own_block(self):
+        """A placeholder preceded by text on its line becomes a block of its own."""
+        inner = MagicMock()
+        inner.convert.return_value = "see DOCRAWLTABLE0PLACEHOLDER below"
+        converter = TableAwareConverter(inner)
+        md = converter.convert("<table><tr><th>a</th><th>b</th></tr></table>")
+        assert md == "see\n\n| a | b |\n| --- | --- |\n\nbelow"
+        inner.convert.assert_called_once()
+        assert converter.tables_rendered == 1
+
+    def test_missing_placeholder_keeps_inner_output(self):
+        """A placeholder the inner converter drops is not converted again."""
+        inner = MagicMock()
+        inner.convert.return_value = "DOCRAWLTABLE1PLACEHOLDER\n\nrewritten by model"
+        converter = TableAwareConverter(inner)
+        html = (
+            "<table><tr><th>a</th><th>b</th></tr></table>"
+            "<table><tr><th>c</th><th>d</th></tr></table>"
+        )
+        assert converter.convert(html) == (
+            "| c | d |\n| --- | --- |\n\nrewritten by model"
+        )
+        inner.convert.assert_called_once()
+        assert converter.tables_rendered == 1
+
+    def test_protocol_methods(self):
+        """supports_tables is always True; code-block support is delegated."""
+        inner = MagicMock()
+        inner.supports_code_blocks.return_value = False
+        converter = TableAwareConverter(inner)
+        assert converter.supports_tables() is True
+        assert converter.supports_code_blocks() is False